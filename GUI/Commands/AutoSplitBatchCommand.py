@@ -101,4 +101,5 @@ class AutoSplitBatchCommand(Command):
             else:
                 logging.warning(f"Line {line_number} not found in merged batch {self.batch_number}")
 
+        merged_batch.MarkModified()
         return True
\ No newline at end of file
@@ -33,7 +33,10 @@ class BatchSubtitlesCommand(Command):
         if self.preprocess_subtitles:
             originals = deepcopy(project.subtitles.originals)
             preprocessor = SubtitleProcessor(self.options)
-            project.subtitles.PreProcess(preprocessor)
+            try:
+                project.subtitles.PreProcess(preprocessor)
+            finally:
+                preprocessor.Close()
 
             if self.options.get('save_preprocessed', False):
                 changed = len(originals) != len(project.subtitles.originals) or any(o != n for o, n in zip(originals, project.subtitles.originals))
@@ -1,4 +1,5 @@
 from GUI.Command import Command, CommandError
+from GUI.Commands.RebatchLinesCommand import RebatchLinesCommand
 from GUI.ProjectDataModel import ProjectDataModel
 from GUI.ViewModel.ViewModelUpdate import ModelUpdate
 from PySubtitle.SubtitleValidator import SubtitleValidator
@@ -50,6 +51,9 @@ class DeleteLinesCommand(Command):
                 validator.ValidateBatch(batch)
                 model_update.batches.update((scene_number, batch_number), {'errors': batch.error_messages})
 
+        # Deleting lines may leave a batch (or a scene) below the minimum size, or empty
+        self.commands_to_queue.append(RebatchLinesCommand(self.line_numbers))
+
         return True
 
     def undo(self):
@@ -76,4 +80,6 @@ class DeleteLinesCommand(Command):
 
                 model_update.lines.add((scene_number, batch_number, line.number), line)
 
+            batch.MarkModified()
+
         return True
\ No newline at end of file
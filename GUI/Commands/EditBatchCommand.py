@@ -30,7 +30,7 @@ class EditBatchCommand(Command):
         if not isinstance(self.edit, dict):
             raise CommandError(_("Edit data must be a dictionary"), command=self)
 
-        with subtitles.lock:
+        with subtitles.SceneLock(self.scene_number):
             batch : SubtitleBatch = subtitles.GetBatch(self.scene_number, self.batch_number)
             if not batch:
                 raise CommandError(_("Batch ({scene},{batch}) not found").format(scene=self.scene_number, batch=self.batch_number), command=self)
@@ -58,7 +58,7 @@ class EditBatchCommand(Command):
 
         subtitles : Subtitles = self.datamodel.project.subtitles
 
-        with subtitles.lock:
+        with subtitles.SceneLock(self.scene_number):
             batch : SubtitleBatch = subtitles.GetBatch(self.scene_number, self.batch_number)
             if not batch:
                 raise CommandError(_("Batch ({scene},{batch}) not found").format(scene=self.scene_number, batch=self.batch_number), command=self)
@@ -81,6 +81,8 @@ class EditLineCommand(Command):
                         translated_line.original = line.text
                         batch.AddTranslatedLine(translated_line)
 
+                batch.MarkModified()
+
             self._update_model(batch, line)
 
         return True
@@ -123,6 +125,8 @@ class EditLineCommand(Command):
                     translated_line.text = self.undo_data['translation']
                     translated_line.original = line.text
 
+                batch.MarkModified()
+
             self._update_model(batch, line)
 
         return True
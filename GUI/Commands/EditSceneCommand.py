@@ -27,7 +27,7 @@ class EditSceneCommand(Command):
         if not isinstance(self.edit, dict):
             raise CommandError("Edit data must be a dictionary", command=self)
 
-        with subtitles.lock:
+        with subtitles.SceneLock(self.scene_number):
             scene : SubtitleScene = subtitles.GetScene(self.scene_number)
             if not scene:
                 raise CommandError(f"Scene {self.scene_number} not found", command=self)
@@ -53,7 +53,7 @@ class EditSceneCommand(Command):
 
         subtitles : Subtitles = self.datamodel.project.subtitles
 
-        with subtitles.lock:
+        with subtitles.SceneLock(self.scene_number):
             scene = subtitles.GetScene(self.scene_number)
             if not scene:
                 raise CommandError(f"Scene {self.scene_number} not found", command=self)
@@ -1,4 +1,5 @@
 from GUI.Command import Command, CommandError, UndoError
+from GUI.Commands.RebatchLinesCommand import RebatchLinesCommand
 from GUI.ProjectDataModel import ProjectDataModel
 from GUI.ViewModel.ViewModelUpdate import ModelUpdate
 from PySubtitle.SubtitleBatch import SubtitleBatch
@@ -69,6 +70,9 @@ class MergeLinesCommand(Command):
             for line in batch_lines[1:]:
                 model_update.lines.remove((batch.scene, batch.number, line))
 
+        # Merging lines may leave a batch below the minimum size
+        self.commands_to_queue.append(RebatchLinesCommand(self.line_numbers))
+
         return True
 
     def undo(self):
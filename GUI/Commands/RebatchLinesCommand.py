@@ -0,0 +1,111 @@
+from GUI.Command import Command, CommandError, UndoError
+from GUI.ProjectDataModel import ProjectDataModel
+from GUI.ViewModel.ViewModelUpdate import ModelUpdate
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleBatcher import BatchingDiff, SubtitleBatcher
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.SubtitleProject import SubtitleProject
+
+import logging
+
+class RebatchLinesCommand(Command):
+    """
+    Re-partition only the batches affected by edits to some lines, leaving the rest of the project untouched.
+
+    Queued automatically after lines are deleted or merged, and can be used directly on a selection.
+    The scenes and batches are kept as they were before re-batching, so that the command can be undone.
+    """
+    def __init__(self, line_numbers : list[int], datamodel : ProjectDataModel|None = None):
+        super().__init__(datamodel)
+        self.line_numbers : list[int] = line_numbers
+        self.diff : BatchingDiff|None = None
+        self.previous_scenes : list[tuple[SubtitleScene, list[SubtitleBatch]]] = []
+        self.changed_scenes : list[int] = []
+
+    def execute(self) -> bool:
+        if not self.line_numbers:
+            raise CommandError(_("No lines selected to rebatch"), command=self)
+
+        logging.info(_("Rebatching lines {lines}").format(lines=str(self.line_numbers)))
+
+        if not self.datamodel or not self.datamodel.project:
+            raise CommandError(_("No project data"), command=self)
+
+        project : SubtitleProject = self.datamodel.project
+
+        if not project.subtitles or not project.subtitles.scenes:
+            raise CommandError(_("Subtitles have not been batched"), command=self)
+
+        batcher = SubtitleBatcher(self.datamodel.project_options)
+        with project.subtitles.lock:
+            self.previous_scenes = [ (scene, list(scene.batches)) for scene in project.subtitles.scenes ]
+            self.diff = project.subtitles.RebatchLines(batcher, self.line_numbers)
+
+        if not self.diff.has_changes:
+            logging.info(_("Batches are already within the size limits"))
+            self.previous_scenes = []
+            self.skip_undo = True
+            return True
+
+        # Scenes whose batches changed, by their number after re-batching
+        self.changed_scenes = sorted({ key[0] for key in self.diff.removed_batches }
+                                     | { key[0] for key in self.diff.renumbered_batches }
+                                     | { batch.scene for batch in self.diff.added_batches })
+
+        # Scene changes are applied first, so that batch keys refer to the renumbered scenes
+        if self.diff.removed_scenes or self.diff.renumbered_scenes:
+            scene_update : ModelUpdate = self.AddModelUpdate()
+            for scene_number, new_number in self.diff.renumbered_scenes.items():
+                scene_update.scenes.update(scene_number, { 'number' : new_number })
+
+            for scene_number in self.diff.removed_scenes:
+                scene_update.scenes.remove(scene_number)
+
+        # The viewmodel cannot renumber batches in place, so scenes with renumbered batches are replaced with their rebatched versions
+        renumbered_scenes : set[int] = { scene_number for scene_number, batch_number in self.diff.renumbered_batches }
+
+        batch_update : ModelUpdate = self.AddModelUpdate()
+        for scene_number in sorted(renumbered_scenes):
+            batch_update.scenes.replace(scene_number, project.subtitles.GetScene(scene_number))
+
+        for key in sorted(self.diff.removed_batches):
+            if key[0] not in renumbered_scenes:
+                batch_update.batches.remove(key)
+
+        for batch in sorted(self.diff.added_batches, key=lambda batch: (batch.scene, batch.number)):
+            if batch.scene not in renumbered_scenes:
+                batch_update.batches.add((batch.scene, batch.number), batch)
+
+        return True
+
+    def undo(self) -> bool:
+        if not self.diff or not self.previous_scenes:
+            raise UndoError(_("Cannot undo rebatch, the previous batches were not saved"), command=self)
+
+        if not self.datamodel or not self.datamodel.project:
+            raise CommandError(_("No project data"), command=self)
+
+        logging.info(_("Restoring batches before rebatching lines {lines}").format(lines=str(self.line_numbers)))
+
+        subtitles = self.datamodel.project.subtitles
+        subtitles.RestoreScenes(self.previous_scenes)
+
+        model_update : ModelUpdate = self.AddModelUpdate()
+        replaced_scenes : list[int] = self.changed_scenes
+        if self.diff.removed_scenes:
+            # Scenes from the first removed scene onward were renumbered, so they are removed and added again
+            first_removed = min(self.diff.removed_scenes)
+            for scene_number in range(first_removed, len(subtitles.scenes) - len(self.diff.removed_scenes) + 1):
+                model_update.scenes.remove(scene_number)
+
+            for scene in subtitles.scenes[first_removed - 1:]:
+                model_update.scenes.add(scene.number, scene)
+
+            replaced_scenes = [ scene_number for scene_number in self.changed_scenes if scene_number < first_removed ]
+
+        for scene_number in replaced_scenes:
+            model_update.scenes.replace(scene_number, subtitles.GetScene(scene_number))
+
+        self.previous_scenes = []
+        return True
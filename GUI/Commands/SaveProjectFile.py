@@ -1,13 +1,16 @@
+import os
+
 from GUI.Command import Command, CommandError
 from PySubtitle.Helpers import GetOutputPath
 from PySubtitle.Helpers.Localization import _
 from PySubtitle.SubtitleProject import SubtitleProject
 
 class SaveProjectFile(Command):
-    def __init__(self, project : SubtitleProject, filepath : str|None = None):
+    def __init__(self, project : SubtitleProject, filepath : str|None = None, background : bool = False):
         super().__init__()
         self.can_undo = False
-        self.is_blocking = True
+        self.is_blocking = not background
+        self.background : bool = background
         self.project : SubtitleProject = project
         self.filepath : str|None = filepath or project.projectfile
 
@@ -19,8 +22,10 @@ class SaveProjectFile(Command):
             raise CommandError(_("No project data"), command=self)
 
         self.project.projectfile = self.project.GetProjectFilepath(self.filepath)
-        self.project.subtitles.outputpath = GetOutputPath(self.project.projectfile, self.project.target_language)
-        self.project.SaveProjectFile()
+        sourcepath = self.project.subtitles.sourcepath
+        extension = os.path.splitext(sourcepath)[1] if sourcepath else None
+        self.project.subtitles.outputpath = GetOutputPath(self.project.projectfile, self.project.target_language, extension)
+        self.project.SaveProjectFile(background=self.background)
 
         if self.project.subtitles.translated:
             self.project.SaveTranslation()
@@ -67,6 +67,7 @@ class StartTranslationCommand(Command):
                 previous_command = command
 
                 if self.datamodel.autosave_enabled:
-                    command.commands_to_queue.append(SaveProjectFile(project=project))
+                    # Autosave in the background so that translation of the next scene is not held up
+                    command.commands_to_queue.append(SaveProjectFile(project=project, background=True))
 
         return True
\ No newline at end of file
@@ -222,7 +222,10 @@ class BatchPreviewWorker(QThread):
         try:
             if self.settings.get('preprocess_subtitles'):
                 preprocessor = SubtitleProcessor(self.settings)
-                lines = preprocessor.PreprocessSubtitles(self.subtitles)
+                try:
+                    lines = preprocessor.PreprocessSubtitles(self.subtitles)
+                finally:
+                    preprocessor.Close()
             else:
                 lines = self.subtitles
 
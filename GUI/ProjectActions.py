@@ -15,6 +15,7 @@ from GUI.Commands.EditSceneCommand import EditSceneCommand
 from GUI.Commands.MergeBatchesCommand import MergeBatchesCommand
 from GUI.Commands.MergeLinesCommand import MergeLinesCommand
 from GUI.Commands.MergeScenesCommand import MergeScenesCommand
+from GUI.Commands.RebatchLinesCommand import RebatchLinesCommand
 from GUI.Commands.ReparseTranslationsCommand import ReparseTranslationsCommand
 from GUI.Commands.StartTranslationCommand import StartTranslationCommand
 from GUI.Commands.SplitBatchCommand import SplitBatchCommand
@@ -26,6 +27,7 @@ from GUI.ProjectDataModel import ProjectDataModel
 from GUI.ProjectSelection import ProjectSelection
 
 from PySubtitle.Options import Options
+from PySubtitle.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtitle.SubtitleProject import SubtitleProject
 from PySubtitle.Helpers.Localization import _
 
@@ -127,7 +129,8 @@ class ProjectActions(QObject):
         initial_path = self.last_used_path or os.getcwd()
         shift_pressed = self._is_shift_pressed()
 
-        filters = f"{_('Subtitle files')} (*.srt *.subtrans);;{_('All Files')} (*)"
+        extensions = " ".join(f"*{extension}" for extension in SubtitleFormatRegistry.ListExtensions())
+        filters = f"{_('Subtitle files')} ({extensions} *.subtrans *.subtransdb);;{_('All Files')} (*)"
         filepath, dummy = QFileDialog.getOpenFileName(parent=self._mainwindow, caption=_("Open File"), dir=initial_path, filter=filters) # type: ignore[unused-ignore]
 
         if filepath:
@@ -150,7 +153,7 @@ class ProjectActions(QObject):
             base_path = self.last_used_path or os.getcwd()
             base_name = os.path.basename(project.projectfile) if project.projectfile else "untitled.subtrans"
             filepath = os.path.join(base_path, base_name)
-            filters = f"{_('Subtrans projects')} (*.subtrans);;{_('All Files')} (*)"
+            filters = f"{_('Subtrans projects')} (*.subtrans);;{_('Subtrans project databases')} (*.subtransdb);;{_('All Files')} (*)"
             filepath, dummy = QFileDialog.getSaveFileName(self._mainwindow, _("Save Project File"), filepath, filters)  # type: ignore[unused-ignore]
 
         if filepath:
@@ -387,6 +390,18 @@ class ProjectActions(QObject):
 
         self.QueueCommand(AutoSplitBatchCommand(scene_number, batch_number))
 
+    def RebatchSelection(self, selection : ProjectSelection):
+        """
+        Re-partition the batches containing the selected lines, leaving the rest of the project untouched
+        """
+        if not selection.AnyLines():
+            raise ActionError(_("Please select the lines to rebatch"))
+
+        self._validate_datamodel()
+
+        line_numbers = [ line.number for line in selection.selected_lines ]
+        self.QueueCommand(RebatchLinesCommand(line_numbers))
+
     def _swap_text_and_translation(self, selection : ProjectSelection):
         """
         This is a simple action to test the GUI
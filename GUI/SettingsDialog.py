@@ -37,6 +37,9 @@ class SettingsDialog(QDialog):
             'prompt': (str, _("The (brief) instruction for each batch of subtitles. Some [tags] are automatically filled in")),
             'autosave': (bool, _("Automatically save the project after each translation batch")),
             'write_backup': (bool, _("Save a backup copy of the project when opening it")),
+            'pretty_project_file': (bool, _("Indent project files so that they are easier to read (larger and slower to save)")),
+            'save_prompts': (bool, _("Save the prompt sent for each batch in the project file")),
+            'save_responses': (bool, _("Save the full response for each batch in the project file (needed to reparse translations)")),
             # 'autosplit_incomplete': (bool, "If true, incomplete translations will be split into smaller batches and retried"),
             'retry_on_error': (bool, _("If true, translations that fail validation will be retried with a note about the error")),
             'stop_on_error': (bool, _("Stop translating if an error is encountered"))
@@ -69,6 +72,8 @@ class SettingsDialog(QDialog):
             'min_batch_size': (int, _("Avoid creating a new batch smaller than this")),
             'max_batch_size': (int, _("Divide any batches larger than this into multiple batches")),
             'scene_threshold': (float, _("Consider a new scene to have started after this many seconds without subtitles")),
+            'auto_scene_threshold': (bool, _("Choose the scene threshold automatically from the gaps between subtitles")),
+            'balance_batches': (bool, _("Divide scenes into evenly sized batches, preferring to split at large gaps")),
             'substitution_mode': (Substitutions.Mode, _("Whether to substitute whole words or partial matches, or choose automatically based on input language")),
             'max_context_summaries': (int, _("Limits the number of scene/batch summaries to include as context with each translation batch")),
             'max_summary_length': (int, _("Maximum length of the context summary to include with each translation batch")),
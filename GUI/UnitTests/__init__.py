@@ -6,3 +6,4 @@ from GUI.UnitTests.test_DeleteLinesCommand import DeleteLinesCommandTest
 from GUI.UnitTests.test_ReparseTranslationCommand import ReparseTranslationsCommandTest
 from GUI.UnitTests.test_StartTranslationCommand import StartTranslationCommandTests
 from GUI.UnitTests.test_EditCommands import EditCommandsTests
+from GUI.UnitTests.test_RebatchLinesCommand import RebatchLinesCommandTest
@@ -0,0 +1,163 @@
+from copy import deepcopy
+
+from GUI.Command import Command
+from GUI.Commands.DeleteLinesCommand import DeleteLinesCommand
+from GUI.Commands.RebatchLinesCommand import RebatchLinesCommand
+from GUI.ProjectDataModel import ProjectDataModel
+from GUI.UnitTests.DataModelHelpers import CreateTestDataModel
+from GUI.ViewModel.ViewModel import ProjectViewModel
+from PySubtitle.Helpers.TestCases import AddTranslations, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class RebatchLinesCommandTest(SubtitleTestCase):
+    rebatch_lines_test_cases = [
+        {
+            'description': "Lines deleted inside a batch that remains large enough",
+            'lines': [3, 4],
+            'expected_batch_sizes': [[12, 16], [12, 13], [6], [3]],
+            'expected_changes': False,
+        },
+        {
+            'description': "Undersized batch is merged with its neighbour",
+            'lines': list(range(33, 43)),
+            'expected_batch_sizes': [[14, 16], [15], [6], [3]],
+            'expected_changes': True,
+        },
+        {
+            'description': "Empty scene is removed and later scenes renumbered",
+            'lines': list(range(56, 62)),
+            'expected_batch_sizes': [[14, 16], [12, 13], [3]],
+            'expected_changes': True,
+        },
+    ]
+
+    def test_RebatchLinesCommand(self):
+        log_test_name("RebatchLinesCommand")
+
+        for test_case in self.rebatch_lines_test_cases:
+            with self.subTest(test_case['description']):
+                datamodel : ProjectDataModel = self._create_batched_datamodel()
+                if not datamodel.project:
+                    self.fail("Failed to create test datamodel")
+                    return
+
+                subtitles : Subtitles = datamodel.project.subtitles
+                viewmodel : ProjectViewModel = datamodel.CreateViewModel()
+                untouched_batch = subtitles.GetBatch(1, 2)
+                translated_count = sum(len(batch.translated) for scene in subtitles.scenes for batch in scene.batches)
+                initial_batches = self._describe_batches(subtitles)
+
+                lines = test_case['lines']
+                delete_command = DeleteLinesCommand(lines, datamodel=datamodel)
+                self.assertTrue(delete_command.execute())
+                self._apply_model_updates(viewmodel, delete_command)
+                deleted_batches = self._describe_batches(subtitles)
+
+                # Deleting lines queues a rebatch of the affected region
+                queued = [ queued for queued in delete_command.commands_to_queue if isinstance(queued, RebatchLinesCommand) ]
+                self.assertEqual(len(queued), 1)
+
+                command = queued[0]
+                command.SetDataModel(datamodel)
+                self.assertTrue(command.execute())
+                self.assertEqual(command.skip_undo, not test_case['expected_changes'])
+                self.assertIsNotNone(command.diff)
+                self._apply_model_updates(viewmodel, command)
+                command.ClearModelUpdates()
+
+                batch_sizes = [ [ batch.size for batch in scene.batches ] for scene in subtitles.scenes ]
+                log_input_expected_result(lines, test_case['expected_batch_sizes'], batch_sizes)
+                self.assertSequenceEqual(batch_sizes, test_case['expected_batch_sizes'])
+
+                if command.diff:
+                    self.assertEqual(command.diff.has_changes, test_case['expected_changes'])
+
+                # Batches outside the edited region are untouched and translations are carried over
+                self.assertIs(subtitles.GetBatch(1, 2), untouched_batch)
+                remaining_translated = sum(len(batch.translated) for scene in subtitles.scenes for batch in scene.batches)
+                self.assertEqual(remaining_translated, translated_count - len(lines))
+
+                self._assert_viewmodel_matches(viewmodel, subtitles)
+
+                # The rebatch can be undone, and then the deletion, restoring the original batches
+                self.assertTrue(command.can_undo)
+                if test_case['expected_changes']:
+                    self.assertTrue(command.undo())
+                    self._apply_model_updates(viewmodel, command)
+                    log_input_expected_result("Undo rebatch", deleted_batches, self._describe_batches(subtitles))
+                    self.assertEqual(self._describe_batches(subtitles), deleted_batches)
+                    self._assert_viewmodel_matches(viewmodel, subtitles)
+
+                    delete_command.ClearModelUpdates()
+                    self.assertTrue(delete_command.undo())
+                    self._apply_model_updates(viewmodel, delete_command)
+                    self.assertEqual(self._describe_batches(subtitles), initial_batches)
+                    self._assert_viewmodel_matches(viewmodel, subtitles)
+
+    def test_RebatchRenumbersBatches(self):
+        log_test_name("RebatchLinesCommand renumbers batches")
+
+        datamodel : ProjectDataModel = self._create_batched_datamodel()
+        if not datamodel.project:
+            self.fail("Failed to create test datamodel")
+            return
+
+        # Split the first batch so that the scene has a small batch followed by others
+        subtitles : Subtitles = datamodel.project.subtitles
+        subtitles.GetScene(1).SplitBatch(1, 8)
+        last_batch = subtitles.GetBatch(1, 3)
+        viewmodel : ProjectViewModel = datamodel.CreateViewModel()
+
+        command = RebatchLinesCommand([1], datamodel=datamodel)
+        self.assertTrue(command.execute())
+        self._apply_model_updates(viewmodel, command)
+
+        self.assertIsNotNone(command.diff)
+        if command.diff:
+            log_input_expected_result("Renumbered batches", { (1, 3): 2 }, command.diff.renumbered_batches)
+            self.assertEqual(command.diff.renumbered_batches, { (1, 3): 2 })
+
+        batch_sizes = [ [ batch.size for batch in scene.batches ] for scene in subtitles.scenes ]
+        self.assertSequenceEqual(batch_sizes, [[14, 16], [12, 13], [6], [3]])
+        self.assertIs(subtitles.GetBatch(1, 2), last_batch)
+
+        self._assert_viewmodel_matches(viewmodel, subtitles)
+
+        # Undo restores the split batches with their original numbers
+        command.ClearModelUpdates()
+        self.assertTrue(command.undo())
+        self._apply_model_updates(viewmodel, command)
+        self.assertIs(subtitles.GetBatch(1, 3), last_batch)
+        self._assert_viewmodel_matches(viewmodel, subtitles)
+
+    def _create_batched_datamodel(self) -> ProjectDataModel:
+        data = deepcopy(chinese_dinner_data)
+        datamodel : ProjectDataModel = CreateTestDataModel(data, self.options)
+        if datamodel.project:
+            subtitles : Subtitles = datamodel.project.subtitles
+            subtitles.AutoBatch(SubtitleBatcher(self.options))
+            AddTranslations(subtitles, data, 'translated')
+        return datamodel
+
+    def _apply_model_updates(self, viewmodel : ProjectViewModel, command : Command):
+        for model_update in command.model_updates:
+            viewmodel.ApplyUpdate(lambda viewmodel, model_update=model_update: model_update.ApplyToViewModel(viewmodel))
+
+    def _describe_batches(self, subtitles : Subtitles) -> list[tuple[int, int, list[int], int]]:
+        return [ (batch.scene, batch.number, [ line.number for line in batch.originals ], len(batch.translated)) for scene in subtitles.scenes for batch in scene.batches ]
+
+    def _assert_viewmodel_matches(self, viewmodel : ProjectViewModel, subtitles : Subtitles):
+        """
+        Check that the patched viewmodel has the same structure as the subtitles
+        """
+        expected = { scene.number: { batch.number: [ line.number for line in batch.originals ] for batch in scene.batches } for scene in subtitles.scenes }
+        actual = { scene_number: { batch_number: list(batch_item.lines.keys()) for batch_number, batch_item in scene_item.batches.items() } for scene_number, scene_item in viewmodel.model.items() }
+        self.assertEqual(actual, expected)
+
+        for scene_number, scene_item in viewmodel.model.items():
+            self.assertEqual(scene_item.number, scene_number)
+            for batch_number, batch_item in scene_item.batches.items():
+                self.assertEqual((batch_item.scene, batch_item.number), (scene_number, batch_number))
@@ -27,29 +27,23 @@ class BatchItem(ViewModelItem):
             'end': batch.srt_end,
             'summary': batch.summary,
             'errors': self._get_errors(batch.errors),
-            'translated': batch.translation is not None
+            'translated': batch.has_translation
         }
 
         # cache on demand
         self._first_line_num: int|None = None
         self._last_line_num: int|None = None
 
-        if batch.translation and isinstance(batch.translation, Translation):
-            self.batch_model.update({
-                'response': batch.translation.FormatResponse(),
-                'reasoning': batch.translation.reasoning,
-                'context': batch.context
-            })
+        # Prompts and responses that have not been loaded from the project file are formatted when they are needed
+        self._unloaded_batch: SubtitleBatch|None = None
 
-        if batch.prompt:
-            self.batch_model.update({
-                'prompt': FormatPrompt(batch.prompt)
-            })
+        if batch.has_translation:
+            self.batch_model['context'] = batch.context
 
-            if self.debug_view:
-                self.batch_model.update({
-                    'messages': FormatMessages(batch.prompt.messages)
-                })
+        if batch._lazy:
+            self._unloaded_batch = batch
+        else:
+            self._update_content(batch)
 
         self.setData(self.batch_model, Qt.ItemDataRole.UserRole)
 
@@ -87,14 +81,17 @@ class BatchItem(ViewModelItem):
 
     @property
     def response(self) -> str|None:
+        self.LoadContent()
         return self.batch_model.get('response')
 
     @property
     def prompt(self) -> str|None:
+        self.LoadContent()
         return self.batch_model.get('prompt')
     
     @property
     def reasoning(self) -> str|None:
+        self.LoadContent()
         return self.batch_model.get('reasoning')
 
     @property
@@ -146,6 +143,16 @@ class BatchItem(ViewModelItem):
 
         self.setData(self.batch_model, Qt.ItemDataRole.UserRole)
 
+    def LoadContent(self):
+        """
+        Format the prompt and response for the batch if they were not loaded with the project
+        """
+        batch = self._unloaded_batch
+        if batch is not None:
+            self._unloaded_batch = None
+            self._update_content(batch)
+            self.setData(self.batch_model, Qt.ItemDataRole.UserRole)
+
     def AddLineItem(self, line_number : int, model : dict[str, Any]):
         """
         Add an original line item to the batch
@@ -218,6 +225,23 @@ class BatchItem(ViewModelItem):
             }
         }
 
+    def _update_content(self, batch : SubtitleBatch) -> None:
+        if batch.translation and isinstance(batch.translation, Translation):
+            self.batch_model.update({
+                'response': batch.translation.FormatResponse(),
+                'reasoning': batch.translation.reasoning
+            })
+
+        if batch.prompt:
+            self.batch_model.update({
+                'prompt': FormatPrompt(batch.prompt)
+            })
+
+            if self.debug_view:
+                self.batch_model.update({
+                    'messages': FormatMessages(batch.prompt.messages)
+                })
+
     def _update_first_and_last(self) -> None:
         line_numbers = [ num for num in self.lines.keys() if num ] if self.lines else None
         self._first_line_num = min(line_numbers) if line_numbers else None
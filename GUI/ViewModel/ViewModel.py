@@ -1,4 +1,5 @@
 from __future__ import annotations
+from datetime import timedelta
 import logging
 import os
 from collections.abc import Callable
@@ -16,6 +17,7 @@ from PySubtitle.Subtitles import Subtitles
 from PySubtitle.SubtitleScene import SubtitleScene
 from PySubtitle.SubtitleBatch import SubtitleBatch
 from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleTimings import SubtitleTimings
 from PySubtitle.Helpers.Localization import _
 
 class ProjectViewModel(QStandardItemModel):
@@ -104,20 +106,18 @@ class ProjectViewModel(QStandardItemModel):
     def CreateBatchItem(self, scene_number : int, batch : SubtitleBatch) -> BatchItem:
         batch_item = BatchItem(scene_number, batch, debug_view=self.debug_view)
 
-        gap_start = None
-        for line in batch.originals:
+        gaps : list[int] = SubtitleTimings(batch.originals).Gaps()
+        for index, line in enumerate(batch.originals):
             batch_item.AddLineItem(line.number, {
                 'scene': scene_number,
                 'batch': batch.number,
                 'start': line.txt_start,
                 'end': line.srt_end,
                 'duration': line.txt_duration,
-                'gap': TimedeltaToText(line.start - gap_start) if gap_start else "",
+                'gap': TimedeltaToText(timedelta(milliseconds=gaps[index])) if index > 0 and batch.originals[index - 1].end_ms else "",
                 'text': line.text
             })
 
-            gap_start = line.end
-
         if batch.translated:
             for line in batch.translated:
                 batch_item.AddTranslation(line.number, line.text if line.text else None)
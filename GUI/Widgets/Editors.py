@@ -100,6 +100,7 @@ class EditSceneDialog(EditDialog):
 class EditBatchDialog(EditDialog):
     def __init__(self, item : BatchItem, parent=None) -> None:
         self.item = item
+        item.LoadContent()
         super().__init__(item.batch_model, parent, title=_("Scene {scene} Batch {batch}").format(scene=item.scene, batch=item.number))
 
     def CreateEditor(self):
@@ -45,6 +45,7 @@ class SelectionView(QFrame):
         _show(self._merge_batches_button, selection.OnlyBatches() and selection.MultipleSelected() and selection.IsContiguous())
         _show(self._merge_lines_button, selection.AnyLines() and selection.MultipleSelected(max=3) and selection.IsContiguous() and selection.AllLinesInSameBatch())
         _show(self._delete_lines_button, selection.AnyLines())
+        _show(self._rebatch_lines_button, selection.AnyLines())
         _show(self._swap_text_button, False and selection.AnyBatches() and not selection.MultipleSelected())
 
     def UpdateUiLanguage(self):
@@ -92,6 +93,7 @@ class SelectionView(QFrame):
         self._merge_scenes_button = self._create_button(_("Merge Scenes"), self._on_merge_selection)
         self._merge_batches_button = self._create_button(_("Merge Batches"), self._on_merge_selection)
         self._delete_lines_button = self._create_button(_("Delete Lines"), self._on_delete_lines)
+        self._rebatch_lines_button = self._create_button(_("Rebatch Lines"), self._on_rebatch_lines)
         self._swap_text_button = self._create_button(_("Swap Text"), self._on_swap_text)
 
         # Rebuild layout in the desired order
@@ -104,6 +106,7 @@ class SelectionView(QFrame):
         layout.addWidget(self._merge_scenes_button)
         layout.addWidget(self._merge_batches_button)
         layout.addWidget(self._delete_lines_button)
+        layout.addWidget(self._rebatch_lines_button)
         layout.addWidget(self._reparse_button)
         layout.addWidget(self._translate_button)
 
@@ -137,6 +140,13 @@ class SelectionView(QFrame):
             # HACK: the selection should be updated automatically when lines are deleted, but it doesn't work correctly
             self.resetSelection.emit()
 
+    def _on_rebatch_lines(self):
+        if self.selection and self.selection.AnyLines():
+            self.action_handler.RebatchSelection(self.selection)
+
+            # HACK: the selection should be updated automatically when batches change, but it doesn't work correctly
+            self.resetSelection.emit()
+
     def _on_split_batch(self):
         if self.selection and self.selection.AnyLines() and not self.selection.MultipleSelected():
             self.action_handler.SplitBatch(self.selection)
@@ -0,0 +1,92 @@
+import logging
+import threading
+from typing import Callable
+
+from PySubtitle.Helpers.Localization import _
+
+class BackgroundWriter:
+    """
+    Runs file writes on a dedicated background thread, so that callers never wait for serialisation or disk I/O.
+
+    Writes are queued per file. A write requested while an earlier one for the same file is still waiting replaces it,
+    so bursts of save requests are coalesced and only the latest content is written. The thread exits when it is idle.
+    """
+    idle_timeout : float = 1.0
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending : dict[str, tuple[int, Callable[[], None]]] = {}
+        self._busy : bool = False
+        self._sequence : int = 0
+        self._written : dict[str, int] = {}
+        self._file_lock = threading.Lock()
+        self._thread : threading.Thread|None = None
+        self.write_count : int = 0
+        self.coalesced_count : int = 0
+
+    def QueueWrite(self, filepath : str, write : Callable[[], None]):
+        """
+        Queue a write to be performed in the background, replacing any write to the same file that has not started yet
+        """
+        with self._condition:
+            if filepath in self._pending:
+                self.coalesced_count += 1
+
+            self._sequence += 1
+            self._pending[filepath] = (self._sequence, write)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="BackgroundWriter")
+                self._thread.start()
+
+            self._condition.notify_all()
+
+    def Write(self, filepath : str, write : Callable[[], None]):
+        """
+        Perform a write immediately, superseding any queued write to the same file
+        """
+        with self._condition:
+            self._pending.pop(filepath, None)
+            self._sequence += 1
+            sequence = self._sequence
+
+        self._perform_write(filepath, sequence, write)
+
+    def Flush(self, timeout : float|None = None) -> bool:
+        """
+        Wait for queued writes to finish. Returns False if they did not finish within the timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._pending, self.idle_timeout):
+                    self._thread = None
+                    return
+
+                filepath = next(iter(self._pending))
+                sequence, write = self._pending.pop(filepath)
+                self._busy = True
+
+            try:
+                self._perform_write(filepath, sequence, write)
+
+            except Exception as e:
+                logging.error(_("Error writing {}: {}").format(filepath, str(e)))
+
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _perform_write(self, filepath : str, sequence : int, write : Callable[[], None]):
+        with self._file_lock:
+            # Never overwrite a file with older content than has already been written to it
+            if sequence < self._written.get(filepath, 0):
+                return
+
+            write()
+            self._written[filepath] = sequence
+            self.write_count += 1
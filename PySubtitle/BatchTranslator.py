@@ -0,0 +1,245 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from PySubtitle.Helpers import GetOutputPath
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.Options import Options
+from PySubtitle.RequestBudget import RequestBudget
+from PySubtitle.SharedClients import SharedClients
+from PySubtitle.SubtitleFormatRegistry import SubtitleFormatRegistry
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.TranslationProvider import TranslationProvider
+
+default_manifest_name = "subtrans_batch.json"
+
+class BatchTranslator:
+    """
+    Translates a set of subtitle files in a single process.
+
+    One translation provider and client are shared by every file, several files are translated at once, and requests
+    for all of them are made within a shared budget of concurrent requests and requests per minute. Files that have
+    already been translated are skipped, and a manifest summarising the results is written when the batch is finished.
+    """
+    def __init__(self, options : Options, translation_provider : TranslationProvider, max_files : int = 2, output_dir : str|None = None, overwrite : bool = False, movie_name : str|None = None, input_root : str|None = None):
+        """
+        :param options: the options to translate every file with
+        :param max_files: the maximum number of files to translate at the same time
+        :param output_dir: write translations to this directory rather than next to the source files
+        :param input_root: the directory whose structure is recreated in output_dir (the common directory of the files if None)
+        :param overwrite: translate files again even if the translation already exists
+        :param movie_name: the movie name for every file (the name of each file is used if None)
+        """
+        self.options : Options = options
+        self.translation_provider : TranslationProvider = translation_provider
+        self.output_dir : str|None = output_dir
+        self.input_root : str|None = input_root
+        self.overwrite : bool = overwrite
+        self.movie_name : str|None = movie_name
+        self.target_language : str|None = options.get_str('target_language')
+        self.aborted : bool = False
+        self.results : list[dict[str, Any]] = []
+
+        if not translation_provider.allow_multithreaded_translation:
+            max_files = 1
+
+        self.max_files : int = max(1, max_files)
+
+        self._lock = threading.Lock()
+        self._translators : list[SubtitleTranslator] = []
+        self._clients = SharedClients()
+
+    @property
+    def request_budget(self) -> RequestBudget|None:
+        """
+        The budget that every request for every file is made within, once the first file has started
+        """
+        return self._clients.budgets.get(self.translation_provider.name)
+
+    @classmethod
+    def FindSourceFiles(cls, path : str, target_language : str|None = None) -> list[str]:
+        """
+        Find the subtitle files in a directory (including subdirectories) or matching a glob pattern,
+        ignoring files that are the translation of another file that was found.
+        """
+        extensions = set(SubtitleFormatRegistry.ListExtensions())
+        if os.path.isdir(path):
+            filepaths = [ os.path.join(directory, filename) for directory, _dirs, filenames in os.walk(path) for filename in filenames ]
+        else:
+            filepaths = glob.glob(path, recursive=True)
+
+        filepaths = sorted(os.path.normpath(filepath) for filepath in filepaths if os.path.splitext(filepath)[1].lower() in extensions)
+
+        outputs = { os.path.normpath(GetOutputPath(filepath, target_language) or '') for filepath in filepaths }
+        return [ filepath for filepath in filepaths if filepath not in outputs ]
+
+    def GetOutputPath(self, filepath : str) -> str:
+        """
+        Get the path that the translation of a file is written to
+        """
+        outputpath = GetOutputPath(filepath, self.target_language) or f"{filepath}.translated"
+        if self.output_dir:
+            # Keep the path relative to the input root, so that files with the same name in different directories do not collide
+            relative = os.path.relpath(os.path.abspath(outputpath), os.path.abspath(self.input_root)) if self.input_root else os.pardir
+            if relative.startswith(os.pardir):
+                relative = os.path.basename(outputpath)
+            outputpath = os.path.join(self.output_dir, relative)
+        return os.path.normpath(outputpath)
+
+    def TranslateFiles(self, filepaths : list[str], manifest_path : str|None = None) -> list[dict[str, Any]]:
+        """
+        Translate the files, several at a time, and write a manifest of the results if a path is given
+        """
+        started = datetime.now()
+        start_time = time.monotonic()
+
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            if not self.input_root and filepaths:
+                self.input_root = os.path.commonpath([ os.path.dirname(os.path.abspath(filepath)) for filepath in filepaths ])
+
+        logging.info(_("Translating {count} files, {max_files} at a time").format(count=len(filepaths), max_files=self.max_files))
+
+        with ThreadPoolExecutor(max_workers=self.max_files, thread_name_prefix="BatchTranslator") as executor:
+            self.results = list(executor.map(self.TranslateFile, filepaths))
+
+        if manifest_path:
+            self.WriteManifest(manifest_path, started, time.monotonic() - start_time)
+
+        summary = self.GetSummary()
+        logging.info(_("Batch finished: {translated} translated, {skipped} skipped, {failed} failed").format(**summary))
+        return self.results
+
+    def TranslateFile(self, filepath : str) -> dict[str, Any]:
+        """
+        Translate a single file, unless it has already been translated, and return a summary of the result
+        """
+        outputpath = self.GetOutputPath(filepath)
+        result : dict[str, Any] = { 'source': filepath, 'output': outputpath, 'status': 'pending' }
+        start_time = time.monotonic()
+
+        if self.aborted:
+            result['status'] = 'aborted'
+            return result
+
+        try:
+            options = Options(self.options)
+            options['movie_name'] = self.movie_name or os.path.splitext(os.path.basename(filepath))[0]
+
+            project = SubtitleProject(options)
+            if os.path.exists(outputpath) and not self.overwrite and not self._can_resume(project, filepath):
+                logging.info(_("Skipping {file}, already translated to {output}").format(file=filepath, output=outputpath))
+                result['status'] = 'skipped'
+                return result
+
+            os.makedirs(os.path.dirname(outputpath) or os.curdir, exist_ok=True)
+            project.InitialiseProject(filepath, outputpath)
+            project.UpdateProjectSettings(options)
+            result['project'] = project.projectfile if project.write_project else None
+
+            # Continue translating a partially translated project rather than starting again
+            if project.read_project and project.subtitles.scenes and not options.get_bool('retranslate'):
+                options['resume'] = True
+
+            translator = self._create_translator(options)
+            try:
+                project.TranslateSubtitles(translator)
+
+                if project.write_project:
+                    project.SaveProjectFile()
+
+            finally:
+                with self._lock:
+                    self._translators.remove(translator)
+
+            subtitles = project.subtitles
+            result['lines'] = subtitles.linecount
+            result['translated'] = len(subtitles.translated or [])
+            result['errors'] = [ str(error) for error in translator.errors ]
+            result['status'] = 'aborted' if translator.aborted else 'failed' if translator.errors else 'translated'
+
+        except Exception as e:
+            logging.error(_("Failed to translate {file}: {error}").format(file=filepath, error=str(e)))
+            result['status'] = 'failed'
+            result['errors'] = [ str(e) ]
+
+        finally:
+            result['seconds'] = round(time.monotonic() - start_time, 3)
+
+        return result
+
+    def StopTranslating(self):
+        """
+        Stop translating, abandoning files that have not been started
+        """
+        self.aborted = True
+        with self._lock:
+            translators = list(self._translators)
+
+        for translator in translators:
+            translator.StopTranslating()
+
+        self._clients.AbortTranslation()
+
+    def GetSummary(self) -> dict[str, int]:
+        """
+        Count the files with each result
+        """
+        summary = { 'translated': 0, 'skipped': 0, 'failed': 0, 'aborted': 0 }
+        for result in self.results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+        return summary
+
+    def WriteManifest(self, manifest_path : str, started : datetime, seconds : float):
+        """
+        Write a summary of the batch as JSON
+        """
+        manifest = {
+            'started': started.isoformat(timespec='seconds'),
+            'seconds': round(seconds, 3),
+            'provider': self.translation_provider.name,
+            'model': self.translation_provider.selected_model,
+            'target_language': self.target_language,
+            'requests': self.request_budget.request_count if self.request_budget else 0,
+            'summary': self.GetSummary(),
+            'files': self.results,
+        }
+
+        directory = os.path.dirname(manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        logging.info(_("Batch manifest written to {path}").format(path=manifest_path))
+
+    def _can_resume(self, project : SubtitleProject, filepath : str) -> bool:
+        """
+        Check whether there is a project for the file that has not been completely translated
+        """
+        if not project.read_project:
+            return False
+
+        projectfile = project.GetProjectFilepath(filepath)
+        if projectfile == filepath or not os.path.exists(projectfile):
+            return False
+
+        subtitles = SubtitleProject(Options(self.options)).ReadProjectFile(projectfile)
+        return bool(subtitles and subtitles.scenes and not all(scene.all_translated for scene in subtitles.scenes))
+
+    def _create_translator(self, options : Options) -> SubtitleTranslator:
+        """
+        Create a translator for a file, sharing a single client with every other file
+        """
+        translator = self._clients.CreateTranslator(options, self.translation_provider)
+        with self._lock:
+            self._translators.append(translator)
+        return translator
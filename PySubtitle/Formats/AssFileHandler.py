@@ -0,0 +1,259 @@
+import io
+import re
+from typing import Any, Iterable, Iterator, TextIO
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SubtitleError import SubtitleParseError
+from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
+from PySubtitle.SubtitleLine import SubtitleLine
+
+DEFAULT_FORMAT = [ 'Layer', 'Start', 'End', 'Style', 'Name', 'MarginL', 'MarginR', 'MarginV', 'Effect', 'Text' ]
+
+DEFAULT_HEADER = (
+    "[Script Info]\n"
+    "ScriptType: v4.00+\n"
+    "\n"
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    "Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1\n"
+    "\n"
+)
+
+TIMESTAMP_PATTERN = re.compile(r'\s*(\d+):(\d+):(\d+)[.:](\d+)\s*')
+
+# Override tags at the start of the text, such as positioning, which are not passed on for translation
+_LEADING_TAGS = re.compile(r'^(?:\{[^}]*\})+')
+
+# Line breaks in the text: \N is a hard break, \n is a soft break that only applies in some wrapping styles
+_LINE_BREAKS = re.compile(r'\\[Nn]')
+
+# Parts of the file longer than this, such as embedded fonts, are not kept in the project - they are read from the source file when needed
+_MAX_PROJECT_METADATA = 16 * 1024
+
+# Default values for the fields of dialogue lines that were not read from an ASS file
+_DEFAULT_FIELDS = { 'Layer': '0', 'Marked': 'Marked=0', 'Style': 'Default', 'MarginL': '0', 'MarginR': '0', 'MarginV': '0' }
+
+class AssFileHandler(SubtitleFileHandler):
+    """
+    File handler for Advanced SubStation Alpha (ASS) and SubStation Alpha (SSA) subtitles.
+
+    Only the text of Dialogue events is exposed for translation. The script info, styles and any other sections
+    are kept in the handler's metadata as the raw text of the file and written back unchanged, along with
+    the other fields of each Dialogue event, which are kept in the line's metadata.
+
+    Other events, such as comments, are written back in their original position: events before the first
+    Dialogue event are part of the header, events between Dialogue events are kept with the Dialogue event
+    that follows them, and events after the last Dialogue event are part of the footer.
+    """
+    def parse_file(self, file_obj: TextIO) -> Iterator[SubtitleLine]:
+        """
+        Parse ASS/SSA file content and yield a SubtitleLine for each Dialogue event.
+        """
+        yield from self._parse_lines(file_obj)
+
+    def parse_string(self, content: str) -> Iterator[SubtitleLine]:
+        """
+        Parse ASS/SSA string content and yield a SubtitleLine for each Dialogue event.
+        """
+        yield from self._parse_lines(io.StringIO(content))
+
+    def compose_lines(self, lines: list[SubtitleLine], reindex: bool = True) -> str:
+        """
+        Compose subtitle lines into an ASS/SSA format string.
+        """
+        buffer = io.StringIO()
+        self.write_lines(lines, buffer, reindex=reindex)
+        return buffer.getvalue()
+
+    def write_lines(self, lines: Iterable[SubtitleLine], file_obj: TextIO, reindex: bool = True) -> None:
+        """
+        Write subtitle lines to a file as Dialogue events, between the original header and any sections that followed the events.
+
+        ASS events are not numbered, so reindex has no effect.
+        """
+        write = file_obj.write
+        write(self.compose_header())
+
+        fields = self.metadata.get('format') or DEFAULT_FORMAT
+        newline = self.metadata.get('newline', '\n')
+        previous_events = None
+        for line in lines:
+            # Parts of a split line share the events that preceded the original line
+            events = line.metadata.get('ass_events')
+            if events and events != previous_events:
+                write(events)
+            previous_events = events
+
+            if line.text:
+                write(_compose_dialogue(line, fields, newline))
+
+        write(self.compose_footer())
+
+    def compose_header(self) -> str:
+        """
+        Compose the sections before the Dialogue events, and the other lines of the Events section
+        """
+        header = self.metadata.get('header') or DEFAULT_HEADER
+        return header + (self.metadata.get('events') or f"[Events]\nFormat: {', '.join(DEFAULT_FORMAT)}\n")
+
+    def compose_footer(self) -> str:
+        """
+        Compose any events after the last Dialogue event, and any sections that came after the Events section
+        """
+        footer = self.metadata.get('trailing_events') or ''
+        trailer = self.metadata.get('trailer')
+        if trailer:
+            footer += self.metadata.get('newline', '\n') + trailer
+        return footer
+
+    def get_project_metadata(self) -> dict[str, Any]:
+        """
+        Leave out parts of the file that are too large to keep in the project, such as embedded fonts
+        """
+        large = [ key for key, value in self.metadata.items() if isinstance(value, str) and len(value) > _MAX_PROJECT_METADATA ]
+        if not large:
+            return self.metadata
+
+        metadata = { key: value for key, value in self.metadata.items() if key not in large }
+        metadata['source_metadata'] = large
+        return metadata
+
+    def get_output_newline(self) -> str|None:
+        """
+        Files read from an ASS file are written with its line endings, which are kept in the header and events
+        """
+        return '' if 'newline' in self.metadata else None
+
+    def get_file_extensions(self) -> list[str]:
+        return ['.ass', '.ssa']
+
+    def detect_content(self, sample: str) -> bool:
+        return sample.lstrip('\ufeff').lstrip().startswith('[Script Info]')
+
+    def _parse_lines(self, file_obj: Iterable[str]) -> Iterator[SubtitleLine]:
+        """
+        Read the file a line at a time, keeping everything except the text of Dialogue events as it is
+        """
+        header : list[str] = []
+        events : list[str] = []
+        pending : list[str] = []
+        trailer : list[str] = []
+        fields : list[str] = DEFAULT_FORMAT
+        section : str|None = None
+        number = 0
+
+        self.metadata = {}
+
+        for line_number, raw in enumerate(file_obj, 1):
+            text = raw.rstrip('\r\n')
+            if line_number == 1:
+                raw = raw.lstrip('\ufeff')
+                text = text.lstrip('\ufeff')
+                self.metadata['newline'] = '\r\n' if raw.endswith('\r\n') else '\n'
+
+            stripped = text.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                section = stripped.lower()
+                if section != '[events]' and (events or trailer):
+                    trailer.append(raw)
+                    section = 'trailer'
+                    continue
+
+            if section == 'trailer':
+                trailer.append(raw)
+
+            elif section != '[events]':
+                header.append(raw)
+
+            elif text.startswith('Dialogue:'):
+                number += 1
+                line = _parse_dialogue(number, line_number, text, fields)
+                if pending:
+                    line.metadata = { **line.metadata, 'ass_events': ''.join(pending) }
+                    pending = []
+                yield line
+
+            elif stripped:
+                if text.startswith('Format:'):
+                    fields = [ field.strip() for field in text[len('Format:'):].split(',') ]
+                    if 'Start' not in fields or 'End' not in fields or fields[-1] != 'Text':
+                        raise SubtitleParseError(_("Invalid ASS at line {line}: unsupported event format").format(line=line_number))
+                    self.metadata['format'] = fields
+
+                event = raw if raw.endswith('\n') else f"{raw}{self.metadata['newline']}"
+                if number:
+                    pending.append(event)
+                else:
+                    events.append(event)
+
+        if not events:
+            raise SubtitleParseError(_("Invalid ASS: no [Events] section"))
+
+        self.metadata['header'] = ''.join(header)
+        self.metadata['events'] = ''.join(events)
+        if pending:
+            self.metadata['trailing_events'] = ''.join(pending)
+        if trailer:
+            self.metadata['trailer'] = ''.join(trailer)
+
+def _parse_dialogue(number : int, line_number : int, text : str, fields : list[str]) -> SubtitleLine:
+    values = text[len('Dialogue:'):].lstrip().split(',', len(fields) - 1)
+    if len(values) != len(fields):
+        raise SubtitleParseError(_("Invalid ASS at line {line}: expected {count} fields").format(line=line_number, count=len(fields)))
+
+    start = TIMESTAMP_PATTERN.fullmatch(values[fields.index('Start')])
+    end = TIMESTAMP_PATTERN.fullmatch(values[fields.index('End')])
+    if not start or not end:
+        raise SubtitleParseError(_("Invalid ASS at line {line}: invalid timestamp").format(line=line_number))
+
+    content = values[-1]
+    metadata : dict[str, Any] = { 'ass_fields': values[:-1] }
+
+    tags = _LEADING_TAGS.match(content)
+    if tags:
+        metadata['ass_tags'] = tags.group(0)
+        content = content[tags.end():]
+
+    breaks = _LINE_BREAKS.findall(content)
+    if '\\n' in breaks:
+        metadata['ass_breaks'] = breaks
+
+    content = _LINE_BREAKS.sub('\n', content)
+    return SubtitleLine.FromFields(number, _to_milliseconds(start.groups()), _to_milliseconds(end.groups()), content or None, metadata)
+
+def _to_milliseconds(groups : tuple) -> int:
+    hours, minutes, seconds, fraction = groups
+    return int(hours) * 3600000 + int(minutes) * 60000 + int(seconds) * 1000 + int(fraction.ljust(3, '0')[:3])
+
+def _ass_timestamp(milliseconds : int) -> str:
+    centiseconds = (milliseconds + 5) // 10
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    seconds, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+
+def _compose_dialogue(line : SubtitleLine, fields : list[str], newline : str) -> str:
+    metadata = line.metadata
+    values : list[str] = list(metadata.get('ass_fields') or [])
+    if len(values) != len(fields) - 1:
+        values = [ _DEFAULT_FIELDS.get(field, '') for field in fields[:-1] ]
+
+    values[fields.index('Start')] = _ass_timestamp(line.start_ms)
+    values[fields.index('End')] = _ass_timestamp(line.end_ms)
+
+    content = _compose_breaks(str(line.text).strip('\n').replace('\r', ''), metadata.get('ass_breaks'))
+    return f"Dialogue: {','.join(values)},{metadata.get('ass_tags', '')}{content}{newline}"
+
+def _compose_breaks(text : str, breaks : list[str]|None) -> str:
+    """
+    Write line breaks as hard breaks, unless the original text had soft breaks. The original breaks are kept
+    if the text has the same number of lines, otherwise soft breaks are used if the original only had soft breaks.
+    """
+    parts = text.split('\n')
+    if not breaks or len(parts) == 1:
+        return '\\N'.join(parts)
+
+    if len(breaks) == len(parts) - 1:
+        return ''.join(part + separator for part, separator in zip(parts, breaks + ['']))
+
+    return ('\\n' if '\\N' not in breaks else '\\N').join(parts)
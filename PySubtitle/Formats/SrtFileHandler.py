@@ -1,6 +1,8 @@
-import srt # type: ignore
-from typing import Iterator, TextIO
+import io
+import re
+from typing import Iterable, Iterator, TextIO
 
+from PySubtitle.Formats.SrtParser import INDEX_PATTERN, TIMING_PATTERN, SrtParser
 from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
 from PySubtitle.SubtitleLine import SubtitleLine
 from PySubtitle.SubtitleError import SubtitleParseError
@@ -11,10 +13,12 @@ class SrtFileHandler(SubtitleFileHandler):
     File handler for SRT subtitle format.
     Encapsulates all SRT library usage for file I/O operations.
     """
-    
     def parse_file(self, file_obj: TextIO) -> Iterator[SubtitleLine]:
         """
         Parse SRT file content and yield SubtitleLine objects.
+
+        The file is read a line at a time, so each line is yielded as soon as it is parsed
+        without reading the whole file into memory first. A binary file or memory map is decoded as UTF-8.
         """
         yield from self._parse_srt_items(file_obj)
     
@@ -35,23 +39,21 @@ class SrtFileHandler(SubtitleFileHandler):
         Returns:
             str: SRT formatted subtitle content
         """
-        # Convert SubtitleLine objects to srt.Subtitle objects for composition
-        srt_items = []
+        buffer = io.StringIO()
+        self.write_lines(lines, buffer, reindex=reindex)
+        return buffer.getvalue()
+
+    def write_lines(self, lines: Iterable[SubtitleLine], file_obj: TextIO, reindex: bool = True) -> None:
+        """
+        Write subtitle lines to a file in SRT format, one cue at a time.
+
+        Lines without text are skipped. The output is the same as the srt library would compose.
+        """
+        write = file_obj.write
         for i, line in enumerate(lines):
-            if line.text and line.start is not None and line.end is not None:
-                # Create srt.Subtitle object
-                index = i + 1 if reindex else line.number
-                srt_item = srt.Subtitle(
-                    index=index,
-                    start=line.start,
-                    end=line.end,
-                    content=line.text,
-                    proprietary=""
-                )
-                srt_items.append(srt_item)
-        
-        return srt.compose(srt_items, reindex=False)  # We handle reindexing above
-    
+            if line.text:
+                write(_compose_cue(i + 1 if reindex else line.number, line.start_ms, line.end_ms, line.text))
+
     def get_file_extensions(self) -> list[str]:
         """
         Get file extensions supported by this handler.
@@ -61,27 +63,39 @@ class SrtFileHandler(SubtitleFileHandler):
         """
         return ['.srt']
 
+    def detect_content(self, sample: str) -> bool:
+        """
+        Check whether a sample starts with an SRT cue, with or without an index
+        """
+        lines = [ line for line in sample.lstrip('\ufeff').splitlines() if line.strip() ][:2]
+        if lines and TIMING_PATTERN.fullmatch(lines[0]):
+            return True
+        return len(lines) == 2 and bool(INDEX_PATTERN.fullmatch(lines[0]) and TIMING_PATTERN.fullmatch(lines[1]))
+
     def _parse_srt_items(self, source) -> Iterator[SubtitleLine]:
         """
         Internal helper to parse SRT items from a file object or string and yield SubtitleLine objects.
         Handles error translation to SubtitleParseError.
         """
         try:
-            srt_items = list(srt.parse(source))
-            for srt_item in srt_items:
-                line = SubtitleLine.Construct(
-                    number=srt_item.index,
-                    start=srt_item.start,
-                    end=srt_item.end,
-                    text=srt_item.content,
-                    metadata={
-                        "proprietary": getattr(srt_item, 'proprietary', '')
-                    }
-                )
-                yield line
-                
-        except srt.SRTParseError as e:
-            raise SubtitleParseError(_("Failed to parse SRT: {}" ).format(str(e)), e)
+            yield from SrtParser().Parse(source)
+
+        except SubtitleParseError:
+            raise
         except Exception as e:
             raise SubtitleParseError(_("Unexpected error parsing SRT: {}" ).format(str(e)), e)
-    
+
+_BLANK_LINES = re.compile(r'\n\n+')
+
+def _compose_cue(number : int, start_ms : int, end_ms : int, content : str) -> str:
+    # Blank lines would end the cue early, so they are removed
+    if content[0] == '\n' or '\n\n' in content:
+        content = _BLANK_LINES.sub('\n', content.strip('\n'))
+
+    return f"{number}\n{_srt_timestamp(start_ms)} --> {_srt_timestamp(end_ms)}\n{content}\n\n"
+
+def _srt_timestamp(milliseconds : int) -> str:
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
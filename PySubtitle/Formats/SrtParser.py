@@ -0,0 +1,181 @@
+import io
+import mmap
+import re
+from typing import IO, Iterable, Iterator, NoReturn
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SubtitleError import SubtitleParseError
+from PySubtitle.SubtitleLine import SubtitleLine
+
+# The same timestamp and index formats that the srt library accepts
+_TIMESTAMP = r'(\d+)[,.:，．。：](\d+)[,.:，．。：](\d+)[,.:，．。：]?(\d*)'
+TIMING_PATTERN = re.compile(r'\s*' + _TIMESTAMP + r' *-[ -] *> *' + _TIMESTAMP + r' ?(.*)')
+INDEX_PATTERN = re.compile(r'\s*(-?\d+)(?:\.\d*)?\s*')
+
+_START_PATTERN = re.compile(r'\s*' + _TIMESTAMP)
+_ARROW_PATTERN = re.compile(r' *-[ -] *> *')
+
+class SrtParser:
+    """
+    Incremental parser for SRT subtitles, which reads one line of text at a time and yields each SubtitleLine
+    as soon as it is complete, so only the current cue is held in memory.
+
+    The parser is tolerant of the same irregularities as the srt library: a missing index, alternative timestamp
+    separators, blank lines inside a subtitle, a missing blank line between subtitles and extra text after the
+    timestamps, which is kept in the line's metadata as "proprietary". Text that cannot be parsed is reported
+    with its line and column.
+    """
+    def __init__(self, encoding : str = 'utf-8'):
+        self.encoding : str = encoding
+
+    def Parse(self, source : str|Iterable[str]|IO[bytes]|mmap.mmap) -> Iterator[SubtitleLine]:
+        """
+        Parse SRT content from a string, a text or binary file object or a memory map
+        """
+        match_timing = TIMING_PATTERN.fullmatch
+        match_index = INDEX_PATTERN.fullmatch
+
+        # The subtitle being read
+        in_subtitle : bool = False
+        index : int|None = None
+        timing : tuple = ()
+        content : list[str] = []
+
+        # Blank lines after the content, which are only part of it if more text follows
+        blanks : list[str] = []
+
+        # An index (line number, text, value) that starts the next subtitle if timestamps follow it, otherwise it is content
+        candidate : tuple[int, str, int]|None = None
+        candidate_blanks : list[str] = []
+
+        # An index at the start of a subtitle, which must be followed by timestamps
+        expected : tuple[int, int]|None = None
+
+        for line_number, text in enumerate(self._get_lines(source), 1):
+            text = text.rstrip('\r\n')
+            if line_number == 1:
+                text = text.lstrip('\ufeff')
+            blank = not text or text.isspace()
+
+            if not in_subtitle:
+                if blank:
+                    continue
+
+                match = match_timing(text)
+                if match:
+                    index = expected[1] if expected else None
+                    timing = match.groups()
+                    in_subtitle = True
+                    expected = None
+                    continue
+
+                if expected:
+                    self._raise_error(line_number, text)
+
+                match = match_index(text)
+                if not match:
+                    self._raise_error(line_number, text)
+
+                expected = (line_number, int(match.group(1)))
+                continue
+
+            if candidate is not None:
+                if blank:
+                    candidate_blanks.append(text)
+                    continue
+
+                match = match_timing(text)
+                if match:
+                    yield _build_line(index, timing, content)
+                    index = candidate[2]
+                    timing = match.groups()
+                    content = []
+                    blanks = []
+                    candidate = None
+                    candidate_blanks = []
+                    continue
+
+                # The index was part of the text
+                content.extend(blanks)
+                content.append(candidate[1])
+                content.extend(candidate_blanks)
+                blanks = []
+                candidate = None
+                candidate_blanks = []
+
+            if blank:
+                blanks.append(text)
+                continue
+
+            if blanks:
+                match = match_timing(text)
+                if match:
+                    # A subtitle without an index
+                    yield _build_line(index, timing, content)
+                    index = None
+                    timing = match.groups()
+                    content = []
+                    blanks = []
+                    continue
+
+            if (content or blanks) and text[0] in _INDEX_START:
+                match = match_index(text)
+                if match:
+                    # Possibly the start of the next subtitle, with or without a blank line before it
+                    candidate = (line_number, text, int(match.group(1)))
+                    continue
+
+            if blanks:
+                content.extend(blanks)
+                blanks = []
+            content.append(text)
+
+        if expected:
+            raise SubtitleParseError(_("Invalid SRT at line {line}: subtitle {index} has no timestamps").format(line=expected[0], index=expected[1]))
+
+        if in_subtitle:
+            if candidate is not None:
+                content.extend(blanks)
+                content.append(candidate[1])
+            yield _build_line(index, timing, content)
+
+    def _get_lines(self, source : str|Iterable[str]|IO[bytes]|mmap.mmap) -> Iterable[str]:
+        """
+        Get an iterable of lines of text, decoding binary sources
+        """
+        if isinstance(source, str):
+            return io.StringIO(source)
+
+        if isinstance(source, mmap.mmap) or (hasattr(source, 'readline') and _is_binary(source)):
+            return (line.decode(self.encoding) for line in iter(source.readline, b''))     # type: ignore[union-attr]
+
+        return source   # type: ignore[return-value]
+
+    def _raise_error(self, line_number : int, text : str) -> NoReturn:
+        """
+        Report text that is neither an index nor timestamps, with the column where parsing failed
+        """
+        column = len(text) - len(text.lstrip()) + 1
+        start = _START_PATTERN.match(text)
+        if start:
+            arrow = _ARROW_PATTERN.match(text, start.end())
+            column = (arrow.end() if arrow else start.end()) + 1
+
+        raise SubtitleParseError(_("Invalid SRT at line {line}, column {column}: {text}").format(line=line_number, column=column, text=text.strip()))
+
+# Characters an index line can start with
+_INDEX_START = frozenset("-0123456789 \t")
+
+def _build_line(index : int|None, timing : tuple, content : list[str]) -> SubtitleLine:
+    text = '\n'.join(content).strip() if content else None
+    start_hours, start_minutes, start_seconds, start_ms, end_hours, end_minutes, end_seconds, end_ms, proprietary = timing
+    return SubtitleLine.FromFields(
+        index,
+        int(start_hours) * 3600000 + int(start_minutes) * 60000 + int(start_seconds) * 1000 + (int(start_ms) if start_ms else 0),
+        int(end_hours) * 3600000 + int(end_minutes) * 60000 + int(end_seconds) * 1000 + (int(end_ms) if end_ms else 0),
+        text or None,
+        { "proprietary": proprietary } if proprietary else None
+    )
+
+def _is_binary(source) -> bool:
+    return 'b' in getattr(source, 'mode', '') or not hasattr(source, 'encoding')
@@ -0,0 +1,156 @@
+import io
+import re
+from typing import Any, Iterable, Iterator, TextIO
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SubtitleError import SubtitleParseError
+from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
+from PySubtitle.SubtitleLine import SubtitleLine
+
+_TIMESTAMP = r'(?:(\d+):)?(\d{1,2}):(\d{1,2})[.,](\d{1,3})'
+TIMING_PATTERN = re.compile(r'\s*' + _TIMESTAMP + r'\s+-->\s+' + _TIMESTAMP + r'(?:\s+(.*?))?\s*')
+
+# Blocks that are not cues, which must come before the first cue
+_HEADER_BLOCKS = ('NOTE', 'STYLE', 'REGION')
+
+_BLANK_LINES = re.compile(r'\n\n+')
+
+class VttFileHandler(SubtitleFileHandler):
+    """
+    File handler for WebVTT subtitles.
+
+    The file is read a block at a time, so each cue is yielded as soon as it has been read. The WEBVTT header
+    and any STYLE, REGION or NOTE blocks before the first cue are kept in the handler's metadata and written
+    back unchanged. Cue identifiers and settings are kept in each line's metadata.
+    """
+    def parse_file(self, file_obj: TextIO) -> Iterator[SubtitleLine]:
+        """
+        Parse WebVTT file content and yield SubtitleLine objects.
+        """
+        yield from self._parse_blocks(file_obj)
+
+    def parse_string(self, content: str) -> Iterator[SubtitleLine]:
+        """
+        Parse WebVTT string content and yield SubtitleLine objects.
+        """
+        yield from self._parse_blocks(io.StringIO(content))
+
+    def compose_lines(self, lines: list[SubtitleLine], reindex: bool = True) -> str:
+        """
+        Compose subtitle lines into a WebVTT format string.
+        """
+        buffer = io.StringIO()
+        self.write_lines(lines, buffer, reindex=reindex)
+        return buffer.getvalue()
+
+    def write_lines(self, lines: Iterable[SubtitleLine], file_obj: TextIO, reindex: bool = True) -> None:
+        """
+        Write subtitle lines to a file in WebVTT format, one cue at a time.
+
+        Cue identifiers from the source file are kept, as WebVTT does not require cues to be numbered.
+        """
+        write = file_obj.write
+        write(self.compose_header())
+        for line in lines:
+            if line.text:
+                write(_compose_cue(line))
+
+    def compose_header(self) -> str:
+        """
+        Compose the WEBVTT header and the blocks that came before the first cue
+        """
+        blocks = [ self.metadata.get('header') or 'WEBVTT' ] + self.metadata.get('blocks', [])
+        return ''.join(f"{block}\n\n" for block in blocks)
+
+    def get_file_extensions(self) -> list[str]:
+        return ['.vtt']
+
+    def detect_content(self, sample: str) -> bool:
+        return sample.lstrip('\ufeff').startswith('WEBVTT')
+
+    def _parse_blocks(self, file_obj: Iterable[str]) -> Iterator[SubtitleLine]:
+        """
+        Split the file into blocks separated by blank lines, and yield a line for each cue
+        """
+        self.metadata = { 'blocks': [] }
+        number = 0
+        block : list[str] = []
+        block_start : int = 0
+
+        for line_number, text in enumerate(file_obj, 1):
+            text = text.rstrip('\r\n')
+            if line_number == 1:
+                text = text.lstrip('\ufeff')
+                if not text.startswith('WEBVTT'):
+                    raise SubtitleParseError(_("Invalid WebVTT at line 1: the file must start with WEBVTT"))
+
+            if text.strip():
+                if not block:
+                    block_start = line_number
+                block.append(text)
+                continue
+
+            if block:
+                line = self._parse_block(block, block_start, number + 1)
+                if line is not None:
+                    number += 1
+                    yield line
+                block = []
+
+        if block:
+            line = self._parse_block(block, block_start, number + 1)
+            if line is not None:
+                yield line
+
+    def _parse_block(self, block : list[str], line_number : int, number : int) -> SubtitleLine|None:
+        if line_number == 1:
+            self.metadata['header'] = '\n'.join(block)
+            return None
+
+        if block[0].split(maxsplit=1)[0] in _HEADER_BLOCKS and '-->' not in block[0]:
+            # Only comments can come after the first cue, and they are not kept
+            if number == 1:
+                self.metadata['blocks'].append('\n'.join(block))
+            return None
+
+        identifier = None
+        if '-->' not in block[0]:
+            identifier = block[0]
+            block = block[1:]
+            line_number += 1
+
+        match = TIMING_PATTERN.fullmatch(block[0]) if block else None
+        if not match:
+            raise SubtitleParseError(_("Invalid WebVTT at line {line}: {text}").format(line=line_number, text=block[0] if block else identifier))
+
+        groups = match.groups()
+        metadata : dict[str, Any] = {}
+        if identifier is not None:
+            metadata['vtt_id'] = identifier
+        if groups[8]:
+            metadata['vtt_settings'] = groups[8]
+
+        text = '\n'.join(block[1:])
+        return SubtitleLine.FromFields(number, _to_milliseconds(groups[0:4]), _to_milliseconds(groups[4:8]), text or None, metadata or None)
+
+def _to_milliseconds(groups : tuple) -> int:
+    hours, minutes, seconds, fraction = groups
+    return int(hours or 0) * 3600000 + int(minutes) * 60000 + int(seconds) * 1000 + int(fraction.ljust(3, '0'))
+
+def _vtt_timestamp(milliseconds : int) -> str:
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+def _compose_cue(line : SubtitleLine) -> str:
+    content = str(line.text)
+    # Blank lines would end the cue early, and the timing arrow cannot appear in the text
+    if content[0] == '\n' or '\n\n' in content:
+        content = _BLANK_LINES.sub('\n', content.strip('\n'))
+    content = content.replace('-->', '->')
+
+    metadata = line.metadata
+    identifier = f"{metadata['vtt_id']}\n" if metadata.get('vtt_id') else ""
+    settings = f" {metadata['vtt_settings']}" if metadata.get('vtt_settings') else ""
+    return f"{identifier}{_vtt_timestamp(line.start_ms)} --> {_vtt_timestamp(line.end_ms)}{settings}\n{content}\n\n"
@@ -0,0 +1,61 @@
+import codecs
+
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+# Number of bytes read from the start of a file to detect its encoding
+detection_sample_size = 64 * 1024
+
+# Byte order marks, with UTF-32 before UTF-16 because the UTF-32 LE mark starts with the UTF-16 LE mark
+_byte_order_marks : list[tuple[bytes, str]] = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def DetectEncoding(filepath : str, default : str = 'iso-8859-1', sample_size : int = detection_sample_size) -> str:
+    """
+    Detect the text encoding of a file from a sample at the start of it
+    """
+    with open(filepath, 'rb') as f:
+        sample = f.read(sample_size)
+
+    return DetectSampleEncoding(sample, default, complete=len(sample) < sample_size)
+
+def DetectSampleEncoding(sample : bytes, default : str = 'iso-8859-1', complete : bool = True) -> str:
+    """
+    Detect the text encoding of a sample of bytes, checking for a byte order mark, then valid UTF-8,
+    then using charset_normalizer if it is installed. Returns the default if the encoding cannot be determined.
+
+    :param complete: whether the sample holds all of the content, otherwise it may end part way through a character.
+    """
+    for bom, encoding in _byte_order_marks:
+        if sample.startswith(bom):
+            return encoding
+
+    if _is_utf8(sample, complete):
+        return 'utf-8'
+
+    if charset_normalizer is not None:
+        if not complete:
+            # Avoid misleading the detector with a partial character at the end of the sample
+            sample = sample[:sample.rfind(b'\n') + 1] or sample
+
+        match = charset_normalizer.from_bytes(sample).best()
+        if match is not None:
+            return match.encoding
+
+    return default
+
+def _is_utf8(sample : bytes, complete : bool) -> bool:
+    try:
+        sample.decode('utf-8')
+        return True
+
+    except UnicodeDecodeError as e:
+        # The sample may have been cut off in the middle of a multibyte character
+        return not complete and e.reason == 'unexpected end of data' and e.start >= len(sample) - 3
@@ -91,7 +91,7 @@ def ResyncTranslatedLines(original_lines : list[SubtitleLine], translated_lines
     elif num_original > num_translated:
         logging.warning(f"Number of lines in original and translated subtitles don't match. Synced {min_lines} lines.")
 
-def FindSplitPoint(line: SubtitleLine, split_sequences: list[regex.Pattern[Any]], min_duration: timedelta, min_split_chars: int) -> int|None:
+def FindSplitPoint(line: SubtitleLine, split_sequences: list[regex.Pattern[Any]], min_duration: timedelta, min_split_chars: int, duration: timedelta|None = None) -> int|None:
     """
     Find the optimal split point for a subtitle.
 
@@ -99,7 +99,10 @@ def FindSplitPoint(line: SubtitleLine, split_sequences: list[regex.Pattern[Any]]
     Take break sequences as priority order, find the first matching sequence.
     Break at the occurence that is as close to the middle as possible.
     Neither side of the split should be shorter than the minimum line duration
+
+    The duration of the line can be supplied if it is more precise than the line's own (millisecond) timings.
     """
+    line_duration : timedelta = duration if duration is not None else line.duration
     line_length : int = len(line.text or "")
     start_index : int = min_split_chars
     end_index : int = line_length - min_split_chars
@@ -119,10 +122,10 @@ def FindSplitPoint(line: SubtitleLine, split_sequences: list[regex.Pattern[Any]]
         if split_index < start_index or split_index > end_index:
             continue
 
-        split_time = GetProportionalDuration(line, split_index, min_duration)
+        split_time = GetProportionalDuration(line, split_index, min_duration, duration=line_duration)
 
         # Skip if the split is too close to the start or end (exception for newlines)
-        if split_time < min_duration or (line.duration - split_time) < min_duration:
+        if split_time < min_duration or (line_duration - split_time) < min_duration:
             if priority > 0:
                 continue
 
@@ -130,11 +133,11 @@ def FindSplitPoint(line: SubtitleLine, split_sequences: list[regex.Pattern[Any]]
 
     return None
 
-def GetProportionalDuration(line : SubtitleLine, num_characters : int, min_duration : timedelta|None = None) -> timedelta:
+def GetProportionalDuration(line : SubtitleLine, num_characters : int, min_duration : timedelta|None = None, duration : timedelta|None = None) -> timedelta:
     """
-    Calculate the proportional duration of a character string as a percentage of a subtitle
+    Calculate the proportional duration of a character string as a percentage of a subtitle (or of the supplied duration)
     """
-    line_duration = line.duration.total_seconds()
+    line_duration = (duration if duration is not None else line.duration).total_seconds()
     line_length = len(line.text or "")
 
     if num_characters > line_length:
@@ -1,4 +1,5 @@
 from copy import deepcopy
+import time
 import unittest
 from typing import Any
 
@@ -209,6 +210,11 @@ class DummyTranslationClient(TranslationClient):
         return prompt
 
     def _request_translation(self, prompt : TranslationPrompt, temperature : float|None = None) -> Translation|None:
+        # Optionally simulate the latency of a real provider
+        response_delay = self.settings.get_float('response_delay', 0.0)
+        if response_delay:
+            time.sleep(response_delay)
+
         for user_prompt, text in self.response_map.items():
             if user_prompt == prompt.user_prompt:
                 text = text.replace("\\n", "\n")
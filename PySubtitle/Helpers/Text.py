@@ -56,6 +56,11 @@ fullwidth_punctuation_map = {
 
 # Regex to find half-width punctuation adjacent to Asian script characters
 fullwidth_pattern = r'(?<=[\p{Script=Han}\p{Script=Hangul}\p{Script=Hiragana}\p{Script=Katakana}])(?P<punct>[,.;:?!\-])(?=[\p{Script=Han}\p{Script=Hangul}\p{Script=Hiragana}\p{Script=Katakana}])'
+fullwidth_regex = regex.compile(fullwidth_pattern)
+
+whitespace_blocks_regex = regex.compile(r' {3,}|\，\s*')
+wide_dashes_regex = regex.compile(r'\s*—+\s*')
+tags_regex = regex.compile(r"<[^>]+>")
 
 def RemoveWhitespaceAndPunctuation(string) -> str:
     """
@@ -95,28 +100,37 @@ def ConvertWhitespaceBlocksToNewlines(text : str) -> str:
     Convert blocks of 3 or more spaces or chinese commas to newlines, unless the text contains newlines already
     """
     if text and '\n' not in text:
-        text = regex.sub(r' {3,}|\，\s*', '\n', text)
+        text = whitespace_blocks_regex.sub('\n', text)
 
     return text
 
 def ConvertWideDashesToStandardDashes(text : str) -> str:
     """
+    Replace em dashes and the whitespace around them with a standard dash
     """
-    text = regex.sub(r'\s*—+\s*', ' - ', text)
-    return text
+    if emdash not in text:
+        return text
+
+    return wide_dashes_regex.sub(' - ', text)
 
 def EnsureFullWidthPunctuation(text: str) -> str:
     """
     Ensure full-width punctuation is used in East Asian languages by replacing half-width
     punctuation with full-width equivalents only when directly adjacent to Asian script characters.
     """
-    # Function to replace each punctuation mark found with its full-width counterpart
-    def replace(match):
-        punctuation = match.group('punct')
-        return fullwidth_punctuation_map[punctuation]
+    # Only text with non-ASCII characters can contain Asian script
+    if text.isascii():
+        return text
 
     # Replace all occurrences of half-width punctuation in the text
-    return regex.sub(fullwidth_pattern, replace, text)
+    return fullwidth_regex.sub(_replace_fullwidth_punctuation, text)
+
+def _replace_fullwidth_punctuation(match) -> str:
+    """
+    Replace a punctuation mark with its full-width counterpart
+    """
+    punctuation : str = match.group('punct')
+    return fullwidth_punctuation_map.get(punctuation) or punctuation
 
 
 def CompileDialogSplitPattern(dialog_marker):
@@ -302,7 +316,7 @@ def ContainsTags(text : str) -> bool:
     """
     Check if a line contains any html-like tags (<i>, <b>, etc.)
     """
-    return regex.search(r"<[^>]+>", text) is not None
+    return tags_regex.search(text) is not None
 
 def ExtractTag(tagname : str, text : str) -> tuple[str, str|None]:
     """
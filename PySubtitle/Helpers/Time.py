@@ -14,6 +14,8 @@ timestamp_patterns = [
     r"^(?P<seconds>\d{1,2})(?:,(?P<milliseconds>\d{3}))?$",
 ]
 
+_one_millisecond = datetime.timedelta(milliseconds=1)
+
 re_timestamps = [
     regex.compile(pattern) for pattern in timestamp_patterns
 ]
@@ -59,6 +61,15 @@ def GetTimeDeltaSafe(time : datetime.timedelta|str|int|float|None) -> datetime.t
     else:
         return timedelta
 
+def TimedeltaToMilliseconds(time : datetime.timedelta|None) -> int|None:
+    """
+    Convert a timedelta to a whole number of milliseconds, truncating any remainder as SRT timestamps do
+    """
+    if time is None:
+        return None
+
+    return time // _one_millisecond
+
 def TimedeltaToText(time: datetime.timedelta|None, include_milliseconds : bool = True) -> str:
     """
     Convert a timedelta to a minimal string representation, adhering to specific formatting rules:
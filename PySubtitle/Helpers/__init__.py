@@ -47,15 +47,15 @@ def GetInputPath(filepath : str|None) -> str|None:
     if not filepath:
         return None
 
-    basename, dummy = os.path.splitext(os.path.basename(filepath)) # type: ignore[unused-ignore]
-    path = os.path.join(os.path.dirname(filepath), f"{basename}.srt")
+    basename, extension = os.path.splitext(os.path.basename(filepath))
+    path = os.path.join(os.path.dirname(filepath), f"{basename}{GetSubtitleExtension(extension)}")
     return os.path.normpath(path)
 
-def GetOutputPath(filepath : str|None, language : str|None = None) -> str|None:
+def GetOutputPath(filepath : str|None, language : str|None = None, extension : str|None = None) -> str|None:
     if not filepath:
         return None
 
-    basename, dummy = os.path.splitext(os.path.basename(filepath)) # type: ignore[unused-ignore]
+    basename, file_extension = os.path.splitext(os.path.basename(filepath))
 
     language = language or "translated"
 
@@ -63,7 +63,15 @@ def GetOutputPath(filepath : str|None, language : str|None = None) -> str|None:
     if not basename.endswith(language_suffix):
         basename = basename + language_suffix
 
-    return os.path.join(os.path.dirname(filepath), f"{basename}.srt")
+    return os.path.join(os.path.dirname(filepath), f"{basename}{GetSubtitleExtension(extension or file_extension)}")
+
+def GetSubtitleExtension(extension : str|None) -> str:
+    """
+    Get the extension of a subtitle file, which is the same as the original file unless it is a project file
+    """
+    if not extension or extension.lower().startswith('.subtrans'):
+        return '.srt'
+    return extension
 
 def FormatMessages(messages : list[dict[str,Any]]) -> str:
     lines : list[str] = []
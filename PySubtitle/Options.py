@@ -59,6 +59,8 @@ default_settings = {
     'scene_threshold': env_float('SCENE_THRESHOLD', 30.0),
     'min_batch_size': env_int('MIN_BATCH_SIZE', 10),
     'max_batch_size': env_int('MAX_BATCH_SIZE', 30),
+    'balance_batches': env_bool('BALANCE_BATCHES', False),
+    'auto_scene_threshold': env_bool('AUTO_SCENE_THRESHOLD', False),
     'max_context_summaries': env_int('MAX_CONTEXT_SUMMARIES', 10),
     'max_characters': env_int('MAX_CHARACTERS', 120),
     'max_newlines': env_int('MAX_NEWLINES', 2),
@@ -92,6 +94,13 @@ default_settings = {
     'last_used_path': None,
     'stop_on_error' : env_bool('STOP_ON_ERROR'),
     'write_backup' : env_bool('WRITE_BACKUP_FILE', True),
+    'pretty_project_file' : env_bool('PRETTY_PROJECT_FILE', False),
+    'save_prompts' : env_bool('SAVE_PROMPTS', True),
+    'save_responses' : env_bool('SAVE_RESPONSES', True),
+    'project_database' : env_str('PROJECT_DATABASE', None),
+    'progressive_output' : env_bool('PROGRESSIVE_OUTPUT', False),
+    'progressive_interval' : env_float('PROGRESSIVE_INTERVAL', 10.0),
+    'processing_workers' : env_int('PROCESSING_WORKERS', 1),
     'theme' : env_str('THEME', None),
     'ui_language': env_str('UI_LANGUAGE', 'en'),
     'firstrun' : False
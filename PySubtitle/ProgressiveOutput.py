@@ -0,0 +1,183 @@
+import logging
+import os
+import threading
+import time
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.Subtitles import Subtitles, default_encoding
+
+class _Segment:
+    """
+    The composed output for one scene, which is reused until the scene or its numbering changes
+    """
+    __slots__ = ('scene', 'version', 'start_number', 'next_number', 'flags', 'text')
+
+    def __init__(self, scene : SubtitleScene, version : int, start_number : int, next_number : int, flags : tuple, text : str):
+        self.scene = scene
+        self.version = version
+        self.start_number = start_number
+        self.next_number = next_number
+        self.flags = flags
+        self.text = text
+
+class ProgressiveOutput:
+    """
+    Writes the translation to the output file while it is in progress, so that a partial translation can be used.
+
+    Each scene is composed once and the result reused until the scene changes. Scenes completed after the last write
+    are appended to the file, otherwise the file is rewritten from the composed scenes and atomically replaced.
+    Updates are debounced, so the file is written at most once per interval, with a final write for the latest changes.
+
+    The output is written in the format of the output path's extension. Formats with a footer after the subtitle lines
+    are always rewritten, since the file cannot be appended to.
+    """
+    def __init__(self, subtitles : Subtitles, outputpath : str, interval : float = 10.0, handler : SubtitleFileHandler|None = None, encoding : str = default_encoding):
+        self.subtitles : Subtitles = subtitles
+        self.outputpath : str = os.path.normpath(outputpath)
+        self.interval : float = interval
+        self.handler : SubtitleFileHandler = handler or subtitles.CreateOutputHandler(self.outputpath)
+        self.encoding : str = encoding
+        self.append_count : int = 0
+        self.rewrite_count : int = 0
+        self.composed_count : int = 0
+
+        self._lock = threading.RLock()
+        self._segments : dict[int, _Segment] = {}
+        self._written : list[_Segment] = []
+        self._written_stat : tuple[int, int]|None = None
+        self._last_write : float = 0.0
+        self._pending : bool = False
+        self._timer : threading.Timer|None = None
+
+    def Update(self):
+        """
+        Write the output file if the interval has passed since the last write, otherwise schedule a write for when it has
+        """
+        with self._lock:
+            self._pending = True
+            elapsed = time.monotonic() - self._last_write
+            if elapsed >= self.interval:
+                self._write()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.interval - elapsed, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def Write(self):
+        """
+        Write the output file immediately
+        """
+        with self._lock:
+            self._write()
+
+    def Close(self, write : bool = True):
+        """
+        Stop updating the output file, first writing any changes that are waiting for the interval to pass unless write is False
+        """
+        with self._lock:
+            if self._pending and write:
+                self._write()
+            self._pending = False
+            self._cancel_timer()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            if not self._pending:
+                return
+
+            try:
+                self._write()
+
+            except Exception as e:
+                logging.error(_("Unable to write translation to {}: {}").format(self.outputpath, str(e)))
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write(self):
+        self._cancel_timer()
+        self._pending = False
+        self._last_write = time.monotonic()
+
+        segments = self._compose_segments()
+
+        # Scenes after the last one with any translated lines add nothing to the file
+        while segments and not segments[-1].text:
+            segments.pop()
+
+        header = self.handler.compose_header()
+        footer = self.handler.compose_footer()
+
+        written = len(self._written)
+        if self._written and not footer and segments[:written] == self._written and self._written_stat == self._get_stat():
+            text = ''.join(segment.text for segment in segments[written:])
+            if text:
+                with open(self.outputpath, 'a', encoding=self.encoding, newline=self.handler.get_output_newline()) as f:
+                    f.write(text)
+                self.append_count += 1
+                logging.debug(f"Appended {len(segments) - written} scenes to {self.outputpath}")
+        else:
+            temp_path = f"{self.outputpath}.tmp"
+            with open(temp_path, 'w', encoding=self.encoding, newline=self.handler.get_output_newline()) as f:
+                f.write(header)
+                for segment in segments:
+                    f.write(segment.text)
+                f.write(footer)
+            os.replace(temp_path, self.outputpath)
+            self.rewrite_count += 1
+            logging.debug(f"Wrote {len(segments)} scenes to {self.outputpath}")
+
+        self._written = segments
+        self._written_stat = self._get_stat()
+
+    def _compose_segments(self) -> list[_Segment]:
+        """
+        Get the composed output for each scene, composing only the scenes that have changed since they were last composed
+        """
+        subtitles = self.subtitles
+        segments : list[_Segment] = []
+        with subtitles.read_lock:
+            flags = (subtitles.settings.get('include_original'), subtitles.settings.get('add_right_to_left_markers'))
+            number = subtitles.start_line_number or 1
+
+            for scene in subtitles.scenes:
+                version = scene.version
+                segment = self._segments.get(scene.number)
+                if segment is None or segment.scene is not scene or segment.version != version or segment.start_number != number or segment.flags != flags:
+                    segment = self._compose_scene(scene, version, number, flags)
+                    self._segments[scene.number] = segment
+
+                segments.append(segment)
+                number = segment.next_number
+
+            # Forget scenes that no longer exist
+            for scene_number in [ scene_number for scene_number in self._segments if scene_number > len(subtitles.scenes) ]:
+                del self._segments[scene_number]
+
+        return segments
+
+    def _compose_scene(self, scene : SubtitleScene, version : int, start_number : int, flags : tuple) -> _Segment:
+        text = ''
+        next_number = start_number
+        # Original lines are written for untranslated scenes if they are included in the output
+        if scene.translated or flags[0]:
+            output_lines, next_number = self.subtitles.PrepareOutputLines(scene.originals or [], scene.translated or [], start_number)
+            text = self.handler.compose_lines(output_lines, reindex=False)
+            # Each scene is composed as a complete file, but the header and footer are only written once
+            header, footer = self.handler.compose_header(), self.handler.compose_footer()
+            text = text[len(header):len(text) - len(footer)]
+            self.composed_count += 1
+
+        return _Segment(scene, version, start_number, next_number, flags, text)
+
+    def _get_stat(self) -> tuple[int, int]|None:
+        try:
+            stat = os.stat(self.outputpath)
+            return (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return None
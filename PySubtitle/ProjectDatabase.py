@@ -0,0 +1,390 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleError import SubtitleError
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.SubtitleSerialisation import DecodeBatchContent, DecodeProject, DecodeValue, EncodeBatchContent, EncodeProject, EncodeValue
+from PySubtitle.Subtitles import Subtitles
+
+_schema = [
+    """CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        sourcepath TEXT,
+        outputpath TEXT,
+        settings BLOB
+    )""",
+    """CREATE TABLE IF NOT EXISTS scenes (
+        project INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+        scene INTEGER NOT NULL,
+        context BLOB,
+        PRIMARY KEY (project, scene)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS batches (
+        project INTEGER NOT NULL,
+        scene INTEGER NOT NULL,
+        batch INTEGER NOT NULL,
+        summary TEXT,
+        context BLOB,
+        errors BLOB,
+        translation BLOB,
+        prompt BLOB,
+        line_count INTEGER NOT NULL,
+        translated_count INTEGER NOT NULL,
+        PRIMARY KEY (project, scene, batch),
+        FOREIGN KEY (project, scene) REFERENCES scenes(project, scene) ON DELETE CASCADE
+    ) WITHOUT ROWID""",
+    """CREATE INDEX IF NOT EXISTS untranslated_batches ON batches(project, scene, batch) WHERE translated_count < line_count""",
+    """CREATE TABLE IF NOT EXISTS lines (
+        project INTEGER NOT NULL,
+        scene INTEGER NOT NULL,
+        batch INTEGER NOT NULL,
+        kind INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        number INTEGER,
+        start_ms INTEGER,
+        end_ms INTEGER,
+        content TEXT,
+        metadata BLOB,
+        translation TEXT,
+        original TEXT,
+        PRIMARY KEY (project, scene, batch, kind, position),
+        FOREIGN KEY (project, scene, batch) REFERENCES batches(project, scene, batch) ON DELETE CASCADE
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS blobs (
+        project INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+        key TEXT NOT NULL,
+        content TEXT NOT NULL,
+        PRIMARY KEY (project, key)
+    ) WITHOUT ROWID"""
+]
+
+# Values of the kind column in the lines table
+_ORIGINAL = 0
+_TRANSLATED = 1
+
+class _BatchRecord:
+    """
+    A batch converted to the rows that are stored for it
+    """
+    def __init__(self, batch : SubtitleBatch, include_prompts : bool, include_responses : bool):
+        self.scene : int = batch.scene
+        self.batch : int = batch.number
+        self.blobs : dict[str,str] = {}
+
+        errors, translation, prompt = EncodeBatchContent(batch, self.blobs, include_prompts, include_responses)
+        context = EncodeValue(batch.context) if batch.context else None
+        translated_count = sum(1 for line in batch.originals if line.translation is not None)
+        self.row : tuple = (batch.scene, batch.number, batch.summary, context, errors, translation, prompt, batch.size, translated_count)
+
+        self.lines : list[tuple] = [ _line_row(line, _ORIGINAL, position) for position, line in enumerate(batch.originals) ]
+        self.lines.extend(_line_row(line, _TRANSLATED, position) for position, line in enumerate(batch.translated))
+
+        self.digest : bytes = _digest(self.row, self.lines)
+
+class ProjectDatabase:
+    """
+    Stores projects in an SQLite database instead of a JSON project file.
+
+    A database can hold several projects (e.g. the episodes of a season), identified by name. Each batch is stored
+    in its own rows and can be written in a single transaction, so workers in several threads or processes can update
+    one project at the same time. The database uses write-ahead logging, so readers are not blocked by writers.
+
+    Saving a project only rewrites batches that have changed since this instance last read or wrote them,
+    so batches updated by other workers are not overwritten.
+    """
+    extension : str = ".subtransdb"
+
+    # Seconds to wait for another connection to finish writing
+    busy_timeout : float = 30.0
+
+    def __init__(self, filepath : str):
+        self.filepath : str = os.path.normpath(filepath)
+        self.lock = threading.RLock()
+        self._local = threading.local()
+        self._connections : list[sqlite3.Connection] = []
+
+        # Digest of each batch as it was last read or written by this instance, for each project
+        self._digests : dict[str, dict[tuple[int,int], bytes]] = {}
+
+        with self._transaction() as connection:
+            for statement in _schema:
+                connection.execute(statement)
+
+    def ListProjects(self) -> list[str]:
+        """
+        Get the names of the projects in the database
+        """
+        rows = self._connection().execute("SELECT name FROM projects ORDER BY name").fetchall()
+        return [ row[0] for row in rows ]
+
+    def HasProject(self, name : str) -> bool:
+        """
+        Check whether the database contains a project
+        """
+        return self._connection().execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone() is not None
+
+    def ReadProject(self, name : str) -> Subtitles|None:
+        """
+        Load a project from the database, returning None if it does not exist
+        """
+        connection = self._connection()
+        project = connection.execute("SELECT id, sourcepath, outputpath, settings FROM projects WHERE name = ?", (name,)).fetchone()
+        if project is None:
+            return None
+
+        project_id, sourcepath, outputpath, settings = project
+
+        # Read in a single transaction, so that the project is consistent if other workers are writing to it
+        connection.execute("BEGIN")
+        try:
+            blobs : dict[str,str] = dict(connection.execute("SELECT key, content FROM blobs WHERE project = ?", (project_id,)).fetchall())
+            scene_rows = connection.execute("SELECT scene, context FROM scenes WHERE project = ? ORDER BY scene", (project_id,)).fetchall()
+            batch_rows = connection.execute("SELECT scene, batch, summary, context, errors, translation, prompt, line_count, translated_count FROM batches WHERE project = ? ORDER BY scene, batch", (project_id,)).fetchall()
+            line_rows = connection.execute("SELECT scene, batch, kind, position, number, start_ms, end_ms, content, metadata, translation, original FROM lines WHERE project = ? ORDER BY scene, batch, kind, position", (project_id,)).fetchall()
+        finally:
+            connection.execute("COMMIT")
+
+        lines : dict[tuple[int,int], list[tuple]] = {}
+        for row in line_rows:
+            lines.setdefault((row[0], row[1]), []).append(row[2:])
+
+        batches : dict[int, list[SubtitleBatch]] = {}
+        digests : dict[tuple[int,int], bytes] = {}
+        for row in batch_rows:
+            scene_number, batch_number, summary, context, errors, translation, prompt = row[:7]
+            batch_lines = lines.get((scene_number, batch_number), [])
+            digests[(scene_number, batch_number)] = _digest(tuple(row), batch_lines)
+
+            decoded_errors, decoded_translation, decoded_prompt = DecodeBatchContent(errors, translation, prompt, blobs)
+            batch = SubtitleBatch({
+                'scene': scene_number,
+                'number': batch_number,
+                'summary': summary,
+                'context': DecodeValue(context) if context else {},
+                'errors': decoded_errors,
+                'originals': [ _build_line(line) for line in batch_lines if line[0] == _ORIGINAL ],
+                'translated': [ _build_line(line) for line in batch_lines if line[0] == _TRANSLATED ],
+                'translation': decoded_translation,
+                'prompt': decoded_prompt
+            })
+            batches.setdefault(scene_number, []).append(batch)
+
+        scenes = [ SubtitleScene({ 'number': number, 'context': DecodeValue(context) if context else {}, 'batches': batches.get(number, []) }) for number, context in scene_rows ]
+
+        subtitles = Subtitles(sourcepath, outputpath)
+        subtitles.settings = SettingsType(DecodeValue(settings) if settings else {})
+        subtitles.scenes = scenes
+        subtitles.UpdateProjectSettings(SettingsType())
+
+        with self.lock:
+            self._digests[name] = digests
+
+        return subtitles
+
+    def WriteProject(self, name : str, subtitles : Subtitles, include_prompts : bool = True, include_responses : bool = True) -> None:
+        """
+        Save a project to the database in a single transaction.
+
+        Only batches that have changed since they were last read or written are updated. If the project's scenes and batches
+        have been restructured, or it was not read from this database, the project is replaced.
+        """
+        records = [ _BatchRecord(batch, include_prompts, include_responses) for scene in subtitles.scenes for batch in scene.batches ]
+        settings = EncodeValue(dict(subtitles.settings or {}))
+
+        with self.lock:
+            known = self._digests.get(name)
+
+        with self._transaction() as connection:
+            connection.execute("INSERT INTO projects (name, sourcepath, outputpath, settings) VALUES (?, ?, ?, ?) "
+                               "ON CONFLICT (name) DO UPDATE SET sourcepath = excluded.sourcepath, outputpath = excluded.outputpath, settings = excluded.settings",
+                               (name, subtitles.sourcepath, subtitles.outputpath, settings))
+            project_id = self._get_project_id(connection, name)
+
+            stored = { (row[0], row[1]) for row in connection.execute("SELECT scene, batch FROM batches WHERE project = ?", (project_id,)) }
+            keys = { (record.scene, record.batch) for record in records }
+
+            if known is None or stored != keys or set(known) != keys:
+                # The structure of the project has changed, so replace it
+                connection.execute("DELETE FROM scenes WHERE project = ?", (project_id,))
+                connection.execute("DELETE FROM blobs WHERE project = ?", (project_id,))
+                known = {}
+
+            connection.executemany("INSERT INTO scenes (project, scene, context) VALUES (?, ?, ?) ON CONFLICT (project, scene) DO UPDATE SET context = excluded.context",
+                                   [ (project_id, scene.number, EncodeValue(scene.context) if scene.context else None) for scene in subtitles.scenes ])
+
+            for record in records:
+                if known.get((record.scene, record.batch)) != record.digest:
+                    self._write_batch(connection, project_id, record)
+
+        with self.lock:
+            self._digests[name] = { (record.scene, record.batch): record.digest for record in records }
+
+    def WriteBatch(self, name : str, batch : SubtitleBatch, include_prompts : bool = True, include_responses : bool = True) -> None:
+        """
+        Save a single batch in its own transaction, e.g. as soon as it has been translated
+        """
+        record = _BatchRecord(batch, include_prompts, include_responses)
+
+        with self._transaction() as connection:
+            project_id = self._get_project_id(connection, name)
+            connection.execute("INSERT OR IGNORE INTO scenes (project, scene) VALUES (?, ?)", (project_id, record.scene))
+            self._write_batch(connection, project_id, record)
+
+        with self.lock:
+            digests = self._digests.get(name)
+            if digests is not None and (record.scene, record.batch) in digests:
+                digests[(record.scene, record.batch)] = record.digest
+
+    def WriteScene(self, name : str, scene : SubtitleScene, include_prompts : bool = True, include_responses : bool = True) -> None:
+        """
+        Save a scene and its batches in a single transaction
+        """
+        records = [ _BatchRecord(batch, include_prompts, include_responses) for batch in scene.batches ]
+
+        with self._transaction() as connection:
+            project_id = self._get_project_id(connection, name)
+            connection.execute("INSERT INTO scenes (project, scene, context) VALUES (?, ?, ?) ON CONFLICT (project, scene) DO UPDATE SET context = excluded.context",
+                               (project_id, scene.number, EncodeValue(scene.context) if scene.context else None))
+            for record in records:
+                self._write_batch(connection, project_id, record)
+
+        with self.lock:
+            digests = self._digests.get(name)
+            if digests is not None:
+                for record in records:
+                    if (record.scene, record.batch) in digests:
+                        digests[(record.scene, record.batch)] = record.digest
+
+    def GetUntranslatedBatches(self, name : str|None = None) -> list[tuple[str, int, int]]:
+        """
+        Get the project name, scene and batch number of every batch with untranslated lines, in one project or all of them
+        """
+        query = "SELECT projects.name, batches.scene, batches.batch FROM batches JOIN projects ON projects.id = batches.project WHERE batches.translated_count < batches.line_count"
+        parameters : tuple = ()
+        if name is not None:
+            query += " AND projects.name = ?"
+            parameters = (name,)
+
+        rows = self._connection().execute(query + " ORDER BY projects.name, batches.scene, batches.batch", parameters).fetchall()
+        return [ (row[0], row[1], row[2]) for row in rows ]
+
+    def DeleteProject(self, name : str) -> None:
+        """
+        Remove a project from the database
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM projects WHERE name = ?", (name,))
+
+        with self.lock:
+            self._digests.pop(name, None)
+
+    def ImportProject(self, filepath : str, name : str|None = None) -> str:
+        """
+        Import a JSON project file, replacing any project with the same name. Returns the name of the project.
+        """
+        name = name or os.path.splitext(os.path.basename(filepath))[0]
+        with open(filepath, 'rb') as f:
+            subtitles = DecodeProject(f.read())
+
+        if not isinstance(subtitles, Subtitles):
+            raise SubtitleError(_("{} is not a project file").format(filepath))
+
+        with self.lock:
+            self._digests.pop(name, None)
+
+        self.WriteProject(name, subtitles)
+        return name
+
+    def ExportProject(self, name : str, filepath : str, pretty : bool = False) -> None:
+        """
+        Export a project to a JSON project file
+        """
+        subtitles = self.ReadProject(name)
+        if subtitles is None:
+            raise SubtitleError(_("Project {} not found in {}").format(name, self.filepath))
+
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(EncodeProject(subtitles, pretty=pretty))
+        os.replace(temp_path, filepath)
+
+    def Close(self) -> None:
+        """
+        Close all connections to the database
+        """
+        with self.lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+            self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get a connection for the current thread, since connections cannot be shared between threads
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.filepath, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self.lock:
+                self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in a write transaction, which is committed if they succeed and rolled back if they fail
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _get_project_id(self, connection : sqlite3.Connection, name : str) -> int:
+        row = connection.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise SubtitleError(_("Project {} not found in {}").format(name, self.filepath))
+        return row[0]
+
+    def _write_batch(self, connection : sqlite3.Connection, project_id : int, record : _BatchRecord) -> None:
+        connection.execute("DELETE FROM batches WHERE project = ? AND scene = ? AND batch = ?", (project_id, record.scene, record.batch))
+        connection.execute("INSERT INTO batches (project, scene, batch, summary, context, errors, translation, prompt, line_count, translated_count) "
+                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (project_id, *record.row))
+        connection.executemany("INSERT INTO lines (project, scene, batch, kind, position, number, start_ms, end_ms, content, metadata, translation, original) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [ (project_id, record.scene, record.batch, *line) for line in record.lines ])
+        if record.blobs:
+            connection.executemany("INSERT OR IGNORE INTO blobs (project, key, content) VALUES (?, ?, ?)", [ (project_id, key, text) for key, text in record.blobs.items() ])
+
+def _line_row(line : SubtitleLine, kind : int, position : int) -> tuple:
+    metadata = EncodeValue(dict(line._metadata)) if line._metadata else None
+    return (kind, position, line._index, line._start_ms, line._end_ms, line.content, metadata, line.translation, line.original)
+
+def _build_line(row : tuple) -> SubtitleLine:
+    _, _, number, start_ms, end_ms, content, metadata, translation, original = row
+    return SubtitleLine.FromFields(number, start_ms, end_ms, content, DecodeValue(metadata) if metadata else None, translation, original)
+
+def _digest(row : tuple, lines : list[tuple]) -> bytes:
+    """
+    Fingerprint the stored form of a batch, to tell whether it has changed
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(row).encode('utf-8'))
+    hasher.update(repr(lines).encode('utf-8'))
+    return hasher.digest()
@@ -0,0 +1,274 @@
+import json
+import logging
+import mmap
+import os
+import threading
+from typing import Any, Callable
+import weakref
+
+from PySubtitle.Helpers.Localization import _
+
+# Guards lazily loaded content against the project file being replaced while it is read
+_content_lock = threading.RLock()
+
+# The source that lazily loaded content is currently read from for each project file
+_sources : weakref.WeakValueDictionary[str, 'ProjectContentSource'] = weakref.WeakValueDictionary()
+
+class ProjectContentSource:
+    """
+    A project file that content is loaded from on demand, memory-mapped while it is in use
+    """
+    def __init__(self, filepath : str, blobs : dict[str, tuple[int, int]]|None = None):
+        self.filepath : str = filepath
+        self.blobs : dict[str, tuple[int, int]] = blobs or {}
+        self._file = None
+        self._map : mmap.mmap|None = None
+        self._mappable : bool = True
+        self._contents : weakref.WeakSet[LazyContent] = weakref.WeakSet()
+
+        with _content_lock:
+            _sources[os.path.normpath(filepath)] = self
+
+    def Read(self, start : int, end : int) -> bytes:
+        """
+        Read a range of bytes from the project file
+        """
+        with _content_lock:
+            if self._map is None and self._mappable:
+                self._open_map()
+
+            if self._map is not None:
+                return self._map[start:end]
+
+            with open(self.filepath, 'rb') as f:
+                f.seek(start)
+                return f.read(end - start)
+
+    def ReadBlob(self, key : str) -> bytes|None:
+        """
+        Read the encoded content of a blob from the project file
+        """
+        location = self.blobs.get(key)
+        return self.Read(*location) if location else None
+
+    def _open_map(self):
+        self._file = open(self.filepath, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except (OSError, ValueError):
+            # Fall back to reading the file directly if it cannot be mapped
+            self._file.close()
+            self._file = None
+            self._mappable = False
+
+    def Detach(self, keep : set[int]|None = None):
+        """
+        Read any content that has not been loaded into memory, so that the file can be replaced or deleted
+        """
+        with _content_lock:
+            for content in list(self._contents):
+                if content.source is self and id(content) not in (keep or set()):
+                    content.Pin()
+            self.Close()
+
+    def Close(self):
+        """
+        Release the file. It will be reopened if more content is read.
+        """
+        with _content_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class LazyContent:
+    """
+    A prompt or translation in a project file, which is only read and decoded when it is needed
+    """
+    def __init__(self, source : ProjectContentSource, start : int, end : int, build : Callable[['LazyContent'], Any], blob_keys : list[str]|None = None):
+        self.source : ProjectContentSource = source
+        self.start : int = start
+        self.end : int = end
+        self.blob_keys : list[str] = blob_keys or []
+        self._build = build
+        self._content : bytes|None = None
+        self._blobs : dict[str, bytes|None]|None = None
+        source._contents.add(self)
+
+    def Read(self) -> bytes:
+        """
+        Read the encoded content from the project file
+        """
+        with _content_lock:
+            if self._content is not None:
+                return self._content
+            return self.source.Read(self.start, self.end)
+
+    def ReadBlob(self, key : str) -> bytes|None:
+        """
+        Read the encoded content of a blob the content refers to
+        """
+        with _content_lock:
+            if self._blobs is not None:
+                return self._blobs.get(key)
+            return self.source.ReadBlob(key)
+
+    def Load(self) -> Any:
+        """
+        Read and decode the content
+        """
+        return self._build(self)
+
+    def Pin(self):
+        """
+        Keep the encoded content in memory instead of reading it from the project file
+        """
+        with _content_lock:
+            if self._content is None:
+                self._content = self.source.Read(self.start, self.end)
+                self._blobs = { key: self.source.ReadBlob(key) for key in self.blob_keys }
+
+    def Rebind(self, source : ProjectContentSource, start : int, end : int):
+        """
+        Point to the location of the content in a newly written project file
+        """
+        with _content_lock:
+            self.source = source
+            self.start = start
+            self.end = end
+            self._content = None
+            self._blobs = None
+            source._contents.add(self)
+
+class ProjectIndex:
+    """
+    Sidecar index recording where the prompt and response of each batch are stored in a project file,
+    so that a project can be opened without reading and decoding them.
+
+    The index is only valid for the exact file it was written for, which is checked by size and modification time.
+    """
+    version : int = 1
+
+    def __init__(self):
+        self.filesize : int = 0
+        self.modified : int = 0
+        self.fragments : list[dict[str, Any]] = []
+        self.blobs : dict[str, tuple[int, int]] = {}
+
+        # Content that was copied from an earlier version of the project file, to be rebound once it is replaced
+        self.rebind : list[tuple[LazyContent, int, int]] = []
+
+    def AddFragment(self, scene : int, batch : int, kind : str, start : int, end : int, blob_keys : list[str]|None = None):
+        """
+        Record the location of a batch's prompt or translation
+        """
+        fragment : dict[str, Any] = { 'scene': scene, 'batch': batch, 'kind': kind, 'start': start, 'end': end }
+        if blob_keys:
+            fragment['blobs'] = blob_keys
+        self.fragments.append(fragment)
+
+    def AddBlob(self, key : str, start : int, end : int):
+        """
+        Record the location of a blob
+        """
+        self.blobs[key] = (start, end)
+
+    def GetRanges(self) -> list[tuple[int, int]]:
+        """
+        Get the byte ranges of all indexed content, in file order
+        """
+        ranges = [ (fragment['start'], fragment['end']) for fragment in self.fragments ]
+        ranges.extend(self.blobs.values())
+        return sorted(ranges)
+
+    def Matches(self, projectfile : str) -> bool:
+        """
+        Check whether the index describes the project file as it is now
+        """
+        try:
+            stat = os.stat(projectfile)
+        except OSError:
+            return False
+
+        return stat.st_size == self.filesize and stat.st_mtime_ns == self.modified
+
+    def Stamp(self, projectfile : str):
+        """
+        Record the size and modification time of the project file the index describes
+        """
+        stat = os.stat(projectfile)
+        self.filesize = stat.st_size
+        self.modified = stat.st_mtime_ns
+
+    def Commit(self, temp_path : str, projectfile : str):
+        """
+        Replace the project file with a newly written version that this index describes,
+        and point content that was copied from the previous version at its new location.
+        """
+        with _content_lock:
+            ReleaseProjectFile(projectfile, keep={ id(lazy) for lazy, _, _ in self.rebind })
+            for lazy, _, _ in self.rebind:
+                lazy.source.Close()
+
+            os.replace(temp_path, projectfile)
+            self.Stamp(projectfile)
+
+            source = ProjectContentSource(projectfile, self.blobs)
+            for lazy, start, end in self.rebind:
+                lazy.Rebind(source, start, end)
+            self.rebind = []
+
+    def Write(self, filepath : str):
+        """
+        Write the index to a file
+        """
+        data = {
+            'version': self.version,
+            'filesize': self.filesize,
+            'modified': self.modified,
+            'fragments': self.fragments,
+            'blobs': self.blobs
+        }
+
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, filepath)
+
+    @classmethod
+    def Read(cls, filepath : str) -> 'ProjectIndex|None':
+        """
+        Read an index from a file, returning None if there is no usable index
+        """
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != cls.version:
+                return None
+
+            index = ProjectIndex()
+            index.filesize = data['filesize']
+            index.modified = data['modified']
+            index.fragments = data['fragments']
+            index.blobs = { key: (location[0], location[1]) for key, location in data['blobs'].items() }
+            return index
+
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(_("Unable to read project index {}: {}").format(filepath, str(e)))
+            return None
+
+def ReleaseProjectFile(filepath : str, keep : set[int]|None = None):
+    """
+    Load any content that is still to be read from a project file, before the file is replaced or deleted
+    """
+    with _content_lock:
+        source = _sources.get(os.path.normpath(filepath))
+        if source is not None:
+            source.Detach(keep)
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.SubtitleSerialisation import SubtitleDecoder, SubtitleEncoder
+
+default_encoding = os.getenv('DEFAULT_ENCODING', 'utf-8')
+
+class ProjectJournal:
+    """
+    Append-only log of changes made to a project since it was last saved in full.
+
+    Each translated batch (or scene summary) is written as a single JSON record and flushed to disk immediately,
+    so a checkpoint costs the same however large the project is and no work is lost if the process is killed.
+    The journal is replayed over the project file when it is loaded, and compacted when the project is saved.
+    """
+    def __init__(self, filepath : str):
+        self.filepath : str = filepath
+        self.lock = threading.Lock()
+        self.record_count : int = len(self._read_records())
+
+    def AppendBatch(self, batch : SubtitleBatch):
+        """
+        Record the translation of a batch
+        """
+        self._append({
+            'type': 'batch',
+            'scene': batch.scene,
+            'batch': batch.number,
+            'first_line': batch.first_line_number,
+            'last_line': batch.last_line_number,
+            'summary': batch.summary,
+            'context': batch.context,
+            'errors': batch.errors or None,
+            'translated': batch.translated,
+            'translation': batch.translation
+        })
+
+    def AppendScene(self, scene : SubtitleScene):
+        """
+        Record the summary of a scene
+        """
+        self._append({
+            'type': 'scene',
+            'scene': scene.number,
+            'first_line': scene.first_line_number,
+            'summary': scene.summary
+        })
+
+    def Replay(self, subtitles : Subtitles) -> int:
+        """
+        Apply the journal to subtitles loaded from the project file. Returns the number of records applied.
+        """
+        applied = 0
+        with self.lock:
+            records = self._read_records()
+
+        for record in records:
+            try:
+                data : dict[str,Any] = json.loads(record, cls=SubtitleDecoder)
+
+            except json.JSONDecodeError:
+                # The last record may be incomplete if the process was killed while it was being written
+                logging.warning(_("Ignoring incomplete record in project journal {}").format(self.filepath))
+                continue
+
+            if self._apply_record(subtitles, data):
+                applied += 1
+
+        return applied
+
+    def Compact(self, record_count : int):
+        """
+        Remove records which have been included in a full save of the project
+        """
+        with self.lock:
+            records = self._read_records()
+            remaining = records[record_count:]
+            if not remaining:
+                if os.path.exists(self.filepath):
+                    os.remove(self.filepath)
+            else:
+                temp_path = f"{self.filepath}.tmp"
+                with open(temp_path, 'w', encoding=default_encoding, newline='\n') as f:
+                    f.writelines(f"{record}\n" for record in remaining)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.filepath)
+
+            self.record_count = len(remaining)
+
+    def Clear(self):
+        """
+        Discard the journal, e.g. because the subtitles were reloaded from the source file
+        """
+        self.Compact(self.record_count)
+
+    def _append(self, record : dict[str,Any]):
+        line = json.dumps(record, cls=SubtitleEncoder, ensure_ascii=False)
+        with self.lock:
+            with open(self.filepath, 'a', encoding=default_encoding, newline='\n') as f:
+                f.write(f"{line}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.record_count += 1
+
+    def _read_records(self) -> list[str]:
+        if not os.path.exists(self.filepath):
+            return []
+
+        with open(self.filepath, 'r', encoding=default_encoding, newline='\n') as f:
+            return [ line.rstrip('\n') for line in f if line.strip() ]
+
+    def _apply_record(self, subtitles : Subtitles, record : dict[str,Any]) -> bool:
+        """
+        Apply a record to the subtitles, if the batch or scene it describes is still there
+        """
+        scene_number : int = record.get('scene', 0)
+        if record.get('type') == 'scene':
+            scene = next((scene for scene in subtitles.scenes if scene.number == scene_number), None)
+            if not scene or scene.first_line_number != record.get('first_line'):
+                logging.warning(_("Project journal record for scene {} does not match the project").format(scene_number))
+                return False
+
+            scene.summary = record.get('summary')
+            return True
+
+        batch_number : int = record.get('batch', 0)
+        scene = next((scene for scene in subtitles.scenes if scene.number == scene_number), None)
+        batch = scene.GetBatch(batch_number) if scene else None
+        if not batch or batch.first_line_number != record.get('first_line') or batch.last_line_number != record.get('last_line'):
+            logging.warning(_("Project journal record for scene {} batch {} does not match the project").format(scene_number, batch_number))
+            return False
+
+        batch.translated = record.get('translated') or []
+        translations = { line.number : line.text for line in batch.translated }
+        for line in batch.originals:
+            line.translation = translations.get(line.number)
+
+        batch.summary = record.get('summary')
+        batch.context = record.get('context') or {}
+        batch.errors = record.get('errors') or []
+        batch.translation = record.get('translation')
+        batch.MarkModified()
+        return True
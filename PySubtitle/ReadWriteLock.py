@@ -0,0 +1,114 @@
+import threading
+import time
+
+class ReadWriteLock:
+    """
+    A lock that can be held by any number of readers at once, or by a single writer.
+
+    Both sides are reentrant, and the writer can also take the read lock. A thread that already holds the read lock
+    can take it again while a writer is waiting, so nested reads cannot deadlock. It can also take the write lock,
+    which waits for the other readers to finish. Two readers that were each waiting for the other to leave would
+    deadlock, so if another reader is already upgrading, the thread gives up its read lock until it gets the write
+    lock and its read lock is restored. Anything it read before the upgrade may have been changed by then.
+
+    Waiting writers take priority over new readers. The time spent waiting for each side is accumulated for diagnostics.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers : dict[int, int] = {}
+        self._writer : int|None = None
+        self._writer_depth : int = 0
+        self._waiting_writers : int = 0
+        self._upgrading : int|None = None
+        self.read_wait_time : float = 0.0
+        self.write_wait_time : float = 0.0
+        self.read_lock = _LockSide(self.AcquireRead, self.ReleaseRead)
+        self.write_lock = _LockSide(self.AcquireWrite, self.ReleaseWrite)
+
+    def AcquireRead(self):
+        """
+        Take a shared lock, waiting for any writer to finish
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer != thread_id and thread_id not in self._readers:
+                started = time.perf_counter()
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self.read_wait_time += time.perf_counter() - started
+
+            self._readers[thread_id] = self._readers.get(thread_id, 0) + 1
+
+    def ReleaseRead(self):
+        thread_id = threading.get_ident()
+        with self._condition:
+            depth = self._readers.get(thread_id)
+            if not depth:
+                raise RuntimeError("Read lock released by a thread that does not hold it")
+
+            if depth > 1:
+                self._readers[thread_id] = depth - 1
+            else:
+                del self._readers[thread_id]
+                if not self._readers or self._upgrading is not None:
+                    self._condition.notify_all()
+
+    def AcquireWrite(self):
+        """
+        Take an exclusive lock, waiting for all readers and any other writer to finish
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer == thread_id:
+                self._writer_depth += 1
+                return
+
+            # Queue behind a reader that is already upgrading, releasing the read lock so that it can proceed
+            read_depth = 0
+            if thread_id in self._readers:
+                if self._upgrading is None:
+                    self._upgrading = thread_id
+                else:
+                    read_depth = self._readers.pop(thread_id)
+                    self._condition.notify_all()
+
+            started = time.perf_counter()
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or any(reader != thread_id for reader in self._readers):
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+                if self._upgrading == thread_id:
+                    self._upgrading = None
+                if read_depth:
+                    self._readers[thread_id] = read_depth
+
+            self._writer = thread_id
+            self._writer_depth = 1
+            self.write_wait_time += time.perf_counter() - started
+
+    def ReleaseWrite(self):
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Write lock released by a thread that does not hold it")
+
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+class _LockSide:
+    """
+    One side of a ReadWriteLock, usable like a regular lock (acquire/release or a with statement)
+    """
+    def __init__(self, acquire, release):
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
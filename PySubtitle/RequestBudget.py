@@ -0,0 +1,54 @@
+import threading
+import time
+
+class RequestBudget:
+    """
+    Limits the number of requests that are in progress at once and the rate at which they are made,
+    across every translation client that shares the budget.
+    """
+    def __init__(self, max_concurrent : int|None = None, rate_limit : float|None = None):
+        """
+        :param max_concurrent: the maximum number of requests in progress at once (unlimited if None)
+        :param rate_limit: the maximum number of requests to start per minute (unlimited if None)
+        """
+        self.max_concurrent : int|None = max_concurrent if max_concurrent and max_concurrent > 0 else None
+        self.rate_limit : float|None = rate_limit if rate_limit and rate_limit > 0.0 else None
+        self.request_count : int = 0
+
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent) if self.max_concurrent else None
+        self._lock = threading.Lock()
+        self._next_start : float = 0.0
+
+    def Acquire(self):
+        """
+        Wait until a request can be made within the budget
+        """
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+
+        with self._lock:
+            self.request_count += 1
+            if self.rate_limit is None:
+                return
+
+            # Reserve the next slot, so that requests are spread evenly rather than made in bursts
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 60.0 / self.rate_limit
+
+        if start > now:
+            time.sleep(start - now)
+
+    def Release(self):
+        """
+        Mark a request as finished
+        """
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def __enter__(self):
+        self.Acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Release()
@@ -0,0 +1,46 @@
+import threading
+
+from PySubtitle.Options import Options
+from PySubtitle.RequestBudget import RequestBudget
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.TranslationClient import TranslationClient
+from PySubtitle.TranslationProvider import TranslationProvider
+
+class SharedClients:
+    """
+    Translation clients shared by every translator with the same settings.
+
+    A client is created by the first translator that needs it, and every client for a provider makes its requests
+    within one budget of concurrent requests and requests per minute. Translators do not abort a shared client
+    when they stop, as it may be translating for other translators, so the owner must call AbortTranslation.
+    """
+    def __init__(self):
+        self.clients : dict[str, TranslationClient] = {}
+        self.budgets : dict[str, RequestBudget] = {}
+        self._lock = threading.Lock()
+
+    def CreateTranslator(self, options : Options, provider : TranslationProvider, key : str = "") -> SubtitleTranslator:
+        """
+        Create a translator that uses the client for the key, which is created with the translator if the key has not been used
+        """
+        with self._lock:
+            client = self.clients.get(key)
+            translator = SubtitleTranslator(options, provider, client=client)
+            if client is None:
+                budget = self.budgets.get(provider.name)
+                if budget is None:
+                    budget = self.budgets[provider.name] = RequestBudget(options.get_int('max_threads'), translator.client.rate_limit)
+                translator.client.request_budget = budget
+                translator.shared_client = True
+                self.clients[key] = translator.client
+            return translator
+
+    def AbortTranslation(self) -> None:
+        """
+        Abort any requests in progress for every client
+        """
+        with self._lock:
+            clients = list(self.clients.values())
+
+        for client in clients:
+            client.AbortTranslation()
@@ -1,13 +1,24 @@
 import logging
-from typing import Any
+import threading
+from collections import OrderedDict
+from typing import Any, Literal
 import regex
 from enum import Enum
 
 from PySubtitle.Helpers import GetValueFromName
 
+# Combined patterns compiled for recent sets of substitutions, shared by all instances so that they are only compiled once
+_combined_patterns : OrderedDict[tuple, regex.Pattern[Any]|None] = OrderedDict()
+_combined_patterns_lock = threading.Lock()
+_combined_patterns_limit = 16
+
 class Substitutions:
     """
     Helper class to perform textual substitutions based on a dictionary of (before,after) pairs.
+
+    All of the substitutions are made in a single pass over the text, using one pattern that matches any of the
+    "before" strings. Where several could match at the same position the longest is used, and replaced text is
+    not substituted again.
     """
     class Mode(Enum):
         Auto = 0
@@ -23,6 +34,7 @@ class Substitutions:
 
     def __init__(self, substitutions : dict|list|str, mode : Mode|str = Mode.Auto):
         self._patterns = None
+        self._pattern : regex.Pattern[Any]|Literal[False]|None = None
         self._mode = self._parse_mode(mode)
         self.substitutions = substitutions
 
@@ -34,6 +46,7 @@ class Substitutions:
     def mode(self, mode : Mode|int|str):
         self._mode = self._parse_mode(mode)
         self._patterns = None
+        self._pattern = None
 
     @property
     def substitutions(self) -> dict:
@@ -43,6 +56,7 @@ class Substitutions:
     def substitutions(self, substitutions : dict|list|str):
         self._substitutions = Substitutions.Parse(substitutions) if substitutions else {}
         self._patterns = None
+        self._pattern = None
 
     @property
     def patterns(self) -> list[tuple[regex.Pattern[Any], str]]:
@@ -50,6 +64,15 @@ class Substitutions:
             self._patterns = self._compile_patterns()
         return self._patterns
 
+    @property
+    def pattern(self) -> regex.Pattern[Any]|None:
+        """
+        A single pattern that matches any of the substitutions, or None if there are none
+        """
+        if self._pattern is None:
+            self._pattern = self._get_combined_pattern()
+        return self._pattern or None
+
     def PerformSubstitutions(self, input : list|str):
         """
         Try to substitute all (before,after) pairs in an input string
@@ -58,10 +81,12 @@ class Substitutions:
         :return: a string with the substitutions performed.
         """
         result = str(input)
-        for pattern, substitution in self.patterns:
-            result = pattern.sub(substitution, result)
+        pattern = self.pattern
+        if pattern is None:
+            return result
 
-        return result
+        substitutions = self.substitutions
+        return pattern.sub(lambda match: substitutions[match.group(0)], result)
 
     def PerformSubstitutionsOnAll(self, input : list[str]) -> tuple[list[str], dict[str,str]]:
         """
@@ -85,6 +110,47 @@ class Substitutions:
 
         return patterns
 
+    def _get_combined_pattern(self) -> regex.Pattern[Any]|Literal[False]:
+        """
+        Get the combined pattern for the substitutions, compiling it if it is not cached.
+        Returns False if there are no substitutions, so that the result is still cached.
+        """
+        key = (self.mode, tuple(self.substitutions.items()))
+        with _combined_patterns_lock:
+            if key in _combined_patterns:
+                _combined_patterns.move_to_end(key)
+                return _combined_patterns[key] or False
+
+        pattern = self._compile_combined_pattern()
+
+        with _combined_patterns_lock:
+            _combined_patterns[key] = pattern
+            while len(_combined_patterns) > _combined_patterns_limit:
+                _combined_patterns.popitem(last=False)
+
+        return pattern or False
+
+    def _compile_combined_pattern(self) -> regex.Pattern[Any]|None:
+        """
+        Build a pattern that matches any of the "before" strings, preferring the longest, with the boundaries for the mode.
+        The strings are arranged as a trie so that the pattern does not try each of them in turn.
+        """
+        trie : dict = {}
+        for before in self.substitutions.keys():
+            if not before:
+                continue
+
+            node = trie
+            for char in before:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        if not trie:
+            return None
+
+        alternation = _trie_pattern(trie)
+        return regex.compile(self._get_template().format(f"(?:{alternation})"), flags=regex.UNICODE)
+
     def _get_template(self):
         if self.mode == Substitutions.Mode.WholeWords:
             return self.template_wholewords
@@ -146,4 +212,19 @@ class Substitutions:
 
             return substitutions
 
-        return {}
\ No newline at end of file
+        return {}
+
+def _trie_pattern(node : dict) -> str:
+    """
+    Convert a trie of strings to a regular expression, with longer matches tried first
+    """
+    alternatives = [ regex.escape(char) + _trie_pattern(child) for char, child in node.items() if char ]
+    if not alternatives:
+        return ''
+
+    is_end = '' in node
+    if len(alternatives) == 1 and not is_end:
+        return alternatives[0]
+
+    group = f"(?:{'|'.join(alternatives)})"
+    return f"{group}?" if is_end else group
@@ -1,6 +1,8 @@
+import copy
 from datetime import timedelta
 from typing import Any
 
+from PySubtitle.ProjectIndex import LazyContent
 from PySubtitle.Substitutions import Substitutions
 from PySubtitle.TranslationPrompt import TranslationPrompt
 from PySubtitle.SubtitleError import SubtitleError
@@ -18,8 +20,13 @@ class SubtitleBatch:
         self.errors : list[str|SubtitleError] = dct.get('errors', [])
         self._originals : list[SubtitleLine] = dct.get('originals', []) or dct.get('subtitles', [])
         self._translated : list[SubtitleLine] = dct.get('translated', [])
-        self.translation : Translation|None = dct.get('translation')
-        self.prompt : TranslationPrompt|None = dct.get('prompt')
+        self._translation : Translation|None = dct.get('translation')
+        self._prompt : TranslationPrompt|None = dct.get('prompt')
+        self._lazy : dict[str, LazyContent]|None = None
+        self._version : int = 0
+        self._state : tuple[int, int, int, int]|None = None
+        self._untranslated : tuple[int, list[SubtitleLine]]|None = None
+        self._snapshot_lines : tuple[int, list[SubtitleLine], list[SubtitleLine]]|None = None
 
     def __str__(self) -> str:
         return f"SubtitleBatch: {str(self.number)} in scene {str(self.scene)} with {self.size} lines"
@@ -44,8 +51,45 @@ class SubtitleBatch:
 
     @property
     def untranslated(self) -> list[SubtitleLine]:
-        """ Get the list of lines in the batch which have no translation """
-        return [sub for sub in self.originals if not sub.translated]
+        """ Get the list of lines in the batch which have no translation (cached until the batch is modified) """
+        version = self.version
+        if self._untranslated is None or self._untranslated[0] != version:
+            self._untranslated = (version, [sub for sub in self.originals if sub.translation is None])
+        return self._untranslated[1]
+
+    @property
+    def version(self) -> int:
+        """ Modification counter, which changes whenever lines in the batch are replaced, added or removed """
+        # Catch the line lists being replaced or resized directly as well as changes made through the batch
+        state = (id(self._originals), len(self._originals), id(self._translated), len(self._translated))
+        if state != self._state:
+            self._state = state
+            self._version += 1
+        return self._version
+
+    @property
+    def translation(self) -> Translation|None:
+        """ Get the translation response for the batch, loading it from the project file if necessary """
+        if self._lazy and 'translation' in self._lazy:
+            self._load_content('translation')
+        return self._translation
+
+    @property
+    def prompt(self) -> TranslationPrompt|None:
+        """ Get the prompt used to translate the batch, loading it from the project file if necessary """
+        if self._lazy and 'prompt' in self._lazy:
+            self._load_content('prompt')
+        return self._prompt
+
+    @property
+    def has_translation(self) -> bool:
+        """ Check whether the batch has a translation response, without loading it """
+        return self._translation is not None or bool(self._lazy and 'translation' in self._lazy)
+
+    @property
+    def has_prompt(self) -> bool:
+        """ Check whether the batch has a prompt, without loading it """
+        return self._prompt is not None or bool(self._lazy and 'prompt' in self._lazy)
 
     @property
     def all_translated(self) -> bool:
@@ -114,6 +158,7 @@ class SubtitleBatch:
         """
         lines = [SubtitleLine(line) for line in value] if value else []
         self._originals = [line for line in lines if line.number]
+        self.MarkModified()
 
     @translated.setter
     def translated(self, value : list[SubtitleLine]|list[str]):
@@ -122,16 +167,71 @@ class SubtitleBatch:
         """
         lines = [SubtitleLine(line) for line in value] if value else []
         self._translated = [line for line in lines if line.number]
+        self.MarkModified()
+
+    @translation.setter
+    def translation(self, value : Translation|None):
+        self._translation = value
+        if self._lazy:
+            self._lazy.pop('translation', None)
+
+    @prompt.setter
+    def prompt(self, value : TranslationPrompt|None):
+        self._prompt = value
+        if self._lazy:
+            self._lazy.pop('prompt', None)
 
     def AddLine(self, line : SubtitleLine|str):
         """
         Insert a line into the batch or replace an existing line
         """
         AddOrUpdateLine(self._originals, SubtitleLine(line))
+        self.MarkModified()
 
     def AddTranslatedLine(self, line : SubtitleLine|str):
        """ Insert a translated line into the batch or replace an existing translation """
        AddOrUpdateLine(self._translated, SubtitleLine(line))
+       self.MarkModified()
+
+    def Snapshot(self) -> 'SubtitleBatch':
+        """
+        Get a copy of the batch that will not be affected by later changes to it, e.g. for saving in the background.
+        The lines are only copied again once the batch is modified, so changes to lines must be recorded with MarkModified,
+        and the copies are shared between snapshots, which must be treated as read-only.
+        """
+        version = self.version
+        if self._snapshot_lines is None or self._snapshot_lines[0] != version:
+            self._snapshot_lines = (version, [ SubtitleLine(line) for line in self._originals ], [ SubtitleLine(line) for line in self._translated ])
+
+        translation = copy.copy(self._translation)
+        if translation:
+            translation.content = dict(translation.content)
+
+        snapshot = SubtitleBatch({
+            'scene': self.scene,
+            'number': self.number,
+            'summary': self.summary,
+            'context': dict(self.context),
+            'errors': list(self.errors),
+            'originals': self._snapshot_lines[1],
+            'translated': self._snapshot_lines[2],
+            'translation': translation,
+            'prompt': copy.copy(self._prompt)
+        })
+
+        # Content that has not been loaded is shared with the snapshot rather than loaded
+        snapshot._lazy = dict(self._lazy) if self._lazy else None
+        return snapshot
+
+    def SetLazyContent(self, kind : str, content : LazyContent):
+        """ Defer loading the translation or prompt until it is accessed """
+        if self._lazy is None:
+            self._lazy = {}
+        self._lazy[kind] = content
+
+    def MarkModified(self):
+        """ Record that the lines in the batch have changed, e.g. a translation was set on an original line """
+        self._version += 1
 
     def HasTranslatedLine(self, line_number : int) -> bool:
         """ Check if the batch has a translated line with the given number """
@@ -191,6 +291,7 @@ class SubtitleBatch:
                     if item.text:
                         # Replace the text in the original lines
                         item.text = replacements.get(item.text, item.text)
+                self.MarkModified()
 
             return replacements
 
@@ -208,6 +309,7 @@ class SubtitleBatch:
                 for item in self.translated:
                     if item.text:
                         item.text = replacements.get(item.text) or item.text
+                self.MarkModified()
 
             return replacements
 
@@ -233,9 +335,11 @@ class SubtitleBatch:
             last_translated_index = self.translated.index(translated_lines[-1])
             merged_translated = MergeSubtitles(translated_lines)
             self._translated = self.translated[:first_translated_index] + [ merged_translated ] + self.translated[last_translated_index + 1:]
+            self.MarkModified()
 
             return merged, merged_translated
 
+        self.MarkModified()
         return merged, None
 
     def DeleteLines(self, line_numbers : list[int]) -> tuple[list[SubtitleLine], list[SubtitleLine]]:
@@ -253,6 +357,7 @@ class SubtitleBatch:
 
         self._originals = originals
         self._translated = translated
+        self.MarkModified()
 
         return deleted_originals, deleted_translated
 
@@ -266,7 +371,7 @@ class SubtitleBatch:
         if not self.originals:
             self.originals = [line]
 
-        if self.first_line_number is not None and line.number < self.first_line_number:
+        elif self.first_line_number is not None and line.number < self.first_line_number:
             self.originals.insert(0, line)
 
         elif self.last_line_number is not None and line.number > self.last_line_number:
@@ -278,6 +383,8 @@ class SubtitleBatch:
                     self.originals.insert(index, line)
                     break
 
+        self.MarkModified()
+
     def InsertTranslatedLine(self, line : SubtitleLine):
         """
         Insert a translated line into the batch
@@ -288,7 +395,7 @@ class SubtitleBatch:
         if not self.translated:
             self.translated = [line]
 
-        if line.number < self.translated[0].number:
+        elif line.number < self.translated[0].number:
             self.translated.insert(0, line)
 
         elif line.number > self.translated[-1].number:
@@ -300,6 +407,8 @@ class SubtitleBatch:
                     self.translated.insert(index, line)
                     break
 
+        self.MarkModified()
+
     def InsertLines(self, originals: list[SubtitleLine], translated: list[SubtitleLine]|None = None):
         """
         Insert multiple lines into the batch, with optional translations
@@ -316,3 +425,16 @@ class SubtitleBatch:
             sorted_lines = sorted(translated, key=lambda item: item.number)
             for line in sorted_lines:
                 self.InsertTranslatedLine(line)
+
+    def _load_content(self, kind : str):
+        """ Load content that was deferred when the project was read """
+        content = self._lazy.get(kind) if self._lazy else None
+        if content is None:
+            return
+
+        value = content.Load()
+
+        # Another thread may have loaded or replaced the content in the meantime
+        if self._lazy and self._lazy.get(kind) is content:
+            setattr(self, f"_{kind}", value)
+            del self._lazy[kind]
@@ -1,14 +1,84 @@
+import bisect
 from datetime import timedelta
+import logging
+import math
+from typing import Iterable, Iterator
 from PySubtitle.Options import SettingsType
 from PySubtitle.SubtitleBatch import SubtitleBatch
 from PySubtitle.SubtitleScene import SubtitleScene
 from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleTimings import SubtitleTimings
+
+class GapIndex:
+    """
+    Sparse table over the gaps between consecutive lines, which finds the largest gap in any range of lines in constant time
+    """
+    def __init__(self, gaps : list[int]):
+        self.gaps : list[int] = gaps
+        self._table : list[list[int]] = [ list(range(len(gaps))) ]
+
+        span = 1
+        while span * 2 <= len(gaps):
+            previous = self._table[-1]
+            self._table.append([ right if gaps[right] > gaps[left] else left for left, right in zip(previous, previous[span:]) ])
+            span *= 2
+
+    def LargestGap(self, first : int, last : int) -> int:
+        """
+        Get the index of the largest gap in the range [first, last), preferring the earliest if several are equal
+        """
+        if last <= first:
+            raise ValueError(f"Invalid gap range {first}-{last}")
+
+        level = (last - first).bit_length() - 1
+        left = self._table[level][first]
+        right = self._table[level][last - (1 << level)]
+        return right if self.gaps[right] > self.gaps[left] else left
+
+class BatchingDiff:
+    """
+    Changes made to the scenes and batches by incremental re-batching.
+
+    Batch keys combine the scene number after re-batching with the batch number before it.
+    """
+    def __init__(self):
+        self.removed_scenes : list[int] = []
+        self.renumbered_scenes : dict[int, int] = {}
+        self.removed_batches : list[tuple[int, int]] = []
+        self.added_batches : list[SubtitleBatch] = []
+        self.renumbered_batches : dict[tuple[int, int], int] = {}
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.removed_scenes or self.renumbered_scenes or self.removed_batches or self.added_batches or self.renumbered_batches)
+
+    def Extend(self, other : 'BatchingDiff') -> None:
+        """ Combine the changes from another diff into this one """
+        self.removed_scenes.extend(other.removed_scenes)
+        self.renumbered_scenes.update(other.renumbered_scenes)
+        self.removed_batches.extend(other.removed_batches)
+        self.added_batches.extend(other.added_batches)
+        self.renumbered_batches.update(other.renumbered_batches)
 
 class SubtitleBatcher:
+    # Relative weights of the costs minimised when balancing batches
+    request_cost : float = 1.0
+    imbalance_cost : float = 1.0
+    small_gap_cost : float = 1.0
+
+    # Limits for an automatically chosen scene threshold
+    min_auto_scene_threshold : timedelta = timedelta(seconds=5)
+    max_auto_scene_threshold : timedelta = timedelta(seconds=300)
+
+    # Overlapping lines are moved to start this long after the previous line ends
+    overlap_gap : timedelta = timedelta(milliseconds=10)
+
     def __init__(self, settings : SettingsType):
         """ Initialize a SubtitleBatcher helper class with settings """
         self.min_batch_size : int = settings.get_int('min_batch_size') or 1
         self.max_batch_size : int = settings.get_int('max_batch_size') or 100
+        self.balance_batches : bool = settings.get_bool('balance_batches', False)
+        self.auto_scene_threshold : bool = settings.get_bool('auto_scene_threshold', False)
 
         scene_threshold_seconds : float = settings.get_float('scene_threshold') or 30.0
         self.scene_threshold : timedelta = timedelta(seconds=scene_threshold_seconds)
@@ -17,80 +87,312 @@ class SubtitleBatcher:
         if self.min_batch_size > self.max_batch_size:
             raise ValueError("min_batch_size must be less than max_batch_size.")
 
+        if not lines:
+            return []
+
+        for line in lines:
+            self._validate_timing(line)
+
+        timings = SubtitleTimings(lines)
+
+        scene_threshold : timedelta = self.scene_threshold
+        if self.auto_scene_threshold:
+            scene_threshold = self._choose_scene_threshold(timings.Gaps())
+            logging.info(f"Using a scene threshold of {scene_threshold.total_seconds():.1f} seconds")
+
+        # Fix overlapping display times
+        if timings.FixOverlaps(self.overlap_gap):
+            timings.WriteBack()
+
+        gaps : list[int] = timings.Gaps()
+        scene_starts : list[int] = [ 0 ] + timings.FindGaps(scene_threshold)
+        scene_ends : list[int] = scene_starts[1:] + [ len(lines) ]
+
         scenes : list[SubtitleScene] = []
+        for scene_number, (first, last) in enumerate(zip(scene_starts, scene_ends), start=1):
+            scene_gaps = [ 0 ] + gaps[first + 1:last]
+            scenes.append(self._create_scene(scene_number, lines[first:last], scene_gaps))
+
+        return scenes
+
+    def StreamScenes(self, lines : Iterable[SubtitleLine]) -> Iterator[SubtitleScene]:
+        """
+        Divide a stream of lines into scenes and batches, yielding each scene as soon as a gap
+        larger than the scene threshold closes it. The batcher only holds on to the lines of the current scene,
+        so it is up to the caller whether the scenes are kept.
+
+        The scene threshold cannot be chosen automatically, because that requires all of the lines.
+        """
+        if self.min_batch_size > self.max_batch_size:
+            raise ValueError("min_batch_size must be less than max_batch_size.")
+
+        if self.auto_scene_threshold:
+            logging.warning(f"Automatic scene threshold is not supported when streaming, using {self.scene_threshold.total_seconds():.1f} seconds")
+
+        yield from self._generate_scenes(lines, self.scene_threshold)
+
+    def CreateNewScene(self, scenes : list[SubtitleScene], current_lines : list[SubtitleLine], gaps : list[int]|None = None):
+        """
+        Create a scene and lines to it in batches
+        """
+        scene = self._create_scene(len(scenes) + 1, current_lines, gaps)
+        scenes.append(scene)
+        return scene
+
+    def RebatchScene(self, scene : SubtitleScene, first_line_number : int, last_line_number : int) -> BatchingDiff:
+        """
+        Re-partition the batches of a scene that contain a range of edited lines, along with their neighbours
+        if a batch has become too small. Batches whose lines are unchanged are kept, with their translations.
+        """
+        diff = BatchingDiff()
+        batches : list[SubtitleBatch] = scene.batches
+        if not batches:
+            return diff
+
+        affected : list[int] = self._get_affected_batches(batches, first_line_number, last_line_number)
+        first, last = affected[0], affected[-1] + 1
+
+        if all(self._is_valid_batch(batch, len(batches)) for batch in batches[first:last]):
+            return diff
+
+        if any(batch.size < self.min_batch_size for batch in batches[first:last]):
+            first, last = max(first - 1, 0), min(last + 1, len(batches))
+
+        window : list[SubtitleBatch] = batches[first:last]
+        lines : list[SubtitleLine] = [ line for batch in window for line in batch.originals ]
+        ranges : list[tuple[int, int]] = []
+        if lines:
+            gaps = self._get_gaps(lines)
+            ranges = self._partition_lines(gaps) if self.balance_batches else self._split_lines(gaps)
+
+        existing : dict[tuple[int, ...], SubtitleBatch] = { tuple(line.number for line in batch.originals): batch for batch in window if batch.originals }
+        group_starts : list[int] = [ lines[group_first].number for group_first, group_last in ranges ]
+
+        new_batches : list[SubtitleBatch] = []
+        for group_first, group_last in ranges:
+            group : list[SubtitleLine] = lines[group_first:group_last]
+            batch : SubtitleBatch|None = existing.pop(tuple(line.number for line in group), None)
+            if batch is None:
+                line_numbers = set(line.number for line in group)
+                sources = [ source for source in window if any(line.number in line_numbers for line in source.originals) ]
+                batch = SubtitleBatch({
+                    'scene': scene.number,
+                    'originals': group,
+                    'translated': [],
+                    'summary': "\n".join(source.summary for source in sources if source.summary) or None
+                })
+                diff.added_batches.append(batch)
+
+            new_batches.append(batch)
+
+        # Assign translated lines from replaced batches to whichever new batch spans their line number
+        for source in window:
+            if source not in new_batches:
+                for line in source.translated:
+                    index = max(bisect.bisect_right(group_starts, line.number) - 1, 0)
+                    if new_batches and new_batches[index] in diff.added_batches:
+                        new_batches[index].translated.append(line)
+
+        diff.removed_batches = [ (scene.number, batch.number) for batch in window if batch not in new_batches ]
+
+        scene.batches = batches[:first] + new_batches + batches[last:]
+        for number, batch in enumerate(scene.batches, start=1):
+            if batch.number != number and batch not in diff.added_batches:
+                diff.renumbered_batches[(scene.number, batch.number)] = number
+            batch.scene = scene.number
+            batch.number = number
+
+        return diff
+
+    def ChooseSceneThreshold(self, lines : list[SubtitleLine]) -> timedelta:
+        """
+        Choose a scene threshold from the distribution of gaps between lines.
+
+        Gaps are roughly log-normal, so scene breaks are taken to be outliers on a log scale (beyond Q3 + 1.5 * IQR).
+        """
+        return self._choose_scene_threshold(SubtitleTimings(lines).Gaps())
+
+    def _choose_scene_threshold(self, line_gaps : list[int]) -> timedelta:
+        """
+        Choose a scene threshold from the gap before each line in milliseconds
+        """
+        gaps : list[float] = [ math.log(max(gap / 1000.0, 0.01)) for gap in line_gaps[1:] if gap > 0 ]
+
+        if len(gaps) < 4:
+            return self.scene_threshold
+
+        gaps.sort()
+        lower_quartile = gaps[len(gaps) // 4]
+        upper_quartile = gaps[(len(gaps) * 3) // 4]
+        fence = upper_quartile + 1.5 * (upper_quartile - lower_quartile)
+
+        threshold = timedelta(seconds=math.exp(fence))
+        return min(max(threshold, self.min_auto_scene_threshold), self.max_auto_scene_threshold)
+
+    def _generate_scenes(self, lines : Iterable[SubtitleLine], scene_threshold : timedelta) -> Iterator[SubtitleScene]:
+        """
+        Group lines into scenes at gaps larger than the threshold, fixing overlapping display times
+        """
+        scene_number : int = 0
         current_lines : list[SubtitleLine] = []
-        last_endtime : timedelta|None = None
+        current_gaps : list[int] = []
+        last_end : int|None = None
+        threshold : float = scene_threshold.total_seconds() * 1000.0
+        overlap_gap : int = self.overlap_gap // timedelta(milliseconds=1)
 
         for line in lines:
-            if line.start is None or line.end is None:
-                raise ValueError(f"Line {line.number} has missing start or end time.")
+            self._validate_timing(line)
 
             # Fix overlapping display times
-            if last_endtime and line.start < last_endtime:
-                line.start = last_endtime + timedelta(milliseconds=10)
+            if last_end and line.start_ms < last_end:
+                line.start_ms = last_end + overlap_gap
 
-            gap = line.start - last_endtime if last_endtime is not None else None
+            gap = line.start_ms - last_end if last_end is not None else None
 
-            if gap is not None and gap > self.scene_threshold:
+            if gap is not None and gap > threshold:
                 if current_lines:
-                    self.CreateNewScene(scenes, current_lines)
+                    scene_number += 1
+                    yield self._create_scene(scene_number, current_lines, current_gaps)
                     current_lines = []
+                    current_gaps = []
 
             current_lines.append(line)
-            last_endtime = line.end
+            current_gaps.append(gap if gap is not None and current_gaps else 0)
+            last_end = line.end_ms
 
         # Handle any remaining lines
         if current_lines:
-            self.CreateNewScene(scenes, current_lines)
+            yield self._create_scene(scene_number + 1, current_lines, current_gaps)
 
-        return scenes
+    def _validate_timing(self, line : SubtitleLine) -> None:
+        """
+        Lines without a start or end time cannot be placed in a scene
+        """
+        if not line.has_timing:
+            raise ValueError(f"Line {line.number} has missing start or end time.")
 
-    def CreateNewScene(self, scenes : list[SubtitleScene], current_lines : list[SubtitleLine]):
+    def _create_scene(self, scene_number : int, lines : list[SubtitleLine], gaps : list[int]|None = None) -> SubtitleScene:
         """
-        Create a scene and lines to it in batches
+        Create a numbered scene and divide its lines into batches
         """
-        scene = SubtitleScene()
-        scenes.append(scene)
-        scene.number = len(scenes)
+        scene = SubtitleScene({ 'number': scene_number })
+
+        if gaps is None:
+            gaps = self._get_gaps(lines)
 
-        split_lines : list[list[SubtitleLine]] = self._split_lines(current_lines)
+        ranges = self._partition_lines(gaps) if self.balance_batches else self._split_lines(gaps)
 
-        for lines in split_lines:
+        for first, last in ranges:
             batch : SubtitleBatch = scene.AddNewBatch()
-            batch._originals = lines
+            batch._originals = lines[first:last]
 
         return scene
 
-    def _split_lines(self, lines : list[SubtitleLine]) -> list[list[SubtitleLine]]:
+    def _split_lines(self, gaps : list[int]) -> list[tuple[int, int]]:
         """
-        Recursively divide the lines at the largest gap until there is no batch larger than the maximum batch size
+        Divide the lines at the largest gap until there is no batch larger than the maximum batch size.
+
+        Takes the gap before each line (in milliseconds) and returns the [first, last) index range of each batch.
+        """
+        if len(gaps) <= self.max_batch_size:
+            return [ (0, len(gaps)) ]
+
+        gap_index = GapIndex(gaps)
+        ranges : list[tuple[int, int]] = []
+        stack : list[tuple[int, int]] = [ (0, len(gaps)) ]
+
+        while stack:
+            first, last = stack.pop()
+
+            # If the batch is small enough, we're done
+            if last - first <= self.max_batch_size:
+                ranges.append((first, last))
+                continue
+
+            # Find the longest gap starting from the min_batch_size index
+            split_index : int = first + self.min_batch_size
+            last_split_index : int = last - self.min_batch_size
+
+            if last_split_index > split_index:
+                longest_gap_index = gap_index.LargestGap(split_index, last_split_index)
+                if gaps[longest_gap_index] > 0:
+                    split_index = longest_gap_index
+
+            # Split the batch into two, processing the left half first
+            stack.append((split_index, last))
+            stack.append((first, split_index))
+
+        return ranges
+
+    def _partition_lines(self, gaps : list[int]) -> list[tuple[int, int]]:
+        """
+        Divide the lines into batches using dynamic programming to minimise the combined cost of
+        the number of requests, the deviation of each batch from the ideal size and cutting at small gaps.
+
+        Takes the gap before each line (in milliseconds) and returns the [first, last) index range of each batch.
         """
-        # If the batch is small enough, we're done
-        if len(lines) <= self.max_batch_size:
-            return [ lines ]
+        count = len(gaps)
+        if count <= self.max_batch_size:
+            return [ (0, count) ]
 
-        # Find the longest gap starting from the min_batch_size index
-        longest_gap : timedelta = timedelta(seconds=0)
-        split_index : int = self.min_batch_size
-        last_split_index : int = len(lines) - self.min_batch_size
+        target_size : float = count / math.ceil(count / self.max_batch_size)
+        largest_gap : int = max(max(gaps[1:]), 1)
 
-        if last_split_index > split_index:
-            for i in range(split_index, last_split_index):
-                if lines[i].start is None:
-                    raise ValueError(f"Line {lines[i].number} has no start time.")
+        # Cost of a batch of each permitted size, independent of where it is placed
+        size_cost : list[float] = [ math.inf ] * (self.max_batch_size + 1)
+        for size in range(self.min_batch_size, self.max_batch_size + 1):
+            deviation = (size - target_size) / target_size
+            size_cost[size] = self.request_cost + self.imbalance_cost * deviation * deviation
 
-                if lines[i - 1].end is None:
-                    raise ValueError(f"Line {lines[i - 1].number} has no end time.")
+        best_cost : list[float] = [ math.inf ] * (count + 1)
+        best_start : list[int] = [ -1 ] * (count + 1)
+        best_cost[0] = 0.0
 
-                gap : timedelta = lines[i].start - lines[i - 1].end
-                if gap > longest_gap:
-                    longest_gap = gap
-                    split_index = i
+        for last in range(self.min_batch_size, count + 1):
+            candidates = range(max(0, last - self.max_batch_size), last - self.min_batch_size + 1)
+            first = min(candidates, key=lambda first: best_cost[first] + size_cost[last - first])
+            cost = best_cost[first] + size_cost[last - first]
+            if cost == math.inf:
+                continue
 
-        # Split the batch into two
-        left = lines[:split_index]
-        right = lines[split_index:]
+            cut_cost = self.small_gap_cost * (1.0 - max(gaps[last], 0) / largest_gap) if last < count else 0.0
+            best_cost[last] = cost + cut_cost
+            best_start[last] = first
 
-        # Recursively split the batches and concatenate the lists
-        return self._split_lines(left) + self._split_lines(right)
+        if best_cost[count] == math.inf:
+            logging.debug(f"Unable to partition {count} lines into batches of {self.min_batch_size}-{self.max_batch_size} lines, splitting at the largest gaps")
+            return self._split_lines(gaps)
 
+        ranges : list[tuple[int, int]] = []
+        last = count
+        while last > 0:
+            first = best_start[last]
+            ranges.append((first, last))
+            last = first
+
+        ranges.reverse()
+        return ranges
+
+    def _get_affected_batches(self, batches : list[SubtitleBatch], first_line_number : int, last_line_number : int) -> list[int]:
+        """
+        Get the indices of batches that overlap a range of line numbers or are empty,
+        or the batches either side of the range if it falls between them (e.g. after lines were deleted)
+        """
+        affected = [ i for i, batch in enumerate(batches) if not batch.originals or (batch.originals[0].number <= last_line_number and batch.originals[-1].number >= first_line_number) ]
+        if affected:
+            return affected
+
+        following = next((i for i, batch in enumerate(batches) if batch.originals[0].number > last_line_number), len(batches))
+        return [ i for i in (following - 1, following) if 0 <= i < len(batches) ]
+
+    def _is_valid_batch(self, batch : SubtitleBatch, batch_count : int) -> bool:
+        """
+        Check whether a batch satisfies the size limits (a scene with a single batch may be smaller than the minimum)
+        """
+        return 0 < batch.size <= self.max_batch_size and (batch.size >= self.min_batch_size or batch_count == 1)
+
+    def _get_gaps(self, lines : list[SubtitleLine]) -> list[int]:
+        """
+        Calculate the gap before each line in milliseconds (the first line has no gap)
+        """
+        return SubtitleTimings(lines).Gaps()
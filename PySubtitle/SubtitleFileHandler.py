@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterator, TextIO
+from typing import Any, Iterable, Iterator, TextIO
 from PySubtitle.SubtitleLine import SubtitleLine
 
 class SubtitleFileHandler(ABC):
@@ -7,7 +7,12 @@ class SubtitleFileHandler(ABC):
     Abstract interface for reading and writing subtitle files.
     Implementations handle format-specific operations while business logic
     remains format-agnostic.
+
+    Information about the file that does not belong to any line, such as a header, is
+    recorded in metadata when the file is parsed and used when lines are composed.
     """
+    def __init__(self, metadata: dict[str, Any]|None = None):
+        self.metadata : dict[str, Any] = metadata or {}
     
     @abstractmethod
     def parse_file(self, file_obj: TextIO) -> Iterator[SubtitleLine]:
@@ -54,7 +59,60 @@ class SubtitleFileHandler(ABC):
             str: Formatted subtitle content
         """
         pass
-    
+
+    def write_lines(self, lines: Iterable[SubtitleLine], file_obj: TextIO, reindex: bool = True) -> None:
+        """
+        Write subtitle lines to a file. Handlers can override this to write each line
+        as it is composed rather than composing the whole file first.
+        
+        Args:
+            lines: Subtitle lines to write
+            file_obj: Open file object to write to
+            reindex: Whether to renumber lines sequentially
+        """
+        file_obj.write(self.compose_lines(list(lines), reindex))
+
+    def compose_header(self) -> str:
+        """
+        Compose the text that comes before the subtitle lines in a file, if the format has a header.
+        Composed files always start with the header.
+        
+        Returns:
+            str: The header, or an empty string
+        """
+        return ''
+
+    def compose_footer(self) -> str:
+        """
+        Compose the text that comes after the subtitle lines in a file, if the format has one.
+        Composed files always end with the footer.
+        
+        Returns:
+            str: The footer, or an empty string
+        """
+        return ''
+
+    def get_project_metadata(self) -> dict[str, Any]:
+        """
+        Get the metadata to record in a project, so that files can be written in the same format.
+        Handlers can leave out items that are too large to keep in the project, listing their keys
+        in 'source_metadata' so that they are read from the source file again when they are needed.
+
+        Returns:
+            dict: Metadata to record in the project settings
+        """
+        return self.metadata
+
+    def get_output_newline(self) -> str|None:
+        """
+        Get the newline argument to open files with when writing them in this format.
+        Handlers that write the line endings of the source file return '' so that they are not translated again.
+
+        Returns:
+            str|None: None to use the platform's line endings, or the newline argument for open
+        """
+        return None
+
     @abstractmethod
     def get_file_extensions(self) -> list[str]:
         """
@@ -63,4 +121,16 @@ class SubtitleFileHandler(ABC):
         Returns:
             list[str]: List of file extensions (e.g., ['.srt'])
         """
-        pass
\ No newline at end of file
+        pass
+
+    def detect_content(self, sample: str) -> bool:
+        """
+        Check whether a sample from the start of a file looks like this format.
+        
+        Args:
+            sample: Text from the start of the file
+            
+        Returns:
+            bool: True if the sample is in this format
+        """
+        return False
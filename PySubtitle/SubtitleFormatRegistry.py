@@ -0,0 +1,90 @@
+import os
+from typing import Any
+
+from PySubtitle.Formats.AssFileHandler import AssFileHandler
+from PySubtitle.Formats.SrtFileHandler import SrtFileHandler
+from PySubtitle.Formats.VttFileHandler import VttFileHandler
+from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
+
+# Number of characters read from the start of a file to detect its format
+detection_sample_size = 4096
+
+class SubtitleFormatRegistry:
+    """
+    Finds the file handler for a subtitle format by file extension, or by the content of the file if the extension is not recognised
+    """
+    _handlers : list[type[SubtitleFileHandler]] = []
+    _extensions : dict[str, type[SubtitleFileHandler]] = {}
+
+    default_handler : type[SubtitleFileHandler] = SrtFileHandler
+
+    @classmethod
+    def Register(cls, handler_class : type[SubtitleFileHandler]):
+        """
+        Register a handler for the file extensions it supports
+        """
+        if handler_class not in cls._handlers:
+            cls._handlers.append(handler_class)
+
+        for extension in handler_class().get_file_extensions():
+            cls._extensions[extension.lower()] = handler_class
+
+    @classmethod
+    def GetHandlerClass(cls, filepath : str|None) -> type[SubtitleFileHandler]|None:
+        """
+        Get the handler for a file extension, or None if it is not a known subtitle format
+        """
+        if not filepath:
+            return None
+
+        return cls.GetExtensionHandlerClass(os.path.splitext(filepath)[1])
+
+    @classmethod
+    def GetExtensionHandlerClass(cls, extension : str|None) -> type[SubtitleFileHandler]|None:
+        """
+        Get the handler for a file extension such as ".srt", or None if it is not a known subtitle format
+        """
+        return cls._extensions.get(extension.lower()) if extension else None
+
+    @classmethod
+    def DetectHandlerClass(cls, sample : str) -> type[SubtitleFileHandler]|None:
+        """
+        Get the handler for a format recognised from a sample of the start of a file
+        """
+        for handler_class in cls._handlers:
+            if handler_class().detect_content(sample):
+                return handler_class
+        return None
+
+    @classmethod
+    def CreateHandler(cls, filepath : str|None = None, sample : str|None = None, default : type[SubtitleFileHandler]|None = None, metadata : dict[str, Any]|None = None) -> SubtitleFileHandler:
+        """
+        Create a handler for a file, by its extension or a sample of its content, otherwise the default format (SRT unless specified)
+        """
+        handler_class = cls.GetHandlerClass(filepath)
+        if handler_class is None and sample:
+            handler_class = cls.DetectHandlerClass(sample)
+
+        return (handler_class or default or cls.default_handler)(metadata)
+
+    @classmethod
+    def CreateHandlerForFile(cls, filepath : str, encoding : str = 'utf-8') -> SubtitleFileHandler:
+        """
+        Create a handler for an existing file, reading the start of the file if the extension is not recognised
+        """
+        sample = None
+        if cls.GetHandlerClass(filepath) is None and os.path.exists(filepath):
+            with open(filepath, 'r', encoding=encoding, errors='replace') as f:
+                sample = f.read(detection_sample_size)
+
+        return cls.CreateHandler(filepath, sample)
+
+    @classmethod
+    def ListExtensions(cls) -> list[str]:
+        """
+        Get the file extensions of all supported subtitle formats
+        """
+        return list(cls._extensions.keys())
+
+for handler in [ SrtFileHandler, VttFileHandler, AssFileHandler ]:
+    SubtitleFormatRegistry.Register(handler)
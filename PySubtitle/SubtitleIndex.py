@@ -0,0 +1,59 @@
+import bisect
+
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleScene import SubtitleScene
+
+class SubtitleIndex:
+    """
+    Lookup tables for the scenes, batches and lines of a set of subtitles.
+
+    The index is a snapshot - it is discarded whenever the subtitles are restructured and rebuilt on demand,
+    so results should be checked (e.g. that the number still matches) before they are trusted.
+    """
+    def __init__(self, scenes : list[SubtitleScene], originals : list[SubtitleLine]|None, translated : list[SubtitleLine]|None):
+        self.scenes : dict[int, SubtitleScene] = {}
+        self.batches : dict[tuple[int, int], SubtitleBatch] = {}
+        self.originals : dict[int, SubtitleLine] = {}
+        self.translated : dict[int, SubtitleLine] = {}
+        self.has_duplicate_scenes : bool = False
+
+        # Non-empty batches in line order, with the first line number of each for bisection
+        self._line_batches : list[SubtitleBatch] = []
+        self._batch_first_lines : list[int] = []
+
+        for scene in scenes:
+            if scene.number in self.scenes:
+                self.has_duplicate_scenes = True
+            self.scenes.setdefault(scene.number, scene)
+
+            for batch in scene.batches:
+                self.batches.setdefault((scene.number, batch.number), batch)
+                if batch.originals:
+                    self._line_batches.append(batch)
+                    self._batch_first_lines.append(batch.originals[0].number)
+
+        if any(first > second for first, second in zip(self._batch_first_lines, self._batch_first_lines[1:])):
+            # Batches are out of order, so lines cannot be found by bisection
+            self._line_batches = []
+            self._batch_first_lines = []
+
+        for line in originals or []:
+            self.originals.setdefault(line.number, line)
+
+        for line in translated or []:
+            self.translated.setdefault(line.number, line)
+
+    def FindBatch(self, line_number : int) -> SubtitleBatch|None:
+        """
+        Find the batch whose range of line numbers includes the line number, if there is one
+        """
+        index = bisect.bisect_right(self._batch_first_lines, line_number) - 1
+        if index < 0:
+            return None
+
+        batch = self._line_batches[index]
+        if batch.last_line_number is None or batch.last_line_number < line_number:
+            return None
+
+        return batch
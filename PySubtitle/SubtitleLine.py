@@ -3,12 +3,13 @@ from copy import deepcopy
 from datetime import timedelta
 import logging
 from os import linesep
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 import regex
 
 from PySubtitle.Helpers.Localization import _
 from PySubtitle.SubtitleError import SubtitleError
-from PySubtitle.Helpers.Time import GetTimeDelta, GetTimeDeltaSafe, TimedeltaToSrtTimestamp, TimedeltaToText
+from PySubtitle.Helpers.Time import GetTimeDelta, GetTimeDeltaSafe, TimedeltaToMilliseconds, TimedeltaToSrtTimestamp, TimedeltaToText
 
 # Global regex pattern for SRT parsing (compiled once for performance)
 SRT_PATTERN = regex.compile(
@@ -18,33 +19,39 @@ SRT_PATTERN = regex.compile(
     regex.DOTALL
 )
 
+# Shared by all lines that have no metadata, so that they do not each need their own dictionary
+EMPTY_METADATA : Mapping[str, Any] = MappingProxyType({})
+
 class SubtitleLine:
     """
     Represents a single subtitle line with timing, content, and metadata.
     This is the internal representation used throughout the application.
+
+    Lines are slotted and store their timings as integer milliseconds to keep large projects compact,
+    with start, end and duration exposed as timedeltas on demand.
     """
+    __slots__ = ('_index', '_start_ms', '_end_ms', 'content', '_metadata', 'translation', 'original')
+
     def __init__(self, line : SubtitleLine|str|dict|None = None, translation : str|None = None, original : str|None = None):
         # Core subtitle properties 
         self._index: int|None = None
-        self._start: timedelta|None = None
-        self._end: timedelta|None = None
+        self._start_ms: int|None = None
+        self._end_ms: int|None = None
         self.content: str|None = None
-        self.metadata: dict[str, Any] = {}
+        self._metadata: dict[str, Any]|None = None
         
         # Additional properties
         self.translation : str|None = translation
         self.original : str|None = original
-        self._duration : timedelta|None = None
 
         if isinstance(line, SubtitleLine):
             self._index = line._index
-            self._start = line._start
-            self._end = line._end
+            self._start_ms = line._start_ms
+            self._end_ms = line._end_ms
             self.content = line.text
-            self._duration = line._duration
             self.original = original if original is not None else line.original
             self.translation = translation if translation is not None else line.translation
-            self.metadata = line.metadata.copy()
+            self._metadata = line._metadata.copy() if line._metadata else None
 
         elif isinstance(line, dict):
             if 'line' in line:
@@ -55,11 +62,12 @@ class SubtitleLine:
                 self._index = int(line.get('index') or line.get('number') or 0)
                 start_time = line.get('start')
                 end_time = line.get('end')
-                self._start = GetTimeDeltaSafe(start_time)
-                self._end = GetTimeDeltaSafe(end_time)
+                self._start_ms = TimedeltaToMilliseconds(GetTimeDeltaSafe(start_time))
+                self._end_ms = TimedeltaToMilliseconds(GetTimeDeltaSafe(end_time))
                 self.text = line.get('content') or line.get('text') or line.get('body')
 
-            self.metadata = deepcopy(line.get('metadata', {}))
+            metadata = line.get('metadata')
+            self._metadata = deepcopy(metadata) if metadata else None
             
             # Override with provided translation/original if specified
             self.translation = translation if translation is not None else line.get('translation')
@@ -70,7 +78,7 @@ class SubtitleLine:
             self._parse_from_string(str(line))
 
     def __str__(self) -> str:
-        return f"{self.number}:{self.srt_start}-->{self.srt_end}: {self.text}" if self._start is not None and self._end is not None else "Invalid SubtitleLine"
+        return f"{self.number}:{self.srt_start}-->{self.srt_end}: {self.text}" if self._start_ms is not None and self._end_ms is not None else "Invalid SubtitleLine"
 
     def __repr__(self) -> str:
         return f"[Line {self.number}] {TimedeltaToText(self.start)}, {repr(self.text)}"
@@ -87,22 +95,44 @@ class SubtitleLine:
         """Create a copy of this subtitle line."""
         new_line = SubtitleLine()
         new_line._index = self._index
-        new_line._start = self._start
-        new_line._end = self._end
+        new_line._start_ms = self._start_ms
+        new_line._end_ms = self._end_ms
         new_line.content = self.content
         new_line.translation = self.translation
         new_line.original = self.original
-        new_line._duration = self._duration
-        new_line.metadata = deepcopy(self.metadata)
+        new_line._metadata = deepcopy(self._metadata) if self._metadata else None
         return new_line
 
     @property
     def start(self) -> timedelta:
-        return self._start or timedelta(seconds=0)
+        return timedelta(milliseconds=self._start_ms) if self._start_ms else timedelta(seconds=0)
 
     @property
     def end(self) -> timedelta:
-        return self._end or timedelta(seconds=0)
+        return timedelta(milliseconds=self._end_ms) if self._end_ms else timedelta(seconds=0)
+
+    @property
+    def start_ms(self) -> int:
+        return self._start_ms or 0
+
+    @property
+    def end_ms(self) -> int:
+        return self._end_ms or 0
+
+    @property
+    def has_timing(self) -> bool:
+        return self._start_ms is not None and self._end_ms is not None
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self._start_ms if self._start_ms is not None and self._end_ms else 0
+
+    @property
+    def metadata(self) -> Mapping[str, Any]:
+        """
+        Metadata for the line - lines without metadata share a read-only empty mapping
+        """
+        return self._metadata or EMPTY_METADATA
 
     @property
     def key(self) -> int|str:
@@ -138,9 +168,7 @@ class SubtitleLine:
 
     @property
     def duration(self) -> timedelta:
-        if not self._duration:
-            self._duration = self.end - self.start if self._start is not None and self.end else timedelta(seconds=0)
-        return self._duration
+        return timedelta(milliseconds=self.duration_ms)
 
     @property
     def txt_duration(self) -> str:
@@ -168,8 +196,7 @@ class SubtitleLine:
         if isinstance(new_time, Exception):
             raise SubtitleError(f"Invalid start time: {time}", error=new_time)
 
-        self._start = new_time
-        self._duration = None
+        self._start_ms = TimedeltaToMilliseconds(new_time)
 
     @end.setter
     def end(self, time : timedelta|str):
@@ -179,8 +206,15 @@ class SubtitleLine:
         if isinstance(new_time, Exception):
             raise SubtitleError(f"Invalid end time: {time}", error=new_time)
 
-        self._end = new_time
-        self._duration = None
+        self._end_ms = TimedeltaToMilliseconds(new_time)
+
+    @start_ms.setter
+    def start_ms(self, milliseconds : int|None):
+        self._start_ms = int(milliseconds) if milliseconds is not None else None
+
+    @end_ms.setter
+    def end_ms(self, milliseconds : int|None):
+        self._end_ms = int(milliseconds) if milliseconds is not None else None
 
     @duration.setter
     def duration(self, duration : timedelta|str):
@@ -189,9 +223,12 @@ class SubtitleLine:
         if isinstance(tdelta, Exception):
             raise SubtitleError(f"Invalid duration", error=tdelta)
 
-        self._duration = tdelta or timedelta(seconds=0)
-        if self._start is not None:
-            self._end = self._start + self._duration
+        if self._start_ms is not None:
+            self._end_ms = TimedeltaToMilliseconds(self.start + (tdelta or timedelta(seconds=0)))
+
+    @metadata.setter
+    def metadata(self, metadata : Mapping[str, Any]|None):
+        self._metadata = dict(metadata) if metadata else None
 
     @translated.setter
     def translated(self, translated : SubtitleLine|str|None):
@@ -214,8 +251,8 @@ class SubtitleLine:
         except ValueError as e:
             raise SubtitleError(_("Invalid subtitle line index: {}").format(match.group('index')), error=e)
         
-        self._start = GetTimeDeltaSafe(match.group('start'))
-        self._end = GetTimeDeltaSafe(match.group('end'))
+        self._start_ms = TimedeltaToMilliseconds(GetTimeDeltaSafe(match.group('start')))
+        self._end_ms = TimedeltaToMilliseconds(GetTimeDeltaSafe(match.group('end')))
             
         self.content = match.group('content').strip()
 
@@ -238,7 +275,23 @@ class SubtitleLine:
         line.start = t_start or timedelta(seconds=0)
         line.end = t_end or timedelta(seconds=0)
         line.text = legal_text
-        line.metadata = metadata or {}
+        line.metadata = metadata
+        return line
+
+    @classmethod
+    def FromFields(cls, index : int|None, start_ms : int|None, end_ms : int|None, content : str|None, metadata : dict[str,Any]|None = None, translation : str|None = None, original : str|None = None) -> SubtitleLine:
+        """
+        Construct a line directly from stored field values, without parsing or validation.
+        The line takes ownership of the metadata dictionary.
+        """
+        line = cls.__new__(cls)
+        line._index = index
+        line._start_ms = start_ms
+        line._end_ms = end_ms
+        line.content = content
+        line._metadata = metadata or None
+        line.translation = translation
+        line.original = original
         return line
 
     @classmethod
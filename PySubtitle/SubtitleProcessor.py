@@ -1,11 +1,18 @@
 import logging
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 import regex
 from datetime import timedelta
 
 from PySubtitle.Helpers.Subtitles import FindSplitPoint, GetProportionalDuration
 from PySubtitle.Helpers.Text import (
+    common_punctuation,
     dialog_marker,
+    emdash,
     split_sequences,
     break_sequences,
     sentence_end_punctuation,
@@ -22,6 +29,17 @@ from PySubtitle.Helpers.Text import (
 from PySubtitle.Options import SettingsType
 from PySubtitle.SettingsType import SettingsType
 from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleTimings import SubtitleTimings
+from PySubtitle.TextPipeline import TextPipeline
+
+# Characters that must be present for filler words to be matched, as they must be followed by punctuation
+_filler_punctuation = common_punctuation.strip('[]')
+
+# Set if worker processes could not be started, e.g. because the main module re-runs the program when it is imported
+_process_pools_broken : bool = False
+
+# Processors created in a worker process, by their settings
+_worker_processors : dict[str, 'SubtitleProcessor'] = {}
 
 class SubtitleProcessor:
     """
@@ -33,7 +51,8 @@ class SubtitleProcessor:
         # Convert plain dict to SettingsType if needed for typed access
         if isinstance(settings, dict) and not isinstance(settings, SettingsType):
             settings = SettingsType(settings)
-            
+
+        self.settings : SettingsType = settings
         self.dialog_marker = dialog_marker
         self.split_sequences = split_sequences
         self.break_sequences = break_sequences
@@ -72,6 +91,28 @@ class SubtitleProcessor:
 
         self.split_by_duration: bool = self.max_line_duration.total_seconds() > 0.0
 
+        # Large sets of lines can be processed in chunks by a pool of worker processes
+        self.processing_workers : int = settings.get_int('processing_workers') or 1
+        self.min_chunk_size : int = settings.get_int('processing_chunk_size') or 250
+
+        # Worker processes are started the first time they are needed and stopped when the processor is closed or discarded
+        self._process_pool : ProcessPoolExecutor|None = None
+        self._process_pool_finalizer : weakref.finalize|None = None
+        self._process_pool_lock = threading.Lock()
+
+        self.preprocess_pipeline : TextPipeline = self._build_preprocess_pipeline()
+        self.postprocess_pipeline : TextPipeline = self._build_postprocess_pipeline()
+
+    def Close(self) -> None:
+        """
+        Stop any worker processes started by the processor. A new pool is started if the processor is used again.
+        """
+        with self._process_pool_lock:
+            if self._process_pool_finalizer:
+                self._process_pool_finalizer()
+            self._process_pool = None
+            self._process_pool_finalizer = None
+
     def PreprocessSubtitles(self, lines : list[SubtitleLine]) -> list[SubtitleLine]:
         """
         Pre-process subtitles to make them suitable for translation.
@@ -81,34 +122,25 @@ class SubtitleProcessor:
         if not lines:
             return []
 
-        processed : list[SubtitleLine] = []
         line_number : int = lines[0].number
 
         if self.merge_line_duration.total_seconds() > 0.0:
             lines = self._merge_short_lines(lines, self.merge_line_duration)
 
-        for line in lines:
-            line.number = line_number
-            self._preprocess_line(line)
-            if not line.text:
-                continue
-
-            needs_split : bool = self.split_by_duration and line.duration > self.max_line_duration
+        long_lines : set[int] = set(SubtitleTimings(lines).FilterByDuration(longer_than=self.max_line_duration)) if self.split_by_duration else set()
+        needs_split : list[bool] = [ index in long_lines for index in range(len(lines)) ]
 
-            if needs_split:
-                split_lines = self._split_line_by_duration(line)
+        results = self._map_chunks(_preprocess_chunk, lines, needs_split) if self._use_process_pool(lines) else None
+        if results is None:
+            results = [ self._preprocess_and_split(line, split) for line, split in zip(lines, needs_split) ]
 
-                processed.extend(split_lines)
-                line_number += len(split_lines)
-
-                if len(split_lines) > 1:
-                    new_line_text = ''.join([str(l) for l in split_lines])
-                    logging.debug(f"Split line {line.number} into {len(split_lines)} parts:\n{str(line)}-->\n{new_line_text}")
-                else:
-                    logging.debug(f"Failed to split line {line.number}:\n{str(line)}")
-            else:
-                processed.append(line)
+        # Number the lines in order, as each line may have been split into several or removed
+        processed : list[SubtitleLine] = []
+        for result in results:
+            for line in result:
+                line.number = line_number
                 line_number += 1
+            processed.extend(result)
 
         return processed
 
@@ -119,18 +151,44 @@ class SubtitleProcessor:
         if not lines:
             return []
 
-        processed : list[SubtitleLine] = []
+        results = self._map_chunks(_postprocess_chunk, lines) if self._use_process_pool(lines) else None
+        if results is None:
+            results = [ self._postprocess_line(line) for line in lines ]
 
-        for line in lines:
-            processed_line = self._postprocess_line(line)
-            if processed_line:
-                processed.append(processed_line)
+        processed : list[SubtitleLine] = [ line for line in results if line ]
 
         # TODO: fix minimum durations
         # TODO: fix overlapping start/end times (or merge the lines?)
 
         return processed
 
+    def GetTimings(self) -> dict[str, dict[str, dict[str, float|int]]]:
+        """
+        Get the time spent in each step of pre-processing and post-processing
+        """
+        return { 'preprocess': self.preprocess_pipeline.GetTimings(), 'postprocess': self.postprocess_pipeline.GetTimings() }
+
+    def _preprocess_and_split(self, line : SubtitleLine, needs_split : bool) -> list[SubtitleLine]:
+        """
+        Pre-process a line and split it by duration if it is too long, returning no lines if it is empty
+        """
+        self._preprocess_line(line)
+        if not line.text:
+            return []
+
+        if not needs_split:
+            return [ line ]
+
+        split_lines = self._split_line_by_duration(line)
+
+        if len(split_lines) > 1:
+            new_line_text = ''.join([str(l) for l in split_lines])
+            logging.debug(f"Split line {line.number} into {len(split_lines)} parts:\n{str(line)}-->\n{new_line_text}")
+        else:
+            logging.debug(f"Failed to split line {line.number}:\n{str(line)}")
+
+        return split_lines
+
     def _preprocess_line(self, line : SubtitleLine):
         """
         Split dialogs onto separate lines.
@@ -140,69 +198,97 @@ class SubtitleProcessor:
         if not text:
             return
 
+        text = self.preprocess_pipeline.Apply(text)
+
+        if text != line.text:
+            logging.debug(f"Preprocessed line {line.number}:\n{line.text}\n-->\n{text}")
+            line.text = text
+
+    def _postprocess_line(self, line : SubtitleLine):
+        """
+        Split dialogs onto separate lines.
+        Normalise dialog markers.
+        Add line breaks to long lines.
+        """
+        text = line.text.strip() if line.text else ""
+
+        if not text:
+            return line
+
+        text = self.postprocess_pipeline.Apply(text)
+
+        if text == line.text:
+            return line
+
+        logging.debug(f"Postprocessed line {line.number}:\n{line.text}\n-->\n{text}")
+        processed_line = SubtitleLine.Construct(line.number, line.start, line.end, text)
+        return processed_line
+
+    def _build_preprocess_pipeline(self) -> TextPipeline:
+        """
+        Build the enabled pre-processing steps into a pipeline, in the order they are applied
+        """
+        pipeline = TextPipeline()
+        marker = self.dialog_marker
+
         # Convert whitespace blocks to newlines
         if self.convert_whitespace_to_linebreak:
-            text = ConvertWhitespaceBlocksToNewlines(text)
+            pipeline.Add('whitespace_to_newline', ConvertWhitespaceBlocksToNewlines, lambda text: '\n' not in text and ('   ' in text or '，' in text))
 
         # Convert wide dashes to standard dashes
         if self.convert_wide_dashes:
-            text = ConvertWideDashesToStandardDashes(text)
+            pipeline.Add('convert_wide_dashes', ConvertWideDashesToStandardDashes, lambda text: emdash in text)
 
         # Ensure full-width punctuation is used in Asian languages
         if self.full_width_punctuation:
-            text = EnsureFullWidthPunctuation(text)
+            pipeline.Add('full_width_punctuation', EnsureFullWidthPunctuation, lambda text: not text.isascii())
 
         # Remove filler words
-        if self.remove_filler_words and self.filler_words_pattern:
-            text = RemoveFillerWords(text, self.filler_words_pattern)
+        filler_words_pattern = self.filler_words_pattern
+        if self.remove_filler_words and filler_words_pattern:
+            pipeline.Add('remove_filler_words', lambda text: RemoveFillerWords(text, filler_words_pattern), _has_filler_punctuation)
 
         # If the subtitle is a single line, see if it should have line breaks added
-        if self.break_dialog_on_one_line and self.split_dialog_pattern:
-            text = BreakDialogOnOneLine(text, self.split_dialog_pattern)
+        split_dialog_pattern = self.split_dialog_pattern
+        if self.break_dialog_on_one_line and split_dialog_pattern:
+            pipeline.Add('break_dialog_on_one_line', lambda text: BreakDialogOnOneLine(text, split_dialog_pattern), lambda text: marker in text)
 
         # If the subtitle has multiple lines, make sure dialog markers match
         if self.normalise_dialog_tags:
-            text = NormaliseDialogTags(text, self.dialog_marker)
+            pipeline.Add('normalise_dialog_tags', lambda text: NormaliseDialogTags(text, marker), lambda text: marker in text)
 
-        if text != line.text:
-            logging.debug(f"Preprocessed line {line.number}:\n{line.text}\n-->\n{text}")
-            line.text = text
+        return pipeline
 
-    def _postprocess_line(self, line : SubtitleLine):
+    def _build_postprocess_pipeline(self) -> TextPipeline:
         """
-        Split dialogs onto separate lines.
-        Normalise dialog markers.
-        Add line breaks to long lines.
+        Build the enabled post-processing steps into a pipeline, in the order they are applied
         """
-        text = line.text.strip() if line.text else ""
-
-        if not text:
-            return line
+        pipeline = TextPipeline()
+        marker = self.dialog_marker
 
-        if self.remove_filler_words and self.filler_words_pattern:
-            text = RemoveFillerWords(text, self.filler_words_pattern)
+        filler_words_pattern = self.filler_words_pattern
+        if self.remove_filler_words and filler_words_pattern:
+            pipeline.Add('remove_filler_words', lambda text: RemoveFillerWords(text, filler_words_pattern), _has_filler_punctuation)
 
         if self.convert_wide_dashes:
-            text = ConvertWideDashesToStandardDashes(text)
+            pipeline.Add('convert_wide_dashes', ConvertWideDashesToStandardDashes, lambda text: emdash in text)
 
-        if self.break_dialog_on_one_line and self.split_dialog_pattern:
-            text = BreakDialogOnOneLine(text, self.split_dialog_pattern)
+        split_dialog_pattern = self.split_dialog_pattern
+        if self.break_dialog_on_one_line and split_dialog_pattern:
+            pipeline.Add('break_dialog_on_one_line', lambda text: BreakDialogOnOneLine(text, split_dialog_pattern), lambda text: marker in text)
 
         if self.normalise_dialog_tags:
-            text = NormaliseDialogTags(text, self.dialog_marker)
+            pipeline.Add('normalise_dialog_tags', lambda text: NormaliseDialogTags(text, marker), lambda text: marker in text)
 
         if self.full_width_punctuation:
-            text = EnsureFullWidthPunctuation(text)
+            pipeline.Add('full_width_punctuation', EnsureFullWidthPunctuation, lambda text: not text.isascii())
 
         if self.break_long_lines:
-            text = self._break_long_lines(text)
-
-        if text == line.text:
-            return line
+            self._compile_break_sequences()
+            max_length = self.max_single_line_length
+            pipeline.Add('break_long_lines', self._break_long_lines, lambda text: len(text) > max_length and '\n' not in text)
 
-        logging.debug(f"Postprocessed line {line.number}:\n{line.text}\n-->\n{text}")
-        processed_line = SubtitleLine.Construct(line.number, line.start, line.end, text)
-        return processed_line
+        return pipeline
 
     def _break_long_lines(self, text : str) -> str:
         """
@@ -224,7 +310,10 @@ class SubtitleProcessor:
         by choosing a split point from the defined sequences weighted towards the middle.
         """
         result : list[SubtitleLine] = []
-        stack : list[SubtitleLine] = [line]
+
+        # Line timings are stored in whole milliseconds, so the exact start and end of each part are kept separately
+        # to stop the rounding from accumulating when a part is split again
+        stack : list[tuple[SubtitleLine, timedelta, timedelta]] = [(line, line.start, line.end)]
 
         if self._compiled_split_sequences is None:
             self._compile_split_sequences()
@@ -232,11 +321,12 @@ class SubtitleProcessor:
                 raise ValueError("No split sequences defined for splitting lines by duration.")
 
         while stack:
-            current_line = stack.pop()
-            if not current_line or not current_line.text or not current_line.start or not current_line.end:
+            current_line, current_start, current_end = stack.pop()
+            if not current_line or not current_line.text or not current_start or not current_end:
                 continue
 
-            if current_line.duration <= self.max_line_duration or len(current_line.text) < self.min_split_chars * 2:
+            current_duration : timedelta = current_end - current_start
+            if current_duration <= self.max_line_duration or len(current_line.text) < self.min_split_chars * 2:
                 result.append(current_line)
                 continue
 
@@ -244,20 +334,20 @@ class SubtitleProcessor:
                 result.append(current_line)
                 continue
 
-            split_point = FindSplitPoint(current_line, self._compiled_split_sequences, min_duration=self.min_line_duration, min_split_chars=self.min_split_chars)
+            split_point = FindSplitPoint(current_line, self._compiled_split_sequences, min_duration=self.min_line_duration, min_split_chars=self.min_split_chars, duration=current_duration)
             if split_point is None:
                 result.append(current_line)
                 continue
 
             split_text : str = current_line.text[split_point:].strip()
-            split_duration : timedelta = GetProportionalDuration(current_line, len(split_text), self.min_line_duration)
-            split_start : timedelta = current_line.end - split_duration
-            split_end : timedelta = current_line.end
+            split_duration : timedelta = GetProportionalDuration(current_line, len(split_text), self.min_line_duration, duration=current_duration)
+            split_start : timedelta = current_end - split_duration
+            new_end : timedelta = split_start - self.min_gap
 
-            new_line = SubtitleLine.Construct(current_line.number, current_line.start, split_start - self.min_gap, current_line.text[:split_point])
-            split_line = SubtitleLine.Construct(current_line.number, split_start, split_end, split_text)
+            new_line = SubtitleLine.Construct(current_line.number, current_start, new_end, current_line.text[:split_point])
+            split_line = SubtitleLine.Construct(current_line.number, split_start, current_end, split_text)
 
-            stack.extend([split_line, new_line])
+            stack.extend([(split_line, split_start, current_end), (new_line, current_start, new_end)])
 
         for i, result_line in enumerate(result, start=0):
             result_line.number = line.number + i
@@ -273,13 +363,14 @@ class SubtitleProcessor:
 
         merged_lines : list[SubtitleLine] = []
         current_line : SubtitleLine = lines[0]
+        short_lines : set[int] = set(SubtitleTimings(lines).FilterByDuration(shorter_than=short_duration))
 
-        for line in lines[1:]:
+        for index, line in enumerate(lines[1:], start=1):
             if not current_line.text_normalized:
                 current_line = line
                 continue
 
-            if line.duration < short_duration:
+            if index in short_lines:
                 # If the line ends with a sentence-ending punctuation mark, assume different speakers (questionable logic)
                 if current_line.text_normalized[-1] in sentence_end_punctuation:
                     current_line.text = f"{dialog_marker}{current_line.text}\n{dialog_marker}{line.text}"
@@ -294,6 +385,52 @@ class SubtitleProcessor:
         merged_lines.append(current_line)
         return merged_lines
 
+    def _use_process_pool(self, lines : list[SubtitleLine]) -> bool:
+        """
+        Only use worker processes if there are enough lines for each worker to have a worthwhile chunk
+        """
+        return self.processing_workers > 1 and len(lines) >= self.min_chunk_size * 2 and not _process_pools_broken
+
+    def _map_chunks(self, function, lines : list[SubtitleLine], *args : list) -> list|None:
+        """
+        Divide the lines into chunks, process them in worker processes and return the results in the original order.
+
+        Returns None if the worker processes failed, so that the lines can be processed in this process instead.
+        Worker processes are spawned, so they import the main module - scripts must guard their entry point with
+        `if __name__ == "__main__":` or each worker will run the script again and the pool will fail.
+        """
+        chunk_size = max(self.min_chunk_size, -(-len(lines) // (self.processing_workers * 4)))
+        chunks = [ (lines[start:start + chunk_size], *(arg[start:start + chunk_size] for arg in args)) for start in range(0, len(lines), chunk_size) ]
+
+        pool = self._get_process_pool()
+        settings = SettingsType(self.settings)
+        results : list = []
+        try:
+            for chunk_results in pool.map(function, [ settings ] * len(chunks), *zip(*chunks)):
+                results.extend(chunk_results)
+
+        except BrokenProcessPool as e:
+            logging.warning(f"Worker processes failed, processing subtitles in a single process instead: {e}")
+            _discard_process_pools()
+            self.Close()
+            return None
+
+        return results
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the processor's pool of worker processes, starting it the first time it is needed.
+
+        The pool is reused for every set of lines the processor handles, and shut down when the processor
+        is closed, garbage collected or the interpreter exits, so worker processes do not outlive it.
+        """
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # Worker processes are spawned rather than forked, as the caller may be running other threads
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processing_workers, mp_context=multiprocessing.get_context('spawn'))
+                self._process_pool_finalizer = weakref.finalize(self, _shutdown_process_pool, self._process_pool)
+            return self._process_pool
+
     def _compile_split_sequences(self):
         self._compiled_split_sequences = [regex.compile(seq) for seq in self.split_sequences]
 
@@ -301,3 +438,35 @@ class SubtitleProcessor:
         self._compiled_break_sequences = [regex.compile(seq) for seq in self.break_sequences]
 
 
+
+def _has_filler_punctuation(text : str) -> bool:
+    return any(punctuation in text for punctuation in _filler_punctuation)
+
+def _discard_process_pools():
+    """
+    Stop using worker processes after a pool has failed, as starting another pool would fail in the same way
+    """
+    global _process_pools_broken
+    _process_pools_broken = True
+
+def _shutdown_process_pool(pool : ProcessPoolExecutor):
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _get_worker_processor(settings : SettingsType) -> SubtitleProcessor:
+    """
+    Get a processor for the settings in a worker process, creating it the first time the settings are seen
+    """
+    key = repr(sorted(settings.items()))
+    processor = _worker_processors.get(key)
+    if processor is None:
+        processor = SubtitleProcessor(SettingsType({ **settings, 'processing_workers': 1 }))
+        _worker_processors[key] = processor
+    return processor
+
+def _preprocess_chunk(settings : SettingsType, lines : list[SubtitleLine], needs_split : list[bool]) -> list[list[SubtitleLine]]:
+    processor = _get_worker_processor(settings)
+    return [ processor._preprocess_and_split(line, split) for line, split in zip(lines, needs_split) ]
+
+def _postprocess_chunk(settings : SettingsType, lines : list[SubtitleLine]) -> list[SubtitleLine]:
+    processor = _get_worker_processor(settings)
+    return [ processor._postprocess_line(line) for line in lines ]
@@ -3,25 +3,31 @@ import os
 import logging
 import threading
 
+from PySubtitle.BackgroundWriter import BackgroundWriter
 from PySubtitle.Helpers import GetOutputPath
 from PySubtitle.Helpers.Localization import _
 from PySubtitle.Options import Options, SettingsType
+from PySubtitle.ProjectDatabase import ProjectDatabase
+from PySubtitle.ProjectIndex import ProjectIndex, ReleaseProjectFile
+from PySubtitle.ProjectJournal import ProjectJournal
+from PySubtitle.ProgressiveOutput import ProgressiveOutput
 from PySubtitle.SettingsType import SettingsType
 from PySubtitle.SubtitleError import SubtitleError, TranslationAbortedError
 from PySubtitle.Subtitles import Subtitles
 
 from PySubtitle.SubtitleBatch import SubtitleBatch
 from PySubtitle.SubtitleScene import SubtitleScene
-from PySubtitle.SubtitleSerialisation import SubtitleDecoder, SubtitleEncoder
+from PySubtitle.SubtitleSerialisation import DecodeIndexedProject, DecodeProject, EncodeProject
 from PySubtitle.SubtitleTranslator import SubtitleTranslator
 from PySubtitle.TranslationEvents import TranslationEvents
 
-default_encoding = os.getenv('DEFAULT_ENCODING', 'utf-8')
-
 class SubtitleProject:
     """
     Handles loading, saving and creation of project files for LLM-Subtrans
     """
+    # Number of journal records after which the project is saved in full and the journal compacted
+    journal_compact_threshold : int = 50
+
     def __init__(self, options : Options):
         """
         Initialise an empty project. Can be initialised from a project file or a subtitle file,
@@ -32,10 +38,27 @@ class SubtitleProject:
         self.subtitles : Subtitles = Subtitles()
         self.events = TranslationEvents()
         self.projectfile : str|None = None
+        self.outputpath : str|None = None
         self.read_project : bool = False
         self.write_project : bool = False
         self.needs_writing : bool = False
+        self.stream_subtitles : bool = options.get_bool('stream_subtitles', False)
+        self.pretty_project_file : bool = options.get_bool('pretty_project_file', False)
+        self.save_prompts : bool = options.get_bool('save_prompts', True)
+        self.save_responses : bool = options.get_bool('save_responses', True)
         self.lock = threading.RLock()
+        self.writer = BackgroundWriter()
+        self.journal : ProjectJournal|None = None
+
+        # Projects can be stored in an SQLite database, optionally shared by several projects
+        self.project_database : str|None = options.get_str('project_database') or None
+        self.project_name : str|None = None
+        self.database : ProjectDatabase|None = None
+
+        # The translation can be written to the output file as each scene is completed
+        self.progressive_output : bool = options.get_bool('progressive_output', False)
+        self.progressive_interval : float = options.get_float('progressive_interval', 10.0) or 0.0
+        self.output : ProgressiveOutput|None = None
 
         self._update_project_mode(options)
 
@@ -67,8 +90,13 @@ class SubtitleProject:
         filepath = os.path.normpath(filepath)
         sourcepath : str = filepath
         self.projectfile = self.GetProjectFilepath(filepath or "subtitles")
+        self.outputpath = outputpath
 
-        project_file_exists : bool = os.path.exists(self.projectfile)
+        if self.IsDatabase(self.projectfile) and self.projectfile != filepath:
+            # Each source file is a separate project in the database
+            self.project_name = os.path.splitext(os.path.basename(filepath))[0]
+
+        project_file_exists : bool = self._project_exists(self.projectfile)
         project_settings : SettingsType = SettingsType()
 
         if self.projectfile == filepath and not self.read_project:
@@ -86,7 +114,7 @@ class SubtitleProject:
             project_settings = self.GetProjectSettings()
 
             if subtitles:
-                outputpath = outputpath or GetOutputPath(self.projectfile, subtitles.target_language)
+                outputpath = outputpath or self._get_outputpath(self.projectfile, subtitles)
                 sourcepath = subtitles.sourcepath if subtitles.sourcepath else sourcepath               
                 logging.info(_("Project file loaded"))
 
@@ -101,8 +129,13 @@ class SubtitleProject:
 
         if self.load_subtitles:
             try:
-                # (re)load the source subtitle file if required
-                subtitles = self.LoadSubtitleFile(sourcepath)
+                # (re)load the source subtitle file if required, or defer loading to translation if streaming
+                if self.stream_subtitles:
+                    with self.lock:
+                        subtitles = self.subtitles = Subtitles(sourcepath)
+                else:
+                    subtitles = self.LoadSubtitleFile(sourcepath, encoding=project_settings.get_str('encoding'))
+                    project_settings['encoding'] = subtitles.settings.get('encoding')
 
                 # Reapply project settings
                 if self.read_project and project_settings:
@@ -112,12 +145,17 @@ class SubtitleProject:
                 logging.error(_("Failed to load subtitle file {}: {}").format(filepath, str(e)))
                 raise
 
-            if not subtitles or not subtitles.has_subtitles:
+            if not subtitles or not (subtitles.has_subtitles or self.stream_subtitles):
                 raise ValueError(_("No subtitles to translate in {}").format(filepath))
 
             if outputpath:
                 subtitles.outputpath = outputpath
 
+            # Changes journalled against a previous version of the project no longer apply
+            journal = self._get_journal()
+            if journal:
+                journal.Clear()
+
         self.needs_writing = self.write_project
 
     def SaveOriginal(self, outputpath : str|None = None):
@@ -125,8 +163,7 @@ class SubtitleProject:
         Write the original subtitles to a file
         """
         try:
-            with self.lock:
-                self.subtitles.SaveOriginal(outputpath)
+            self.subtitles.SaveOriginal(outputpath)
 
         except Exception as e:
             logging.error(_("Unable to save original subtitles: {}").format(e))
@@ -136,8 +173,7 @@ class SubtitleProject:
         Write output file
         """
         try:
-            with self.lock:
-                self.subtitles.SaveTranslation(outputpath)
+            self.subtitles.SaveTranslation(outputpath)
 
         except Exception as e:
             logging.error(_("Unable to save translation: {}").format(e))
@@ -145,27 +181,45 @@ class SubtitleProject:
     def GetProjectFilepath(self, filepath : str) -> str:
         """ Calculate the project file path based on the source file path """
         path, ext = os.path.splitext(filepath)
-        filepath = filepath if ext == '.subtrans' else f"{path}.subtrans"
-        return os.path.normpath(filepath)
+        if ext in ['.subtrans', ProjectDatabase.extension]:
+            return os.path.normpath(filepath)
+
+        if self.project_database:
+            return os.path.normpath(self.project_database)
+
+        return os.path.normpath(f"{path}.subtrans")
+
+    def IsDatabase(self, filepath : str|None) -> bool:
+        """ Check whether a project path refers to a project database rather than a project file """
+        return bool(filepath) and os.path.splitext(str(filepath))[1] == ProjectDatabase.extension
 
     def GetBackupFilepath(self, filepath : str) -> str:
         """ Get the backup file path for the project file """
         projectfile = self.GetProjectFilepath(filepath)
         return f"{projectfile}-backup"
 
-    def LoadSubtitleFile(self, filepath : str) -> Subtitles:
+    def GetJournalFilepath(self, filepath : str) -> str:
+        """ Get the journal file path for the project file """
+        projectfile = self.GetProjectFilepath(filepath)
+        return f"{projectfile}-journal"
+
+    def GetIndexFilepath(self, filepath : str) -> str:
+        """ Get the path of the index for a project file """
+        return f"{os.path.normpath(filepath)}-index"
+
+    def LoadSubtitleFile(self, filepath : str, encoding : str|None = None) -> Subtitles:
         """
-        Load subtitles from an SRT file
+        Load subtitles from an SRT file, detecting its encoding if it is not specified
         """
         with self.lock:
             self.subtitles = Subtitles(filepath)
-            self.subtitles.LoadSubtitles()
+            self.subtitles.LoadSubtitles(encoding=encoding)
 
         return self.subtitles
 
-    def SaveProjectFile(self, projectfile : str|None = None) -> None:
+    def SaveProjectFile(self, projectfile : str|None = None, background : bool = False) -> None:
         """
-        Write a set of subtitles to a project file
+        Write a set of subtitles to a project file, optionally returning immediately and writing it in the background
         """
         with self.lock:
             if not self.subtitles:
@@ -181,6 +235,9 @@ class SubtitleProject:
                 self.write_project = True
                 self.read_project = True
 
+            # Keep an output path that was chosen for the project unless it is saved somewhere else
+            keep_outputpath = bool(self.outputpath) and projectfile in (None, self.projectfile)
+
             if not projectfile:
                 projectfile = self.projectfile
             elif projectfile and not self.projectfile:
@@ -189,19 +246,23 @@ class SubtitleProject:
             if not projectfile:
                 raise Exception("No file path provided")
 
-            self.subtitles.outputpath = GetOutputPath(projectfile, self.subtitles.target_language)
-            self.WriteProjectToFile(projectfile, encoder_class=SubtitleEncoder)
-
+            self.subtitles.outputpath = self.outputpath if keep_outputpath else self._get_outputpath(projectfile, self.subtitles)
             self.needs_writing = False
 
+        # The project lock is not held while writing, which could otherwise block translation threads
+        self.WriteProjectToFile(projectfile, background=background)
+
     def SaveBackupFile(self) -> None:
         """
         Save a backup copy of the project
         """
         with self.lock:
-            if self.subtitles and self.projectfile:
-                backupfile = self.GetBackupFilepath(self.projectfile)
-                self.WriteProjectToFile(backupfile, encoder_class=SubtitleEncoder)
+            if not self.subtitles or not self.projectfile:
+                return
+
+            backupfile = self.GetBackupFilepath(self.projectfile)
+
+        self.WriteProjectToFile(backupfile)
 
     def ReadProjectFile(self, filepath : str|None = None) -> Subtitles|None:
         """
@@ -212,13 +273,26 @@ class SubtitleProject:
             if not filepath:
                 raise ValueError(_("No project file path provided"))
 
+            if self.IsDatabase(filepath):
+                return self._read_project_database(filepath)
+
             with self.lock:
                 logging.info(_("Reading project data from {}").format(str(filepath)))
 
-                with open(filepath, 'r', encoding=default_encoding, newline='') as f:
-                    subtitles: Subtitles = json.load(f, cls=SubtitleDecoder)
+                subtitles : Subtitles|None = self._read_indexed_project(filepath)
+                if subtitles is None:
+                    with open(filepath, 'rb') as f:
+                        subtitles = DecodeProject(f.read())
 
                 subtitles.Sanitise()
+
+                # Apply any changes that were journalled since the project was last saved
+                journal = ProjectJournal(self.GetJournalFilepath(filepath))
+                if journal.record_count:
+                    replayed = journal.Replay(subtitles)
+                    logging.info(_("Restored {} changes from the project journal").format(replayed))
+                    self.needs_writing = self.needs_writing or bool(replayed)
+
                 self.subtitles = subtitles
                 return subtitles
 
@@ -230,13 +304,51 @@ class SubtitleProject:
             logging.error(_("Error decoding JSON file: {}").format(e))
             return None
 
+    def _read_project_database(self, filepath : str) -> Subtitles|None:
+        """
+        Load the project from a project database
+        """
+        with self.lock:
+            database = self._get_database(filepath)
+            name = self._get_project_name(database)
+            if not name:
+                return None
+
+            logging.info(_("Reading project {} from {}").format(name, str(filepath)))
+            subtitles = database.ReadProject(name)
+            if subtitles is None:
+                logging.error(_("Project {} not found in {}").format(name, str(filepath)))
+                return None
+
+            subtitles.Sanitise()
+            self.subtitles = subtitles
+            return subtitles
+
+    def _read_indexed_project(self, filepath : str) -> Subtitles|None:
+        """
+        Read a project file using its index, leaving prompts and responses to be loaded when they are needed.
+        Returns None if the project has no index or the index does not match the file.
+        """
+        index = ProjectIndex.Read(self.GetIndexFilepath(filepath))
+        if not index or not index.Matches(filepath):
+            return None
+
+        try:
+            return DecodeIndexedProject(filepath, index)
+
+        except (ValueError, OSError) as e:
+            logging.warning(_("Unable to use project index, reading the full project: {}").format(str(e)))
+            return None
+
     def UpdateProjectFile(self) -> None:
         """
         Save the project file if it needs updating
         """
         with self.lock:
-            if self.needs_writing and self.subtitles and self.subtitles.scenes:
-                self.SaveProjectFile()
+            needs_writing = self.needs_writing and self.subtitles and self.subtitles.scenes
+
+        if needs_writing:
+            self.SaveProjectFile()
 
     def GetProjectSettings(self) -> SettingsType:
         """
@@ -268,20 +380,90 @@ class SubtitleProject:
             self.subtitles.UpdateOutputPath()
             self.needs_writing = True
 
-    def WriteProjectToFile(self, projectfile: str, encoder_class: type|None = None) -> None:
-        """
-        Save the project settings to a JSON file
+    def WriteProjectToFile(self, projectfile: str, encoder_class: type|None = None, background : bool = False) -> None:
         """
-        if encoder_class is None:
-            raise ValueError("No encoder provided")
+        Save the project settings to a JSON file.
 
-        projectfile = os.path.normpath(projectfile)
-        logging.info(_("Writing project data to {}").format(str(projectfile)))
+        A snapshot of the subtitles is serialised, so translation can continue while the project is written.
+        The file is replaced atomically, then journal records included in the snapshot are discarded.
 
+        The project codec is used unless a JSON encoder class is provided. Output is compact unless the
+        pretty_project_file option is set, and batch prompts and responses are omitted if the save_prompts
+        or save_responses options are disabled. An index is written alongside the file, so that prompts and
+        responses can be loaded on demand when the project is read.
+        """
+        projectfile = os.path.normpath(projectfile)
+        if self.IsDatabase(projectfile):
+            self._write_project_database(projectfile, background)
+            return
+
+        journal = self._get_journal()
+        if journal and journal.filepath != self.GetJournalFilepath(projectfile):
+            journal = None
+
+        # Count the journal records first, so that any appended while the snapshot is taken are kept
+        journal_records = journal.record_count if journal else 0
+        snapshot : Subtitles = self.subtitles.Snapshot()
+        is_projectfile = self.projectfile is not None and projectfile == os.path.normpath(self.projectfile)
+
+        def write_snapshot():
+            logging.info(_("Writing project data to {}").format(str(projectfile)))
+            index : ProjectIndex|None = None
+            if encoder_class is None:
+                index = ProjectIndex()
+                content = EncodeProject(snapshot, pretty=self.pretty_project_file, include_prompts=self.save_prompts, include_responses=self.save_responses, index=index)
+            else:
+                content = json.dumps(snapshot, cls=encoder_class, ensure_ascii=False, indent=4 if self.pretty_project_file else None).encode('utf-8')
+
+            temp_path = f"{projectfile}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if index is None:
+                ReleaseProjectFile(projectfile)
+                os.replace(temp_path, projectfile)
+            else:
+                # Content that has not been loaded yet is read from the new file in future, but only from the project file itself
+                if not is_projectfile:
+                    index.rebind = []
+                index.Commit(temp_path, projectfile)
+                index.Write(self.GetIndexFilepath(projectfile))
+
+            if journal and journal_records:
+                journal.Compact(journal_records)
+
+        if background:
+            self.writer.QueueWrite(projectfile, write_snapshot)
+        else:
+            self.writer.Write(projectfile, write_snapshot)
+
+    def _write_project_database(self, filepath : str, background : bool = False) -> None:
+        """
+        Save the project to a project database, updating only batches that have changed
+        """
         with self.lock:
-            with open(projectfile, 'w', encoding=default_encoding) as f:
-                project_json = json.dumps(self.subtitles, cls=encoder_class, ensure_ascii=False, indent=4) # type: ignore
-                f.write(project_json)
+            database = self._get_database(filepath)
+            name = self.project_name or self._default_project_name(filepath)
+            self.project_name = self.project_name or name
+
+        snapshot : Subtitles = self.subtitles.Snapshot()
+
+        def write_snapshot():
+            logging.info(_("Writing project {} to {}").format(name, str(filepath)))
+            database.WriteProject(name, snapshot, include_prompts=self.save_prompts, include_responses=self.save_responses)
+
+        if background:
+            self.writer.QueueWrite(filepath, write_snapshot)
+        else:
+            self.writer.Write(filepath, write_snapshot)
+
+    def FlushProjectFile(self, timeout : float|None = None) -> bool:
+        """
+        Wait for any project file writes queued in the background to finish
+        """
+        return self.writer.Flush(timeout)
 
     def TranslateSubtitles(self, translator : SubtitleTranslator) -> None:
         """
@@ -298,13 +480,17 @@ class SubtitleProject:
             translator.events.batch_translated += self._on_batch_translated # type: ignore
             translator.events.scene_translated += self._on_scene_translated # type: ignore
 
-            translator.TranslateSubtitles(self.subtitles)
+            if self.stream_subtitles and not self.subtitles.scenes:
+                translator.TranslateStreamingScenes(self.subtitles, self.subtitles.StreamScenes(translator.batcher))
+            else:
+                translator.TranslateSubtitles(self.subtitles)
 
             translator.events.preprocessed -= self._on_preprocessed # type: ignore
             translator.events.batch_translated -= self._on_batch_translated # type: ignore
             translator.events.scene_translated -= self._on_scene_translated # type: ignore
 
             if self.save_subtitles and not translator.aborted:
+                self._close_progressive_output(write=False)
                 self.SaveTranslation()
 
         except TranslationAbortedError:
@@ -312,11 +498,15 @@ class SubtitleProject:
 
         except Exception as e:
             if self.subtitles and self.save_subtitles and translator.stop_on_error:
+                self._close_progressive_output(write=False)
                 self.SaveTranslation()
 
             logging.error(_("Failed to translate subtitles: {}").format(str(e)))
             raise
 
+        finally:
+            self._close_progressive_output()
+
     def TranslateScene(self, translator : SubtitleTranslator, scene_number : int, batch_numbers : list[int]|None = None, line_numbers : list[int]|None = None) -> SubtitleScene|None:
         """
         Pass batches of subtitles to the translation engine.
@@ -335,7 +525,11 @@ class SubtitleProject:
             translator.TranslateScene(self.subtitles, scene, batch_numbers=batch_numbers, line_numbers=line_numbers)
 
             if self.save_subtitles and not translator.aborted:
-                self.SaveTranslation()
+                output = self._get_progressive_output()
+                if output:
+                    output.Update()
+                else:
+                    self.SaveTranslation()
 
             return scene
 
@@ -391,9 +585,160 @@ class SubtitleProject:
     def _on_batch_translated(self, batch) -> None:
         logging.debug("Batch translated")
         self.needs_writing = self.write_project
+        if self.IsDatabase(self.projectfile):
+            self._database_change(lambda database, name: database.WriteBatch(name, batch, self.save_prompts, self.save_responses))
+        else:
+            self._journal_change(lambda journal: journal.AppendBatch(batch))
         self.events.batch_translated(batch)
 
     def _on_scene_translated(self, scene) -> None:
         logging.debug("Scene translated")
         self.needs_writing = self.write_project
+        if self.IsDatabase(self.projectfile):
+            self._database_change(lambda database, name: database.WriteScene(name, scene, self.save_prompts, self.save_responses))
+        else:
+            self._journal_change(lambda journal: journal.AppendScene(scene))
+
+        output = self._get_progressive_output() if self.save_subtitles else None
+        if output:
+            output.Update()
+
         self.events.scene_translated(scene)
+
+    def _get_progressive_output(self) -> ProgressiveOutput|None:
+        """
+        Get the writer for progressive output, if it is enabled
+        """
+        if not self.progressive_output or not self.subtitles:
+            return None
+
+        with self.lock:
+            outputpath = self.subtitles.outputpath
+            if not outputpath and self.subtitles.sourcepath:
+                outputpath = GetOutputPath(self.subtitles.sourcepath, self.subtitles.target_language)
+
+            if not outputpath:
+                return None
+
+            if self.output is None or self.output.subtitles is not self.subtitles or self.output.outputpath != os.path.normpath(outputpath):
+                self._close_progressive_output()
+                self.output = ProgressiveOutput(self.subtitles, outputpath, interval=self.progressive_interval)
+
+            return self.output
+
+    def _close_progressive_output(self, write : bool = True):
+        """
+        Stop writing progressive output, optionally writing any pending changes first
+        """
+        with self.lock:
+            if self.output is not None:
+                self.output.Close(write=write)
+                self.output = None
+
+    def _project_exists(self, projectfile : str) -> bool:
+        """
+        Check whether the project has been saved, either as a project file or in a project database
+        """
+        if not os.path.exists(projectfile):
+            return False
+
+        if not self.IsDatabase(projectfile):
+            return True
+
+        database = self._get_database(projectfile)
+        return database.HasProject(self.project_name) if self.project_name else bool(database.ListProjects())
+
+    def _get_database(self, filepath : str) -> ProjectDatabase:
+        """
+        Open a project database, reusing the connection if it is already open
+        """
+        with self.lock:
+            filepath = os.path.normpath(filepath)
+            if not self.database or self.database.filepath != filepath:
+                if self.database:
+                    self.database.Close()
+                self.database = ProjectDatabase(filepath)
+            return self.database
+
+    def _get_project_name(self, database : ProjectDatabase) -> str|None:
+        """
+        Determine which project in the database to use, which can only be inferred if there is exactly one
+        """
+        if not self.project_name:
+            projects = database.ListProjects()
+            if len(projects) != 1:
+                logging.error(_("{} contains {} projects, open the subtitle file to select one").format(database.filepath, len(projects)))
+                return None
+            self.project_name = projects[0]
+
+        return self.project_name
+
+    def _default_project_name(self, filepath : str) -> str:
+        sourcepath = self.subtitles.sourcepath if self.subtitles else None
+        return os.path.splitext(os.path.basename(sourcepath or filepath))[0]
+
+    def _get_outputpath(self, projectfile : str, subtitles : Subtitles) -> str|None:
+        """
+        Get the default output path, next to the source file for projects in a database shared by several projects
+        """
+        if self.IsDatabase(projectfile) and subtitles.sourcepath:
+            return GetOutputPath(subtitles.sourcepath, subtitles.target_language)
+
+        # Write the translation in the same format as the source
+        extension = os.path.splitext(subtitles.sourcepath)[1] if subtitles.sourcepath else None
+        return GetOutputPath(projectfile, subtitles.target_language, extension)
+
+    def _database_change(self, write) -> None:
+        """
+        Write a change to the project database, saving the project in full if it is not in the database yet
+        """
+        if not self.write_project or not self.projectfile or not self.subtitles.scenes:
+            return
+
+        try:
+            if not self._project_exists(self.projectfile):
+                self.SaveProjectFile()
+                return
+
+            database = self._get_database(self.projectfile)
+            name = self._get_project_name(database)
+            if name:
+                write(database, name)
+
+        except Exception as e:
+            logging.error(_("Unable to update project database: {}").format(str(e)))
+
+    def _get_journal(self) -> ProjectJournal|None:
+        """
+        Get the journal for the project file, if the project is being written
+        """
+        with self.lock:
+            if not self.write_project or not self.projectfile or self.IsDatabase(self.projectfile):
+                return None
+
+            journal_path = self.GetJournalFilepath(self.projectfile)
+            if not self.journal or self.journal.filepath != journal_path:
+                self.journal = ProjectJournal(journal_path)
+
+            return self.journal
+
+    def _journal_change(self, append) -> None:
+        """
+        Checkpoint a change to the journal, saving the project in full if it has no base to replay over
+        """
+        journal = self._get_journal()
+        if not journal or not self.projectfile or not self.subtitles.scenes:
+            return
+
+        try:
+            if not os.path.exists(self.projectfile):
+                self.SaveProjectFile()
+                return
+
+            append(journal)
+
+            if journal.record_count >= self.journal_compact_threshold:
+                self.SaveProjectFile(background=True)
+
+        except Exception as e:
+            logging.error(_("Unable to update project journal: {}").format(str(e)))
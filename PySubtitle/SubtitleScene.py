@@ -1,5 +1,6 @@
 from datetime import timedelta
 import logging
+import threading
 from typing import Any
 
 from PySubtitle.SubtitleBatch import SubtitleBatch
@@ -13,6 +14,10 @@ class SubtitleScene:
         self.context : dict[str,Any] = dct.get('context', {})
         self._batches : list[SubtitleBatch] = dct.get('batches', [])
         self.errors : list[str|Exception] = dct.get('errors', [])
+        self._version : int = 0
+        self._state : tuple|None = None
+        self._lines : tuple[int, list[SubtitleLine], list[SubtitleLine], list[SubtitleLine]]|None = None
+        self.lock = threading.RLock()
 
     def __str__(self) -> str:
         return f"SubtitleScene {self.number} with {self.size} batches and {self.linecount} lines"
@@ -37,13 +42,37 @@ class SubtitleScene:
 
     @property
     def originals(self) -> list[SubtitleLine]|None:
-        """ Get all original lines in the scene """
-        return [ line for batch in self.batches for line in batch.originals ] if self.batches else None
+        """ Get all original lines in the scene (a cached list, which should not be modified) """
+        return self._get_lines()[0] if self.batches else None
 
     @property
     def translated(self) -> list[SubtitleLine]|None:
-        """ Get all translated lines in the scene """
-        return [ line for batch in self.batches for line in batch.translated ] if self.batches else None
+        """ Get all translated lines in the scene (a cached list, which should not be modified) """
+        return self._get_lines()[1] if self.batches else None
+
+    @property
+    def untranslated(self) -> list[SubtitleLine]:
+        """ Get all lines in the scene which have no translation (a cached list, which should not be modified) """
+        return self._get_lines()[2]
+
+    @property
+    def translated_linecount(self) -> int:
+        """ Get the number of translated lines in the scene """
+        return len(self._get_lines()[1])
+
+    @property
+    def untranslated_linecount(self) -> int:
+        """ Get the number of lines in the scene which have no translation """
+        return len(self._get_lines()[2])
+
+    @property
+    def version(self) -> int:
+        """ Modification counter, which changes whenever batches are added, removed or modified """
+        state = tuple((id(batch), batch.version) for batch in self._batches)
+        if state != self._state:
+            self._state = state
+            self._version += 1
+        return self._version
 
     @property
     def first_line_number(self) -> int|None:
@@ -99,6 +128,17 @@ class SubtitleScene:
         self._batches.append(batch)
         return self._batches[-1]
 
+    def Snapshot(self) -> 'SubtitleScene':
+        """
+        Get a read-only copy of the scene and its batches that will not be affected by later changes
+        """
+        return SubtitleScene({
+            'number': self.number,
+            'context': dict(self.context),
+            'batches': [ batch.Snapshot() for batch in self._batches ],
+            'errors': list(self.errors)
+        })
+
     def AddContext(self, key : str, value : str|dict[str,str]):
         if not self.context:
             self.context = {}
@@ -245,6 +285,24 @@ class SubtitleScene:
             logging.info(f"Splitting batch {batch_number} at line {split_line}")
             self.SplitBatch(batch_number, split_line)
 
+    def _get_lines(self) -> tuple[list[SubtitleLine], list[SubtitleLine], list[SubtitleLine]]:
+        """
+        Get the original, translated and untranslated lines of the scene, linearising the batches again only if they have changed
+        """
+        version = self.version
+        if self._lines is None or self._lines[0] != version:
+            originals : list[SubtitleLine] = []
+            translated : list[SubtitleLine] = []
+            untranslated : list[SubtitleLine] = []
+            for batch in self._batches:
+                originals.extend(batch.originals)
+                translated.extend(batch.translated)
+                untranslated.extend(batch.untranslated)
+
+            self._lines = (version, originals, translated, untranslated)
+
+        return self._lines[1], self._lines[2], self._lines[3]
+
     def _renumber_batches(self):
         for number, batch in enumerate(self._batches, start = 1):
             batch.number = number
@@ -259,12 +317,10 @@ def UnbatchScenes(scenes : list[SubtitleScene]) -> tuple[list[SubtitleLine], lis
     untranslated : list[SubtitleLine] = []
 
     for scene in scenes:
-        for batch in scene.batches:
-            if batch.originals:
-                originals.extend(batch.originals)
-            if batch.translated:
-                translations.extend(batch.translated)
-            if batch.untranslated:
-                untranslated.extend(batch.untranslated)
+        if scene.batches:
+            scene_originals, scene_translated, scene_untranslated = scene._get_lines()
+            originals.extend(scene_originals)
+            translations.extend(scene_translated)
+            untranslated.extend(scene_untranslated)
 
     return originals, translations, untranslated
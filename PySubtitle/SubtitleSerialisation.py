@@ -1,6 +1,12 @@
+import hashlib
 import json
+import logging
 from datetime import timedelta
+from typing import Any
 
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.Helpers.Time import GetTimeDeltaSafe, TimedeltaToMilliseconds
+from PySubtitle.ProjectIndex import LazyContent, ProjectContentSource, ProjectIndex
 from PySubtitle.SettingsType import SettingsType
 from PySubtitle.SubtitleLine import SubtitleLine
 from PySubtitle.SubtitleBatch import SubtitleBatch
@@ -10,6 +16,17 @@ from PySubtitle.SubtitleScene import SubtitleScene
 from PySubtitle.Translation import Translation
 from PySubtitle.TranslationPrompt import TranslationPrompt
 
+# orjson or msgspec are used for project files when they are available, with the standard library as a fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
+try:
+    import msgspec # type: ignore
+except ImportError:
+    msgspec = None # type: ignore
+
 # Serialisation helpers
 def classname(obj):
     if isinstance(obj, type):
@@ -82,7 +99,7 @@ class SubtitleEncoder(json.JSONEncoder):
                 "start": obj.start.total_seconds() if obj.start else None,
                 "end": obj.end.total_seconds() if obj.end else None,
                 "content": obj.content,
-                "metadata": getattr(obj, 'metadata'),
+                "metadata": dict(obj.metadata),
                 "translation": getattr(obj, 'translation'),
                 "original": getattr(obj, 'original')
             }
@@ -113,13 +130,7 @@ def _object_hook(dct):
     if '_class' in dct:
         class_name = dct.pop('_class')
         if class_name in {classname(Subtitles), "SubtitleFile"}:      # Backward compatibility
-            sourcepath = dct.get('sourcepath')
-            outpath = dct.get('outputpath') or dct.get('filename')
-            obj = Subtitles(sourcepath, outpath)
-            obj.settings = dct.get('settings', {}) or dct.get('context', {})
-            obj.scenes = dct.get('scenes', [])
-            obj.UpdateProjectSettings(SettingsType()) # Force update for legacy files
-            return obj
+            return _build_subtitles(dct, dct.get('scenes', []))
         elif class_name == classname(SubtitleScene):
             obj = SubtitleScene(dct)
             return obj
@@ -129,38 +140,539 @@ def _object_hook(dct):
         elif class_name == classname(SubtitleLine) or class_name == "Subtitle": # TEMP backward compatibility
             return SubtitleLine(dct)
         elif class_name == classname(Translation) or class_name == "GPTTranslation":
-            content = dct.get('content') or {
-                'text' : dct.get('text'),
-                'finish_reason' : dct.get('finish_reason'),
-                'response_time' : dct.get('response_time'),
-                'prompt_tokens' : dct.get('prompt_tokens'),
-                'output_tokens' : dct.get('completion_tokens'),
-                'reasoning_tokens' : dct.get('reasoning_tokens'),
-                'accepted_prediction_tokens' : dct.get('accepted_prediction_tokens'),
-                'rejected_prediction_tokens' : dct.get('rejected_prediction_tokens'),
-                'total_tokens' : dct.get('total_tokens'),
-                'summary': dct.get('summary'),
-                'scene': dct.get('scene'),
-                'synopsis': dct.get('synopsis'),
-                'names': dct.get('names') or dct.get('characters')
-                }
-
-            if isinstance(content['text'], list):
-                # This shouldn't happen, but try to recover if it does
-                content['text'] = '\n'.join(content['text'])
-
-            obj = Translation(content)
-            return obj
+            return _build_translation(dct)
         elif class_name == classname(TranslationPrompt):
-            user_prompt = dct.get('user_prompt')
-            conversation = dct.get('conversation')
-            obj = TranslationPrompt(user_prompt, conversation)
-            obj.supports_system_messages = dct.get('supports_system_messages')
-            obj.supports_system_prompt = dct.get('supports_system_prompt')
-            obj.batch_prompt = dct.get('batch_prompt')
-            obj.messages = dct.get('messages')
-            return obj
+            return _build_prompt(dct)
         elif class_name == classname(TranslationError):
             return TranslationError(dct.get('message'))
 
     return dct
+
+def _build_subtitles(dct : dict, scenes : list[SubtitleScene]) -> Subtitles:
+    sourcepath = dct.get('sourcepath')
+    outpath = dct.get('outputpath') or dct.get('filename')
+    obj = Subtitles(sourcepath, outpath)
+    obj.settings = dct.get('settings', {}) or dct.get('context', {})
+    obj.scenes = scenes
+    obj.UpdateProjectSettings(SettingsType()) # Force update for legacy files
+
+    if dct.get('blobs'):
+        # Prompts built by the object hook still contain references to the blob table
+        blobs = _BlobTable(dct['blobs'])
+        for scene in scenes:
+            for batch in scene.batches:
+                if batch.prompt:
+                    blobs.ResolvePrompt(batch.prompt)
+    return obj
+
+def _build_translation(dct : dict[str, Any]) -> Translation:
+    content = dct.get('content') or {
+        'text' : dct.get('text'),
+        'finish_reason' : dct.get('finish_reason'),
+        'response_time' : dct.get('response_time'),
+        'prompt_tokens' : dct.get('prompt_tokens'),
+        'output_tokens' : dct.get('completion_tokens'),
+        'reasoning_tokens' : dct.get('reasoning_tokens'),
+        'accepted_prediction_tokens' : dct.get('accepted_prediction_tokens'),
+        'rejected_prediction_tokens' : dct.get('rejected_prediction_tokens'),
+        'total_tokens' : dct.get('total_tokens'),
+        'summary': dct.get('summary'),
+        'scene': dct.get('scene'),
+        'synopsis': dct.get('synopsis'),
+        'names': dct.get('names') or dct.get('characters')
+        }
+
+    text = content.get('text')
+    if isinstance(text, list):
+        # This shouldn't happen, but try to recover if it does
+        content['text'] = '\n'.join(str(item) for item in text)
+
+    return Translation(content)
+
+def _build_prompt(dct : dict[str, Any]) -> TranslationPrompt:
+    # The user prompt may still be a reference to the blob table, which is resolved later
+    obj = TranslationPrompt(dct.get('user_prompt') or "", bool(dct.get('conversation')))
+    obj.supports_system_messages = bool(dct.get('supports_system_messages'))
+    obj.supports_system_prompt = bool(dct.get('supports_system_prompt'))
+    obj.batch_prompt = dct.get('batch_prompt')
+    obj.messages = dct.get('messages') or []
+    return obj
+
+#############################################################################
+# Project codec
+#############################################################################
+
+codec_backend : str = "orjson" if orjson else "msgspec" if msgspec else "json"
+
+class _BlobTable:
+    """
+    Content-addressed table of long strings that recur throughout a project, such as the instructions and user prompt
+    """
+    min_length : int = 64
+
+    def __init__(self, blobs : dict[str,str]|None = None):
+        self.blobs : dict[str,str] = blobs if blobs is not None else {}
+        self._keys : dict[str,str] = {}
+
+    def Store(self, text : Any) -> Any:
+        """
+        Add a string to the table and return a reference to it, or return the value unchanged if it is not worth storing
+        """
+        if not isinstance(text, str) or len(text) < self.min_length:
+            return text
+
+        key = self._keys.get(text)
+        if key is None:
+            key = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+            self._keys[text] = key
+            self.blobs[key] = text
+
+        return { "_blob": key }
+
+    def Resolve(self, value : Any) -> Any:
+        """
+        Return the string for a reference, or the value unchanged if it is not a reference
+        """
+        if not isinstance(value, dict) or '_blob' not in value:
+            return value
+
+        text = self.blobs.get(value['_blob'])
+        if text is None:
+            logging.warning(_("Missing prompt content {} in project file").format(value['_blob']))
+        return text
+
+    def ResolvePrompt(self, prompt : TranslationPrompt) -> TranslationPrompt:
+        """
+        Replace references in a prompt with the strings they refer to
+        """
+        prompt.user_prompt = self.Resolve(prompt.user_prompt)
+        prompt.batch_prompt = self.Resolve(prompt.batch_prompt)
+        if prompt.messages:
+            for message in prompt.messages:
+                if isinstance(message, dict) and 'content' in message:
+                    message['content'] = self.Resolve(message['content'])
+        return prompt
+
+def EncodeProject(subtitles : Subtitles, pretty : bool = False, include_prompts : bool = True, include_responses : bool = True, index : ProjectIndex|None = None) -> bytes:
+    """
+    Serialise subtitles to project file content (UTF-8 encoded JSON), compact unless pretty is specified.
+
+    The object tree is converted to plain data directly rather than through per-object encoder callbacks,
+    and written with the fastest JSON library available. The output can be read by SubtitleDecoder.
+
+    Long prompt strings (instructions, user prompt, batch prompt) are stored once in a blob table and referenced
+    by hash. Prompts and the raw text of translation responses can be omitted entirely.
+
+    If an index is provided the location of each prompt, response and blob in the output is recorded in it.
+    """
+    state = _EncodeState(include_prompts, include_responses, index)
+    data = _encode_subtitles(subtitles, state)
+    if state.blobs.blobs:
+        data["blobs"] = { key: state.AddFragment(text, { 'key': key }) for key, text in state.blobs.blobs.items() }
+
+    content = _dumps(data, pretty)
+
+    if index is not None:
+        content = _splice_fragments(content, state, index)
+
+    return content
+
+def DecodeProject(content : bytes|str) -> Subtitles:
+    """
+    Reconstruct subtitles from project file content.
+
+    The JSON is parsed to plain data with the fastest library available, then objects are built according to
+    the structure of the project instead of inspecting every dictionary. Raises json.JSONDecodeError if the
+    content is not valid JSON.
+    """
+    return _decode_project(_loads(content))
+
+def DecodeIndexedProject(filepath : str, index : ProjectIndex) -> Subtitles:
+    """
+    Reconstruct subtitles from a project file using its index.
+
+    Only the structure and lines of the project are read. Prompts and responses are left in the file,
+    to be read (through a memory map) and decoded when they are accessed.
+    """
+    source = ProjectContentSource(filepath, index.blobs)
+
+    # Read everything except the indexed content, which is replaced with nulls
+    parts : list[bytes] = []
+    position = 0
+    for start, end in index.GetRanges():
+        parts.append(source.Read(position, start))
+        parts.append(b'null')
+        position = end
+    parts.append(source.Read(position, index.filesize))
+
+    subtitles = _decode_project(_loads(b''.join(parts)))
+    if not isinstance(subtitles, Subtitles):
+        raise ValueError(_("Project file does not match its index"))
+
+    batches = { (batch.scene, batch.number): batch for scene in subtitles.scenes for batch in scene.batches }
+    for fragment in index.fragments:
+        batch = batches.get((fragment['scene'], fragment['batch']))
+        if batch is None:
+            raise ValueError(_("Project file does not match its index"))
+
+        build = _load_lazy_prompt if fragment['kind'] == 'prompt' else _load_lazy_translation
+        batch.SetLazyContent(fragment['kind'], LazyContent(source, fragment['start'], fragment['end'], build, fragment.get('blobs')))
+
+    return subtitles
+
+def EncodeValue(value : Any) -> bytes:
+    """
+    Serialise a value that is part of a project, such as settings or context, to compact UTF-8 encoded JSON
+    """
+    return _dumps(value)
+
+def DecodeValue(content : bytes|str) -> Any:
+    """
+    Reconstruct a value serialised with EncodeValue
+    """
+    return _decode_generic(_loads(content))
+
+def EncodeBatchContent(batch : SubtitleBatch, blobs : dict[str,str], include_prompts : bool = True, include_responses : bool = True) -> tuple[bytes|None, bytes|None, bytes|None]:
+    """
+    Serialise the errors, translation and prompt of a batch, for storing separately from its lines.
+    Long prompt strings are added to the blobs dictionary and referenced by key, as they are in a project file.
+    """
+    errors = _dumps(batch.errors) if batch.errors else None
+
+    translation = None
+    if batch.translation is not None:
+        content = batch.translation.content
+        if not include_responses:
+            content = { key: value for key, value in content.items() if key != 'text' }
+        translation = _dumps({ "_class": "Translation", "content": content })
+
+    prompt = None
+    if include_prompts and batch.prompt is not None:
+        prompt = _dumps(_encode_prompt(batch.prompt, _BlobTable(blobs)))
+
+    return errors, translation, prompt
+
+def DecodeBatchContent(errors : bytes|str|None, translation : bytes|str|None, prompt : bytes|str|None, blobs : dict[str,str]) -> tuple[list, Translation|None, TranslationPrompt|None]:
+    """
+    Reconstruct the errors, translation and prompt of a batch serialised with EncodeBatchContent
+    """
+    decoded_errors = _decode_generic(_loads(errors)) if errors else []
+
+    translation_data = _loads(translation) if translation else None
+    decoded_translation = _build_translation(translation_data) if isinstance(translation_data, dict) else None
+
+    prompt_data = _loads(prompt) if prompt else None
+    decoded_prompt = _BlobTable(blobs).ResolvePrompt(_build_prompt(prompt_data)) if isinstance(prompt_data, dict) else None
+
+    return decoded_errors, decoded_translation, decoded_prompt
+
+def _dumps(data : Any, pretty : bool = False) -> bytes:
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, default=_encode_default, option=option)
+
+    if msgspec:
+        content = msgspec.json.Encoder(enc_hook=_encode_default).encode(data)
+        return msgspec.json.format(content, indent=4) if pretty else content
+
+    if pretty:
+        return json.dumps(data, default=_encode_default, ensure_ascii=False, indent=4).encode('utf-8')
+
+    return json.dumps(data, default=_encode_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(content : bytes|str) -> Any:
+    """
+    Parse JSON with the fastest library available. Raises json.JSONDecodeError if the content cannot be decoded,
+    whichever library is used, so that readers only need to handle one type of error.
+    """
+    try:
+        if orjson:
+            return orjson.loads(content)
+
+        if msgspec:
+            try:
+                return msgspec.json.decode(content)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        return json.loads(content)
+
+    except json.JSONDecodeError:
+        raise
+
+    except ValueError as e:
+        # Includes invalid UTF-8, which the standard library reports as a UnicodeDecodeError
+        raise json.JSONDecodeError(str(e), content if isinstance(content, str) else '', 0) from e
+
+_encoder = SubtitleEncoder()
+
+def _encode_default(obj : Any) -> Any:
+    # Anything outside the project structure is converted the same way as SubtitleEncoder would
+    return _encoder.default(obj)
+
+class _EncodeState:
+    """
+    Options and data collected while a project is encoded
+    """
+    def __init__(self, include_prompts : bool, include_responses : bool, index : ProjectIndex|None):
+        self.include_prompts : bool = include_prompts
+        self.include_responses : bool = include_responses
+        self.blobs = _BlobTable()
+
+        # Content to be written separately when an index is being built, as (value, index entry, lazy content)
+        self.fragments : list[tuple[Any, dict[str,Any], LazyContent|None]]|None = [] if index is not None else None
+
+    def AddFragment(self, value : Any, entry : dict[str,Any]|None = None, lazy : LazyContent|None = None) -> Any:
+        """
+        Return a placeholder for indexed content, or the value itself if no index is being built
+        """
+        if self.fragments is None:
+            return value
+
+        self.fragments.append((value, entry or {}, lazy))
+        return _fragment_placeholder(len(self.fragments) - 1)
+
+def _fragment_placeholder(number : int) -> str:
+    return f"\x00fragment:{number}\x00"
+
+def _splice_fragments(content : bytes, state : _EncodeState, index : ProjectIndex) -> bytes:
+    """
+    Replace fragment placeholders with the encoded fragments, recording where each one is written
+    """
+    fragments = state.fragments or []
+    output : list[bytes] = []
+    position = 0
+    offset = 0
+    for number, (value, entry, lazy) in enumerate(fragments):
+        placeholder = _dumps(_fragment_placeholder(number))
+        found = content.find(placeholder, position)
+        if found < 0:
+            raise ValueError(f"Fragment {number} not found in project data")
+
+        output.append(content[position:found])
+        offset += found - position
+
+        encoded = _dumps(value)
+        output.append(encoded)
+        start, end = offset, offset + len(encoded)
+        offset = end
+        position = found + len(placeholder)
+
+        if 'key' in entry:
+            index.AddBlob(entry['key'], start, end)
+        else:
+            index.AddFragment(entry['scene'], entry['batch'], entry['kind'], start, end, entry.get('blobs'))
+
+        if lazy is not None:
+            index.rebind.append((lazy, start, end))
+
+    output.append(content[position:])
+    return b''.join(output)
+
+def _encode_subtitles(subtitles : Subtitles, state : _EncodeState) -> dict[str,Any]:
+    data : dict[str,Any] = { "_class": "Subtitles" }
+    if subtitles.sourcepath is not None:
+        data["sourcepath"] = subtitles.sourcepath
+    if subtitles.outputpath is not None:
+        data["outputpath"] = subtitles.outputpath
+    data["scenecount"] = len(subtitles.scenes)
+    data["settings"] = dict(subtitles.settings or {})
+    data["scenes"] = [ _encode_scene(scene, state) for scene in subtitles.scenes ]
+    return data
+
+def _encode_scene(scene : SubtitleScene, state : _EncodeState) -> dict[str,Any]:
+    batches = [ _encode_batch(batch, state) for batch in scene.batches ]
+    return {
+        "_class": "SubtitleScene",
+        "scene": scene.number,
+        "batchcount": len(batches),
+        "linecount": sum(batch["size"] for batch in batches),
+        "all_translated": all(batch["all_translated"] for batch in batches),
+        "context": {
+            "summary": scene.context.get('summary'),
+            "history": scene.context.get('history') or scene.context.get('summaries')
+        },
+        "batches": batches
+    }
+
+def _encode_batch(batch : SubtitleBatch, state : _EncodeState) -> dict[str,Any]:
+    data : dict[str,Any] = {
+        "_class": "SubtitleBatch",
+        "scene": batch.scene,
+        "batch": batch.number,
+        "size": batch.size,
+        "all_translated": batch.all_translated
+    }
+    if batch.errors:
+        data["errors"] = batch.errors
+    if batch.summary is not None:
+        data["summary"] = batch.summary
+    data["originals"] = [ _encode_line(line) for line in batch._originals ]
+    data["translated"] = [ _encode_line(line) for line in batch._translated ]
+    data["context"] = {
+        "summary": batch.context.get('summary'),
+        "history": batch.context.get('history') or batch.context.get('summaries')
+    }
+
+    lazy = batch._lazy or {}
+
+    # Content that has not been loaded is copied from the project file it was read from
+    translation = _loads(lazy['translation'].Read()) if 'translation' in lazy else None
+    if translation is None and batch._translation is not None:
+        translation = { "_class": "Translation", "content": batch._translation.content }
+
+    if translation is not None:
+        if not state.include_responses:
+            # The response text duplicates the translated lines, keep just the metadata
+            content = translation.get('content') or {}
+            translation = { **translation, "content": { key: value for key, value in content.items() if key != 'text' } }
+        entry = { 'scene': batch.scene, 'batch': batch.number, 'kind': 'translation' }
+        data["translation"] = state.AddFragment(translation, entry, lazy.get('translation'))
+
+    if state.include_prompts:
+        prompt = None
+        if 'prompt' in lazy:
+            prompt = _loads(lazy['prompt'].Read())
+            for key in lazy['prompt'].blob_keys:
+                if key not in state.blobs.blobs:
+                    state.blobs.blobs[key] = _loads(lazy['prompt'].ReadBlob(key) or b'null')
+        elif batch._prompt is not None:
+            prompt = _encode_prompt(batch._prompt, state.blobs)
+
+        if prompt is not None:
+            entry = { 'scene': batch.scene, 'batch': batch.number, 'kind': 'prompt', 'blobs': _prompt_blob_keys(prompt) }
+            data["prompt"] = state.AddFragment(prompt, entry, lazy.get('prompt'))
+
+    return data
+
+def _encode_line(line : SubtitleLine) -> dict[str,Any]:
+    data : dict[str,Any] = { "_class": "SubtitleLine" }
+    if line._index is not None:
+        data["index"] = line._index
+    data["start"] = (line._start_ms or 0) / 1000
+    data["end"] = (line._end_ms or 0) / 1000
+    if line.content is not None:
+        data["content"] = line.content
+    data["metadata"] = dict(line._metadata) if line._metadata else {}
+    if line.translation is not None:
+        data["translation"] = line.translation
+    if line.original is not None:
+        data["original"] = line.original
+    return data
+
+def _encode_prompt(prompt : TranslationPrompt, blobs : _BlobTable) -> dict[str,Any]:
+    messages = prompt.messages
+    if messages:
+        messages = [ { **message, 'content': blobs.Store(message['content']) } if 'content' in message else message for message in messages ]
+
+    data : dict[str,Any] = {
+        "_class": "TranslationPrompt",
+        "user_prompt": blobs.Store(prompt.user_prompt),
+        "batch_prompt": blobs.Store(prompt.batch_prompt),
+        "messages": messages,
+        "supports_system_messages": prompt.supports_system_messages,
+        "supports_system_prompt": prompt.supports_system_prompt,
+        "conversation": prompt.conversation
+    }
+    return { key: value for key, value in data.items() if value is not None }
+
+def _prompt_blob_keys(prompt : dict[str,Any]) -> list[str]:
+    values = [ prompt.get('user_prompt'), prompt.get('batch_prompt') ]
+    values.extend(message.get('content') for message in prompt.get('messages') or [] if isinstance(message, dict))
+    return [ value['_blob'] for value in values if isinstance(value, dict) and '_blob' in value ]
+
+def _load_lazy_translation(content : LazyContent) -> Translation|None:
+    data = _loads(content.Read())
+    return _build_translation(data) if isinstance(data, dict) else None
+
+def _load_lazy_prompt(content : LazyContent) -> TranslationPrompt|None:
+    data = _loads(content.Read())
+    if not isinstance(data, dict):
+        return None
+
+    blobs = _BlobTable({ key: _loads(content.ReadBlob(key) or b'null') for key in content.blob_keys })
+    return blobs.ResolvePrompt(_build_prompt(data))
+
+def _decode_project(data : Any) -> Any:
+    if not isinstance(data, dict) or data.get('_class') not in {classname(Subtitles), "SubtitleFile"}:
+        return _decode_generic(data)
+
+    blobs = _BlobTable(data.pop('blobs', None))
+    scenes = [ _decode_scene(scene, blobs) for scene in data.get('scenes') or [] ]
+    settings = data.get('settings')
+    if settings:
+        data['settings'] = _decode_generic(settings)
+    return _build_subtitles(data, scenes)
+
+def _decode_scene(data : Any, blobs : _BlobTable) -> Any:
+    if not isinstance(data, dict) or data.get('_class') != classname(SubtitleScene):
+        return _decode_generic(data)
+
+    data['batches'] = [ _decode_batch(batch, blobs) for batch in data.get('batches') or [] ]
+    return SubtitleScene(data)
+
+def _decode_batch(data : Any, blobs : _BlobTable) -> Any:
+    if not isinstance(data, dict) or data.get('_class') != classname(SubtitleBatch):
+        return _decode_generic(data)
+
+    originals = data.get('originals') or data.get('subtitles')
+    if originals:
+        data['originals'] = [ _decode_line(line) for line in originals ]
+        data.pop('subtitles', None)
+
+    translated = data.get('translated')
+    if translated:
+        data['translated'] = [ _decode_line(line) for line in translated ]
+
+    translation = data.get('translation')
+    if isinstance(translation, dict) and translation.get('_class') in {classname(Translation), "GPTTranslation"}:
+        data['translation'] = _build_translation(translation)
+    elif translation is not None:
+        data['translation'] = _decode_generic(translation)
+
+    prompt = data.get('prompt')
+    if isinstance(prompt, dict) and prompt.get('_class') == classname(TranslationPrompt):
+        data['prompt'] = blobs.ResolvePrompt(_build_prompt(prompt))
+    elif prompt is not None:
+        data['prompt'] = _decode_generic(prompt)
+
+    return SubtitleBatch(data)
+
+_line_classes = { classname(SubtitleLine), "Subtitle" }
+
+def _decode_line(data : Any) -> Any:
+    if not isinstance(data, dict) or 'line' in data or data.get('_class') not in _line_classes:
+        return _decode_generic(data)
+
+    start = data.get('start')
+    end = data.get('end')
+    content = data.get('content') or data.get('text') or data.get('body')
+    return SubtitleLine.FromFields(
+        int(data.get('index') or data.get('number') or 0),
+        round(start * 1000000) // 1000 if type(start) is float else _seconds_to_milliseconds(start),
+        round(end * 1000000) // 1000 if type(end) is float else _seconds_to_milliseconds(end),
+        content.strip() if type(content) is str else str(content).strip() if content else None,
+        data.get('metadata') or None,
+        data.get('translation'),
+        data.get('original')
+    )
+
+def _seconds_to_milliseconds(value : Any) -> int|None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Equivalent to converting to a timedelta and truncating to whole milliseconds
+        return round(value * 1000000) // 1000
+    return TimedeltaToMilliseconds(GetTimeDeltaSafe(value))
+
+def _decode_generic(data : Any) -> Any:
+    """
+    Convert plain data the same way as SubtitleDecoder, for content outside the expected project structure
+    """
+    if isinstance(data, list):
+        return [ _decode_generic(item) for item in data ]
+
+    if isinstance(data, dict):
+        return _object_hook({ key: _decode_generic(value) for key, value in data.items() })
+
+    return data
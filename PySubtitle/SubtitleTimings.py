@@ -0,0 +1,204 @@
+import bisect
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from PySubtitle.Helpers.Time import TimedeltaToMilliseconds
+from PySubtitle.SubtitleLine import SubtitleLine
+
+# NumPy is optional; the same operations are implemented on lists without it, and it is only used if numpy_available is True
+if TYPE_CHECKING:
+    import numpy
+    numpy_available : bool = True
+else:
+    try:
+        import numpy
+        numpy_available = True
+    except ImportError:  # pragma: no cover - environment without NumPy
+        numpy_available = False
+
+class SubtitleTimings:
+    """
+    Columnar view of the start and end times of a list of lines, in integer milliseconds.
+
+    Operations are applied to every line at once (vectorised when NumPy is available),
+    and nothing is changed on the lines until WriteBack is called.
+    """
+    def __init__(self, lines : list[SubtitleLine], use_numpy : bool = True):
+        self.lines : list[SubtitleLine] = lines
+        self.use_numpy : bool = use_numpy and numpy_available
+
+        starts = [ line.start_ms for line in lines ]
+        ends = [ line.end_ms for line in lines ]
+        self._original_starts : list[int] = starts
+        self._original_ends : list[int] = ends
+
+        if self.use_numpy:
+            self.starts : Any = numpy.array(starts, dtype=numpy.int64)
+            self.ends : Any = numpy.array(ends, dtype=numpy.int64)
+        else:
+            self.starts = list(starts)
+            self.ends = list(ends)
+
+    @property
+    def count(self) -> int:
+        return len(self.lines)
+
+    def Durations(self) -> list[int]:
+        """
+        Get the duration of each line in milliseconds
+        """
+        if self.use_numpy:
+            return (self.ends - self.starts).tolist()
+
+        return [ end - start for start, end in zip(self.starts, self.ends) ]
+
+    def Gaps(self) -> list[int]:
+        """
+        Get the gap before each line in milliseconds (the first line has no gap)
+        """
+        if not self.count:
+            return []
+
+        if self.use_numpy:
+            gaps = numpy.zeros(self.count, dtype=numpy.int64)
+            gaps[1:] = self.starts[1:] - self.ends[:-1]
+            return gaps.tolist()
+
+        return [ 0 ] + [ start - end for start, end in zip(self.starts[1:], self.ends) ]
+
+    def FindGaps(self, longer_than : timedelta) -> list[int]:
+        """
+        Get the index of each line that follows a gap longer than the given duration
+        """
+        threshold : float = longer_than.total_seconds() * 1000.0
+        if self.use_numpy:
+            return (numpy.flatnonzero(self.starts[1:] - self.ends[:-1] > threshold) + 1).tolist()
+
+        return [ index for index, gap in enumerate(self.Gaps()) if index > 0 and gap > threshold ]
+
+    def GapHistogram(self, bin_edges : list[timedelta]) -> list[int]:
+        """
+        Count the gaps between lines that fall into each bin [edge, next_edge) - gaps beyond the last edge are counted in the last bin
+        """
+        edges : list[int] = [ TimedeltaToMilliseconds(edge) or 0 for edge in bin_edges ]
+        gaps : list[int] = self.Gaps()[1:]
+        if len(edges) < 2:
+            raise ValueError("At least two bin edges are required")
+
+        if self.use_numpy:
+            indices = numpy.searchsorted(numpy.array(edges), numpy.array(gaps, dtype=numpy.int64), side='right') - 1
+            indices = indices[indices >= 0]
+            counts = numpy.bincount(numpy.minimum(indices, len(edges) - 2), minlength=len(edges) - 1)
+            return counts.tolist()
+
+        counts = [ 0 ] * (len(edges) - 1)
+        for gap in gaps:
+            index = bisect.bisect_right(edges, gap) - 1
+            if index >= 0:
+                counts[min(index, len(counts) - 1)] += 1
+        return counts
+
+    def FilterByDuration(self, longer_than : timedelta|None = None, shorter_than : timedelta|None = None) -> list[int]:
+        """
+        Get the index of each line whose duration is within the (exclusive) limits
+        """
+        longer_than_ms : float = longer_than.total_seconds() * 1000.0 if longer_than is not None else -1.0
+        shorter_than_ms : float|None = shorter_than.total_seconds() * 1000.0 if shorter_than is not None else None
+
+        if self.use_numpy:
+            durations = self.ends - self.starts
+            mask = durations > longer_than_ms
+            if shorter_than_ms is not None:
+                mask &= durations < shorter_than_ms
+            return numpy.flatnonzero(mask).tolist()
+
+        return [ index for index, duration in enumerate(self.Durations()) if duration > longer_than_ms and (shorter_than_ms is None or duration < shorter_than_ms) ]
+
+    def Shift(self, offset : timedelta) -> None:
+        """
+        Move every line by the offset, without moving any line before zero
+        """
+        offset_ms : int = TimedeltaToMilliseconds(offset) or 0
+        if self.use_numpy:
+            self.starts = numpy.maximum(self.starts + offset_ms, 0)
+            self.ends = numpy.maximum(self.ends + offset_ms, 0)
+        else:
+            self.starts = [ max(start + offset_ms, 0) for start in self.starts ]
+            self.ends = [ max(end + offset_ms, 0) for end in self.ends ]
+
+    def ConvertFramerate(self, source_fps : float, target_fps : float) -> None:
+        """
+        Rescale the timings of subtitles synchronised to a video at the source framerate for the same video at the target framerate
+        """
+        if source_fps <= 0 or target_fps <= 0:
+            raise ValueError(f"Invalid framerate conversion {source_fps} -> {target_fps}")
+
+        ratio : float = source_fps / target_fps
+        if self.use_numpy:
+            self.starts = numpy.rint(self.starts * ratio).astype(numpy.int64)
+            self.ends = numpy.rint(self.ends * ratio).astype(numpy.int64)
+        else:
+            self.starts = [ round(start * ratio) for start in self.starts ]
+            self.ends = [ round(end * ratio) for end in self.ends ]
+
+    def FixOverlaps(self, gap : timedelta = timedelta(milliseconds=10)) -> int:
+        """
+        Move the start of any line that begins before the previous line ends to just after it. Returns the number of lines moved.
+        """
+        gap_ms : int = TimedeltaToMilliseconds(gap) or 0
+        if self.count < 2:
+            return 0
+
+        if self.use_numpy:
+            previous_ends = self.ends[:-1]
+            overlapping = self.starts[1:] < previous_ends
+            self.starts[1:][overlapping] = previous_ends[overlapping] + gap_ms
+            return int(numpy.count_nonzero(overlapping))
+
+        fixed = 0
+        for index in range(1, self.count):
+            if self.starts[index] < self.ends[index - 1]:
+                self.starts[index] = self.ends[index - 1] + gap_ms
+                fixed += 1
+        return fixed
+
+    def EnforceMinGap(self, min_gap : timedelta) -> int:
+        """
+        Shorten any line that ends less than min_gap before the next line starts (but not before it starts). Returns the number of lines shortened.
+        """
+        min_gap_ms : int = TimedeltaToMilliseconds(min_gap) or 0
+        if self.count < 2:
+            return 0
+
+        if self.use_numpy:
+            latest_ends = numpy.maximum(self.starts[1:] - min_gap_ms, self.starts[:-1])
+            shortened = self.ends[:-1] > latest_ends
+            self.ends[:-1][shortened] = latest_ends[shortened]
+            return int(numpy.count_nonzero(shortened))
+
+        shortened_count = 0
+        for index in range(self.count - 1):
+            latest_end = max(self.starts[index + 1] - min_gap_ms, self.starts[index])
+            if self.ends[index] > latest_end:
+                self.ends[index] = latest_end
+                shortened_count += 1
+        return shortened_count
+
+    def WriteBack(self) -> int:
+        """
+        Update the lines whose timings have changed. Returns the number of lines updated.
+        """
+        starts : list[int] = self.starts.tolist() if self.use_numpy else self.starts
+        ends : list[int] = self.ends.tolist() if self.use_numpy else self.ends
+
+        updated = 0
+        for index, line in enumerate(self.lines):
+            start, end = starts[index], ends[index]
+            if start != self._original_starts[index] or end != self._original_ends[index]:
+                line.start_ms = start
+                line.end_ms = end
+                updated += 1
+
+        self._original_starts = list(starts)
+        self._original_ends = list(ends)
+        return updated
@@ -1,7 +1,7 @@
 from os import linesep
 import logging
 import threading
-from typing import Any
+from typing import Any, Iterable
 
 from PySubtitle.Helpers.Settings import GetStrSetting
 from PySubtitle.Helpers.Subtitles import MergeTranslations
@@ -22,7 +22,7 @@ from PySubtitle.SubtitleBatch import SubtitleBatch
 from PySubtitle.SubtitleError import NoProviderError, NoTranslationError, ProviderError, SubtitleError, TranslationAbortedError, TranslationError, TranslationImpossibleError
 from PySubtitle.Helpers import FormatErrorMessages
 from PySubtitle.Subtitles import Subtitles
-from PySubtitle.SubtitleScene import SubtitleScene, UnbatchScenes
+from PySubtitle.SubtitleScene import SubtitleScene
 from PySubtitle.TranslationEvents import TranslationEvents
 from PySubtitle.TranslationPrompt import TranslationPrompt
 from PySubtitle.TranslationProvider import TranslationProvider
@@ -31,9 +31,9 @@ class SubtitleTranslator:
     """
     Processes subtitles into scenes and batches and sends them for translation
     """
-    def __init__(self, settings: Options, translation_provider: TranslationProvider):
+    def __init__(self, settings: Options, translation_provider: TranslationProvider, client: TranslationClient|None = None):
         """
-        Initialise a SubtitleTranslator with translation options
+        Initialise a SubtitleTranslator with translation options, optionally sharing a client with other translators
         """
         self.events = TranslationEvents()
         self.lock = threading.Lock()
@@ -78,7 +78,8 @@ class SubtitleTranslator:
             raise NoProviderError()
 
         try:
-            self.client : TranslationClient = self.translation_provider.GetTranslationClient(self.settings)
+            self.client : TranslationClient = client or self.translation_provider.GetTranslationClient(self.settings)
+            self.shared_client : bool = client is not None
 
         except Exception as e:
             raise ProviderError(_("Unable to create provider client: {error}").format(error=str(e)), translation_provider)
@@ -92,7 +93,10 @@ class SubtitleTranslator:
 
     def StopTranslating(self):
         self.aborted = True
-        self.client.AbortTranslation()
+
+        # A shared client is aborted by its owner, as it may be translating for other translators
+        if not self.shared_client:
+            self.client.AbortTranslation()
 
     def TranslateSubtitles(self, subtitles : Subtitles):
         """
@@ -117,44 +121,23 @@ class SubtitleTranslator:
 
         self.events.preprocessed(subtitles.scenes)
 
-        # Iterate over each subtitle scene and request translation
-        for scene in subtitles.scenes:
-            if self.aborted:
-                break
-
-            if self.max_lines and self.lines_processed >= self.max_lines:
-                break
-
-            if self.resume and scene.all_translated:
-                logging.info(_("Scene {scene} already translated {linecount} lines...").format(scene=scene.number, linecount=scene.linecount))
-                continue
-
-            logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
-            batch_numbers = [ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
-
-            self.TranslateScene(subtitles, scene, batch_numbers=batch_numbers)
-
-            if self.errors and self.stop_on_error:
-                logging.error(_("Failed to translate scene {scene}... stopping translation").format(scene=scene.number))
-                return
-
-        if self.aborted:
-            logging.info(_("Translation aborted"))
+        if not self._translate_scenes(subtitles, subtitles.scenes):
             return
 
-        # Linearise the translated scenes
-        originals, translations, untranslated = UnbatchScenes(subtitles.scenes)
+        self._finish_translation(subtitles)
 
-        if translations:
-            logging.info(_("Successfully translated {count} lines!").format(count=len(translations)))
+    def TranslateStreamingScenes(self, subtitles : Subtitles, scenes : Iterable[SubtitleScene]):
+        """
+        Translate scenes as they are produced (e.g. by Subtitles.StreamScenes), without waiting for the whole file to be batched.
+        The scenes are expected to be added to the subtitles as they are produced, since they are all needed to finish the translation.
+        """
+        if not self._translate_scenes(subtitles, scenes, streaming=True):
+            return
 
-        if untranslated and not self.max_lines:
-            logging.warning(_("Failed to translate {count} lines:").format(count=len(untranslated)))
-            for line in untranslated:
-                logging.info(_("Untranslated > {number}. {text}").format(number=line.number, text=line.text))
+        if not subtitles.scenes:
+            raise TranslationImpossibleError(_("No scenes to translate"))
 
-        subtitles.originals = originals
-        subtitles.translated = translations
+        self._finish_translation(subtitles)
 
     def TranslateScene(self, subtitles : Subtitles, scene : SubtitleScene, batch_numbers = None, line_numbers = None):
         """
@@ -324,6 +307,7 @@ class SubtitleTranslator:
             translated = [line for line in translated if line.number in line_numbers]
 
         batch._translated = MergeTranslations(batch.translated or [], translated)
+        batch.MarkModified()
 
         batch.translation = translation
         batch.errors = [err for err in parser.errors if isinstance(err, str) or isinstance(err, SubtitleError)]
@@ -353,6 +337,9 @@ class SubtitleTranslator:
                 untranslated=len(batch.untranslated or []))
                 )
 
+        # Record the substitutions and post-processing so they are included in the next snapshot
+        batch.MarkModified()
+
         if translation.summary and translation.summary.strip():
             logging.info(_("Summary: {summary}").format(summary=translation.summary))
 
@@ -401,6 +388,58 @@ class SubtitleTranslator:
         else:
             logging.info(_("Retry passed validation"))
 
+    def _translate_scenes(self, subtitles : Subtitles, scenes : Iterable[SubtitleScene], streaming : bool = False) -> bool:
+        """
+        Request translation of each scene in turn, returning False if translation stopped because of errors
+        """
+        for scene in scenes:
+            if streaming:
+                # Notify observers of each scene as it arrives
+                self.events.preprocessed([scene])
+
+            if self.aborted:
+                break
+
+            if self.max_lines and self.lines_processed >= self.max_lines:
+                break
+
+            if self.resume and scene.all_translated:
+                logging.info(_("Scene {scene} already translated {linecount} lines...").format(scene=scene.number, linecount=scene.linecount))
+                continue
+
+            logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
+            batch_numbers = [ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
+
+            self.TranslateScene(subtitles, scene, batch_numbers=batch_numbers)
+
+            if self.errors and self.stop_on_error:
+                logging.error(_("Failed to translate scene {scene}... stopping translation").format(scene=scene.number))
+                return False
+
+        return True
+
+    def _finish_translation(self, subtitles : Subtitles):
+        """
+        Collect the translated lines from the scenes and report any that were not translated
+        """
+        if self.aborted:
+            logging.info(_("Translation aborted"))
+            return
+
+        # Linearise the translated scenes
+        originals, translations, untranslated = subtitles.Linearise()
+
+        if translations:
+            logging.info(_("Successfully translated {count} lines!").format(count=len(translations)))
+
+        if untranslated and not self.max_lines:
+            logging.warning(_("Failed to translate {count} lines:").format(count=len(untranslated)))
+            for line in untranslated:
+                logging.info(_("Untranslated > {number}. {text}").format(number=line.number, text=line.text))
+
+        subtitles.originals = list(originals)
+        subtitles.translated = list(translations)
+
     def _get_best_summary(self, candidates : list[str|None]) -> str|None:
         """
         Generate a summary of the translated subtitles
@@ -4,8 +4,10 @@ from copy import deepcopy
 import os
 import logging
 import threading
-from typing import Any
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterable, Iterator
 import bisect
+from PySubtitle.Helpers.Encoding import DetectEncoding
 from PySubtitle.Helpers.Text import IsRightToLeftText
 from PySubtitle.Helpers.Localization import _
 from PySubtitle.Instructions import DEFAULT_TASK_TYPE
@@ -20,8 +22,12 @@ from PySubtitle.Helpers.Parse import ParseNames
 from PySubtitle.SubtitleProcessor import SubtitleProcessor
 from PySubtitle.SubtitleScene import SubtitleScene, UnbatchScenes
 from PySubtitle.SubtitleLine import SubtitleLine
-from PySubtitle.SubtitleBatcher import SubtitleBatcher
-from PySubtitle.Formats.SrtFileHandler import SrtFileHandler
+from PySubtitle.SubtitleBatcher import BatchingDiff, SubtitleBatcher
+from PySubtitle.ReadWriteLock import ReadWriteLock
+from PySubtitle.SubtitleIndex import SubtitleIndex
+from PySubtitle.SubtitleTimings import SubtitleTimings
+from PySubtitle.SubtitleFileHandler import SubtitleFileHandler
+from PySubtitle.SubtitleFormatRegistry import SubtitleFormatRegistry, detection_sample_size
 
 default_encoding = os.getenv('DEFAULT_ENCODING', 'utf-8')
 fallback_encoding = os.getenv('DEFAULT_ENCODING', 'iso-8859-1')
@@ -45,15 +51,29 @@ class Subtitles:
         'substitution_mode': None,
         'include_original': None,
         'add_right_to_left_markers': None,
-        'instruction_file': None
+        'instruction_file': None,
+        'encoding': None
     })
 
     def __init__(self, filepath: str|None = None, outputpath: str|None = None) -> None:
-        self.originals : list[SubtitleLine]|None = None
-        self.translated : list[SubtitleLine]|None = None
+        self._originals : list[SubtitleLine]|None = None
+        self._translated : list[SubtitleLine]|None = None
+        self._index : SubtitleIndex|None = None
+        self._linear_state : tuple|None = None
+        self._linear_lines : tuple[list[SubtitleLine], list[SubtitleLine], list[SubtitleLine]]|None = None
         self.start_line_number : int = 1
         self._scenes : list[SubtitleScene] = []
-        self.lock = threading.RLock()
+        self._format_metadata : dict[str, Any]|None = None
+
+        # Structural changes take the (exclusive) lock, lookups and changes confined to one scene take the (shared) read lock
+        self._rwlock = ReadWriteLock()
+        self.lock = self._rwlock.write_lock
+        self.read_lock = self._rwlock.read_lock
+        self._lines_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        # The index and linearisation caches are rebuilt by readers, so they have their own lock
+        self._cache_lock = threading.Lock()
 
         self.sourcepath : str|None = GetInputPath(filepath)
         self.outputpath : str|None = outputpath or None
@@ -78,24 +98,63 @@ class Subtitles:
 
     @property
     def linecount(self) -> int:
-        with self.lock:
+        with self.read_lock:
             return len(self.originals) if self.originals else 0
 
     @property
     def scenecount(self) -> int:
-        with self.lock:
+        with self.read_lock:
             return len(self.scenes) if self.scenes else 0
 
+    @property
+    def lock_wait_time(self) -> tuple[float, float]:
+        """ Total time in seconds that threads have spent waiting for the read lock and the (exclusive) lock """
+        return self._rwlock.read_wait_time, self._rwlock.write_wait_time
+
+    @property
+    def translated_linecount(self) -> int:
+        """ Number of lines in the scenes which have been translated """
+        with self.read_lock:
+            return sum(scene.translated_linecount for scene in self.scenes)
+
+    @property
+    def untranslated_linecount(self) -> int:
+        """ Number of lines in the scenes which have not been translated """
+        with self.read_lock:
+            return sum(scene.untranslated_linecount for scene in self.scenes)
+
     @property
     def scenes(self) -> list[SubtitleScene]:
         return self._scenes
 
+    @property
+    def originals(self) -> list[SubtitleLine]|None:
+        return self._originals
+
+    @property
+    def translated(self) -> list[SubtitleLine]|None:
+        return self._translated
+
     @scenes.setter
     def scenes(self, scenes: list[SubtitleScene]):
         with self.lock:
             self._scenes = scenes
-            self.originals, self.translated, dummy = UnbatchScenes(scenes) # type: ignore[unused-ignore]
+            originals, translated, dummy = self.Linearise()
+            self.originals, self.translated = list(originals), list(translated)
             self.start_line_number = (self.originals[0].number if self.originals else 1) or 1
+            self._invalidate_index()
+
+    @originals.setter
+    def originals(self, originals: list[SubtitleLine]|None):
+        with self.lock:
+            self._originals = originals
+            self._invalidate_index()
+
+    @translated.setter
+    def translated(self, translated: list[SubtitleLine]|None):
+        with self.lock:
+            self._translated = translated
+            self._invalidate_index()
 
     def GetScene(self, scene_number : int) -> SubtitleScene:
         """
@@ -104,8 +163,15 @@ class Subtitles:
         if not self.scenes:
             raise SubtitleError("Subtitles have not been batched")
 
-        with self.lock:
+        with self.read_lock:
+            index = self._get_index()
+            scene = index.scenes.get(scene_number)
+            if scene is not None and scene.number == scene_number and not index.has_duplicate_scenes:
+                return scene
+
             matches = [ scene for scene in self.scenes if scene.number == scene_number ]
+            if matches:
+                self._invalidate_index()
 
         if not matches:
             raise SubtitleError(f"Scene {scene_number} does not exist")
@@ -119,10 +185,15 @@ class Subtitles:
         """
         Get a batch by scene and batch number
         """
-        with self.lock:
+        with self.read_lock:
+            batch = self._get_index().batches.get((scene_number, batch_number))
+            if batch is not None and batch.scene == scene_number and batch.number == batch_number:
+                return batch
+
             scene = self.GetScene(scene_number)
             for batch in scene.batches:
                 if batch.number == batch_number:
+                    self._invalidate_index()
                     return batch
 
         raise SubtitleError(f"Scene {scene_number} batch {batch_number} doesn't exist")
@@ -132,16 +203,24 @@ class Subtitles:
         Get a line by number
         """
         if self.originals:
-            with self.lock:
-                return next((line for line in self.originals if line.number == line_number), None)
+            with self.read_lock:
+                return self._find_line(self._get_index().originals, self.originals, line_number)
 
     def GetTranslatedLine(self, line_number : int) -> SubtitleLine|None:
         """
         Get a translated line by number
         """
         if self.translated:
-            with self.lock:
-                return next((line for line in self.translated if line.number == line_number), None)
+            with self.read_lock:
+                return self._find_line(self._get_index().translated, self.translated, line_number)
+
+    def GetTimings(self, translated : bool = False) -> SubtitleTimings:
+        """
+        Get a columnar view of the start and end times of the original (or translated) lines, for bulk timing operations
+        """
+        with self.read_lock:
+            lines = self.translated if translated else self.originals
+            return SubtitleTimings(lines or [])
 
     def GetBatchContainingLine(self, line_number: int) -> SubtitleBatch|None:
         """
@@ -150,6 +229,12 @@ class Subtitles:
         if not self.scenes:
             raise SubtitleError("Subtitles have not been batched yet")
 
+        with self.read_lock:
+            batch = self._get_index().FindBatch(line_number)
+            if batch is not None and batch.first_line_number is not None and batch.first_line_number <= line_number <= (batch.last_line_number or 0):
+                return batch
+
+        # Fall back on a search in case the index is out of date or the line falls between batches
         for scene in self.scenes:
             if scene.first_line_number is not None and scene.first_line_number > line_number:
                 break
@@ -210,7 +295,7 @@ class Subtitles:
         """
         Get context for a batch of subtitles, by extracting summaries from previous scenes and batches
         """
-        with self.lock:
+        with self.read_lock:
             scene = self.GetScene(scene_number)
             if not scene:
                 raise SubtitleError(f"Failed to find scene {scene_number}")
@@ -242,9 +327,9 @@ class Subtitles:
 
         return context
 
-    def LoadSubtitles(self, filepath: str|None = None) -> None:
+    def LoadSubtitles(self, filepath: str|None = None, encoding: str|None = None) -> None:
         """
-        Load subtitles from an SRT file
+        Load subtitles from a subtitle file, detecting its encoding unless it is specified or already known
         """
         if filepath:
             self.sourcepath = GetInputPath(filepath)
@@ -253,59 +338,124 @@ class Subtitles:
         if not self.sourcepath:
             raise ValueError("No source path set for subtitles")
         
-        # Use file handler for format-agnostic loading
-        handler = SrtFileHandler()  # For now, we only support SRT
-        
-        try:
-            with open(self.sourcepath, 'r', encoding=default_encoding, newline='') as f:
-                lines = list(handler.parse_file(f))
-
-        except SubtitleParseError as e:
-            logging.warning(_("Error parsing SRT file... trying with fallback encoding: {}").format(str(e)))
+        error : SubtitleParseError|None = None
+        for source_encoding in self._get_source_encodings(encoding):
+            # Use file handler for format-agnostic loading
+            handler = SubtitleFormatRegistry.CreateHandlerForFile(self.sourcepath, source_encoding)
             try:
-                with open(self.sourcepath, 'r', encoding=fallback_encoding) as f:
+                with open(self.sourcepath, 'r', encoding=source_encoding, newline='') as f:
                     lines = list(handler.parse_file(f))
-            except SubtitleParseError as e2:
-                logging.error(_("Failed to parse SRT file with fallback encoding: {}").format(str(e2)))
-                raise e2
+                break
+
+            except SubtitleParseError as e:
+                logging.warning(_("Error parsing subtitle file as {}: {}").format(source_encoding, str(e)))
+                error = e
+        else:
+            logging.error(_("Failed to parse subtitle file: {}").format(str(error)))
+            raise error or SubtitleParseError(_("Unable to read {}").format(self.sourcepath))
 
         with self.lock:
             self._renumber_if_needed(lines)
             self.originals = lines
+            self.settings['encoding'] = source_encoding
+            self._record_format(handler)
+
+    def StreamScenes(self, batcher: SubtitleBatcher) -> Iterator[SubtitleScene]:
+        """
+        Load subtitles from the source file a scene at a time, so that translation can start before the whole file has been read and batched.
+
+        Each scene is added to the subtitles as soon as it is complete and kept for the rest of the run, since the project file,
+        the translated output and the context for later batches need all of the scenes. Streaming shortens the time until
+        translation starts - it does not reduce the memory used, which grows with the length of the file as it does when loading.
+        """
+        if not self.sourcepath:
+            raise ValueError("No source path set for subtitles")
+
+        with self.lock:
+            self._scenes = []
+            self.originals = []
+
+        scene_count = 0
+        error : Exception|None = None
+        for encoding in self._get_source_encodings():
+            handler = SubtitleFormatRegistry.CreateHandlerForFile(self.sourcepath, encoding)
+            try:
+                with open(self.sourcepath, 'r', encoding=encoding, newline='') as f:
+                    with self.lock:
+                        self.settings['encoding'] = encoding
+
+                    for scene in batcher.StreamScenes(self._number_lines(handler.parse_file(f))):
+                        with self.lock:
+                            self._scenes.append(scene)
+                            self.originals.extend(scene.originals or [])
+                            self._invalidate_index()
+
+                        scene_count += 1
+                        yield scene
+
+                with self.lock:
+                    self._record_format(handler)
+                return
+
+            except (SubtitleParseError, UnicodeDecodeError) as e:
+                # The encoding can only be changed if nothing has been passed on yet
+                if scene_count:
+                    raise
+
+                logging.warning(_("Error parsing subtitle file as {}: {}").format(encoding, str(e)))
+                error = e
+
+        raise error or SubtitleParseError(_("Unable to read {}").format(self.sourcepath))
 
     def LoadSubtitlesFromString(self, srt_string: str) -> None:
         """
-        Load subtitles from an SRT string
+        Load subtitles from a string, in any supported format (SRT unless another format is recognised)
         """
         # Use file handler for format-agnostic parsing
-        handler = SrtFileHandler()  # For now, we only support SRT
+        handler = SubtitleFormatRegistry.CreateHandler(sample=srt_string[:detection_sample_size])
         
         try:
             with self.lock:
                 lines = list(handler.parse_string(srt_string))
                 self._renumber_if_needed(lines)
                 self.originals = lines
+                self._record_format(handler)
 
         except SubtitleParseError as e:
             logging.error(_("Failed to parse SRT string: {}").format(str(e)))
 
+    def CreateOutputHandler(self, path: str) -> SubtitleFileHandler:
+        """
+        Create a handler to write a file in the format of its extension, or the format of the source file if it is not recognised.
+        Information from the source file, such as a header, is kept if the formats are the same.
+        """
+        source_format = SubtitleFormatRegistry.GetExtensionHandlerClass(self._get_setting_str('file_format'))
+        handler = SubtitleFormatRegistry.CreateHandler(path, default=source_format)
+
+        metadata = self._format_metadata or self.settings.get('format_metadata')
+        if source_format is type(handler) and isinstance(metadata, dict):
+            if metadata.get('source_metadata'):
+                metadata = self._read_source_metadata(source_format) or metadata
+            handler.metadata = dict(metadata)
+
+        return handler
+
     def SaveOriginal(self, path: str|None = None) -> None:
         """
-        Write original subtitles to an SRT file
+        Write original subtitles to a file, in the format of its extension
         """
         path = path or self.sourcepath
         if not path:
             raise ValueError("No file path set")
 
         # Use file handler for format-agnostic saving
-        handler = SrtFileHandler()  # For now, we only support SRT
+        handler = self.CreateOutputHandler(path)
 
-        with self.lock:
+        with self.read_lock:
             originals = self.originals
             if originals:
-                srtfile = handler.compose_lines(originals, reindex=False)
-                with open(path, 'w', encoding=default_encoding) as f:
-                    f.write(srtfile)
+                with open(path, 'w', encoding=default_encoding, newline=handler.get_output_newline()) as f:
+                    handler.write_lines(originals, f, reindex=False)
             else:
                 logging.warning(_("No original subtitles to save to {}").format(str(path)))
 
@@ -322,52 +472,82 @@ class Subtitles:
 
         outputpath = os.path.normpath(outputpath)
 
-        with self.lock:
+        with self.read_lock:
             if not self.scenes:
                 raise ValueError("No scenes in subtitles")
 
             # Linearise the translation
-            originals, translated, untranslated = UnbatchScenes(self.scenes) # type: ignore[unused-ignore]
+            originals, translated, untranslated = self.Linearise()
 
             if not translated:
                 logging.error(_("No subtitles translated"))
                 return
 
-            if self.settings.get('include_original'):
-                translated = self._merge_original_and_translated(originals, translated)
-
-            # Renumber the lines to ensure compliance with SRT format
-            output_lines : list[SubtitleLine] = []
-            for line_number, line in enumerate(translated, start=self.start_line_number or 1):
-                if line.text:
-                    output_lines.append(SubtitleLine.Construct(line_number, line.start, line.end, line.text))
-
-            logging.info(_("Saving translation to {}").format(str(outputpath)))
+            output_lines, _next_number = self.PrepareOutputLines(originals, translated, self.start_line_number or 1)
+            translated = list(translated)
 
-            # Add Right-To-Left markers to lines that contain primarily RTL script, if requested
-            if self.settings.get('add_right_to_left_markers'):
-                for line in output_lines:
-                    if line.text and IsRightToLeftText(line.text) and not line.text.startswith("\u202b"):
-                        line.text = f"\u202b{line.text}\u202c"
+        logging.info(_("Saving translation to {}").format(str(outputpath)))
 
-            # Use file handler for format-agnostic saving
-            handler = SrtFileHandler()  # For now, we only support SRT
-            srtfile = handler.compose_lines(output_lines, reindex=False)
-            with open(outputpath, 'w', encoding=default_encoding) as f:
-                f.write(srtfile)
+        # Write the file without blocking access to the subtitles
+        handler = self.CreateOutputHandler(outputpath)
+        with self._save_lock:
+            with open(outputpath, 'w', encoding=default_encoding, newline=handler.get_output_newline()) as f:
+                handler.write_lines(output_lines, f, reindex=False)
 
-            # Log a warning if any lines had no text or start time
-            num_invalid = len([line for line in translated if line.start is None])
-            if num_invalid:
-                logging.warning(_("{} lines were invalid and were not written to the output file").format(num_invalid))
+        # Log a warning if any lines had no text or start time
+        num_invalid = len([line for line in translated if line.start is None])
+        if num_invalid:
+            logging.warning(_("{} lines were invalid and were not written to the output file").format(num_invalid))
 
-            num_empty = len([line for line in translated if not line.text])
-            if num_empty:
-                logging.warning(_("{} lines were empty and were not written to the output file").format(num_empty))
+        num_empty = len([line for line in translated if not line.text])
+        if num_empty:
+            logging.warning(_("{} lines were empty and were not written to the output file").format(num_empty))
 
+        with self.lock:
             self.translated = translated
             self.outputpath = outputpath
 
+    def ComposeTranslation(self, path: str|None = None) -> str:
+        """
+        Compose the translated subtitles as a string, in the format of the path's extension or the format of the source
+        """
+        with self.read_lock:
+            if not self.scenes:
+                raise ValueError("No scenes in subtitles")
+
+            originals, translated, _untranslated = self.Linearise()
+            output_lines, _next_number = self.PrepareOutputLines(originals, translated, self.start_line_number or 1)
+
+        handler = self.CreateOutputHandler(path or '')
+        return handler.compose_lines(output_lines, reindex=False)
+
+    def PrepareOutputLines(self, originals: list[SubtitleLine], translated: list[SubtitleLine], start_number: int = 1) -> tuple[list[SubtitleLine], int]:
+        """
+        Prepare translated lines to be written to a file, numbered sequentially from start_number and merged
+        with the original lines or marked as right-to-left if the settings require it.
+
+        Returns the lines with text and the number that follows the last line.
+        """
+        if self.settings.get('include_original'):
+            translated = self._merge_original_and_translated(originals, translated)
+
+        # Keep format information such as styles from the original lines
+        original_metadata = { line.number: line._metadata for line in originals if line._metadata }
+
+        output_lines : list[SubtitleLine] = []
+        for line_number, line in enumerate(translated, start=start_number):
+            if line.text:
+                metadata = original_metadata.get(line.number, line._metadata)
+                output_lines.append(SubtitleLine.Construct(line_number, line.start, line.end, line.text, metadata))
+
+        # Add Right-To-Left markers to lines that contain primarily RTL script, if requested
+        if self.settings.get('add_right_to_left_markers'):
+            for line in output_lines:
+                if line.text and IsRightToLeftText(line.text) and not line.text.startswith("\u202b"):
+                    line.text = f"\u202b{line.text}\u202c"
+
+        return output_lines, start_number + len(translated)
+
     def UpdateProjectSettings(self, settings: SettingsType) -> None:
         """
         Update the project settings
@@ -410,21 +590,69 @@ class Subtitles:
             if self.originals:
                 self.scenes = batcher.BatchSubtitles(self.originals)
 
+    def RebatchLines(self, batcher: SubtitleBatcher, line_numbers: list[int]) -> BatchingDiff:
+        """
+        Re-partition only the scenes and batches affected by edits to a set of lines, returning the changes made
+        """
+        diff = BatchingDiff()
+        if not line_numbers:
+            return diff
+
+        first_line, last_line = min(line_numbers), max(line_numbers)
+
+        with self.lock:
+            for scene in self._get_scenes_for_lines(first_line, last_line):
+                diff.Extend(batcher.RebatchScene(scene, first_line, last_line))
+
+            if all(scene.batches for scene in self.scenes):
+                return diff
+
+            # Remove scenes that no longer contain any lines and renumber the rest
+            diff.removed_scenes = [ scene.number for scene in self.scenes if not scene.batches ]
+            self.scenes = [ scene for scene in self.scenes if scene.batches ]
+
+            scene_numbers : dict[int, int] = { scene.number: number for number, scene in enumerate(self.scenes, start=1) }
+            diff.renumbered_scenes = { old: new for old, new in scene_numbers.items() if old != new }
+            diff.removed_batches = [ (scene_numbers[scene], batch) for scene, batch in diff.removed_batches if scene in scene_numbers ]
+            diff.renumbered_batches = { (scene_numbers[scene], batch): new for (scene, batch), new in diff.renumbered_batches.items() if scene in scene_numbers }
+
+            self._renumber_scenes()
+
+        return diff
+
+    def RestoreScenes(self, scenes: list[tuple[SubtitleScene, list[SubtitleBatch]]]) -> None:
+        """
+        Restore scenes and their batches as they were before they were re-partitioned, e.g. to undo RebatchLines
+        """
+        with self.lock:
+            for scene, batches in scenes:
+                scene.batches = batches
+
+            self.scenes = [ scene for scene, batches in scenes ]
+            self._renumber_scenes()
+
     def AddScene(self, scene: SubtitleScene) -> None:
         with self.lock:
             self.scenes.append(scene)
+            self._invalidate_index()
             logging.debug("Added a new scene")
 
-    def UpdateScene(self, scene_number: int, update: dict[str, Any]) -> Any:
-        with self.lock:
+    @contextmanager
+    def SceneLock(self, scene_number: int) -> Iterator[SubtitleScene]:
+        """
+        Lock a scene for changes that do not affect any other scene, allowing other scenes to be updated concurrently
+        """
+        with self.read_lock:
             scene: SubtitleScene = self.GetScene(scene_number)
-            if not scene:
-                raise ValueError(f"Scene {scene_number} does not exist")
+            with scene.lock:
+                yield scene
 
+    def UpdateScene(self, scene_number: int, update: dict[str, Any]) -> Any:
+        with self.SceneLock(scene_number) as scene:
             return scene.UpdateContext(update)
 
     def UpdateBatch(self, scene_number: int, batch_number: int, update: dict[str, Any]) -> bool:
-        with self.lock:
+        with self.SceneLock(scene_number):
             batch: SubtitleBatch = self.GetBatch(scene_number, batch_number)
             if not batch:
                 raise ValueError(f"Batch ({scene_number},{batch_number}) does not exist")
@@ -432,33 +660,44 @@ class Subtitles:
             return batch.UpdateContext(update)
 
     def UpdateLineText(self, line_number : int, original_text : str, translated_text : str) -> None:
-        with self.lock:
+        with self.read_lock:
             if self.originals is None:
                 raise SubtitleError("Original subtitles are missing!")
 
-            original_line = next((original for original in self.originals if original.number == line_number), None)
+            original_line = self.GetOriginalLine(line_number)
             if not original_line:
                 raise ValueError(f"Line {line_number} not found")
 
+            batch = self.GetBatchContainingLine(line_number) if self.scenes else None
             if original_text:
-                original_line.text = original_text
-                original_line.translation = translated_text
+                with self.GetScene(batch.scene).lock if batch else nullcontext():
+                    original_line.text = original_text
+                    original_line.translation = translated_text
+                    if batch:
+                        batch.MarkModified()
 
             if not translated_text:
                 return
 
-            translated_line = next((translated for translated in self.translated if translated.number == line_number), None) if self.translated else None
-            if translated_line:
-                translated_line.text = translated_text
-                return
+            with self._lines_lock:
+                translated_line = self.GetTranslatedLine(line_number)
+                if translated_line:
+                    translated_line.text = translated_text
+                    if batch:
+                        batch.MarkModified()
+                    return
 
-            translated_line = SubtitleLine.Construct(line_number, original_line.start, original_line.end, translated_text)
+                translated_line = SubtitleLine.Construct(line_number, original_line.start, original_line.end, translated_text)
 
-            if not self.translated:
-                self.translated = []
+                if not self._translated:
+                    self._translated = []
 
-            insertIndex = bisect.bisect_left([line.number for line in self.translated], line_number)
-            self.translated.insert(insertIndex, translated_line)
+                insertIndex = bisect.bisect_left(self._translated, line_number, key=lambda line: line.number)
+                self._translated.insert(insertIndex, translated_line)
+
+                with self._cache_lock:
+                    if self._index is not None:
+                        self._index.translated.setdefault(line_number, translated_line)
 
     def DeleteLines(self, line_numbers: list[int]) -> list[tuple[int, int, list[SubtitleLine], list[SubtitleLine]]]:
         """
@@ -474,6 +713,8 @@ class Subtitles:
                     deletion = (batch.scene, batch.number, deleted_originals, deleted_translated)
                     deletions.append(deletion)
 
+            self._invalidate_index()
+
             if not deletions:
                 raise ValueError("No lines were deleted from any batches")
 
@@ -521,14 +762,17 @@ class Subtitles:
                 raise ValueError(f"Scene {str(scene_number)} not found")
 
             scene.MergeBatches(batch_numbers)
+            self._invalidate_index()
 
     def MergeLinesInBatch(self, scene_number: int, batch_number: int, line_numbers: list[int]) -> tuple[SubtitleLine, SubtitleLine|None]:
         """
         Merge several sequential lines together, remapping originals and translated lines if necessary.
         """
-        with self.lock:
+        with self.SceneLock(scene_number):
             batch : SubtitleBatch = self.GetBatch(scene_number, batch_number)
-            return batch.MergeLines(line_numbers)
+            merged_lines = batch.MergeLines(line_numbers)
+            self._invalidate_index()
+            return merged_lines
 
     def SplitScene(self, scene_number: int, batch_number: int) -> None:
         """
@@ -591,6 +835,96 @@ class Subtitles:
                 batch.scene = scene.number
                 batch.number = batch_number
 
+        self._invalidate_index()
+
+    def Snapshot(self) -> Subtitles:
+        """
+        Take a read-only copy of the subtitles for serialisation, which will not be affected by later changes.
+        Each batch copies its lines, so they can be edited while the snapshot is serialised, but only batches that have been
+        modified since the last snapshot need their lines copied again, so this is cheap to call often.
+        """
+        with self.read_lock:
+            snapshot = Subtitles(outputpath=self.outputpath)
+            snapshot.sourcepath = self.sourcepath
+            snapshot.settings = SettingsType(self.settings)
+            snapshot.start_line_number = self.start_line_number
+            snapshot._scenes = [ scene.Snapshot() for scene in self._scenes ]
+            return snapshot
+
+    def Linearise(self) -> tuple[list[SubtitleLine], list[SubtitleLine], list[SubtitleLine]]:
+        """
+        Get the original, translated and untranslated lines from all scenes in order.
+
+        The lists are cached and only rebuilt when a scene has been modified, so they should be copied rather than modified.
+        """
+        with self.read_lock:
+            state = tuple((id(scene), scene.version) for scene in self._scenes)
+            with self._cache_lock:
+                if self._linear_lines is None or state != self._linear_state:
+                    self._linear_lines = UnbatchScenes(self._scenes)
+                    self._linear_state = state
+
+                return self._linear_lines
+
+    def _get_index(self) -> SubtitleIndex:
+        """
+        Get the lookup index for scenes, batches and lines, building it if necessary
+        """
+        with self.read_lock, self._cache_lock:
+            if self._index is None:
+                self._index = SubtitleIndex(self._scenes, self._originals, self._translated)
+            return self._index
+
+    def _invalidate_index(self) -> None:
+        """
+        Discard the lookup index after the scenes, batches or lines have been restructured
+        """
+        with self._cache_lock:
+            self._index = None
+
+    def _find_line(self, indexed : dict[int, SubtitleLine], lines : list[SubtitleLine], line_number : int) -> SubtitleLine|None:
+        """
+        Look up a line in the index, falling back on a search (and discarding the index) if it is out of date
+        """
+        line = indexed.get(line_number)
+        if line is not None and line.number == line_number:
+            return line
+
+        line = next((line for line in lines if line.number == line_number), None)
+        if line is not None:
+            self._invalidate_index()
+
+        return line
+
+    def _get_scenes_for_lines(self, first_line: int, last_line: int) -> list[SubtitleScene]:
+        """
+        Get the scenes spanning a range of line numbers, or the scene preceding it if it falls between scenes
+        """
+        scenes : list[SubtitleScene] = []
+        preceding : SubtitleScene|None = None
+        for scene in self.scenes:
+            line_numbers = [ line.number for line in scene.originals or [] ]
+            if not line_numbers or any(not batch.originals for batch in scene.batches):
+                scenes.append(scene)
+            elif line_numbers[0] <= last_line and line_numbers[-1] >= first_line:
+                scenes.append(scene)
+            elif line_numbers[0] <= first_line:
+                preceding = scene
+
+        if not any(scene.originals for scene in scenes) and preceding:
+            scenes.append(preceding)
+
+        return scenes
+
+    def _number_lines(self, lines : Iterable[SubtitleLine]) -> Iterator[SubtitleLine]:
+        """
+        Number any lines with a missing index by their position in the stream
+        """
+        for line_number, line in enumerate(lines, start=1):
+            if not line.number:
+                line.number = line_number
+            yield line
+
     def _renumber_if_needed(self, lines : list[SubtitleLine]|None) -> None:
         """
         Renumber subtitle lines if any have number 0 (indicating missing/invalid indices)
@@ -634,6 +968,67 @@ class Subtitles:
 
         return sorted(lines.values(), key=lambda item: item.key)
 
+    def _record_format(self, handler: SubtitleFileHandler) -> None:
+        """
+        Record the format of the source file, and any information from it that is needed to write a file in the same format
+        """
+        extension = os.path.splitext(self.sourcepath or "")[1].lower()
+        if SubtitleFormatRegistry.GetExtensionHandlerClass(extension) is not type(handler):
+            extension = handler.get_file_extensions()[0]
+
+        self.settings['file_format'] = extension
+        self._format_metadata = handler.metadata or None
+        if handler.metadata:
+            self.settings['format_metadata'] = handler.get_project_metadata()
+        else:
+            self.settings.pop('format_metadata', None)
+
+    def _read_source_metadata(self, handler_class: type[SubtitleFileHandler]) -> dict[str, Any]|None:
+        """
+        Read the source file again for metadata that was too large to keep in the project settings
+        """
+        if not self.sourcepath or not os.path.exists(self.sourcepath):
+            logging.warning(_("Source file not found, some information from it will not be written: {}").format(self.sourcepath))
+            return None
+
+        handler = handler_class()
+        try:
+            with open(self.sourcepath, 'r', encoding=self._get_setting_str('encoding') or default_encoding, newline='') as f:
+                for line in handler.parse_file(f):
+                    pass
+
+        except (OSError, UnicodeDecodeError, SubtitleParseError) as e:
+            logging.warning(_("Unable to read the source file, some information from it will not be written: {}").format(str(e)))
+            return None
+
+        self._format_metadata = handler.metadata
+        return handler.metadata
+
+    def _get_source_encodings(self, encoding: str|None = None) -> Iterator[str]:
+        """
+        Yield encodings to read the source file with: the specified or recorded encoding if there is one,
+        then the encoding detected from the start of the file, then the fallback encoding.
+        Detection only runs if the source cannot be read with a known encoding.
+        """
+        tried : set[str] = set()
+
+        encoding = encoding or self._get_setting_str('encoding')
+        if encoding:
+            tried.add(encoding)
+            yield encoding
+
+        if not self.sourcepath:
+            return
+
+        detected = DetectEncoding(self.sourcepath, default=fallback_encoding)
+        if detected not in tried:
+            logging.debug(f"Detected {detected} encoding for {self.sourcepath}")
+            tried.add(detected)
+            yield detected
+
+        if fallback_encoding not in tried:
+            yield fallback_encoding
+
     def _get_setting_str(self, key: str, default: str|None = None) -> str|None:
         """
         Get a setting as a string, or None if not set
@@ -0,0 +1,72 @@
+import time
+from typing import Callable
+
+class TextTransform:
+    """
+    One step of a text pipeline: a transform and an optional precheck that rules out text the transform cannot change
+    """
+    __slots__ = ('name', 'transform', 'precheck', 'elapsed', 'applied', 'skipped')
+
+    def __init__(self, name : str, transform : Callable[[str], str], precheck : Callable[[str], bool]|None = None):
+        self.name : str = name
+        self.transform : Callable[[str], str] = transform
+        self.precheck : Callable[[str], bool]|None = precheck
+        self.elapsed : float = 0.0
+        self.applied : int = 0
+        self.skipped : int = 0
+
+class TextPipeline:
+    """
+    An ordered list of text transforms that is built once and applied to each line of text.
+
+    Each transform is only applied if its precheck passes, so steps that cannot change the text cost a cheap
+    character test rather than a regex pass. The time spent in each step is recorded, for tuning and benchmarks.
+    """
+    def __init__(self, steps : list[TextTransform]|None = None):
+        self.steps : list[TextTransform] = steps or []
+
+    @property
+    def names(self) -> list[str]:
+        return [ step.name for step in self.steps ]
+
+    def Add(self, name : str, transform : Callable[[str], str], precheck : Callable[[str], bool]|None = None) -> 'TextPipeline':
+        """
+        Add a step to the end of the pipeline
+        """
+        self.steps.append(TextTransform(name, transform, precheck))
+        return self
+
+    def Apply(self, text : str) -> str:
+        """
+        Apply each step of the pipeline to the text in order
+        """
+        clock = time.perf_counter
+        for step in self.steps:
+            if not text:
+                break
+
+            if step.precheck is not None and not step.precheck(text):
+                step.skipped += 1
+                continue
+
+            start = clock()
+            text = step.transform(text)
+            step.elapsed += clock() - start
+            step.applied += 1
+
+        return text
+
+    def GetTimings(self) -> dict[str, dict[str, float|int]]:
+        """
+        Get the total time spent in each step, and how many times it was applied or skipped
+        """
+        return { step.name: { 'elapsed': step.elapsed, 'applied': step.applied, 'skipped': step.skipped } for step in self.steps }
+
+    def ResetTimings(self):
+        """
+        Clear the recorded timings
+        """
+        for step in self.steps:
+            step.elapsed = 0.0
+            step.applied = 0
+            step.skipped = 0
@@ -3,6 +3,7 @@ import time
 
 from PySubtitle.Instructions import DEFAULT_TASK_TYPE
 from PySubtitle.Options import Options, SettingsType
+from PySubtitle.RequestBudget import RequestBudget
 from PySubtitle.SettingsType import SettingsType
 from PySubtitle.SubtitleError import TranslationError
 from PySubtitle.SubtitleLine import SubtitleLine
@@ -25,6 +26,9 @@ class TranslationClient:
         self.retry_instructions: str|None = settings.get_str('retry_instructions')
         self.aborted: bool = False
 
+        # Clients that share a budget limit their requests together, instead of applying their own rate limit
+        self.request_budget: RequestBudget|None = None
+
         if not self.instructions:
             raise TranslationError("No instructions provided for the translator")
 
@@ -88,7 +92,12 @@ class TranslationClient:
         start_time = time.monotonic()
 
         # Perform the translation
-        translation = self._request_translation(prompt, temperature)
+        request_budget = self.request_budget
+        if request_budget is not None:
+            with request_budget:
+                translation = self._request_translation(prompt, temperature)
+        else:
+            translation = self._request_translation(prompt, temperature)
 
         if self.aborted or translation is None:
             return None
@@ -98,7 +107,7 @@ class TranslationClient:
 
         # If a rate limit is replied ensure a minimum duration for each request
         rate_limit = self.rate_limit
-        if rate_limit and rate_limit > 0.0:
+        if rate_limit and rate_limit > 0.0 and request_budget is None:
             minimum_duration = 60.0 / rate_limit
 
             elapsed_time = time.monotonic() - start_time
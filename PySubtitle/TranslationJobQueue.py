@@ -0,0 +1,242 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_schema = [
+    """CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        filename TEXT,
+        options TEXT,
+        content TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        line_count INTEGER,
+        translated_count INTEGER,
+        created REAL NOT NULL,
+        started REAL,
+        finished REAL
+    )""",
+    """CREATE INDEX IF NOT EXISTS queued_jobs ON jobs(created) WHERE status = 'queued'""",
+    """CREATE TABLE IF NOT EXISTS events (
+        job TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+        sequence INTEGER NOT NULL,
+        time REAL NOT NULL,
+        type TEXT NOT NULL,
+        data TEXT,
+        PRIMARY KEY (job, sequence)
+    ) WITHOUT ROWID"""
+]
+
+_job_columns = "id, status, filename, options, error, line_count, translated_count, created, started, finished"
+
+class TranslationJobQueue:
+    """
+    A persistent queue of translation jobs, stored in an SQLite database.
+
+    Each job holds the subtitles to translate and the options to translate them with, and records its status,
+    the progress events reported while it was translated and the translated subtitles. Jobs that were running
+    when the queue was closed can be queued again when it is reopened.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    finished_statuses = [ COMPLETED, FAILED, CANCELLED ]
+
+    # Seconds to wait for another connection to finish writing
+    busy_timeout : float = 30.0
+
+    def __init__(self, filepath : str):
+        self.filepath : str = os.path.normpath(filepath)
+        self.lock = threading.RLock()
+        self._local = threading.local()
+        self._connections : list[sqlite3.Connection] = []
+
+        with self._transaction() as connection:
+            for statement in _schema:
+                connection.execute(statement)
+
+    def AddJob(self, content : str, options : dict[str, Any]|None = None, filename : str|None = None) -> str:
+        """
+        Add a job to the end of the queue and return its id
+        """
+        job_id = uuid.uuid4().hex
+        with self._transaction() as connection:
+            connection.execute("INSERT INTO jobs (id, status, filename, options, content, created) VALUES (?, ?, ?, ?, ?, ?)",
+                               (job_id, self.QUEUED, filename, json.dumps(options or {}), content, time.time()))
+            self._add_event(connection, job_id, self.QUEUED, None)
+        return job_id
+
+    def ClaimJob(self) -> dict[str, Any]|None:
+        """
+        Take the oldest queued job and mark it as running, returning it with its content or None if the queue is empty
+        """
+        with self._transaction() as connection:
+            row = connection.execute(f"SELECT {_job_columns}, content FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (self.QUEUED,)).fetchone()
+            if row is None:
+                return None
+
+            job = _job_from_row(row)
+            job['content'] = row[-1]
+            job['status'] = self.RUNNING
+            job['started'] = time.time()
+            connection.execute("UPDATE jobs SET status = ?, started = ? WHERE id = ?", (self.RUNNING, job['started'], job['id']))
+            self._add_event(connection, job['id'], self.RUNNING, None)
+            return job
+
+    def FinishJob(self, job_id : str, status : str, result : str|None = None, error : str|None = None, line_count : int|None = None, translated_count : int|None = None) -> None:
+        """
+        Record the outcome of a job
+        """
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET status = ?, result = ?, error = ?, line_count = ?, translated_count = ?, finished = ? WHERE id = ?",
+                               (status, result, error, line_count, translated_count, time.time(), job_id))
+            self._add_event(connection, job_id, status, { 'error': error } if error else None)
+
+    def CancelJob(self, job_id : str) -> str|None:
+        """
+        Cancel a job if it has not finished, returning its status before it was cancelled (or None if it does not exist)
+        """
+        with self._transaction() as connection:
+            row = connection.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+
+            status = row[0]
+            if status not in self.finished_statuses:
+                connection.execute("UPDATE jobs SET status = ?, finished = ? WHERE id = ?", (self.CANCELLED, time.time(), job_id))
+                self._add_event(connection, job_id, self.CANCELLED, None)
+            return status
+
+    def RequeueRunningJobs(self) -> int:
+        """
+        Queue jobs that were running when the queue was last closed again, returning the number of jobs
+        """
+        with self._transaction() as connection:
+            job_ids = [ row[0] for row in connection.execute("SELECT id FROM jobs WHERE status = ?", (self.RUNNING,)).fetchall() ]
+            for job_id in job_ids:
+                connection.execute("UPDATE jobs SET status = ?, started = NULL WHERE id = ?", (self.QUEUED, job_id))
+                self._add_event(connection, job_id, self.QUEUED, { 'requeued': True })
+            return len(job_ids)
+
+    def GetJob(self, job_id : str) -> dict[str, Any]|None:
+        """
+        Get the status of a job, without its content or result
+        """
+        row = self._connection().execute(f"SELECT {_job_columns} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+
+    def GetJobStatus(self, job_id : str) -> str|None:
+        """
+        Get the status of a job, or None if it does not exist
+        """
+        row = self._connection().execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def GetResult(self, job_id : str) -> str|None:
+        """
+        Get the translated subtitles for a job, if it has completed
+        """
+        row = self._connection().execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def ListJobs(self, status : str|None = None) -> list[dict[str, Any]]:
+        """
+        List jobs in the order they were added, optionally only those with a given status
+        """
+        if status:
+            rows = self._connection().execute(f"SELECT {_job_columns} FROM jobs WHERE status = ? ORDER BY created", (status,)).fetchall()
+        else:
+            rows = self._connection().execute(f"SELECT {_job_columns} FROM jobs ORDER BY created").fetchall()
+        return [ _job_from_row(row) for row in rows ]
+
+    def AddEvent(self, job_id : str, event_type : str, data : dict[str, Any]|None = None) -> int:
+        """
+        Record a progress event for a job, returning its sequence number
+        """
+        with self._transaction() as connection:
+            return self._add_event(connection, job_id, event_type, data)
+
+    def GetEvents(self, job_id : str, after : int = 0) -> list[dict[str, Any]]:
+        """
+        Get the events for a job with a sequence number greater than after
+        """
+        rows = self._connection().execute("SELECT sequence, time, type, data FROM events WHERE job = ? AND sequence > ? ORDER BY sequence", (job_id, after)).fetchall()
+        return [ { 'sequence': sequence, 'time': event_time, 'type': event_type, 'data': json.loads(data) if data else None } for sequence, event_time, event_type, data in rows ]
+
+    def DeleteJob(self, job_id : str) -> None:
+        """
+        Remove a job and its events from the queue
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def Close(self) -> None:
+        """
+        Close all connections to the database
+        """
+        with self.lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+            self._local = threading.local()
+
+    def _add_event(self, connection : sqlite3.Connection, job_id : str, event_type : str, data : dict[str, Any]|None) -> int:
+        row = connection.execute("SELECT MAX(sequence) FROM events WHERE job = ?", (job_id,)).fetchone()
+        sequence = (row[0] or 0) + 1
+        connection.execute("INSERT INTO events (job, sequence, time, type, data) VALUES (?, ?, ?, ?, ?)",
+                           (job_id, sequence, time.time(), event_type, json.dumps(data) if data else None))
+        return sequence
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get a connection for the current thread, since connections cannot be shared between threads
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.filepath, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self.lock:
+                self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in a write transaction, which is committed if they succeed and rolled back if they fail
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+def _job_from_row(row : tuple) -> dict[str, Any]:
+    job_id, status, filename, options, error, line_count, translated_count, created, started, finished = row[:10]
+    return {
+        'id': job_id,
+        'status': status,
+        'filename': filename,
+        'options': json.loads(options) if options else {},
+        'error': error,
+        'line_count': line_count,
+        'translated_count': translated_count,
+        'created': created,
+        'started': started,
+        'finished': finished,
+    }
@@ -6,7 +6,7 @@ import regex
 from PySubtitle.Instructions import DEFAULT_TASK_TYPE
 from PySubtitle.Options import Options
 from PySubtitle.Helpers.Subtitles import MergeTranslations
-from PySubtitle.Helpers.Text import IsTextContentEqual
+from PySubtitle.Helpers.Text import IsTextContentEqual, RemoveWhitespaceAndPunctuation
 from PySubtitle.SubtitleLine import SubtitleLine
 from PySubtitle.SubtitleError import NoTranslationError, TranslationError, UntranslatedLinesError
 from PySubtitle.SubtitleValidator import SubtitleValidator
@@ -33,6 +33,8 @@ class TranslationParser:
     """
     Extract translated subtitles from the AI translation response
     """
+    max_merged_lines : int = 4
+
     def __init__(self, task_type : str, options : Options):
         self.options : Options = options
         self.text : str|None = None
@@ -138,39 +140,83 @@ class TranslationParser:
                 unmatched.append(item)
 
         if unmatched:
-            self.TryFuzzyMatches(unmatched)
+            self.TryFuzzyMatches(originals, matched, unmatched)
 
         if unmatched:
             self.errors.append(UntranslatedLinesError(f"No translation found for {len(unmatched)} lines", lines=unmatched))
 
         return matched, unmatched
 
-    def TryFuzzyMatches(self, unmatched : list [SubtitleLine]) -> None:
-        """
-        Try to match translations to their source lines using heuristics
-        """
-        possible_matches : list[tuple[SubtitleLine,SubtitleLine]] = []
-        for item in (item for item in unmatched if item.number is not None):
-            for translation in self.translations.values():
-                if translation.original:
-                    if IsTextContentEqual(translation.original, item.text):
-                        # A match on the original text is pretty compelling
-                        possible_matches.append((item, translation))
-                        continue
-                    elif IsTextContentEqual(translation.text, item.text):
-                        # LLMs sometimes swap the original and translated text - swap them back
-                        translation.text = translation.original
-                        translation.original = item.text
-                        possible_matches.append((item, translation))
-                        continue
-
-                    #TODO: check for merged lines
-
-        if possible_matches:
-            for item, translation in possible_matches:
-                logging.warning(f"Found fuzzy match for line {item.number} in translations")
-                item.translation = f"#Fuzzy: {translation.text}"
-                #unmatched.remove(item)
+    def TryFuzzyMatches(self, originals : list[SubtitleLine], matched : list[SubtitleLine], unmatched : list[SubtitleLine]) -> None:
+        """
+        Try to match translations to unmatched source lines by the original text, including lines that were merged or split in the translation.
+        Only confident matches are resolved: the original text must match exactly once normalised, and a translation of merged lines must
+        have one line of text for each source line. Other lines are left unmatched, so the batch is still reported and can be retried.
+        """
+        source_keys : list[str] = [ RemoveWhitespaceAndPunctuation(item.text) if item.text else "" for item in originals ]
+        original_index, text_index, split_index = self._build_text_index()
+
+        # Translations that were matched by number are not available for fuzzy matching
+        claimed : set[int] = { id(translation) for translation in matched }
+
+        unmatched_keys : set[int|str] = { item.key for item in unmatched }
+        available : set[int] = { position for position, item in enumerate(originals) if item.key in unmatched_keys }
+        resolved : set[int] = set()
+
+        def resolve(lines : list[int], translations : tuple[SubtitleLine, ...], texts : list[str]):
+            for position, text in zip(lines, texts):
+                item = originals[position]
+                line = SubtitleLine.Construct(item.number, item.start or timedelta(seconds=0), item.end or timedelta(seconds=0), text)
+                line.original = item.text
+                item.translation = text
+                matched.append(line)
+                resolved.add(position)
+
+            available.difference_update(lines)
+            claimed.update(id(translation) for translation in translations)
+
+        for position in sorted(available):
+            key = source_keys[position]
+            if position not in available or not key:
+                continue
+
+            translation = self._first_unclaimed(original_index.get(key), claimed)
+            if translation:
+                # A match on the original text is pretty compelling
+                logging.warning(f"Found fuzzy match for line {originals[position].number} in translations")
+                resolve([ position ], (translation,), [ translation.text or "" ])
+                continue
+
+            translation = self._first_unclaimed(text_index.get(key), claimed)
+            if translation:
+                # LLMs sometimes swap the original and translated text - swap them back
+                logging.warning(f"Found swapped original and translation for line {originals[position].number}")
+                resolve([ position ], (translation,), [ translation.original or "" ])
+                continue
+
+            merged = self._find_merged_lines(position, source_keys, available, original_index, claimed)
+            if merged:
+                lines, translation = merged
+                logging.warning(f"Lines {originals[lines[0]].number}-{originals[lines[-1]].number} were merged in the translation")
+                texts = [ text.strip() for text in (translation.text or "").split('\n') if text.strip() ]
+                if len(texts) != len(lines):
+                    # The translation cannot be divided between the lines, so claim it and leave the lines unmatched
+                    claimed.add(id(translation))
+                    available.difference_update(lines)
+                    continue
+
+                resolve(lines, (translation,), texts)
+                continue
+
+            parts = self._first_unclaimed(split_index.get(key), claimed)
+            if parts:
+                logging.warning(f"Line {originals[position].number} was split into {len(parts)} lines in the translation")
+                resolve([ position ], parts, [ "\n".join(part.text or "" for part in parts) ])
+
+        if resolved:
+            resolved_keys : set[int|str] = { originals[position].key for position in resolved }
+            unmatched[:] = [ item for item in unmatched if item.key not in resolved_keys ]
+            matched.sort(key=lambda line: line.number)
 
     def ValidateTranslations(self) -> list[Exception]:
         """
@@ -200,4 +246,58 @@ class TranslationParser:
                 logging.warning(f"Found unclosed tag {tag} in translation: {tag}")
                 last_line.text = last_line.text[:match.start()]
                 break
-            
\ No newline at end of file
+            
+
+    def _build_text_index(self) -> tuple[dict[str, list[SubtitleLine]], dict[str, list[SubtitleLine]], dict[str, list[tuple[SubtitleLine, ...]]]]:
+        """
+        Index the translations by their normalised original and translated text, and runs of consecutive translations by their combined original text
+        """
+        original_index : dict[str, list[SubtitleLine]] = {}
+        text_index : dict[str, list[SubtitleLine]] = {}
+        split_index : dict[str, list[tuple[SubtitleLine, ...]]] = {}
+
+        translations = [ translation for translation in self.translations.values() if translation.original and translation.text ]
+        original_keys = [ RemoveWhitespaceAndPunctuation(translation.original) for translation in translations ]
+
+        for index, translation in enumerate(translations):
+            if original_keys[index]:
+                original_index.setdefault(original_keys[index], []).append(translation)
+
+            text_key = RemoveWhitespaceAndPunctuation(translation.text)
+            if text_key:
+                text_index.setdefault(text_key, []).append(translation)
+
+            combined_key = original_keys[index]
+            for last in range(index + 1, min(index + self.max_merged_lines, len(translations))):
+                combined_key += original_keys[last]
+                split_index.setdefault(combined_key, []).append(tuple(translations[index:last + 1]))
+
+        return original_index, text_index, split_index
+
+    def _find_merged_lines(self, position : int, source_keys : list[str], available : set[int], original_index : dict[str, list[SubtitleLine]], claimed : set[int]) -> tuple[list[int], SubtitleLine]|None:
+        """
+        Look for a run of consecutive source lines including the one at position whose combined text matches a single translation
+        """
+        for length in range(2, self.max_merged_lines + 1):
+            for first in range(position, position - length, -1):
+                positions = list(range(first, first + length))
+                if first < 0 or positions[-1] >= len(source_keys) or not available.issuperset(positions):
+                    continue
+
+                translation = self._first_unclaimed(original_index.get("".join(source_keys[index] for index in positions)), claimed)
+                if translation:
+                    return positions, translation
+
+        return None
+
+    def _first_unclaimed(self, candidates : list[Any]|None, claimed : set[int]) -> Any:
+        """
+        Return the first candidate translation (or run of translations) that has not already been claimed
+        """
+        for candidate in candidates or []:
+            if isinstance(candidate, tuple):
+                if not any(id(translation) in claimed for translation in candidate):
+                    return candidate
+            elif id(candidate) not in claimed:
+                return candidate
+        return None
@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import socketserver
+import stat
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from PySubtitle.SubtitleError import SubtitleError
+from PySubtitle.TranslationJobQueue import TranslationJobQueue
+from PySubtitle.TranslationService import TranslationService
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP interface to a translation service.
+
+    POST /jobs                      submit a job: {"content": "...", "options": {...}, "filename": "..."}
+    GET  /jobs                      list jobs (optionally ?status=...)
+    GET  /jobs/<id>                 get the status of a job
+    GET  /jobs/<id>/events          get progress events (?after=<sequence>&wait=<seconds>)
+    GET  /jobs/<id>/stream          stream progress events as JSON lines until the job finishes
+    GET  /jobs/<id>/result          get the translated subtitles
+    DELETE /jobs/<id>               cancel a job
+    """
+    server_version = "SubtransService/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # Maximum number of seconds a request can wait for events
+    max_wait : float = 60.0
+
+    # Maximum size of a request body in bytes
+    max_request_size : int = 32 * 1024 * 1024
+
+    @property
+    def service(self) -> TranslationService:
+        return self.server.service # type: ignore[attr-defined]
+
+    def do_GET(self):
+        path, query = self._parse_path()
+        if path == ['health']:
+            return self._send_json({ 'status': 'ok' })
+
+        if path == ['jobs']:
+            status = query.get('status')
+            return self._send_json(self.service.queue.ListJobs(status))
+
+        job = self._get_job(path)
+        if job is None:
+            return
+
+        if len(path) == 2:
+            return self._send_json(job)
+
+        action = path[2] if len(path) == 3 else None
+        if action == 'events':
+            wait = min(self._get_float(query, 'wait'), self.max_wait)
+            return self._send_json(self.service.GetEvents(job['id'], self._get_int(query, 'after'), timeout=wait))
+
+        if action == 'stream':
+            return self._stream_events(job['id'], self._get_int(query, 'after'))
+
+        if action == 'result':
+            if job['status'] != TranslationJobQueue.COMPLETED:
+                return self._send_error(HTTPStatus.CONFLICT, f"Job is {job['status']}")
+            return self._send_text(self.service.GetResult(job['id']) or '')
+
+        self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self):
+        path, _query = self._parse_path()
+        if path != ['jobs']:
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+        # Only accept JSON, so that a web page cannot submit jobs with a simple cross-origin request
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type must be application/json")
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            return self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+
+        if length < 0 or length > self.max_request_size:
+            self.close_connection = True
+            return self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Request is larger than {self.max_request_size} bytes")
+
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+
+            options = request.get('options') or {}
+            if not isinstance(options, dict):
+                raise ValueError("Options must be a JSON object")
+
+            job_id = self.service.SubmitJob(request.get('content', ''), options, request.get('filename'))
+
+        except (ValueError, SubtitleError) as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+
+        except Exception as e:
+            logging.error(f"Unable to submit job: {e}")
+            return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Unable to submit job")
+
+        self._send_json(self.service.GetJob(job_id), HTTPStatus.CREATED)
+
+    def do_DELETE(self):
+        path, _query = self._parse_path()
+        job = self._get_job(path)
+        if job is None:
+            return
+
+        if len(path) != 2:
+            return self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+        if not self.service.CancelJob(job['id']):
+            return self._send_error(HTTPStatus.CONFLICT, f"Job is {job['status']}")
+
+        self._send_json(self.service.GetJob(job['id']))
+
+    def address_string(self) -> str:
+        # Unix socket clients do not have an address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'local'
+
+    def log_message(self, format : str, *args : Any) -> None:
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+    def _stream_events(self, job_id : str, after : int) -> None:
+        """
+        Write events as they are recorded, one JSON object per line, until the job has finished
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            while not self.service.stopping:
+                for event in self.service.GetEvents(job_id, after, timeout=self.max_wait):
+                    self.wfile.write(json.dumps(event).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                    after = event['sequence']
+
+                status = self.service.queue.GetJobStatus(job_id)
+                if status in TranslationJobQueue.finished_statuses and not self.service.queue.GetEvents(job_id, after):
+                    break
+
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug(f"Client stopped streaming events for job {job_id}")
+
+    def _parse_path(self) -> tuple[list[str], dict[str, str]]:
+        url = urlparse(self.path)
+        path = [ part for part in url.path.split('/') if part ]
+        query = { key: values[-1] for key, values in parse_qs(url.query).items() }
+        return path, query
+
+    def _get_job(self, path : list[str]) -> dict[str, Any]|None:
+        job = self.service.GetJob(path[1]) if len(path) >= 2 and path[0] == 'jobs' else None
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Job not found" if path[:1] == ['jobs'] else "Not found")
+        return job
+
+    def _get_int(self, query : dict[str, str], key : str) -> int:
+        try:
+            return int(query.get(key) or 0)
+        except ValueError:
+            return 0
+
+    def _get_float(self, query : dict[str, str], key : str) -> float:
+        try:
+            return max(0.0, float(query.get(key) or 0.0))
+        except ValueError:
+            return 0.0
+
+    def _send_json(self, content : Any, status : HTTPStatus = HTTPStatus.OK) -> None:
+        self._send(json.dumps(content).encode('utf-8'), 'application/json', status)
+
+    def _send_text(self, content : str) -> None:
+        self._send(content.encode('utf-8'), 'text/plain; charset=utf-8', HTTPStatus.OK)
+
+    def _send_error(self, status : HTTPStatus, message : str) -> None:
+        self._send_json({ 'error': message }, status)
+
+    def _send(self, body : bytes, content_type : str, status : HTTPStatus) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class TranslationServer(ThreadingHTTPServer):
+    """
+    Serves a translation service over HTTP on a TCP port
+    """
+    daemon_threads = True
+
+    def __init__(self, service : TranslationService, host : str = "127.0.0.1", port : int = 8765):
+        self.service : TranslationService = service
+        super().__init__((host, port), TranslationRequestHandler)
+
+class UnixTranslationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves a translation service over HTTP on a Unix domain socket
+    """
+    daemon_threads = True
+
+    def __init__(self, service : TranslationService, socket_path : str):
+        self.service : TranslationService = service
+        if os.path.exists(socket_path):
+            # Replace a socket left behind by a previous server, but never another kind of file
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise ValueError(f"{socket_path} exists and is not a socket")
+            os.remove(socket_path)
+        super().__init__(socket_path, TranslationRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if isinstance(self.server_address, str) and os.path.exists(self.server_address):
+            os.remove(self.server_address)
@@ -0,0 +1,278 @@
+import json
+import logging
+import threading
+from typing import Any
+
+from PySubtitle.Helpers.Localization import _
+from PySubtitle.Options import Options
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SharedClients import SharedClients
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleError import SubtitleError
+from PySubtitle.SubtitleProcessor import SubtitleProcessor
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.TranslationJobQueue import TranslationJobQueue
+from PySubtitle.TranslationProvider import TranslationProvider
+
+class TranslationService:
+    """
+    Translates subtitles submitted as jobs, in a long-running process.
+
+    Jobs are added to a persistent queue and translated by a pool of worker threads. Providers, clients and request
+    budgets are created once and shared by every job that uses the same settings, so each job only has to parse and
+    translate its subtitles. Progress is recorded as events that clients can poll or wait for.
+    """
+    # Options that can be set for each job. Paths, providers, credentials and instructions can only be set for the service.
+    job_options : list[str] = [
+        'target_language', 'movie_name', 'description', 'names', 'substitutions', 'substitution_mode',
+        'include_original', 'add_right_to_left_markers',
+        'scene_threshold', 'auto_scene_threshold', 'min_batch_size', 'max_batch_size', 'balance_batches', 'max_context_summaries',
+        'max_characters', 'max_newlines', 'max_single_line_length', 'min_single_line_length', 'max_summary_length', 'max_lines',
+        'preprocess_subtitles', 'postprocess_translation', 'break_long_lines', 'break_dialog_on_one_line',
+        'max_line_duration', 'min_line_duration', 'merge_line_duration', 'min_split_chars', 'normalise_dialog_tags',
+        'remove_filler_words', 'filler_words', 'whitespaces_to_newline', 'full_width_punctuation', 'convert_wide_dashes',
+    ]
+
+    def __init__(self, options : Options, queue_path : str, workers : int = 2):
+        """
+        :param options: the default options for every job, which can be overridden by the options submitted with a job
+        :param queue_path: the path of the database to keep the job queue in
+        :param workers: the number of jobs to translate at the same time
+        """
+        self.options : Options = options
+        self.queue = TranslationJobQueue(queue_path)
+        self.workers : int = max(1, workers)
+        self.stopping : bool = False
+
+        self._lock = threading.RLock()
+        self._jobs_changed = threading.Condition(self._lock)
+        self._threads : list[threading.Thread] = []
+        self._translators : dict[str, SubtitleTranslator] = {}
+        self._providers : dict[str, TranslationProvider] = {}
+        self._clients = SharedClients()
+
+    def Start(self) -> None:
+        """
+        Start the worker threads, queueing any jobs that were interrupted when the service last stopped
+        """
+        requeued = self.queue.RequeueRunningJobs()
+        if requeued:
+            logging.info(_("Requeued {count} interrupted jobs").format(count=requeued))
+
+        self.stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"TranslationWorker-{index + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def Stop(self, timeout : float|None = None) -> None:
+        """
+        Stop the worker threads, aborting jobs in progress. They will be translated again when the service restarts.
+        """
+        with self._lock:
+            self.stopping = True
+            translators = list(self._translators.values())
+            self._jobs_changed.notify_all()
+
+        for translator in translators:
+            translator.StopTranslating()
+
+        self._clients.AbortTranslation()
+
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._threads = []
+        self.queue.Close()
+
+    def SubmitJob(self, content : str, options : dict[str, Any]|None = None, filename : str|None = None) -> str:
+        """
+        Queue subtitles to be translated, returning the id of the job
+        """
+        if not isinstance(content, str):
+            raise ValueError("Content must be a string")
+
+        if filename is not None and not isinstance(filename, str):
+            raise ValueError("Filename must be a string")
+
+        if not content or not content.strip():
+            raise SubtitleError(_("No subtitles to translate"))
+
+        invalid_options = [ key for key in (options or {}) if key not in self.job_options ]
+        if invalid_options:
+            raise SubtitleError(_("Options cannot be set for a job: {options}").format(options=", ".join(invalid_options)))
+
+        job_id = self.queue.AddJob(content, options, filename)
+        self._notify()
+        return job_id
+
+    def GetJob(self, job_id : str) -> dict[str, Any]|None:
+        """
+        Get the status of a job
+        """
+        return self.queue.GetJob(job_id)
+
+    def GetResult(self, job_id : str) -> str|None:
+        """
+        Get the translated subtitles for a completed job
+        """
+        return self.queue.GetResult(job_id)
+
+    def GetEvents(self, job_id : str, after : int = 0, timeout : float|None = None) -> list[dict[str, Any]]:
+        """
+        Get the progress events for a job after a sequence number, waiting up to timeout seconds for new events
+        """
+        with self._jobs_changed:
+            events = self.queue.GetEvents(job_id, after)
+            if not events and timeout:
+                self._jobs_changed.wait(timeout)
+                events = self.queue.GetEvents(job_id, after)
+            return events
+
+    def CancelJob(self, job_id : str) -> bool:
+        """
+        Cancel a job, stopping the translation if it is in progress. Returns False if the job had already finished.
+        """
+        status = self.queue.CancelJob(job_id)
+        if status is None or status in TranslationJobQueue.finished_statuses:
+            return False
+
+        with self._lock:
+            translator = self._translators.get(job_id)
+            if translator:
+                translator.StopTranslating()
+            self._jobs_changed.notify_all()
+
+        return True
+
+    def _worker(self) -> None:
+        """
+        Translate queued jobs until the service is stopped
+        """
+        while not self.stopping:
+            job = self.queue.ClaimJob()
+            if job is None:
+                with self._jobs_changed:
+                    if not self.stopping:
+                        self._jobs_changed.wait(1.0)
+                continue
+
+            self._notify()
+            self._translate_job(job)
+            self._notify()
+
+    def _translate_job(self, job : dict[str, Any]) -> None:
+        """
+        Translate the subtitles for a job and record the result
+        """
+        job_id : str = job['id']
+        subtitles : Subtitles|None = None
+        try:
+            options = Options(self.options)
+            options.update({ key: value for key, value in job['options'].items() if key in self.job_options })
+
+            subtitles = Subtitles()
+            subtitles.LoadSubtitlesFromString(job['content'])
+            if not subtitles.has_subtitles:
+                raise SubtitleError(_("No subtitles to translate"))
+
+            subtitles.UpdateProjectSettings(SettingsType(options))
+
+            if options.get_bool('preprocess_subtitles'):
+                preprocessor = SubtitleProcessor(options)
+                try:
+                    subtitles.PreProcess(preprocessor)
+                finally:
+                    preprocessor.Close()
+
+            translator = self._create_translator(job_id, options)
+            if self.stopping or self.queue.GetJobStatus(job_id) == TranslationJobQueue.CANCELLED:
+                translator.StopTranslating()
+
+            translator.events.preprocessed += lambda scenes: self._on_preprocessed(job_id, scenes) # type: ignore
+            translator.events.batch_translated += lambda batch: self._on_batch_translated(job_id, batch) # type: ignore
+            translator.events.scene_translated += lambda scene: self._on_scene_translated(job_id, scene) # type: ignore
+
+            try:
+                translator.TranslateSubtitles(subtitles)
+            finally:
+                with self._lock:
+                    self._translators.pop(job_id, None)
+
+            if self.stopping:
+                # The job will be translated again when the service restarts
+                return
+
+            if self.queue.GetJobStatus(job_id) == TranslationJobQueue.CANCELLED:
+                return
+
+            if translator.errors and translator.stop_on_error:
+                raise SubtitleError(str(translator.errors[0]))
+
+            result = subtitles.ComposeTranslation(job['filename'])
+            self.queue.FinishJob(job_id, TranslationJobQueue.COMPLETED, result=result, line_count=subtitles.linecount, translated_count=len(subtitles.Linearise()[1]))
+
+        except Exception as e:
+            if self.stopping:
+                return
+
+            logging.error(_("Failed to translate job {job}: {error}").format(job=job_id, error=str(e)))
+            line_count = subtitles.linecount if subtitles else None
+            self.queue.FinishJob(job_id, TranslationJobQueue.FAILED, error=str(e), line_count=line_count)
+
+    def _create_translator(self, job_id : str, options : Options) -> SubtitleTranslator:
+        """
+        Create a translator for a job, reusing the provider and client for the same settings
+        """
+        with self._lock:
+            provider = self._get_provider(options)
+            translator = self._clients.CreateTranslator(options, provider, self._get_client_key(options))
+            self._translators[job_id] = translator
+            return translator
+
+    def _get_provider(self, options : Options) -> TranslationProvider:
+        """
+        Get the provider for the options, creating it if it is the first time it is used
+        """
+        provider_name = options.provider
+        provider = self._providers.get(provider_name)
+        if provider is None:
+            provider = TranslationProvider.get_provider(options)
+            if not provider.ValidateSettings():
+                raise SubtitleError(_("Invalid settings for provider {provider}: {message}").format(provider=provider_name, message=provider.validation_message))
+            self._providers[provider_name] = provider
+
+        return provider
+
+    def _get_client_key(self, options : Options) -> str:
+        """
+        Identify the settings a client is created with, so that it can be shared by jobs with the same settings
+        """
+        instructions = options.GetInstructions()
+        return json.dumps({
+            'provider': options.provider,
+            'provider_settings': options.current_provider_settings,
+            'instructions': instructions.instructions,
+            'retry_instructions': instructions.retry_instructions,
+        }, sort_keys=True, default=str)
+
+    def _notify(self) -> None:
+        with self._jobs_changed:
+            self._jobs_changed.notify_all()
+
+    def _on_preprocessed(self, job_id : str, scenes : list[SubtitleScene]) -> None:
+        self.queue.AddEvent(job_id, 'preprocessed', { 'scenes': len(scenes), 'lines': sum(scene.linecount for scene in scenes) })
+        self._notify()
+
+    def _on_batch_translated(self, job_id : str, batch : SubtitleBatch) -> None:
+        data : dict[str, Any] = { 'scene': batch.scene, 'batch': batch.number, 'lines': batch.size, 'translated': len(batch.translated) }
+        if batch.errors:
+            data['errors'] = [ str(error) for error in batch.errors ]
+        self.queue.AddEvent(job_id, 'batch_translated', data)
+        self._notify()
+
+    def _on_scene_translated(self, job_id : str, scene : SubtitleScene) -> None:
+        self.queue.AddEvent(job_id, 'scene_translated', { 'scene': scene.number, 'summary': scene.summary })
+        self._notify()
@@ -7,3 +7,21 @@ from PySubtitle.UnitTests.test_ChineseDinner import ChineseDinnerTests
 from PySubtitle.UnitTests.test_Translator import SubtitleTranslatorTests
 from PySubtitle.UnitTests.test_Options import TestOptions
 from PySubtitle.UnitTests.test_localization import TestLocalization
+from PySubtitle.UnitTests.test_SubtitleBatcher import TestSubtitleBatcher
+from PySubtitle.UnitTests.test_SrtFileHandler import TestSrtFileHandler
+from PySubtitle.UnitTests.test_TranslationParser import TestTranslationParser
+from PySubtitle.UnitTests.test_SubtitleTimings import TestSubtitleTimings
+from PySubtitle.UnitTests.test_SubtitleIndex import TestSubtitleIndex
+from PySubtitle.UnitTests.test_Linearisation import TestLinearisation
+from PySubtitle.UnitTests.test_ReadWriteLock import TestReadWriteLock, TestConcurrentTranslation
+from PySubtitle.UnitTests.test_BackgroundWriter import TestBackgroundWriter, TestProjectSnapshot
+from PySubtitle.UnitTests.test_ProjectJournal import TestProjectJournal
+from PySubtitle.UnitTests.test_ProjectCodec import TestProjectCodec
+from PySubtitle.UnitTests.test_ProjectIndex import TestProjectIndex
+from PySubtitle.UnitTests.test_ProjectDatabase import TestProjectDatabase
+from PySubtitle.UnitTests.test_Encoding import TestEncoding
+from PySubtitle.UnitTests.test_ProgressiveOutput import TestProgressiveOutput
+from PySubtitle.UnitTests.test_SubtitleFormats import TestSubtitleFormats
+from PySubtitle.UnitTests.test_TextPipeline import TestTextPipeline
+from PySubtitle.UnitTests.test_BatchTranslator import TestBatchTranslator
+from PySubtitle.UnitTests.test_TranslationService import TestTranslationService
@@ -0,0 +1,132 @@
+import os
+import tempfile
+from datetime import timedelta
+import threading
+import unittest
+
+from PySubtitle.BackgroundWriter import BackgroundWriter
+from PySubtitle.Helpers.TestCases import AddTranslations, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestBackgroundWriter(unittest.TestCase):
+    def test_CoalescedWrites(self):
+        log_test_name("BackgroundWriter coalesces writes")
+        writer = BackgroundWriter()
+        written : list[int] = []
+        release = threading.Event()
+
+        def blocking_write():
+            release.wait(5)
+            written.append(0)
+
+        # Hold up the writer thread, then queue several writes to the same file
+        writer.QueueWrite("file", blocking_write)
+        while not writer._busy:
+            release.wait(0.001)
+
+        for value in range(1, 6):
+            writer.QueueWrite("file", lambda value=value: written.append(value))
+
+        release.set()
+        self.assertTrue(writer.Flush(5))
+
+        log_input_expected_result("Written", [0, 5], written)
+        self.assertSequenceEqual(written, [0, 5])
+        self.assertEqual(writer.coalesced_count, 4)
+
+    def test_ImmediateWriteSupersedesQueued(self):
+        log_test_name("BackgroundWriter immediate write")
+        writer = BackgroundWriter()
+        written : list[str] = []
+        release = threading.Event()
+
+        def blocking_write():
+            release.wait(5)
+
+        writer.QueueWrite("other", blocking_write)
+        while not writer._busy:
+            release.wait(0.001)
+
+        writer.QueueWrite("file", lambda: written.append("queued"))
+        thread = threading.Thread(target=writer.Write, args=("file", lambda: written.append("immediate")))
+        thread.start()
+
+        # The immediate write replaces the queued one
+        while "file" in writer._pending:
+            release.wait(0.001)
+
+        release.set()
+        thread.join(5)
+        self.assertTrue(writer.Flush(5))
+
+        log_input_expected_result("Written", ["immediate"], written)
+        self.assertSequenceEqual(written, ["immediate"])
+
+class TestProjectSnapshot(SubtitleTestCase):
+    def test_Snapshot(self):
+        log_test_name("Subtitles snapshot")
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        AddTranslations(subtitles, chinese_dinner_data)
+
+        snapshot = subtitles.Snapshot()
+        self.assertEqual(snapshot.scenecount, subtitles.scenecount)
+        self.assertEqual(snapshot.Linearise()[0], subtitles.Linearise()[0])
+
+        # Changes after the snapshot is taken do not affect it
+        subtitles.GetScene(1).summary = "Changed"
+        batch = subtitles.GetBatch(1, 1)
+        batch.AddTranslatedLine(SubtitleLine.Construct(1000, timedelta(seconds=1000), timedelta(seconds=1001), "Extra"))
+        subtitles.MergeScenes([2, 3])
+
+        self.assertNotEqual(snapshot.GetScene(1).summary, "Changed")
+        self.assertEqual(len(snapshot.GetBatch(1, 1).translated), len(batch.translated) - 1)
+        self.assertEqual(snapshot.scenecount, subtitles.scenecount + 1)
+
+        # Lines are copied, so editing them in place does not affect the snapshot
+        line = batch.originals[0]
+        original_text = line.text
+        subtitles.UpdateLineText(line.number, "Edited", "Edited translation")
+        self.assertEqual(snapshot.GetBatch(1, 1).originals[0].text, original_text)
+        self.assertEqual(subtitles.Snapshot().GetBatch(1, 1).originals[0].text, "Edited")
+
+        # Unmodified batches share their line lists with the previous snapshot
+        second = subtitles.Snapshot()
+        self.assertIs(second.scenes[-1].batches[-1].originals, subtitles.Snapshot().scenes[-1].batches[-1].originals)
+
+    def test_BackgroundSave(self):
+        log_test_name("Background project save")
+        options = Options(self.options)
+        options.add('project', 'write')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project = SubtitleProject(options)
+            project.subtitles = PrepareSubtitles(chinese_dinner_data)
+            project.subtitles.AutoBatch(SubtitleBatcher(self.options))
+            projectfile = os.path.join(temp_dir, "chinese_dinner.subtrans")
+
+            for _ in range(5):
+                project.SaveProjectFile(projectfile, background=True)
+
+            project.subtitles.GetScene(1).summary = "Saved later"
+            self.assertTrue(project.FlushProjectFile(5))
+
+            reloaded = SubtitleProject(options)
+            subtitles = reloaded.ReadProjectFile(projectfile)
+            self.assertIsNotNone(subtitles)
+            if subtitles:
+                log_input_expected_result("Scenes", project.subtitles.scenecount, subtitles.scenecount)
+                self.assertEqual(subtitles.scenecount, project.subtitles.scenecount)
+                self.assertEqual(subtitles.linecount, project.subtitles.linecount)
+                self.assertNotEqual(subtitles.GetScene(1).summary, "Saved later")
+
+            self.assertGreaterEqual(project.writer.write_count, 1)
+            self.assertEqual(project.writer.write_count + project.writer.coalesced_count, 5)
+
+if __name__ == '__main__':
+    unittest.main()
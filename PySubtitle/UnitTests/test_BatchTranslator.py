@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from PySubtitle.BatchTranslator import BatchTranslator
+from PySubtitle.Helpers.TestCases import DummyProvider, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.RequestBudget import RequestBudget
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestBatchTranslator(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filepaths = [ self._write_source(path) for path in [ "episode1.srt", "episode2.srt", os.path.join("season2", "episode3.srt") ] ]
+
+        self.batch_options = Options(self.options)
+        self.batch_options.update({
+            'project': 'write',
+            'description': chinese_dinner_data.get_str('description'),
+            'names': chinese_dinner_data.get_list('names'),
+            'max_threads': 2
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_source(self, path : str) -> str:
+        filepath = os.path.join(self.temp_dir.name, path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(chinese_dinner_data.get_str('original') or '')
+        return os.path.normpath(filepath)
+
+    def _create_batch(self, **kwargs) -> BatchTranslator:
+        return BatchTranslator(self.batch_options, DummyProvider(data=chinese_dinner_data), **kwargs)
+
+    def test_FindSourceFiles(self):
+        log_test_name("Source files are found in subdirectories and translations are ignored")
+        with open(os.path.join(self.temp_dir.name, "episode1.English.srt"), 'w', encoding='utf-8') as f:
+            f.write(chinese_dinner_data.get_str('translated') or '')
+
+        filepaths = BatchTranslator.FindSourceFiles(self.temp_dir.name, 'English')
+        log_input_expected_result(self.temp_dir.name, len(self.filepaths), len(filepaths))
+        self.assertEqual(filepaths, sorted(self.filepaths))
+
+        pattern = os.path.join(self.temp_dir.name, "episode*.srt")
+        self.assertEqual(BatchTranslator.FindSourceFiles(pattern, 'English'), sorted(self.filepaths[:2]))
+
+    def test_TranslateFiles(self):
+        log_test_name("Translate a directory of subtitle files")
+        output_dir = os.path.join(self.temp_dir.name, "translated")
+        manifest_path = os.path.join(output_dir, "manifest.json")
+
+        # A file with the same name as another in a different directory
+        filepaths = self.filepaths + [ self._write_source(os.path.join("season2", "episode1.srt")) ]
+
+        batch = self._create_batch(max_files=2, output_dir=output_dir)
+        results = batch.TranslateFiles(filepaths, manifest_path)
+
+        statuses = [ result['status'] for result in results ]
+        log_input_expected_result("Statuses", ['translated'] * 4, statuses)
+        self.assertEqual(statuses, ['translated'] * 4)
+
+        # The output directory has the same structure as the source directory
+        for result in results:
+            source_directory = os.path.relpath(os.path.dirname(result['source']), self.temp_dir.name)
+            self.assertEqual(os.path.dirname(result['output']), os.path.normpath(os.path.join(output_dir, source_directory)))
+            self.assertTrue(os.path.exists(result['output']))
+            self.assertEqual(result['translated'], result['lines'])
+
+        self.assertEqual(len({ result['output'] for result in results }), 4)
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        log_input_expected_result("Manifest summary", 4, manifest['summary']['translated'])
+        self.assertEqual(manifest['summary'], { 'translated': 4, 'skipped': 0, 'failed': 0, 'aborted': 0 })
+        self.assertEqual(len(manifest['files']), 4)
+        self.assertGreater(manifest['requests'], 0)
+
+        # Every file shares a single client and request budget
+        budget = batch.request_budget
+        self.assertIsNotNone(budget)
+        self.assertEqual(budget.max_concurrent if budget else None, 2)
+        self.assertEqual(len(batch._clients.clients), 1)
+
+    def test_SkipTranslatedFiles(self):
+        log_test_name("Files that have already been translated are skipped")
+        self._create_batch().TranslateFiles(self.filepaths)
+
+        results = self._create_batch().TranslateFiles(self.filepaths)
+        statuses = [ result['status'] for result in results ]
+        log_input_expected_result("Statuses", ['skipped'] * 3, statuses)
+        self.assertEqual(statuses, ['skipped'] * 3)
+
+        results = self._create_batch(overwrite=True).TranslateFiles(self.filepaths[:1])
+        self.assertEqual(results[0]['status'], 'translated')
+
+    def test_RequestBudget(self):
+        log_test_name("The request budget limits concurrent requests")
+        budget = RequestBudget(max_concurrent=2)
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def request():
+            with budget:
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.01)
+                with lock:
+                    active[0] -= 1
+
+        threads = [ threading.Thread(target=request) for _ in range(8) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        log_input_expected_result("Peak concurrency", 2, peak[0])
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual(budget.request_count, 8)
+
+    def test_RequestBudgetRate(self):
+        log_test_name("The request budget spaces requests to the rate limit")
+        budget = RequestBudget(rate_limit=1200.0)
+        start_time = time.monotonic()
+        for _ in range(4):
+            with budget:
+                pass
+
+        elapsed = time.monotonic() - start_time
+        log_input_expected_result("Elapsed >= 0.15s", True, elapsed >= 0.15)
+        self.assertGreaterEqual(elapsed, 0.15)
+
+if __name__ == '__main__':
+    unittest.main()
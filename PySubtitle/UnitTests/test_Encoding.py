@@ -0,0 +1,102 @@
+import codecs
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import PySubtitle.Helpers.Encoding as Encoding
+from PySubtitle.Helpers.Encoding import DetectEncoding, DetectSampleEncoding
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Subtitles import Subtitles
+
+samples = {
+    'cp1251': "1\n00:00:01,000 --> 00:00:02,000\nПривет, как дела? Я давно тебя не видел.\n\n2\n00:00:03,000 --> 00:00:04,000\nВсё хорошо, спасибо. Пойдём ужинать.\n",
+    'gbk': "1\n00:00:01,000 --> 00:00:02,000\n我们今天晚上去吃饭好吗？\n\n2\n00:00:03,000 --> 00:00:04,000\n好的，我的朋友也一起去。\n",
+    'shift_jis': "1\n00:00:01,000 --> 00:00:02,000\n今日は晩ご飯を一緒に食べませんか？\n\n2\n00:00:03,000 --> 00:00:04,000\nはい、友達も一緒に行きます。\n",
+}
+
+class TestEncoding(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name : str, content : bytes) -> str:
+        filepath = os.path.join(self.temp_dir.name, name)
+        with open(filepath, 'wb') as f:
+            f.write(content)
+        return filepath
+
+    def test_ByteOrderMarks(self):
+        log_test_name("Encoding detection from byte order marks")
+        text = samples['cp1251']
+        cases = [
+            (codecs.BOM_UTF8 + text.encode('utf-8'), 'utf-8-sig'),
+            (text.encode('utf-16'), 'utf-16'),
+            (text.encode('utf-32'), 'utf-32'),
+        ]
+
+        for sample, expected in cases:
+            with self.subTest(expected=expected):
+                detected = DetectSampleEncoding(sample)
+                log_input_expected_result(sample[:4], expected, detected)
+                self.assertEqual(detected, expected)
+
+    def test_Utf8(self):
+        log_test_name("Encoding detection of UTF-8")
+        sample = samples['gbk'].encode('utf-8')
+        self.assertEqual(DetectSampleEncoding(sample), 'utf-8')
+
+        # A sample that ends part way through a character is still UTF-8 if the file continues
+        truncated = sample[:sample.index('今'.encode('utf-8')) + 1]
+        self.assertEqual(DetectSampleEncoding(truncated, complete=False), 'utf-8')
+        self.assertNotEqual(DetectSampleEncoding(truncated, complete=True), 'utf-8')
+
+    @unittest.skipIf(Encoding.charset_normalizer is None, "charset_normalizer is not installed")
+    def test_LegacyEncodings(self):
+        log_test_name("Encoding detection of legacy code pages")
+        for encoding, text in samples.items():
+            with self.subTest(encoding=encoding):
+                filepath = self._write(f"{encoding}.srt", text.encode(encoding))
+                detected = DetectEncoding(filepath)
+                with open(filepath, 'r', encoding=detected) as f:
+                    decoded = f.read()
+                log_input_expected_result(f"{encoding} (detected {detected})", text, decoded)
+                self.assertEqual(decoded, text)
+
+    def test_DefaultEncoding(self):
+        log_test_name("Encoding detection without charset_normalizer")
+        sample = samples['cp1251'].encode('cp1251')
+        with patch.object(Encoding, 'charset_normalizer', None):
+            self.assertEqual(DetectSampleEncoding(sample, default='iso-8859-1'), 'iso-8859-1')
+            self.assertEqual(DetectSampleEncoding(b"1\n00:00:01,000 --> 00:00:02,000\nHello\n", default='iso-8859-1'), 'utf-8')
+
+    def test_LoadSubtitles(self):
+        log_test_name("Subtitles are decoded once and the encoding is recorded")
+        filepath = self._write("russian.srt", samples['cp1251'].encode('cp1251'))
+
+        with patch('PySubtitle.Subtitles.DetectEncoding', wraps=DetectEncoding) as detect, \
+             patch('PySubtitle.Formats.SrtFileHandler.SrtFileHandler.parse_file', autospec=True, side_effect=lambda handler, f: iter([])) as parse:
+            Subtitles(filepath).LoadSubtitles()
+            self.assertEqual(detect.call_count, 1)
+            self.assertEqual(parse.call_count, 1)
+
+        subtitles = Subtitles(filepath)
+        subtitles.LoadSubtitles()
+        encoding = subtitles.settings.get('encoding')
+        log_input_expected_result("Encoding", True, bool(encoding))
+        self.assertIsNotNone(encoding)
+        self.assertEqual(subtitles.originals[0].text if subtitles.originals else None, "Привет, как дела? Я давно тебя не видел.")
+
+        # A recorded encoding skips detection
+        reloaded = Subtitles(filepath)
+        reloaded.settings['encoding'] = encoding
+        with patch('PySubtitle.Subtitles.DetectEncoding') as detect:
+            reloaded.LoadSubtitles()
+            detect.assert_not_called()
+
+        self.assertEqual(reloaded.linecount, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+from PySubtitle.Helpers.TestCases import AddTranslations, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestLinearisation(SubtitleTestCase):
+    def _prepare_subtitles(self) -> Subtitles:
+        subtitles : Subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        AddTranslations(subtitles, chinese_dinner_data)
+        return subtitles
+
+    def _assert_linearisation_correct(self, subtitles : Subtitles):
+        """
+        Check the cached linearisation against the lines in the batches
+        """
+        originals, translated, untranslated = subtitles.Linearise()
+        batches = [ batch for scene in subtitles.scenes for batch in scene.batches ]
+        self.assertSequenceEqual(originals, [ line for batch in batches for line in batch.originals ])
+        self.assertSequenceEqual(translated, [ line for batch in batches for line in batch.translated ])
+        self.assertSequenceEqual(untranslated, [ line for batch in batches for line in batch.originals if line.translation is None ])
+        self.assertEqual(subtitles.translated_linecount, len(translated))
+        self.assertEqual(subtitles.untranslated_linecount, len(untranslated))
+
+    def test_Linearise(self):
+        log_test_name("Linearise")
+        subtitles = self._prepare_subtitles()
+        self._assert_linearisation_correct(subtitles)
+
+        log_input_expected_result("Translated lines", 64, subtitles.translated_linecount)
+        self.assertEqual(subtitles.translated_linecount, 64)
+        self.assertEqual(subtitles.untranslated_linecount, 0)
+
+        # Unchanged subtitles should not be linearised again
+        first = subtitles.Linearise()
+        self.assertIs(subtitles.Linearise(), first)
+
+    def test_LineariseAfterChanges(self):
+        log_test_name("Linearise after changes")
+        subtitles = self._prepare_subtitles()
+        scene = subtitles.GetScene(2)
+        batch = scene.batches[0]
+        other_scene = subtitles.GetScene(1)
+        other_lines = other_scene.originals
+
+        with self.subTest("Remove translation"):
+            line = batch.originals[0]
+            batch._translated = [ item for item in batch.translated if item.number != line.number ]
+            line.translation = None
+            self._assert_linearisation_correct(subtitles)
+            log_input_expected_result("Untranslated lines", 1, subtitles.untranslated_linecount)
+            self.assertEqual(subtitles.untranslated_linecount, 1)
+
+            # Other scenes are not linearised again
+            self.assertIs(other_scene.originals, other_lines)
+
+        with self.subTest("Add translation"):
+            line.translation = "Translated again"
+            batch.AddTranslatedLine(SubtitleLine.Construct(line.number, line.start, line.end, line.translation))
+            self._assert_linearisation_correct(subtitles)
+            self.assertEqual(subtitles.untranslated_linecount, 0)
+
+        with self.subTest("Translation set in place"):
+            line.translation = None
+            batch.MarkModified()
+            self.assertEqual(scene.untranslated_linecount, 1)
+            line.translation = "Translated again"
+            subtitles.UpdateLineText(line.number, line.text or "", "Translated once more")
+            self.assertEqual(scene.untranslated_linecount, 0)
+            self._assert_linearisation_correct(subtitles)
+
+        with self.subTest("Restructure"):
+            subtitles.MergeScenes([1, 2])
+            self._assert_linearisation_correct(subtitles)
+            subtitles.DeleteLines([5, 6])
+            self._assert_linearisation_correct(subtitles)
+            subtitles.GetScene(1).SplitBatch(1, 3)
+            self._assert_linearisation_correct(subtitles)
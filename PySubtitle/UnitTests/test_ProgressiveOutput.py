@@ -0,0 +1,121 @@
+import os
+import tempfile
+import time
+import unittest
+
+from PySubtitle.Helpers.TestCases import PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.ProgressiveOutput import ProgressiveOutput
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleScene import SubtitleScene
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestProgressiveOutput(SubtitleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.outputpath = os.path.join(self.temp_dir.name, "output.srt")
+        self.translations : dict[int, SubtitleLine] = { line.number: line for line in PrepareSubtitles(chinese_dinner_data, 'translated').originals or [] }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_subtitles(self) -> Subtitles:
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        return subtitles
+
+    def _translate_scene(self, scene : SubtitleScene):
+        for batch in scene.batches:
+            batch.translated = [ SubtitleLine(self.translations[line.number]) for line in batch.originals if line.number in self.translations ]
+            for line in batch.originals:
+                translated = self.translations.get(line.number)
+                line.translation = translated.text if translated else None
+
+    def _read(self, filepath : str) -> str:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _expected(self, subtitles : Subtitles) -> str:
+        filepath = os.path.join(self.temp_dir.name, "expected.srt")
+        subtitles.SaveTranslation(filepath)
+        return self._read(filepath)
+
+    def test_AppendScenes(self):
+        log_test_name("Progressive output appends completed scenes")
+        subtitles = self._create_subtitles()
+        output = ProgressiveOutput(subtitles, self.outputpath, interval=0)
+        scene_count = len(subtitles.scenes)
+
+        for scene in subtitles.scenes:
+            self._translate_scene(scene)
+            output.Write()
+            self.assertEqual(self._read(self.outputpath), self._expected(subtitles))
+
+        # Each scene is composed once after it has been translated
+        log_input_expected_result("Appends", scene_count - 1, output.append_count)
+        self.assertEqual(output.rewrite_count, 1)
+        self.assertEqual(output.append_count, scene_count - 1)
+        self.assertEqual(output.composed_count, scene_count)
+        self.assertFalse(os.path.exists(f"{self.outputpath}.tmp"))
+
+    def test_PatchScene(self):
+        log_test_name("Progressive output rewrites the file when an earlier scene changes")
+        subtitles = self._create_subtitles()
+        for scene in subtitles.scenes:
+            self._translate_scene(scene)
+
+        output = ProgressiveOutput(subtitles, self.outputpath, interval=0)
+        output.Write()
+        composed_count = output.composed_count
+
+        batch = subtitles.GetBatch(1, 1)
+        batch.translated = [ SubtitleLine.Construct(line.number, line.start, line.end, "") if line.number == 2 else line for line in batch.translated ]
+        output.Write()
+
+        content = self._read(self.outputpath)
+        log_input_expected_result("Rewrites", 2, output.rewrite_count)
+        self.assertEqual(output.rewrite_count, 2)
+        self.assertEqual(output.composed_count, composed_count + 1)
+        self.assertEqual(content, self._expected(subtitles))
+
+        # A file that was changed by something else is rewritten rather than appended to
+        with open(self.outputpath, 'a', encoding='utf-8') as f:
+            f.write("Edited")
+        self._translate_scene(subtitles.scenes[0])
+        output.Write()
+        self.assertEqual(output.rewrite_count, 3)
+        self.assertEqual(self._read(self.outputpath), self._expected(subtitles))
+
+    def test_Debounce(self):
+        log_test_name("Progressive output is debounced")
+        subtitles = self._create_subtitles()
+        output = ProgressiveOutput(subtitles, self.outputpath, interval=60)
+
+        self._translate_scene(subtitles.scenes[0])
+        output.Update()
+        first = self._read(self.outputpath)
+
+        # Updates within the interval are deferred, and written when the output is closed
+        self._translate_scene(subtitles.scenes[1])
+        output.Update()
+        output.Update()
+        self.assertEqual(self._read(self.outputpath), first)
+
+        output.Close()
+        log_input_expected_result("Writes", 2, output.rewrite_count + output.append_count)
+        self.assertEqual(output.rewrite_count + output.append_count, 2)
+        self.assertEqual(self._read(self.outputpath), self._expected(subtitles))
+
+        # A deferred update is written when the interval has passed
+        output.interval = 0.05
+        self._translate_scene(subtitles.scenes[2])
+        output.Update()
+        output.Update()
+        time.sleep(0.5)
+        self.assertEqual(self._read(self.outputpath), self._expected(subtitles))
+
+if __name__ == '__main__':
+    unittest.main()
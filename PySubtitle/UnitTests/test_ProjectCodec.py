@@ -0,0 +1,207 @@
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from typing import Any
+import unittest
+from unittest.mock import patch
+
+from PySubtitle.Helpers.TestCases import AddTranslations, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+import PySubtitle.SubtitleSerialisation as SubtitleSerialisation
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.SubtitleSerialisation import DecodeProject, EncodeProject, SubtitleDecoder, SubtitleEncoder
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.Translation import Translation
+from PySubtitle.TranslationPrompt import TranslationPrompt
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+legacy_project = """{
+    "_class": "SubtitleFile",
+    "filename": "legacy.srt",
+    "context": { "movie_name": "Legacy", "target_language": "English" },
+    "scenes": [ {
+        "_class": "SubtitleScene",
+        "scene": 1,
+        "context": { "summary": "A scene" },
+        "batches": [ {
+            "_class": "SubtitleBatch",
+            "scene": 1,
+            "batch": 1,
+            "subtitles": [
+                { "_class": "Subtitle", "line": "1\\n00:00:01,000 --> 00:00:02,500\\nHello" },
+                { "_class": "Subtitle", "index": 2, "start": "00:00:03,000", "end": "00:00:04,000", "text": "World" }
+            ],
+            "translated": [
+                { "_class": "Subtitle", "index": 1, "start": 1.0, "end": 2.5, "text": "Bonjour" }
+            ],
+            "translation": { "_class": "GPTTranslation", "text": "#1\\nBonjour", "prompt_tokens": 10 }
+        } ]
+    } ]
+}"""
+
+instructions = "Translate these subtitles into English, keeping each line roughly the same length as the original."
+
+def resolve_blobs(data : Any, blobs : dict[str,str]) -> Any:
+    """ Replace references to the blob table with its content """
+    if isinstance(data, list):
+        return [ resolve_blobs(item, blobs) for item in data ]
+    if isinstance(data, dict):
+        if '_blob' in data:
+            return blobs[data['_blob']]
+        return { key: resolve_blobs(value, blobs) for key, value in data.items() if key != 'blobs' }
+    return data
+
+class TestProjectCodec(SubtitleTestCase):
+    def _create_subtitles(self) -> Subtitles:
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        AddTranslations(subtitles, chinese_dinner_data)
+
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                batch.translation = Translation({ 'text': f"<summary>Batch {batch.number}</summary>", 'prompt_tokens': 100 })
+                batch.prompt = TranslationPrompt("Translate these subtitles [ for movie][ to language], paying attention to the context")
+                batch.prompt.supports_system_messages = True
+                batch.prompt.GenerateMessages(instructions, batch.originals, { 'summary': "Context" })
+
+        batch = subtitles.GetBatch(1, 1)
+        batch.summary = "First batch"
+        batch.originals[0].metadata = { 'italic': True }
+        return subtitles
+
+    def _serialise(self, subtitles : Subtitles) -> str:
+        return json.dumps(subtitles, cls=SubtitleEncoder, ensure_ascii=False, sort_keys=True)
+
+    def test_EncoderParity(self):
+        log_test_name("Project codec matches the JSON encoder")
+        subtitles = self._create_subtitles()
+
+        expected = json.loads(self._serialise(subtitles))
+        for pretty in [False, True]:
+            encoded = EncodeProject(subtitles, pretty=pretty)
+            data = json.loads(encoded)
+            self.assertEqual(resolve_blobs(data, data.get('blobs', {})), expected)
+            self.assertEqual(b'\n' in encoded, pretty)
+
+        # Content written by the codec can be read by the JSON decoder and vice versa
+        decoded = json.loads(EncodeProject(subtitles), cls=SubtitleDecoder)
+        self.assertEqual(self._serialise(decoded), self._serialise(subtitles))
+
+    def test_RoundTrip(self):
+        log_test_name("Project codec round trip")
+        subtitles = self._create_subtitles()
+
+        legacy = json.loads(json.dumps(subtitles, cls=SubtitleEncoder), cls=SubtitleDecoder)
+        decoded = DecodeProject(EncodeProject(subtitles))
+        log_input_expected_result("Line count", subtitles.linecount, decoded.linecount)
+        self.assertEqual(self._serialise(decoded), self._serialise(legacy))
+
+        batch = decoded.GetBatch(1, 1)
+        self.assertIsInstance(batch.translation, Translation)
+        self.assertIsInstance(batch.prompt, TranslationPrompt)
+        self.assertEqual(batch.originals[0].metadata, { 'italic': True })
+        self.assertEqual(batch.originals[0].start, subtitles.GetBatch(1, 1).originals[0].start)
+
+    def test_PromptBlobs(self):
+        log_test_name("Project codec stores prompts once")
+        subtitles = self._create_subtitles()
+        batch_count = sum(scene.size for scene in subtitles.scenes)
+
+        data = json.loads(EncodeProject(subtitles))
+        blobs : dict[str,str] = data['blobs']
+
+        # The instructions and user prompt are shared by every batch, each batch prompt is stored once
+        log_input_expected_result("Blobs", batch_count + 2, len(blobs))
+        self.assertEqual(len(blobs), batch_count + 2)
+        self.assertEqual(list(blobs.values()).count(instructions), 1)
+
+        decoded = DecodeProject(EncodeProject(subtitles))
+        prompts = [ batch.prompt for scene in decoded.scenes for batch in scene.batches if batch.prompt ]
+        self.assertEqual(len(prompts), batch_count)
+        self.assertEqual(prompts[0].messages[0]['content'], instructions)
+        self.assertIs(prompts[0].messages[0]['content'], prompts[-1].messages[0]['content'])
+        original_prompt = subtitles.GetBatch(1, 1).prompt
+        self.assertIsNotNone(original_prompt)
+        if original_prompt:
+            self.assertEqual(prompts[0].batch_prompt, original_prompt.batch_prompt)
+
+    def test_OptionalPrompts(self):
+        log_test_name("Project codec without prompts or responses")
+        subtitles = self._create_subtitles()
+
+        full = EncodeProject(subtitles)
+        compact = EncodeProject(subtitles, include_prompts=False, include_responses=False)
+        log_input_expected_result("Smaller", True, len(compact) < len(full))
+        self.assertLess(len(compact), len(full))
+        self.assertNotIn(b'"blobs"', compact)
+
+        decoded = DecodeProject(compact)
+        batch = decoded.GetBatch(1, 1)
+        self.assertIsNone(batch.prompt)
+        self.assertIsNotNone(batch.translation)
+        if batch.translation:
+            self.assertIsNone(batch.translation.text)
+            self.assertEqual(batch.translation.content.get('prompt_tokens'), 100)
+        self.assertEqual(decoded.translated_linecount, subtitles.translated_linecount)
+
+    def test_LegacyProject(self):
+        log_test_name("Project codec reads legacy projects")
+        expected = json.loads(legacy_project, cls=SubtitleDecoder)
+        decoded = DecodeProject(legacy_project.encode('utf-8'))
+
+        log_input_expected_result("Legacy project", self._serialise(expected), self._serialise(decoded))
+        self.assertEqual(self._serialise(decoded), self._serialise(expected))
+        self.assertEqual(decoded.movie_name, "Legacy")
+        self.assertEqual(decoded.GetBatch(1, 1).originals[0].end_ms, 2500)
+        self.assertEqual(decoded.GetBatch(1, 1).originals[1].start_ms, 3000)
+
+    def test_StandardLibraryFallback(self):
+        log_test_name("Project codec standard library fallback")
+        subtitles = self._create_subtitles()
+        expected = EncodeProject(subtitles)
+
+        with patch.object(SubtitleSerialisation, 'orjson', None), patch.object(SubtitleSerialisation, 'msgspec', None):
+            encoded = EncodeProject(subtitles)
+            self.assertEqual(json.loads(encoded), json.loads(expected))
+            self.assertEqual(self._serialise(DecodeProject(encoded)), self._serialise(DecodeProject(expected)))
+            self.assertRaises(json.JSONDecodeError, DecodeProject, encoded[:-10])
+
+        self.assertRaises(json.JSONDecodeError, DecodeProject, expected[:-10])
+
+    def test_DecodeErrors(self):
+        log_test_name("Project codec decode errors")
+        invalid = [ b'{"scenes": [', b'{"movie_name": "\xff\xfe"}' ]
+
+        class DecodeError(Exception):
+            pass
+
+        def decode(content : Any) -> Any:
+            raise DecodeError("Invalid JSON")
+
+        fake_msgspec = SimpleNamespace(DecodeError=DecodeError, json=SimpleNamespace(decode=decode))
+
+        # Every backend raises the same type of error, which is what the project reader handles
+        backends = [
+            ("orjson", { 'orjson': SubtitleSerialisation.orjson }),
+            ("msgspec", { 'orjson': None, 'msgspec': fake_msgspec }),
+            ("json", { 'orjson': None, 'msgspec': None }),
+        ]
+        for backend, patches in backends:
+            for content in invalid:
+                with self.subTest(backend=backend, content=content), patch.multiple(SubtitleSerialisation, **patches):
+                    self.assertRaises(json.JSONDecodeError, DecodeProject, content)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "invalid.subtrans")
+            with open(filepath, 'wb') as f:
+                f.write(invalid[1])
+
+            project = SubtitleProject(self.options)
+            result = project.ReadProjectFile(filepath)
+            log_input_expected_result("Read invalid project", None, result)
+            self.assertIsNone(result)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import unittest
+
+from PySubtitle.Helpers.TestCases import AddTranslations, DummyProvider, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.ProjectDatabase import ProjectDatabase
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.SubtitleSerialisation import SubtitleEncoder
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.Translation import Translation
+from PySubtitle.TranslationPrompt import TranslationPrompt
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+instructions = "Translate these subtitles into English, keeping each line roughly the same length as the original."
+
+class TestProjectDatabase(SubtitleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.databasefile = os.path.join(self.temp_dir.name, "season.subtransdb")
+        self.databases : list[ProjectDatabase] = []
+
+    def tearDown(self):
+        for database in self.databases:
+            database.Close()
+        self.temp_dir.cleanup()
+
+    def _open(self) -> ProjectDatabase:
+        database = ProjectDatabase(self.databasefile)
+        self.databases.append(database)
+        return database
+
+    def _create_subtitles(self, translated : bool = True) -> Subtitles:
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        if not translated:
+            return subtitles
+
+        AddTranslations(subtitles, chinese_dinner_data)
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                batch.translation = Translation({ 'text': f"<summary>Batch {batch.number}</summary>", 'prompt_tokens': 100 })
+                batch.prompt = TranslationPrompt("Translate these subtitles [ for movie][ to language]")
+                batch.prompt.supports_system_messages = True
+                batch.prompt.GenerateMessages(instructions, batch.originals, { 'summary': f"Scene {scene.number}" })
+
+        batch = subtitles.GetBatch(1, 1)
+        batch.errors = [ "An error" ]
+        batch.originals[0].metadata = { 'italic': True }
+        return subtitles
+
+    def _serialise(self, subtitles : Subtitles) -> str:
+        return json.dumps(subtitles, cls=SubtitleEncoder, ensure_ascii=False, sort_keys=True)
+
+    def test_RoundTrip(self):
+        log_test_name("Project database round trip")
+        subtitles = self._create_subtitles()
+
+        database = self._open()
+        database.WriteProject("episode1", subtitles)
+        log_input_expected_result("Projects", ["episode1"], database.ListProjects())
+        self.assertEqual(database.ListProjects(), ["episode1"])
+
+        decoded = self._open().ReadProject("episode1")
+        self.assertIsNotNone(decoded)
+        assert decoded is not None  # Type narrowing for PyLance
+        self.assertEqual(self._serialise(decoded), self._serialise(subtitles))
+        self.assertIsNone(database.ReadProject("episode2"))
+
+    def test_ImportExport(self):
+        log_test_name("Project database import and export")
+        subtitles = self._create_subtitles()
+
+        options = Options(self.options)
+        options.add('project', 'write')
+        project = SubtitleProject(options)
+        project.subtitles = subtitles
+        jsonfile = os.path.join(self.temp_dir.name, "episode1.subtrans")
+        project.SaveProjectFile(jsonfile)
+
+        database = self._open()
+        name = database.ImportProject(jsonfile)
+        log_input_expected_result("Imported project", "episode1", name)
+        self.assertEqual(name, "episode1")
+
+        exportfile = os.path.join(self.temp_dir.name, "exported.subtrans")
+        database.ExportProject(name, exportfile)
+
+        reloaded = SubtitleProject(Options(self.options))
+        exported = reloaded.ReadProjectFile(exportfile)
+        self.assertIsNotNone(exported)
+        assert exported is not None  # Type narrowing for PyLance
+        self.assertEqual(self._serialise(exported), self._serialise(subtitles))
+
+    def test_ConcurrentWorkers(self):
+        log_test_name("Project database shared by several workers")
+        self._open().WriteProject("episode1", self._create_subtitles(translated=False))
+        self._open().WriteProject("episode2", self._create_subtitles(translated=False))
+
+        untranslated = self._open().GetUntranslatedBatches()
+        batch_count = sum(scene.size for scene in self._create_subtitles(translated=False).scenes)
+        log_input_expected_result("Untranslated batches", batch_count * 2, len(untranslated))
+        self.assertEqual(len(untranslated), batch_count * 2)
+        self.assertEqual(untranslated[0], ("episode1", 1, 1))
+
+        # Two workers load the same project and each translate different batches
+        translated = self._create_subtitles()
+        worker1 = self._open()
+        worker2 = self._open()
+        project1 = worker1.ReadProject("episode1")
+        project2 = worker2.ReadProject("episode1")
+        self.assertIsNotNone(project1)
+        self.assertIsNotNone(project2)
+
+        for scene in translated.scenes:
+            subtitles = project1 if scene.number % 2 else project2
+            worker = worker1 if scene.number % 2 else worker2
+            target = subtitles.GetScene(scene.number) if subtitles else None
+            if target:
+                target._batches = scene.batches
+                worker.WriteScene("episode1", target)
+
+        # Saving a whole project does not overwrite batches written by the other worker
+        if project1 and project2:
+            worker1.WriteProject("episode1", project1)
+            worker2.WriteProject("episode1", project2)
+
+        remaining = self._open().GetUntranslatedBatches("episode1")
+        log_input_expected_result("Untranslated batches", [], remaining)
+        self.assertEqual(remaining, [])
+        self.assertEqual(len(self._open().GetUntranslatedBatches()), batch_count)
+
+        merged = self._open().ReadProject("episode1")
+        self.assertIsNotNone(merged)
+        assert merged is not None  # Type narrowing for PyLance
+        self.assertEqual(self._serialise(merged), self._serialise(translated))
+
+    def test_SubtitleProject(self):
+        log_test_name("Project database with SubtitleProject")
+        options = Options(self.options)
+        options.add('project', 'write')
+        options.add('project_database', self.databasefile)
+        project = SubtitleProject(options)
+        self.assertEqual(project.GetProjectFilepath("/path/to/episode1.srt"), os.path.normpath(self.databasefile))
+
+        project.projectfile = self.databasefile
+        project.project_name = "episode1"
+        project.subtitles = self._create_subtitles(translated=False)
+        project.SaveProjectFile()
+
+        # Each translated batch is written to the database as soon as it is translated
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        project.TranslateScene(translator, 1)
+        expected = project.subtitles.GetScene(1).translated_linecount
+
+        reloaded = SubtitleProject(Options(self.options))
+        subtitles = reloaded.ReadProjectFile(self.databasefile)
+        self.assertIsNotNone(subtitles)
+        scene = subtitles.GetScene(1) if subtitles else None
+        log_input_expected_result("Translated lines", expected, scene.translated_linecount if scene else None)
+        self.assertGreater(expected, 0)
+        self.assertEqual(scene.translated_linecount if scene else None, expected)
+        self.assertEqual(reloaded.project_name, "episode1")
+        self.assertFalse(os.path.exists(project.GetJournalFilepath(self.databasefile)))
+
+        if project.database:
+            project.database.Close()
+        if reloaded.database:
+            reloaded.database.Close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+from PySubtitle.Helpers.TestCases import AddTranslations, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.ProjectIndex import ProjectIndex
+from PySubtitle.SubtitleBatch import SubtitleBatch
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.Translation import Translation
+from PySubtitle.TranslationPrompt import TranslationPrompt
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+instructions = "Translate these subtitles into English, keeping each line roughly the same length as the original."
+
+class TestProjectIndex(SubtitleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projectfile = os.path.join(self.temp_dir.name, "chinese_dinner.subtrans")
+
+        options = Options(self.options)
+        options.add('project', 'write')
+        self.project = SubtitleProject(options)
+        self.project.projectfile = self.projectfile
+        self.project.subtitles = PrepareSubtitles(chinese_dinner_data)
+        self.project.subtitles.AutoBatch(SubtitleBatcher(self.options))
+        AddTranslations(self.project.subtitles, chinese_dinner_data)
+
+        for scene in self.project.subtitles.scenes:
+            for batch in scene.batches:
+                batch.translation = Translation({ 'text': f"<summary>Batch {batch.number}</summary>", 'prompt_tokens': 100 })
+                batch.prompt = TranslationPrompt("Translate these subtitles [ for movie][ to language]")
+                batch.prompt.supports_system_messages = True
+                batch.prompt.GenerateMessages(instructions, batch.originals, { 'summary': f"Scene {scene.number}" })
+
+        self.project.SaveProjectFile()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _reload(self) -> tuple[SubtitleProject, Subtitles]:
+        options = Options(self.options)
+        options.add('project', 'write')
+        reloaded = SubtitleProject(options)
+        reloaded.projectfile = self.projectfile
+        subtitles = reloaded.ReadProjectFile(self.projectfile)
+        self.assertIsNotNone(subtitles)
+        assert subtitles is not None  # Type narrowing for PyLance
+        return reloaded, subtitles
+
+    def _assertContentMatches(self, batch : SubtitleBatch, expected : SubtitleBatch):
+        self.assertIsNotNone(batch.translation)
+        self.assertIsNotNone(batch.prompt)
+        if batch.translation and expected.translation:
+            self.assertEqual(batch.translation.text, expected.translation.text)
+            self.assertEqual(batch.translation.content.get('prompt_tokens'), 100)
+        if batch.prompt and expected.prompt:
+            self.assertEqual(batch.prompt.messages, expected.prompt.messages)
+            self.assertEqual(batch.prompt.batch_prompt, expected.prompt.batch_prompt)
+
+    def test_LazyLoad(self):
+        log_test_name("Project index lazy load")
+        index = ProjectIndex.Read(self.project.GetIndexFilepath(self.projectfile))
+        self.assertIsNotNone(index)
+        self.assertTrue(index and index.Matches(self.projectfile))
+
+        _, subtitles = self._reload()
+        batch = subtitles.GetBatch(1, 1)
+        log_input_expected_result("Lazy content", ['prompt', 'translation'], sorted(batch._lazy or []))
+        self.assertEqual(sorted(batch._lazy or []), ['prompt', 'translation'])
+        self.assertIsNone(batch._translation)
+        self.assertIsNone(batch._prompt)
+        self.assertTrue(batch.has_translation)
+        self.assertTrue(batch.has_prompt)
+
+        # Lines are loaded up front, prompts and responses when they are accessed
+        self.assertEqual(subtitles.linecount, self.project.subtitles.linecount)
+        self.assertEqual(subtitles.translated_linecount, self.project.subtitles.translated_linecount)
+        self._assertContentMatches(batch, self.project.subtitles.GetBatch(1, 1))
+        self.assertFalse(batch._lazy)
+
+    def test_SaveUnloadedContent(self):
+        log_test_name("Project index save with unloaded content")
+        reloaded, subtitles = self._reload()
+
+        # Modify a batch so that the project file is rewritten while most content has not been loaded
+        batch = subtitles.GetBatch(1, 1)
+        batch.translation = Translation({ 'text': "Updated", 'prompt_tokens': 100 })
+        reloaded.SaveProjectFile()
+
+        # Content that was not loaded is read from its new location in the rewritten file
+        last_scene = subtitles.scenes[-1]
+        last_batch = last_scene.batches[-1]
+        self.assertTrue(last_batch._lazy)
+        self._assertContentMatches(last_batch, self.project.subtitles.GetBatch(last_scene.number, last_batch.number))
+
+        _, resaved = self._reload()
+        translation = resaved.GetBatch(1, 1).translation
+        log_input_expected_result("Updated translation", "Updated", translation.text if translation else None)
+        self.assertEqual(translation.text if translation else None, "Updated")
+
+        for scene in self.project.subtitles.scenes[1:]:
+            for expected in scene.batches:
+                self._assertContentMatches(resaved.GetBatch(scene.number, expected.number), expected)
+
+    def test_StaleIndex(self):
+        log_test_name("Project index is ignored when the project file changes")
+        with open(self.projectfile, 'ab') as f:
+            f.write(b'\n')
+
+        index = ProjectIndex.Read(self.project.GetIndexFilepath(self.projectfile))
+        log_input_expected_result("Index matches", False, index and index.Matches(self.projectfile))
+        self.assertFalse(index and index.Matches(self.projectfile))
+
+        _, subtitles = self._reload()
+        batch = subtitles.GetBatch(1, 1)
+        self.assertFalse(batch._lazy)
+        self._assertContentMatches(batch, self.project.subtitles.GetBatch(1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
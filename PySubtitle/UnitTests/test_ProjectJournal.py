@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+
+from PySubtitle.Helpers.TestCases import DummyProvider, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.ProjectJournal import ProjectJournal
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestProjectJournal(SubtitleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projectfile = os.path.join(self.temp_dir.name, "chinese_dinner.subtrans")
+
+        options = Options(self.options)
+        options.add('project', 'write')
+        self.project = SubtitleProject(options)
+        self.project.projectfile = self.projectfile
+        self.project.subtitles = PrepareSubtitles(chinese_dinner_data)
+        self.project.subtitles.AutoBatch(SubtitleBatcher(self.options))
+        self.project.SaveProjectFile()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _translate_scene(self, scene_number : int):
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        self.project.TranslateScene(translator, scene_number)
+
+    def _reload(self) -> tuple[SubtitleProject, Subtitles]:
+        reloaded = SubtitleProject(Options(self.options))
+        subtitles = reloaded.ReadProjectFile(self.projectfile)
+        self.assertIsNotNone(subtitles)
+        assert subtitles is not None  # Type narrowing for PyLance
+        return reloaded, subtitles
+
+    def test_ReplayAfterCrash(self):
+        log_test_name("Project journal replay")
+        self._translate_scene(1)
+
+        journal_path = self.project.GetJournalFilepath(self.projectfile)
+        batch_count = len(self.project.subtitles.GetScene(1).batches)
+        self.assertTrue(os.path.exists(journal_path))
+        log_input_expected_result("Journal records", batch_count, ProjectJournal(journal_path).record_count)
+        self.assertEqual(ProjectJournal(journal_path).record_count, batch_count)
+
+        # The project was not saved after translation, so the translations come from the journal
+        reloaded, subtitles = self._reload()
+        expected = self.project.subtitles.GetScene(1)
+        scene = subtitles.GetScene(1)
+        log_input_expected_result("Translated lines", expected.translated_linecount, scene.translated_linecount)
+        self.assertEqual(scene.translated_linecount, expected.translated_linecount)
+        self.assertGreater(scene.translated_linecount, 0)
+        self.assertTrue(reloaded.needs_writing)
+
+        for batch, expected_batch in zip(scene.batches, expected.batches):
+            self.assertEqual(batch.summary, expected_batch.summary)
+            self.assertEqual([ line.text for line in batch.translated ], [ line.text for line in expected_batch.translated ])
+            self.assertEqual([ line.translation for line in batch.originals ], [ line.translation for line in expected_batch.originals ])
+
+    def test_TruncatedRecord(self):
+        log_test_name("Project journal truncated record")
+        self._translate_scene(1)
+
+        # Simulate a crash part way through writing a record
+        journal_path = self.project.GetJournalFilepath(self.projectfile)
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "batch", "scene": 2, "batch": 1, "translated": [')
+
+        _, subtitles = self._reload()
+        log_input_expected_result("Scene 1 translated", True, subtitles.GetScene(1).translated_linecount > 0)
+        self.assertGreater(subtitles.GetScene(1).translated_linecount, 0)
+        self.assertEqual(subtitles.GetScene(2).translated_linecount, 0)
+
+    def test_Compaction(self):
+        log_test_name("Project journal compaction")
+        journal_path = self.project.GetJournalFilepath(self.projectfile)
+
+        self._translate_scene(1)
+        self.assertTrue(os.path.exists(journal_path))
+
+        self.project.SaveProjectFile()
+        log_input_expected_result("Journal exists after save", False, os.path.exists(journal_path))
+        self.assertFalse(os.path.exists(journal_path))
+
+        # Records written after the save are kept by compaction
+        journal = ProjectJournal(journal_path)
+        batch = self.project.subtitles.GetBatch(1, 1)
+        journal.AppendBatch(batch)
+        journal.AppendBatch(batch)
+        journal.Compact(1)
+        self.assertEqual(journal.record_count, 1)
+        self.assertEqual(ProjectJournal(journal_path).record_count, 1)
+
+        _, subtitles = self._reload()
+        self.assertEqual(subtitles.translated_linecount, self.project.subtitles.translated_linecount)
+
+if __name__ == '__main__':
+    unittest.main()
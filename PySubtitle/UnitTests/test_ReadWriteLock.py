@@ -0,0 +1,212 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from PySubtitle.Helpers.TestCases import DummyProvider, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.ReadWriteLock import ReadWriteLock
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleScene import UnbatchScenes
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestReadWriteLock(unittest.TestCase):
+    def test_SharedReaders(self):
+        log_test_name("ReadWriteLock shared readers")
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=5)
+        results : list[bool] = []
+
+        def read():
+            with lock.read_lock:
+                # All readers must hold the lock at the same time to pass the barrier
+                barrier.wait()
+                results.append(True)
+
+        threads = [ threading.Thread(target=read) for _ in range(3) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        log_input_expected_result("Concurrent readers", 3, len(results))
+        self.assertEqual(len(results), 3)
+
+    def test_ExclusiveWriter(self):
+        log_test_name("ReadWriteLock exclusive writer")
+        lock = ReadWriteLock()
+        events : list[str] = []
+        reader_started = threading.Event()
+
+        def read():
+            reader_started.set()
+            with lock.read_lock:
+                events.append("read")
+
+        with lock.write_lock:
+            # The writer can re-enter both sides of the lock
+            with lock.write_lock, lock.read_lock:
+                pass
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            reader_started.wait(5)
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            events.append("write")
+
+        thread.join(5)
+        log_input_expected_result("Order", ["write", "read"], events)
+        self.assertSequenceEqual(events, ["write", "read"])
+        self.assertGreater(lock.read_wait_time, 0.0)
+
+    def test_Upgrade(self):
+        log_test_name("ReadWriteLock upgrade")
+        lock = ReadWriteLock()
+        events : list[str] = []
+        reader_ready = threading.Event()
+        release_reader = threading.Event()
+
+        def read():
+            with lock.read_lock:
+                reader_ready.set()
+                release_reader.wait(5)
+                events.append("read")
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        reader_ready.wait(5)
+
+        # A reader can take the write lock once the other readers have finished
+        with lock.read_lock:
+            threading.Timer(0.1, release_reader.set).start()
+            with lock.write_lock:
+                events.append("write")
+
+        thread.join(5)
+        log_input_expected_result("Order", ["read", "write"], events)
+        self.assertSequenceEqual(events, ["read", "write"])
+
+        self.assertRaises(RuntimeError, lock.ReleaseRead)
+        self.assertRaises(RuntimeError, lock.ReleaseWrite)
+
+    def test_ConcurrentUpgrade(self):
+        log_test_name("ReadWriteLock concurrent upgrade")
+        lock = ReadWriteLock()
+        events : list[str] = []
+
+        def upgrade():
+            with lock.read_lock, lock.write_lock:
+                events.append("first")
+
+        with lock.read_lock:
+            thread = threading.Thread(target=upgrade)
+            thread.start()
+            while lock._upgrading is None:
+                time.sleep(0.01)
+
+            # The second reader to upgrade releases its read lock and waits for the first, rather than deadlocking
+            with lock.write_lock:
+                events.append("second")
+
+            # The read lock is restored once the write lock is released
+            self.assertIn(threading.get_ident(), lock._readers)
+
+        thread.join(5)
+        log_input_expected_result("Order", ["first", "second"], events)
+        self.assertSequenceEqual(events, ["first", "second"])
+        self.assertFalse(lock._readers)
+
+        with lock.write_lock:
+            pass
+
+class TestConcurrentTranslation(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def test_ConcurrentSceneTranslation(self):
+        log_test_name("Concurrent scene translation")
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        provider = DummyProvider(data=chinese_dinner_data)
+
+        errors : list[Exception] = []
+
+        def translate(scene_number : int):
+            try:
+                translator = SubtitleTranslator(self.options, translation_provider=provider)
+                translator.TranslateScene(subtitles, subtitles.GetScene(scene_number))
+                subtitles.UpdateScene(scene_number, { 'summary': f"Scene {scene_number} translated" })
+            except Exception as e:
+                errors.append(e)
+
+        threads = [ threading.Thread(target=translate, args=(scene.number,)) for scene in subtitles.scenes ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertSequenceEqual(errors, [])
+        log_input_expected_result("Untranslated lines", 0, subtitles.untranslated_linecount)
+        self.assertEqual(subtitles.untranslated_linecount, 0)
+        for scene in subtitles.scenes:
+            self.assertEqual(scene.summary, f"Scene {scene.number} translated")
+
+    def test_ConcurrentReaders(self):
+        log_test_name("Concurrent readers")
+        subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        originals = list(subtitles.originals or [])
+        scene_numbers = [ scene.number for scene in subtitles.scenes ]
+
+        thread_count = 8
+        iterations = 20
+        errors : list[Exception] = []
+        linearised : list[set[int]] = [ set() for _ in range(iterations) ]
+
+        def discard_caches():
+            subtitles._invalidate_index()
+            with subtitles._cache_lock:
+                subtitles._linear_lines = None
+
+        # All the readers rebuild the caches at the same time
+        barrier = threading.Barrier(thread_count, action=discard_caches, timeout=5)
+
+        def read(thread_index : int):
+            try:
+                for iteration in range(iterations):
+                    barrier.wait()
+                    with subtitles.read_lock:
+                        linearised[iteration].add(id(subtitles.Linearise()))
+                    line = originals[(thread_index * 7 + iteration) % len(originals)]
+                    self.assertIs(subtitles.GetOriginalLine(line.number), line)
+                    self.assertIsNotNone(subtitles.GetBatchContainingLine(line.number))
+                    scene_number = scene_numbers[iteration % len(scene_numbers)]
+                    self.assertEqual(subtitles.GetScene(scene_number).number, scene_number)
+            except Exception as e:
+                errors.append(e)
+
+        def slow_unbatch(scenes):
+            # Widen the window in which readers could rebuild the cache at the same time
+            time.sleep(0.005)
+            return UnbatchScenes(scenes)
+
+        with patch('PySubtitle.Subtitles.UnbatchScenes', side_effect=slow_unbatch):
+            threads = [ threading.Thread(target=read, args=(index,)) for index in range(thread_count) ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertSequenceEqual(errors, [])
+
+        # The linearisation should only be built once for each round of readers
+        built = [ len(entries) for entries in linearised ]
+        log_input_expected_result("Linearisations built", [1] * iterations, built)
+        self.assertSequenceEqual(built, [1] * iterations)
+
+if __name__ == '__main__':
+    unittest.main()
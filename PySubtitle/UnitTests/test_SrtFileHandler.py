@@ -0,0 +1,141 @@
+import io
+import mmap
+import os
+import tempfile
+import unittest
+
+import srt # type: ignore
+
+from PySubtitle.Formats.SrtFileHandler import SrtFileHandler
+from PySubtitle.Formats.SrtParser import SrtParser
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SubtitleError import SubtitleParseError
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestSrtFileHandler(unittest.TestCase):
+    blank_line_content = (
+        "1\n00:00:01,000 --> 00:00:02,000\nFirst line\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\nA line\n\nwith a blank line inside\n\n"
+        "3\n00:00:05,000 --> 00:00:06,000\n4\n\n"
+        "4\n00:00:07,000 --> 00:00:08,000\nLast line\n"
+    )
+
+    # Irregular files that the srt library accepts
+    tolerant_content = {
+        "CRLF line endings": "1\r\n00:00:01,000 --> 00:00:02,000\r\nFirst\r\nline\r\n\r\n2\r\n00:00:03,000 --> 00:00:04,000\r\nSecond\r\n",
+        "Byte order mark": "﻿1\n00:00:01,000 --> 00:00:02,000\nFirst line\n",
+        "Leading whitespace": "\n\n  \n1\n00:00:01,000 --> 00:00:02,000\nFirst line\n",
+        "Missing index": "00:00:01,000 --> 00:00:02,000\nFirst line\n\n00:00:03,000 --> 00:00:04,000\nSecond line\n",
+        "Missing blank line": "1\n00:00:01,000 --> 00:00:02,000\nFirst line\n2\n00:00:03,000 --> 00:00:04,000\nSecond line",
+        "Extra blank lines": "1\n00:00:01,000 --> 00:00:02,000\nFirst line\n\n\n\n2\n00:00:03,000 --> 00:00:04,000\nSecond line\n\n\n",
+        "Alternative separators": "1\n00:00:01.5 - > 00:00:02：250\nFirst line\n\n2.0\n0:0:3,000 --> 0:0:4,\nSecond line\n",
+        "Proprietary metadata": "1\n00:00:01,000 --> 00:00:02,000 X1:100 X2:200\nFirst line\n",
+        "Empty subtitle": "1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nSecond line\n",
+    }
+
+    def _describe(self, lines) -> list[tuple]:
+        return [ (line.number, line.start_ms, line.end_ms, line.text, dict(line.metadata)) for line in lines ]
+
+    def _describe_srt(self, content : str) -> list[tuple]:
+        expected = []
+        for item in srt.parse(content):
+            line = SubtitleLine.Construct(item.index, item.start, item.end, item.content, { "proprietary": item.proprietary } if item.proprietary else None)
+            expected.append(line)
+        return self._describe(expected)
+
+    def test_ParseFile(self):
+        log_test_name("Parse SRT file")
+        content = chinese_dinner_data.get_str('original') or ""
+
+        for source in [ content, self.blank_line_content ]:
+            handler = SrtFileHandler()
+            expected = self._describe(handler.parse_string(source))
+            result = self._describe(handler.parse_file(io.StringIO(source)))
+
+            log_input_expected_result("Lines", len(expected), len(result))
+            self.assertSequenceEqual(result, expected)
+            self.assertSequenceEqual(result, self._describe_srt(source))
+
+    def test_ParseFileIsLazy(self):
+        log_test_name("Parse SRT file lazily")
+        content = chinese_dinner_data.get_str('original') or ""
+        source = io.StringIO(content)
+
+        handler = SrtFileHandler()
+        lines = handler.parse_file(source)
+        first_line = next(lines)
+
+        self.assertEqual(first_line.number, 1)
+        self.assertLess(source.tell(), len(content) // 10)
+
+    def test_TolerantParsing(self):
+        log_test_name("Parse irregular SRT files")
+        for description, content in self.tolerant_content.items():
+            with self.subTest(description):
+                expected = self._describe_srt(content)
+                result = self._describe(SrtParser().Parse(content))
+                log_input_expected_result(description, expected, result)
+                self.assertSequenceEqual(result, expected)
+
+    def test_BinarySources(self):
+        log_test_name("Parse SRT from binary sources")
+        content = chinese_dinner_data.get_str('original') or ""
+        expected = self._describe(SrtParser().Parse(content))
+
+        result = self._describe(SrtParser().Parse(io.BytesIO(content.encode('utf-8'))))
+        self.assertSequenceEqual(result, expected)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "test.srt")
+            with open(filepath, 'wb') as f:
+                f.write(content.encode('utf-8'))
+
+            with open(filepath, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    result = self._describe(SrtParser().Parse(mapped))
+
+        log_input_expected_result("Memory map", len(expected), len(result))
+        self.assertSequenceEqual(result, expected)
+
+    def test_ComposeLines(self):
+        log_test_name("Composing SRT matches the srt library")
+        handler = SrtFileHandler()
+        lines = list(handler.parse_string(chinese_dinner_data.get_str('original') or ""))
+        lines.extend([
+            SubtitleLine.FromFields(900, 3600000 * 25 + 1, 3600000 * 25 + 1500, "\nLeading\n\n\nblank lines\n"),
+            SubtitleLine.FromFields(901, 0, 500, None),
+            SubtitleLine.FromFields(902, 999, 1000, "Trailing newline\n"),
+        ])
+
+        for reindex in [False, True]:
+            with self.subTest(reindex=reindex):
+                expected = srt.compose([ srt.Subtitle(index=i + 1 if reindex else line.number, start=line.start, end=line.end, content=line.text) for i, line in enumerate(lines) if line.text ], reindex=False)
+                composed = handler.compose_lines(lines, reindex=reindex)
+                log_input_expected_result(reindex, len(expected), len(composed))
+                self.assertEqual(composed, expected)
+
+                buffer = io.StringIO()
+                handler.write_lines(iter(lines), buffer, reindex=reindex)
+                self.assertEqual(buffer.getvalue(), expected)
+
+    def test_ParseErrors(self):
+        log_test_name("SRT parse errors report their location")
+        cases = [
+            ("\nNot a subtitle\n\n1\n00:00:01,000 --> 00:00:02,000\nFirst line\n", "line 2, column 1"),
+            ("1\n00:00:01,000 --> 00:00\nFirst line\n\n2\n00:00:03,000 --> 00:00:04,000\nSecond\n", "line 2, column 18"),
+            ("1\n  00:00:01,000 => 00:00:02,000\nFirst line\n", "line 2, column 15"),
+        ]
+
+        for content, location in cases:
+            with self.subTest(location):
+                self.assertRaises(srt.SRTParseError, lambda: list(srt.parse(content)))
+
+                with self.assertRaises(SubtitleParseError) as context:
+                    list(SrtFileHandler().parse_string(content))
+
+                log_input_expected_result(f"{location} in {context.exception}", True, location in str(context.exception))
+                self.assertIn(location, str(context.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from PySubtitle.Substitutions import Substitutions
 from PySubtitle.Helpers.Tests import log_test_name, log_input_expected_result
@@ -50,5 +51,54 @@ class TestSubstitutions(unittest.TestCase):
                 log_input_expected_result((value, substitutions), expected, result)
                 self.assertEqual(result, expected)
 
+    precedence_cases = [
+        ({"New": "Nuevo", "New York": "Nueva York"}, "New York is new", "Nueva York is new"),
+        ({"New York": "Nueva York", "New": "Nuevo"}, "New Jersey and New York", "Nuevo Jersey and Nueva York"),
+        ({"A": "B", "B": "C"}, "A B", "B C"),
+        ({"李": "Li", "李王": "Li Wang"}, "李王和李", "Li Wang和Li"),
+        ({"Jo": "Joe", "John": "Jon"}, "John and Jo, not Johnny", "Jon and Joe, not Johnny"),
+        ({"": "nothing", "a.b": "c"}, "a.b axb", "c axb"),
+    ]
+
+    def test_Precedence(self):
+        log_test_name("Substitutions prefer the longest match and are not repeated")
+        for substitutions, value, expected in self.precedence_cases:
+            with self.subTest(value=value):
+                helper = Substitutions(substitutions, Substitutions.Mode.Auto)
+                result = helper.PerformSubstitutions(value)
+                log_input_expected_result((value, substitutions), expected, result)
+                self.assertEqual(result, expected)
+
+    def test_Parity(self):
+        log_test_name("Combined substitutions match one pattern per substitution")
+        rng = random.Random(0)
+        syllables = [ "an", "bel", "cor", "dan", "el", "fa", "gor", "hin", "李", "王", "東", "京", "ス", "ミ" ]
+
+        # Names that do not contain one another, so applying them in any order gives the same result
+        names : set[str] = set()
+        while len(names) < 300:
+            names.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize())
+        names = { name for name in names if not any(name != other and name in other for other in names) }
+        glossary = { name: f"<{index}>" for index, name in enumerate(sorted(names)) }
+
+        filler = [ "the", "and", "mr.", "said", "は", "的", "了", ",", "!", "" ]
+        texts = [ ' '.join(rng.choice(list(glossary) + filler) + rng.choice([ "", "", "s", "的" ]) for _ in range(12)) for _ in range(200) ]
+
+        for mode in Substitutions.Mode:
+            helper = Substitutions(glossary, mode)
+            for text in texts:
+                with self.subTest(mode=mode, text=text):
+                    expected = text
+                    for pattern, substitution in helper.patterns:
+                        expected = pattern.sub(substitution, expected)
+
+                    self.assertEqual(helper.PerformSubstitutions(text), expected)
+
+        # The combined pattern is compiled once and shared by instances with the same substitutions
+        log_input_expected_result("Shared pattern", True, Substitutions(glossary).pattern is Substitutions(dict(glossary)).pattern)
+        self.assertIs(Substitutions(glossary).pattern, Substitutions(dict(glossary)).pattern)
+        self.assertIsNone(Substitutions({}).pattern)
+        self.assertEqual(Substitutions({}).PerformSubstitutionsOnAll([ "unchanged" ]), ([ "unchanged" ], {}))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
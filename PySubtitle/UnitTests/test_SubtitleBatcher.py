@@ -0,0 +1,247 @@
+import random
+import unittest
+from datetime import timedelta
+
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import GapIndex, SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+
+def _reference_split_lines(lines : list[SubtitleLine], min_batch_size : int, max_batch_size : int) -> list[list[SubtitleLine]]:
+    """
+    The original recursive splitting algorithm, used to verify that the indexed version gives identical results
+    """
+    if len(lines) <= max_batch_size:
+        return [ lines ]
+
+    longest_gap = timedelta(seconds=0)
+    split_index = min_batch_size
+    last_split_index = len(lines) - min_batch_size
+
+    if last_split_index > split_index:
+        for i in range(split_index, last_split_index):
+            gap = lines[i].start - lines[i - 1].end
+            if gap > longest_gap:
+                longest_gap = gap
+                split_index = i
+
+    return _reference_split_lines(lines[:split_index], min_batch_size, max_batch_size) + _reference_split_lines(lines[split_index:], min_batch_size, max_batch_size)
+
+def _generate_lines(count : int, seed : int, max_gap_ms : int = 5000) -> list[SubtitleLine]:
+    """
+    Generate a sequence of lines with random durations and gaps (including plenty of ties)
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    time = 0
+    for number in range(1, count + 1):
+        time += rng.choice([0, 0, 100, 500, 500, rng.randint(0, max_gap_ms)])
+        duration = rng.randint(500, 4000)
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=time), timedelta(milliseconds=time + duration), f"Line {number}"))
+        time += duration
+    return lines
+
+class TestSubtitleBatcher(unittest.TestCase):
+    def test_GapIndex(self):
+        log_test_name("GapIndex")
+        rng = random.Random(42)
+        gaps = [ rng.randint(0, 20) for _ in range(200) ]
+        gap_index = GapIndex(gaps)
+
+        for _ in range(500):
+            first = rng.randint(0, len(gaps) - 1)
+            last = rng.randint(first + 1, len(gaps))
+            expected = max(range(first, last), key=lambda i: (gaps[i], -i))
+            with self.subTest(first=first, last=last):
+                self.assertEqual(gap_index.LargestGap(first, last), expected)
+
+    batch_cases = [
+        (50, 1, 10, 30.0),
+        (500, 8, 40, 30.0),
+        (500, 10, 100, 60.0),
+        (2000, 16, 80, 40.0),
+        (2000, 20, 21, 1000.0),
+        (3000, 1, 2, 1000.0),
+    ]
+
+    def test_SplitLinesMatchesReference(self):
+        log_test_name("Batcher split matches reference algorithm")
+        for seed, (count, min_batch_size, max_batch_size, scene_threshold) in enumerate(self.batch_cases):
+            with self.subTest(count=count, min_batch_size=min_batch_size, max_batch_size=max_batch_size):
+                batcher = SubtitleBatcher(SettingsType({
+                    'min_batch_size': min_batch_size,
+                    'max_batch_size': max_batch_size,
+                    'scene_threshold': scene_threshold
+                }))
+
+                lines = _generate_lines(count, seed)
+                scenes = batcher.BatchSubtitles(lines)
+
+                expected = []
+                for scene in scenes:
+                    scene_lines = [ line for batch in scene.batches for line in batch.originals ]
+                    expected.append([ [line.number for line in batch] for batch in _reference_split_lines(scene_lines, min_batch_size, max_batch_size) ])
+
+                result = [ [ [line.number for line in batch.originals] for batch in scene.batches ] for scene in scenes ]
+
+                log_input_expected_result((count, min_batch_size, max_batch_size), sum(len(s) for s in expected), sum(len(s) for s in result))
+                self.assertEqual(result, expected)
+                self.assertEqual(sum(scene.linecount for scene in scenes), count)
+
+    def test_BatchSubtitlesFixesOverlaps(self):
+        log_test_name("Batcher fixes overlapping lines")
+        lines = [
+            SubtitleLine.Construct(1, timedelta(seconds=1), timedelta(seconds=3), "One"),
+            SubtitleLine.Construct(2, timedelta(seconds=2), timedelta(seconds=4), "Two"),
+        ]
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 1, 'max_batch_size': 10 }))
+        scenes = batcher.BatchSubtitles(lines)
+
+        self.assertEqual(len(scenes), 1)
+        self.assertEqual(lines[1].start, timedelta(seconds=3, milliseconds=10))
+
+    def test_BatchSubtitlesMissingTimes(self):
+        log_test_name("Batcher rejects lines without timings")
+        lines = [
+            SubtitleLine.Construct(1, timedelta(seconds=1), timedelta(seconds=3), "One"),
+            SubtitleLine({ 'number': 2, 'text': "Two" }),
+        ]
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 1, 'max_batch_size': 10 }))
+
+        self.assertRaises(ValueError, batcher.BatchSubtitles, lines)
+        self.assertRaises(ValueError, lambda: list(batcher.StreamScenes(lines)))
+
+    def test_BalancedBatches(self):
+        log_test_name("Balanced batches")
+        # One large gap near the end of the scene, which the largest-gap splitter will cut at before chopping off min_batch_size lines at a time
+        lines = [ SubtitleLine.Construct(number, timedelta(seconds=number * 2), timedelta(seconds=number * 2 + 1), f"Line {number}") for number in range(1, 101) ]
+        for line in lines[85:]:
+            line.start += timedelta(seconds=10)
+            line.end += timedelta(seconds=10)
+
+        settings = { 'min_batch_size': 5, 'max_batch_size': 60, 'scene_threshold': 60.0 }
+
+        greedy_scenes = SubtitleBatcher(SettingsType(settings)).BatchSubtitles([ SubtitleLine(line) for line in lines ])
+        greedy_sizes = [ batch.size for batch in greedy_scenes[0].batches ]
+
+        balanced_scenes = SubtitleBatcher(SettingsType({ **settings, 'balance_batches': True })).BatchSubtitles([ SubtitleLine(line) for line in lines ])
+        balanced_sizes = [ batch.size for batch in balanced_scenes[0].batches ]
+
+        log_input_expected_result(greedy_sizes, [50, 50], balanced_sizes)
+        self.assertEqual(greedy_sizes[:2], [5, 5])
+        self.assertEqual(greedy_sizes[-1], 15)
+        self.assertEqual(balanced_sizes, [50, 50])
+
+    def test_BalancedBatchesRespectLimits(self):
+        log_test_name("Balanced batches respect size limits")
+        for seed, (count, min_batch_size, max_batch_size, scene_threshold) in enumerate(self.batch_cases):
+            with self.subTest(count=count, min_batch_size=min_batch_size, max_batch_size=max_batch_size):
+                batcher = SubtitleBatcher(SettingsType({
+                    'min_batch_size': min_batch_size,
+                    'max_batch_size': max_batch_size,
+                    'scene_threshold': scene_threshold,
+                    'balance_batches': True
+                }))
+
+                scenes = batcher.BatchSubtitles(_generate_lines(count, seed))
+                self.assertEqual(sum(scene.linecount for scene in scenes), count)
+
+                for scene in scenes:
+                    if scene.linecount > max_batch_size:
+                        self.assertTrue(all(min_batch_size <= batch.size <= max_batch_size for batch in scene.batches))
+
+                greedy_batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': min_batch_size, 'max_batch_size': max_batch_size, 'scene_threshold': scene_threshold }))
+                greedy_scenes = greedy_batcher.BatchSubtitles(_generate_lines(count, seed))
+
+                batch_count = sum(scene.size for scene in scenes)
+                greedy_batch_count = sum(scene.size for scene in greedy_scenes)
+                log_input_expected_result(f"Batch count {batch_count} <= greedy batch count {greedy_batch_count}", True, batch_count <= greedy_batch_count)
+                self.assertLessEqual(batch_count, greedy_batch_count)
+
+    def test_ChooseSceneThreshold(self):
+        log_test_name("Automatic scene threshold")
+        lines = _generate_lines(500, seed=7, max_gap_ms=2000)
+        for line in lines[100::100]:
+            line.start += timedelta(seconds=90)
+            line.end += timedelta(seconds=90)
+
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 10, 'max_batch_size': 50, 'auto_scene_threshold': True }))
+        threshold = batcher.ChooseSceneThreshold(lines)
+        scenes = batcher.BatchSubtitles(lines)
+
+        log_input_expected_result("Scene count", 5, len(scenes))
+        self.assertGreater(threshold, timedelta(seconds=2))
+        self.assertLess(threshold, timedelta(seconds=90))
+        self.assertEqual(len(scenes), 5)
+
+    def test_StreamScenes(self):
+        log_test_name("Streaming batcher")
+        settings = SettingsType({ 'min_batch_size': 5, 'max_batch_size': 20, 'scene_threshold': 3.0 })
+        lines = _generate_lines(300, seed=5)
+
+        expected = [ [ [ line.number for line in batch.originals ] for batch in scene.batches ] for scene in SubtitleBatcher(settings).BatchSubtitles([ SubtitleLine(line) for line in lines ]) ]
+        self.assertGreater(len(expected), 2)
+
+        lines_read : list[int] = []
+        def read_lines():
+            for line in lines:
+                lines_read.append(line.number)
+                yield SubtitleLine(line)
+
+        result = []
+        for scene in SubtitleBatcher(settings).StreamScenes(read_lines()):
+            # Only the line that closed the scene has been read beyond its end
+            if len(result) < len(expected) - 1:
+                self.assertIsNotNone(scene.last_line_number)
+                assert scene.last_line_number is not None  # Type narrowing for PyLance
+                self.assertEqual(lines_read[-1], scene.last_line_number + 1)
+
+            self.assertEqual(scene.number, len(result) + 1)
+            result.append([ [ line.number for line in batch.originals ] for batch in scene.batches ])
+
+        log_input_expected_result("Scene count", len(expected), len(result))
+        self.assertEqual(result, expected)
+
+    def test_RebatchScene(self):
+        log_test_name("Incremental rebatching of an edited scene")
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 5, 'max_batch_size': 20, 'scene_threshold': 1000.0 }))
+        scenes = batcher.BatchSubtitles(_generate_lines(100, seed=3))
+        self.assertEqual(len(scenes), 1)
+
+        scene = scenes[0]
+        original_batches = list(scene.batches)
+        self.assertGreater(len(original_batches), 4)
+
+        # Nothing to do if the edited batch is still within the limits
+        first_line_number, last_line_number = original_batches[1].first_line_number, original_batches[1].last_line_number
+        self.assertIsNotNone(first_line_number)
+        self.assertIsNotNone(last_line_number)
+        assert first_line_number is not None and last_line_number is not None  # Type narrowing for PyLance
+        unchanged = batcher.RebatchScene(scene, first_line_number, last_line_number)
+        self.assertFalse(unchanged.has_changes)
+
+        # Move the lines of the third batch into the second, so that it is too large
+        first_batch, oversized_batch, emptied_batch = original_batches[0:3]
+        oversized_batch.originals.extend(emptied_batch.originals)
+        emptied_batch.originals.clear()
+        oversized_lines = [ line.number for line in oversized_batch.originals ]
+
+        diff = batcher.RebatchScene(scene, oversized_lines[0], oversized_lines[-1])
+
+        log_input_expected_result("Removed batches", [(1, 2), (1, 3)], diff.removed_batches)
+        self.assertEqual(diff.removed_batches, [(1, 2), (1, 3)])
+        self.assertGreaterEqual(len(diff.added_batches), 2)
+        self.assertTrue(all(5 <= batch.size <= 20 for batch in scene.batches))
+        self.assertEqual([ line.number for batch in diff.added_batches for line in batch.originals ], oversized_lines)
+
+        # Batches outside the edited region are kept and renumbered if necessary
+        self.assertIs(scene.batches[0], first_batch)
+        for batch in original_batches[3:]:
+            self.assertIn(batch, scene.batches)
+
+        self.assertEqual([ batch.number for batch in scene.batches ], list(range(1, len(scene.batches) + 1)))
+        for (scene_number, old_number), new_number in diff.renumbered_batches.items():
+            self.assertEqual(original_batches[old_number - 1].number, new_number)
+
+if __name__ == '__main__':
+    unittest.main()
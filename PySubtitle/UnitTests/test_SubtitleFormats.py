@@ -0,0 +1,351 @@
+import os
+import tempfile
+import unittest
+
+from PySubtitle.Formats.AssFileHandler import AssFileHandler
+from PySubtitle.Formats.SrtFileHandler import SrtFileHandler
+from PySubtitle.Formats.VttFileHandler import VttFileHandler
+from PySubtitle.Helpers import GetOutputPath
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.ProgressiveOutput import ProgressiveOutput
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleError import SubtitleParseError
+from PySubtitle.SubtitleFormatRegistry import SubtitleFormatRegistry
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Subtitles import Subtitles
+
+vtt_content = (
+    "WEBVTT - Dinner\n"
+    "\n"
+    "STYLE\n"
+    "::cue { color: yellow }\n"
+    "\n"
+    "NOTE This comment is kept\n"
+    "\n"
+    "intro\n"
+    "00:00:01.000 --> 00:00:02.500 align:start line:0\n"
+    "Is it raining?\n"
+    "\n"
+    "00:01.000 --> 00:04.250\n"
+    "Let's eat\n"
+    "at home\n"
+    "\n"
+    "NOTE This comment is dropped\n"
+    "\n"
+    "3\n"
+    "01:00:05.000 --> 01:00:06.000\n"
+    "Good night\n"
+    "\n"
+)
+
+ass_header = (
+    "[Script Info]\n"
+    "Title: Dinner\n"
+    "ScriptType: v4.00+\n"
+    "\n"
+    "[V4+ Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+    "Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1\n"
+    "Style: Sign,Arial,16,&H0000FFFF,&H000000FF,&H00000000,&H00000000,1,0,0,0,100,100,0,0,1,2,2,8,10,10,10,1\n"
+    "\n"
+)
+
+ass_events = (
+    "[Events]\n"
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    "Comment: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,Timing reference\n"
+)
+
+ass_dialogue = (
+    "Dialogue: 0,0:00:01.00,0:00:02.50,Default,Mei,0,0,0,,Is it raining?\n"
+    "Dialogue: 1,0:00:03.00,0:00:04.25,Sign,,0,0,0,,{\\an8\\pos(320,50)}Let's eat\\Nat home, okay?\n"
+    "Dialogue: 0,1:00:05.00,1:00:06.00,Default,,0,0,0,,Good night\n"
+)
+
+ass_trailer = (
+    "[Fonts]\n"
+    "fontname: dinner.ttf\n"
+)
+
+ass_content = ass_header + ass_events + ass_dialogue + "\n" + ass_trailer
+
+class TestSubtitleFormats(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _path(self, filename : str) -> str:
+        return os.path.join(self.temp_dir.name, filename)
+
+    def _write(self, filename : str, content : str) -> str:
+        filepath = self._path(filename)
+        with open(filepath, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return filepath
+
+    def _read(self, filepath : str) -> str:
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def test_Registry(self):
+        log_test_name("Subtitle format registry")
+        extension_cases = [
+            ("movie.srt", SrtFileHandler),
+            ("movie.VTT", VttFileHandler),
+            ("movie.ass", AssFileHandler),
+            ("movie.ssa", AssFileHandler),
+            ("movie.txt", None),
+            ("movie", None),
+        ]
+        for filepath, expected in extension_cases:
+            with self.subTest(filepath=filepath):
+                result = SubtitleFormatRegistry.GetHandlerClass(filepath)
+                log_input_expected_result(filepath, expected, result)
+                self.assertIs(result, expected)
+
+        sample_cases = [
+            ("1\n00:00:01,000 --> 00:00:02,000\nFirst line\n", SrtFileHandler),
+            ("\n00:00:01,000 --> 00:00:02,000\nFirst line\n", SrtFileHandler),
+            ("\ufeffWEBVTT\n\n00:01.000 --> 00:02.000\nFirst line\n", VttFileHandler),
+            (ass_content, AssFileHandler),
+            ("Just some text\n", None),
+        ]
+        for sample, expected in sample_cases:
+            with self.subTest(sample=sample[:20]):
+                result = SubtitleFormatRegistry.DetectHandlerClass(sample)
+                log_input_expected_result(sample[:20], expected, result)
+                self.assertIs(result, expected)
+
+        # Files without a recognised extension are detected from their content, and SRT is the default
+        self.assertIsInstance(SubtitleFormatRegistry.CreateHandlerForFile(self._write("movie.txt", vtt_content)), VttFileHandler)
+        self.assertIsInstance(SubtitleFormatRegistry.CreateHandler("movie.txt", sample="Just some text"), SrtFileHandler)
+
+        for extension in ['.srt', '.vtt', '.ass', '.ssa']:
+            self.assertIn(extension, SubtitleFormatRegistry.ListExtensions())
+
+    def test_OutputPath(self):
+        log_test_name("Output paths keep the subtitle format")
+        cases = [
+            (("movie.ass", "French"), "movie.French.ass"),
+            (("movie.vtt", None), "movie.translated.vtt"),
+            (("movie.subtrans", "French"), "movie.French.srt"),
+            (("movie.subtrans", "French", ".ass"), "movie.French.ass"),
+        ]
+        for args, expected in cases:
+            with self.subTest(args=args):
+                result = GetOutputPath(*args)
+                log_input_expected_result(args, expected, result)
+                self.assertEqual(result, expected)
+
+    def test_ParseVtt(self):
+        log_test_name("Parse WebVTT")
+        handler = VttFileHandler()
+        lines = list(handler.parse_string(vtt_content))
+
+        expected = [
+            (1, 1000, 2500, "Is it raining?", { 'vtt_id': "intro", 'vtt_settings': "align:start line:0" }),
+            (2, 1000, 4250, "Let's eat\nat home", {}),
+            (3, 3605000, 3606000, "Good night", { 'vtt_id': "3" }),
+        ]
+        result = [ (line.number, line.start_ms, line.end_ms, line.text, dict(line.metadata)) for line in lines ]
+        log_input_expected_result("Lines", expected, result)
+        self.assertEqual(result, expected)
+
+        self.assertEqual(handler.metadata['header'], "WEBVTT - Dinner")
+        self.assertEqual(handler.metadata['blocks'], [ "STYLE\n::cue { color: yellow }", "NOTE This comment is kept" ])
+
+        with self.assertRaises(SubtitleParseError):
+            list(VttFileHandler().parse_string("1\n00:00:01,000 --> 00:00:02,000\nNot WebVTT\n"))
+
+        with self.assertRaises(SubtitleParseError):
+            list(VttFileHandler().parse_string("WEBVTT\n\nintro\nNot a timing line\n"))
+
+    def test_ComposeVtt(self):
+        log_test_name("Compose WebVTT")
+        handler = VttFileHandler()
+        lines = list(handler.parse_string(vtt_content))
+
+        # Everything except the comment after the first cue is written back, with full timestamps
+        expected = vtt_content.replace("NOTE This comment is dropped\n\n", "").replace("00:01.000 --> 00:04.250", "00:00:01.000 --> 00:00:04.250")
+        result = handler.compose_lines(lines)
+        log_input_expected_result("Round trip", True, result == expected)
+        self.assertEqual(result, expected)
+
+        # Blank lines and timing arrows cannot appear in the text of a cue
+        line = SubtitleLine.Construct(1, "00:00:01,000", "00:00:02,000", "First -->\n\nSecond")
+        self.assertEqual(VttFileHandler().compose_lines([line]), "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nFirst ->\nSecond\n\n")
+
+    def test_ParseAss(self):
+        log_test_name("Parse ASS")
+        handler = AssFileHandler()
+        lines = list(handler.parse_string(ass_content))
+
+        expected = [
+            (1, 1000, 2500, "Is it raining?"),
+            (2, 3000, 4250, "Let's eat\nat home, okay?"),
+            (3, 3605000, 3606000, "Good night"),
+        ]
+        result = [ (line.number, line.start_ms, line.end_ms, line.text) for line in lines ]
+        log_input_expected_result("Lines", expected, result)
+        self.assertEqual(result, expected)
+
+        self.assertEqual(lines[1].metadata['ass_tags'], "{\\an8\\pos(320,50)}")
+        self.assertEqual(lines[1].metadata['ass_fields'], [ '1', '0:00:03.00', '0:00:04.25', 'Sign', '', '0', '0', '0', '' ])
+        self.assertEqual(handler.metadata['header'], ass_header)
+        self.assertEqual(handler.metadata['events'], ass_events)
+        self.assertEqual(handler.metadata['trailer'], ass_trailer)
+
+        with self.assertRaises(SubtitleParseError):
+            list(AssFileHandler().parse_string(ass_header))
+
+        with self.assertRaises(SubtitleParseError):
+            list(AssFileHandler().parse_string(ass_header + ass_events + "Dialogue: 0,0:00:01.00,Default,Too few fields\n"))
+
+    def test_ComposeAss(self):
+        log_test_name("Compose ASS")
+        handler = AssFileHandler()
+        lines = list(handler.parse_string(ass_content))
+
+        result = handler.compose_lines(lines)
+        log_input_expected_result("Round trip", True, result == ass_content)
+        self.assertEqual(result, ass_content)
+
+        # Translated text keeps the style, tags and other fields of the original event
+        translated = [ SubtitleLine.Construct(line.number, line.start, line.end, f"Translated\n{line.number}", dict(line.metadata)) for line in lines ]
+        result = handler.compose_lines(translated)
+        self.assertIn("Dialogue: 1,0:00:03.00,0:00:04.25,Sign,,0,0,0,,{\\an8\\pos(320,50)}Translated\\N2\n", result)
+        self.assertTrue(result.startswith(ass_header + ass_events))
+        self.assertTrue(result.endswith(ass_trailer))
+
+        # Lines from another format are written with the default style
+        line = SubtitleLine.Construct(1, "00:00:01,000", "00:00:02,345", "Hello")
+        result = AssFileHandler().compose_lines([line])
+        self.assertTrue(result.endswith("Dialogue: 0,0:00:01.00,0:00:02.35,Default,,0,0,0,,Hello\n"))
+
+    def test_AssEventsAndBreaks(self):
+        log_test_name("ASS events and line breaks")
+        dialogue = (
+            "Dialogue: 0,0:00:01.00,0:00:02.50,Default,,0,0,0,,Is it raining?\n"
+            "Comment: 0,0:00:03.00,0:00:04.25,Default,,0,0,0,,Check the timing\n"
+            "Dialogue: 0,0:00:03.00,0:00:04.25,Default,,0,0,0,,Let's eat\\nat home\n"
+            "Dialogue: 0,0:00:05.00,0:00:06.00,Default,,0,0,0,,One\\Ntwo\\nthree\n"
+            "Comment: 0,0:00:07.00,0:00:08.00,Default,,0,0,0,,The end\n"
+        )
+        content = ass_header + ass_events + dialogue + "\n" + ass_trailer
+
+        handler = AssFileHandler()
+        lines = list(handler.parse_string(content))
+        self.assertEqual([ line.text for line in lines ], [ "Is it raining?", "Let's eat\nat home", "One\ntwo\nthree" ])
+
+        result = handler.compose_lines(lines)
+        log_input_expected_result("Round trip", True, result == content)
+        self.assertEqual(result, content)
+
+        # Soft breaks are kept when the number of lines changes, and the events stay in place when a line is split
+        translated = [
+            SubtitleLine.Construct(1, lines[0].start, lines[0].end, "Il pleut ?", dict(lines[0].metadata)),
+            SubtitleLine.Construct(2, lines[1].start, lines[1].end, "On mange\nà la\nmaison", dict(lines[1].metadata)),
+            SubtitleLine.Construct(3, lines[2].start, lines[2].end, "Un\ndeux", dict(lines[2].metadata)),
+            SubtitleLine.Construct(4, lines[2].start, lines[2].end, "trois", dict(lines[2].metadata)),
+        ]
+        expected = (
+            "Dialogue: 0,0:00:01.00,0:00:02.50,Default,,0,0,0,,Il pleut ?\n"
+            "Comment: 0,0:00:03.00,0:00:04.25,Default,,0,0,0,,Check the timing\n"
+            "Dialogue: 0,0:00:03.00,0:00:04.25,Default,,0,0,0,,On mange\\nà la\\nmaison\n"
+            "Dialogue: 0,0:00:05.00,0:00:06.00,Default,,0,0,0,,Un\\Ndeux\n"
+            "Dialogue: 0,0:00:05.00,0:00:06.00,Default,,0,0,0,,trois\n"
+            "Comment: 0,0:00:07.00,0:00:08.00,Default,,0,0,0,,The end\n"
+        )
+        result = handler.compose_lines(translated)
+        log_input_expected_result("Translated", expected, result)
+        self.assertEqual(result, ass_header + ass_events + expected + "\n" + ass_trailer)
+
+    def test_AssEmbeddedFonts(self):
+        log_test_name("Embedded fonts are not kept in the project")
+        trailer = ass_trailer + "".join(f"{'A' * 80}\n" for _ in range(500))
+        sourcepath = self._write("fonts.ass", ass_header + ass_events + ass_dialogue + "\n" + trailer)
+
+        subtitles = Subtitles(sourcepath)
+        subtitles.LoadSubtitles()
+        metadata = subtitles.settings.get('format_metadata')
+        self.assertIsInstance(metadata, dict)
+        assert isinstance(metadata, dict)
+        self.assertNotIn('trailer', metadata)
+        self.assertEqual(metadata.get('source_metadata'), [ 'trailer' ])
+        self.assertEqual(metadata.get('header'), ass_header)
+
+        # A project loaded without the source metadata reads it from the source file again
+        reloaded = Subtitles(sourcepath)
+        reloaded.settings = subtitles.settings
+        reloaded.originals = subtitles.originals
+        outputpath = self._path("fonts.out.ass")
+        reloaded.SaveOriginal(outputpath)
+        self.assertTrue(self._read(outputpath).endswith(trailer))
+
+    def test_AssLineEndings(self):
+        log_test_name("ASS line endings")
+        content = ass_content.replace("\n", "\r\n")
+        sourcepath = self._write("dinner.ass", content)
+
+        subtitles = Subtitles(sourcepath)
+        subtitles.LoadSubtitles()
+
+        # The file's line endings are written as they are, rather than being translated again
+        handler = subtitles.CreateOutputHandler(sourcepath)
+        self.assertEqual(handler.get_output_newline(), '')
+        self.assertIsNone(AssFileHandler().get_output_newline())
+
+        outputpath = self._path("dinner.out.ass")
+        subtitles.SaveOriginal(outputpath)
+        result = self._read(outputpath)
+        log_input_expected_result("CRLF round trip", True, result == content)
+        self.assertEqual(result, content)
+
+    def test_TranslateAss(self):
+        log_test_name("Subtitles keep the source format")
+        sourcepath = self._write("dinner.ass", ass_content)
+
+        subtitles = Subtitles(sourcepath)
+        subtitles.LoadSubtitles()
+        self.assertEqual(subtitles.linecount, 3)
+        self.assertEqual(subtitles.settings.get('file_format'), '.ass')
+
+        for line in subtitles.originals or []:
+            line.translation = f"Translated {line.number}"
+
+        subtitles.translated = [ SubtitleLine.Construct(line.number, line.start, line.end, line.translation or "") for line in subtitles.originals or [] ]
+        subtitles.AutoBatch(SubtitleBatcher(SettingsType({ 'min_batch_size': 1, 'max_batch_size': 2, 'scene_threshold': 60 })))
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                batch.translated = [ SubtitleLine.Construct(line.number, line.start, line.end, line.translation or "", dict(line.metadata)) for line in batch.originals ]
+
+        outputpath = GetOutputPath(sourcepath, "French")
+        assert outputpath is not None
+        subtitles.SaveTranslation(outputpath)
+        result = self._read(outputpath)
+        log_input_expected_result(outputpath, True, result.startswith(ass_header))
+        self.assertTrue(result.startswith(ass_header + ass_events))
+        self.assertIn("Dialogue: 1,0:00:03.00,0:00:04.25,Sign,,0,0,0,,{\\an8\\pos(320,50)}Translated 2\n", result)
+        self.assertTrue(result.endswith(ass_trailer))
+
+        # Progressive output writes the same file, and cannot append because of the trailer
+        progressive_path = self._path("progressive.ass")
+        output = ProgressiveOutput(subtitles, progressive_path, interval=0)
+        output.Write()
+        output.Write()
+        self.assertEqual(output.rewrite_count, 2)
+        self.assertEqual(self._read(progressive_path), result)
+
+        # An output path without a recognised extension uses the source format
+        subtitles.SaveTranslation(self._path("dinner.txt"))
+        self.assertEqual(self._read(self._path("dinner.txt")), result)
+
+        # Writing to another format does not carry over the ASS header
+        subtitles.SaveTranslation(self._path("dinner.srt"))
+        self.assertTrue(self._read(self._path("dinner.srt")).startswith("1\n00:00:01,000 --> 00:00:02,500\nTranslated 1\n"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+from PySubtitle.Helpers.TestCases import AddTranslations, PrepareSubtitles, SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleError import SubtitleError
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestSubtitleIndex(SubtitleTestCase):
+    def _prepare_subtitles(self) -> Subtitles:
+        subtitles : Subtitles = PrepareSubtitles(chinese_dinner_data)
+        subtitles.AutoBatch(SubtitleBatcher(self.options))
+        AddTranslations(subtitles, chinese_dinner_data)
+        return subtitles
+
+    def _assert_lookups_consistent(self, subtitles : Subtitles):
+        """
+        Check that indexed lookups return the same results as a search of the subtitles
+        """
+        for scene in subtitles.scenes:
+            self.assertIs(subtitles.GetScene(scene.number), scene)
+            for batch in scene.batches:
+                self.assertIs(subtitles.GetBatch(scene.number, batch.number), batch)
+                for line in batch.originals:
+                    self.assertIs(subtitles.GetBatchContainingLine(line.number), batch)
+
+        for line in subtitles.originals or []:
+            self.assertIs(subtitles.GetOriginalLine(line.number), line)
+
+        for line in subtitles.translated or []:
+            self.assertIs(subtitles.GetTranslatedLine(line.number), line)
+
+    def test_Lookups(self):
+        log_test_name("SubtitleIndex lookups")
+        subtitles = self._prepare_subtitles()
+        self._assert_lookups_consistent(subtitles)
+
+        batch = subtitles.GetBatchContainingLine(25)
+        self.assertIsNotNone(batch)
+        assert batch is not None  # Type narrowing for PyLance
+        log_input_expected_result("Line 25", (1, 2), (batch.scene, batch.number))
+        self.assertEqual((batch.scene, batch.number), (1, 2))
+
+        self.assertIsNone(subtitles.GetOriginalLine(1000))
+        self.assertIsNone(subtitles.GetTranslatedLine(1000))
+        self.assertRaises(SubtitleError, subtitles.GetScene, 100)
+        self.assertRaises(SubtitleError, subtitles.GetBatch, 1, 100)
+
+    def test_LookupsAfterEdits(self):
+        log_test_name("SubtitleIndex lookups after edits")
+        subtitles = self._prepare_subtitles()
+
+        with self.subTest("Merge scenes"):
+            subtitles.MergeScenes([2, 3])
+            log_input_expected_result("Scene count", 3, subtitles.scenecount)
+            self.assertEqual(subtitles.scenecount, 3)
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Split scene"):
+            subtitles.SplitScene(2, 2)
+            self.assertEqual(subtitles.scenecount, 4)
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Merge batches"):
+            subtitles.MergeBatches(1, [1, 2])
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Split batch directly"):
+            # Scenes can be edited without going through Subtitles, so stale lookups must not be trusted
+            scene = subtitles.GetScene(1)
+            first_line = scene.batches[0].first_line_number or 0
+            scene.SplitBatch(1, first_line + 5)
+            split_batch = subtitles.GetBatchContainingLine(first_line + 5)
+            self.assertIsNotNone(split_batch)
+            assert split_batch is not None  # Type narrowing for PyLance
+            self.assertEqual(split_batch.number, 2)
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Delete lines"):
+            batch = subtitles.GetBatchContainingLine(10)
+            self.assertIsNotNone(batch)
+            assert batch is not None  # Type narrowing for PyLance
+            subtitles.DeleteLines([10, 11])
+            self.assertIsNone(batch.GetOriginalLine(10))
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Merge lines"):
+            batch = subtitles.GetBatchContainingLine(20)
+            self.assertIsNotNone(batch)
+            assert batch is not None  # Type narrowing for PyLance
+            subtitles.MergeLinesInBatch(batch.scene, batch.number, [20, 21])
+            self.assertIsNone(batch.GetOriginalLine(21))
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Sanitise"):
+            subtitles.Sanitise()
+            self._assert_lookups_consistent(subtitles)
+
+        with self.subTest("Update line text"):
+            subtitles.translated = [ line for line in subtitles.translated or [] if line.number != 30 ]
+            self.assertIsNone(subtitles.GetTranslatedLine(30))
+            subtitles.UpdateLineText(30, "Original", "Translated")
+            translated = subtitles.GetTranslatedLine(30)
+            self.assertIsNotNone(translated)
+            self.assertEqual(translated.text if translated else None, "Translated")
+            self.assertEqual([ line.number for line in subtitles.translated or [] ], sorted(line.number for line in subtitles.translated or []))
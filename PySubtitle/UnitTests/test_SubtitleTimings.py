@@ -0,0 +1,91 @@
+import unittest
+from datetime import timedelta
+
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleTimings import SubtitleTimings
+
+def _create_lines(timings : list[tuple[int, int]]) -> list[SubtitleLine]:
+    return [ SubtitleLine.Construct(number, timedelta(milliseconds=start), timedelta(milliseconds=end), f"Line {number}") for number, (start, end) in enumerate(timings, start=1) ]
+
+def _get_timings(lines : list[SubtitleLine]) -> list[tuple[int, int]]:
+    return [ (line.start_ms, line.end_ms) for line in lines ]
+
+class TestSubtitleTimings(unittest.TestCase):
+    line_timings = [ (1000, 3000), (2500, 4000), (4020, 9000), (12000, 12300), (70000, 72000) ]
+
+    def _run_both(self, operation):
+        """
+        Run an operation with and without NumPy, checking that both give the same result and leave the lines with the same timings
+        """
+        results = []
+        for use_numpy in [ True, False ]:
+            lines = _create_lines(self.line_timings)
+            timings = SubtitleTimings(lines, use_numpy=use_numpy)
+            result = operation(timings)
+            timings.WriteBack()
+            results.append((result, _get_timings(lines)))
+
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_Gaps(self):
+        log_test_name("SubtitleTimings gaps")
+        gaps, _ = self._run_both(lambda timings: timings.Gaps())
+        log_input_expected_result("Gaps", [0, -500, 20, 3000, 57700], gaps)
+        self.assertEqual(gaps, [0, -500, 20, 3000, 57700])
+
+        scene_breaks, _ = self._run_both(lambda timings: timings.FindGaps(timedelta(seconds=2)))
+        self.assertEqual(scene_breaks, [3, 4])
+
+        histogram, _ = self._run_both(lambda timings: timings.GapHistogram([timedelta(0), timedelta(seconds=1), timedelta(seconds=10)]))
+        log_input_expected_result("Histogram", [1, 2], histogram)
+        self.assertEqual(histogram, [1, 2])
+
+    def test_FilterByDuration(self):
+        log_test_name("SubtitleTimings duration filter")
+        durations, _ = self._run_both(lambda timings: timings.Durations())
+        self.assertEqual(durations, [2000, 1500, 4980, 300, 2000])
+
+        long_lines, _ = self._run_both(lambda timings: timings.FilterByDuration(longer_than=timedelta(seconds=2)))
+        self.assertEqual(long_lines, [2])
+
+        short_lines, _ = self._run_both(lambda timings: timings.FilterByDuration(shorter_than=timedelta(seconds=2)))
+        self.assertEqual(short_lines, [1, 3])
+
+        medium_lines, _ = self._run_both(lambda timings: timings.FilterByDuration(longer_than=timedelta(seconds=1), shorter_than=timedelta(seconds=3)))
+        self.assertEqual(medium_lines, [0, 1, 4])
+
+    def test_Retiming(self):
+        log_test_name("SubtitleTimings retiming")
+        _, shifted = self._run_both(lambda timings: timings.Shift(timedelta(seconds=-2)))
+        log_input_expected_result("Shift", [(0, 1000), (500, 2000)], shifted[:2])
+        self.assertEqual(shifted, [ (0, 1000), (500, 2000), (2020, 7000), (10000, 10300), (68000, 70000) ])
+
+        _, converted = self._run_both(lambda timings: timings.ConvertFramerate(25.0, 23.976))
+        self.assertEqual(converted[4], (round(70000 * 25.0 / 23.976), round(72000 * 25.0 / 23.976)))
+
+        fixed, repaired = self._run_both(lambda timings: timings.FixOverlaps(timedelta(milliseconds=10)))
+        log_input_expected_result("Overlaps fixed", 1, fixed)
+        self.assertEqual(fixed, 1)
+        self.assertEqual(repaired[1], (3010, 4000))
+
+        shortened, spaced = self._run_both(lambda timings: timings.EnforceMinGap(timedelta(milliseconds=100)))
+        log_input_expected_result("Lines shortened", 2, shortened)
+        self.assertEqual(shortened, 2)
+        self.assertEqual(spaced[:3], [ (1000, 2400), (2500, 3920), (4020, 9000) ])
+
+    def test_WriteBack(self):
+        log_test_name("SubtitleTimings write back")
+        lines = _create_lines(self.line_timings)
+        timings = SubtitleTimings(lines)
+        timings.FixOverlaps()
+
+        # Lines are not changed until the timings are written back
+        self.assertEqual(lines[1].start_ms, 2500)
+        self.assertEqual(timings.WriteBack(), 1)
+        self.assertEqual(lines[1].start, timedelta(milliseconds=3010))
+        self.assertEqual(timings.WriteBack(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
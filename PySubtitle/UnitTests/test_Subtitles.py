@@ -1,7 +1,13 @@
+import gc
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 import regex
 from datetime import timedelta
 
+from PySubtitle.SettingsType import SettingsType
 from PySubtitle.SubtitleLine import SubtitleLine
 from PySubtitle.Helpers.Text import split_sequences, standard_filler_words
 from PySubtitle.Helpers.Tests import log_info, log_input_expected_result, log_test_name
@@ -136,6 +142,31 @@ class TestSubtitles(unittest.TestCase):
                 log_input_expected_result((line.text, characters, min_duration.total_seconds()), expected_duration, result)
                 self.assertEqual(result, expected_duration)
 
+    def test_SubtitleLineStorage(self):
+        log_test_name("SubtitleLine compact storage")
+        line = SubtitleLine.Construct(1, timedelta(seconds=1, microseconds=500999), "00:00:03,250", "Test line")
+
+        log_input_expected_result("Timings (ms)", (1500, 3250, 1750), (line.start_ms, line.end_ms, line.duration_ms))
+        self.assertEqual((line.start_ms, line.end_ms, line.duration_ms), (1500, 3250, 1750))
+        self.assertEqual(line.start, timedelta(seconds=1.5))
+        self.assertEqual(line.duration, timedelta(seconds=1.75))
+        self.assertFalse(hasattr(line, '__dict__'))
+
+        line.duration = timedelta(seconds=2)
+        self.assertEqual(line.end, timedelta(seconds=3.5))
+
+        # Lines without metadata share a read-only empty mapping
+        other_line = SubtitleLine(line)
+        self.assertIs(line.metadata, other_line.metadata)
+        with self.assertRaises(TypeError):
+            line.metadata['key'] = 'value' # type: ignore
+
+        line.metadata = { 'key': 'value' }
+        copied_line = line.copy()
+        self.assertEqual(copied_line.metadata, { 'key': 'value' })
+        self.assertIsNot(copied_line.metadata, line.metadata)
+        self.assertEqual(len(other_line.metadata), 0)
+
 class SubtitleProcessorTests(unittest.TestCase):
     example_line_1 = "1\n00:00:01,000 --> 00:00:02,000\nThis is line 1"
     example_line_2 = "2\n00:00:02,500 --> 00:00:03,500\nThis is line 2"
@@ -247,6 +278,79 @@ class SubtitleProcessorTests(unittest.TestCase):
                 self._log_expected_vs_actual(result_lines, expected)
                 self.assertSequenceEqual(result_lines, expected)
 
+    def test_ParallelProcessing(self):
+        log_test_name("Pre-processing and post-processing in worker processes")
+        fragments = [ self.example_line_3, self.example_line_4, self.example_line_5, self.example_line_9, self.example_line_10, self.example_line_11 ]
+        texts = [ fragment.split('\n', 2)[2] for fragment in fragments ] + [ "" ]
+
+        # Source lines with a mix of long lines that are split, lines that are removed and lines that are unchanged
+        source : list[SubtitleLine] = []
+        for index in range(600):
+            start = timedelta(seconds=index * 10)
+            source.append(SubtitleLine.Construct(index + 1, start, start + timedelta(seconds=1 + index % 8), texts[index % len(texts)]))
+
+        settings = SettingsType({ 'max_line_duration': 3.0, 'min_line_duration': 0.8, 'break_long_lines': True, 'max_single_line_length': 30,
+                    'remove_filler_words': True, 'filler_words': standard_filler_words, 'processing_chunk_size': 100 })
+
+        def describe(lines : list[SubtitleLine]) -> list[str]:
+            return [ f"{line.number}\n{line.srt_start} --> {line.srt_end}\n{line.text}" for line in lines ]
+
+        serial = SubtitleProcessor(settings)
+        parallel = SubtitleProcessor(SettingsType({ **settings, 'processing_workers': 2 }))
+
+        expected = describe(serial.PreprocessSubtitles([ SubtitleLine(line) for line in source ]))
+        result = describe(parallel.PreprocessSubtitles([ SubtitleLine(line) for line in source ]))
+        log_input_expected_result("Preprocessed lines", len(expected), len(result))
+        self.assertGreater(len(expected), len(source))
+        self.assertSequenceEqual(result, expected)
+
+        expected = describe(serial.PostprocessSubtitles([ SubtitleLine(line) for line in source ]))
+        result = describe(parallel.PostprocessSubtitles([ SubtitleLine(line) for line in source ]))
+        log_input_expected_result("Postprocessed lines", len(expected), len(result))
+        self.assertSequenceEqual(result, expected)
+
+        # The worker processes belong to the processor, and are stopped when it is closed or discarded
+        finalizer = parallel._process_pool_finalizer
+        self.assertIsNotNone(finalizer)
+        parallel.Close()
+        self.assertIsNone(parallel._process_pool)
+        self.assertFalse(finalizer and finalizer.alive)
+
+        result = describe(parallel.PostprocessSubtitles([ SubtitleLine(line) for line in source ]))
+        self.assertSequenceEqual(result, expected)
+        finalizer = parallel._process_pool_finalizer
+        del parallel
+        gc.collect()
+        log_input_expected_result("Pool stopped with processor", False, finalizer and finalizer.alive)
+        self.assertFalse(finalizer and finalizer.alive)
+
+    def test_ParallelProcessingUnguardedScript(self):
+        log_test_name("Processing falls back to a single process when the script re-runs in worker processes")
+
+        # Spawned workers import the main module, so a script without a __main__ guard runs again in each worker
+        script = "\n".join([
+            "from datetime import timedelta",
+            "from PySubtitle.SubtitleLine import SubtitleLine",
+            "from PySubtitle.SubtitleProcessor import SubtitleProcessor",
+            "lines = [ SubtitleLine.Construct(i + 1, timedelta(seconds=i * 10), timedelta(seconds=i * 10 + 2), 'A line that is long enough to break in two') for i in range(600) ]",
+            "processor = SubtitleProcessor({ 'break_long_lines': True, 'max_single_line_length': 20, 'processing_workers': 2, 'processing_chunk_size': 100 })",
+            "print(len(processor.PostprocessSubtitles(lines)))",
+        ])
+
+        base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            script_path = os.path.join(temp_dir, "unguarded.py")
+            with open(script_path, 'w', encoding='utf-8') as f:
+                f.write(script)
+
+            environment = { **os.environ, 'PYTHONPATH': base_path }
+            result = subprocess.run([ sys.executable, script_path ], capture_output=True, text=True, env=environment, timeout=120)
+
+        output = result.stdout.strip().splitlines()
+        log_input_expected_result("Output", "600", output[-1] if output else None)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(output[-1] if output else None, "600")
+
     def _log_expected_vs_actual(self, result : list[str], expected_result : list[str]):
         log_info(',\n'.join(self._format_lines(expected_result)), prefix="===".ljust(10))
         log_info(',\n'.join(self._format_lines(result)), prefix="-->".ljust(10))
@@ -0,0 +1,126 @@
+import random
+import unittest
+
+import regex
+
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Helpers.Text import (
+    break_sequences,
+    dialog_marker,
+    standard_filler_words,
+    BreakDialogOnOneLine,
+    BreakLongLine,
+    CompileDialogSplitPattern,
+    CompileFillerWordsPattern,
+    ConvertWhitespaceBlocksToNewlines,
+    ConvertWideDashesToStandardDashes,
+    EnsureFullWidthPunctuation,
+    NormaliseDialogTags,
+    RemoveFillerWords
+)
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleProcessor import SubtitleProcessor
+from PySubtitle.TextPipeline import TextPipeline
+
+all_settings = {
+    'whitespaces_to_newline': True,
+    'convert_wide_dashes': True,
+    'full_width_punctuation': True,
+    'remove_filler_words': True,
+    'filler_words': standard_filler_words,
+    'break_dialog_on_one_line': True,
+    'normalise_dialog_tags': True,
+    'break_long_lines': True,
+    'max_single_line_length': 30,
+    'min_single_line_length': 6,
+}
+
+fragments = [
+    "Umm, I don't know.", "Where are you going?", "- Wait!", "- What?", "No escape—I have one condition",
+    "Err, this is, uh, difficult.", "我们去吃饭吧,好吗?", "今天下雨了。", "不过，满清对浙江很注意，", "Hello   there",
+    "<i>Italic text, with a comma.</i>", "Oh! That's it.", "晚饭-准备好了", "a——b", "(Laughs) Okay.",
+]
+
+def generate_texts(count : int, seed : int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [ rng.choice([' ', '\n', '']).join(rng.choice(fragments) for _ in range(rng.randint(1, 4))) for _ in range(count) ]
+
+def preprocess_reference(text : str, settings : dict) -> str:
+    """ The pre-processing steps applied one after another, without prechecks """
+    filler_pattern = CompileFillerWordsPattern(settings['filler_words'])
+    text = ConvertWhitespaceBlocksToNewlines(text)
+    text = ConvertWideDashesToStandardDashes(text)
+    text = EnsureFullWidthPunctuation(text)
+    text = RemoveFillerWords(text, filler_pattern) if filler_pattern else text
+    text = BreakDialogOnOneLine(text, CompileDialogSplitPattern(dialog_marker))
+    return NormaliseDialogTags(text, dialog_marker)
+
+def postprocess_reference(text : str, settings : dict) -> str:
+    """ The post-processing steps applied one after another, without prechecks """
+    filler_pattern = CompileFillerWordsPattern(settings['filler_words'])
+    text = RemoveFillerWords(text, filler_pattern) if filler_pattern else text
+    text = ConvertWideDashesToStandardDashes(text)
+    text = BreakDialogOnOneLine(text, CompileDialogSplitPattern(dialog_marker))
+    text = NormaliseDialogTags(text, dialog_marker)
+    text = EnsureFullWidthPunctuation(text)
+    patterns = [ regex.compile(sequence) for sequence in break_sequences ]
+    return BreakLongLine(text, settings['max_single_line_length'], settings['min_single_line_length'], patterns)
+
+class TestTextPipeline(unittest.TestCase):
+    def test_Pipeline(self):
+        log_test_name("TextPipeline")
+        pipeline = TextPipeline()
+        pipeline.Add('upper', str.upper, lambda text: 'a' in text)
+        pipeline.Add('reverse', lambda text: text[::-1])
+
+        cases = [ ("abc", "CBA"), ("xyz", "zyx"), ("", "") ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                result = pipeline.Apply(text)
+                log_input_expected_result(text, expected, result)
+                self.assertEqual(result, expected)
+
+        timings = pipeline.GetTimings()
+        self.assertEqual(pipeline.names, [ 'upper', 'reverse' ])
+        self.assertEqual((timings['upper']['applied'], timings['upper']['skipped']), (1, 1))
+        self.assertEqual(timings['reverse']['applied'], 2)
+
+        pipeline.ResetTimings()
+        self.assertEqual(pipeline.GetTimings()['reverse']['applied'], 0)
+
+    def test_ProcessorSteps(self):
+        log_test_name("SubtitleProcessor builds only the enabled steps")
+        processor = SubtitleProcessor(SettingsType({ 'convert_wide_dashes': True, 'break_long_lines': True }))
+        log_input_expected_result("Preprocess", [ 'convert_wide_dashes' ], processor.preprocess_pipeline.names)
+        self.assertEqual(processor.preprocess_pipeline.names, [ 'convert_wide_dashes' ])
+        self.assertEqual(processor.postprocess_pipeline.names, [ 'convert_wide_dashes', 'break_long_lines' ])
+
+        processor = SubtitleProcessor(SettingsType(all_settings))
+        self.assertEqual(len(processor.preprocess_pipeline.steps), 6)
+        self.assertEqual(len(processor.postprocess_pipeline.steps), 6)
+
+    def test_Parity(self):
+        log_test_name("SubtitleProcessor matches the individual text helpers")
+        texts = generate_texts(500)
+        processor = SubtitleProcessor(SettingsType(all_settings))
+
+        for text in texts:
+            with self.subTest(text=text):
+                line = SubtitleLine.Construct(1, "00:00:01,000", "00:00:03,000", text)
+                processor.PreprocessSubtitles([ line ])
+                self.assertEqual(line.text, preprocess_reference(text.strip(), all_settings).strip() or None)
+
+                line = SubtitleLine.Construct(1, "00:00:01,000", "00:00:03,000", text)
+                processed = processor.PostprocessSubtitles([ line ])
+                self.assertEqual(processed[0].text, postprocess_reference(text.strip(), all_settings).strip() or None)
+
+        # Most lines do not need most steps, so they are skipped by the prechecks
+        timings = processor.GetTimings()
+        log_input_expected_result("Dashes skipped", True, timings['preprocess']['convert_wide_dashes']['skipped'] > 0)
+        self.assertGreater(timings['preprocess']['convert_wide_dashes']['skipped'], 0)
+        self.assertGreater(timings['postprocess']['full_width_punctuation']['applied'], 0)
+        self.assertGreater(timings['postprocess']['full_width_punctuation']['skipped'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
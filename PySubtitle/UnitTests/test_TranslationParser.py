@@ -0,0 +1,95 @@
+import unittest
+from datetime import timedelta
+
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Instructions import DEFAULT_TASK_TYPE
+from PySubtitle.Options import Options
+from PySubtitle.SubtitleError import UntranslatedLinesError
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Translation import Translation
+from PySubtitle.TranslationParser import TranslationParser
+
+def _format_response(entries : list[tuple[int, str, str]]) -> str:
+    """
+    Format (number, original, translation) entries the way a translation response is expected to look
+    """
+    return "\n\n".join(f"#{number}\nOriginal>\n{original}\nTranslation>\n{translation}" for number, original, translation in entries)
+
+class TestTranslationParser(unittest.TestCase):
+    match_translations_cases = [
+        {
+            'description': "Lines matched by number",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (1, "Hello there.", "Bonjour."), (2, "How are you?", "Comment ça va?"), (3, "Fine.", "Bien.") ],
+            'expected': [ "Bonjour.", "Comment ça va?", "Bien." ],
+        },
+        {
+            'description': "Lines renumbered in the translation",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (11, "Hello there.", "Bonjour."), (12, "How are you?", "Comment ça va?"), (13, "Fine.", "Bien.") ],
+            'expected': [ "Bonjour.", "Comment ça va?", "Bien." ],
+        },
+        {
+            'description': "Renumbered line with original and translation swapped",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (1, "Hello there.", "Bonjour."), (2, "How are you?", "Comment ça va?"), (7, "Bien.", "Fine!") ],
+            'expected': [ "Bonjour.", "Comment ça va?", "Bien." ],
+        },
+        {
+            'description': "Two lines merged in the translation with a line break between them",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (11, "Hello there.\nHow are you?", "Bonjour.\nComment ça va?"), (3, "Fine.", "Bien.") ],
+            'expected': [ "Bonjour.", "Comment ça va?", "Bien." ],
+        },
+        {
+            'description': "Merged lines without a line break for each line remain unmatched",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (11, "Hello there. How are you?", "Bonjour. Comment ça va?"), (3, "Fine.", "Bien.") ],
+            'expected': [ None, None, "Bien." ],
+        },
+        {
+            'description': "One line split in the translation",
+            'originals': [ "I went to the market and bought some apples.", "Then I went home." ],
+            'response': [ (11, "I went to the market", "Je suis allé au marché"), (12, "and bought some apples.", "et j'ai acheté des pommes."), (2, "Then I went home.", "Puis je suis rentré.") ],
+            'expected': [ "Je suis allé au marché\net j'ai acheté des pommes.", "Puis je suis rentré." ],
+        },
+        {
+            'description': "Lines matched by number are not displaced",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (1, "Hello there. How are you?", "Bonjour. Comment ça va?"), (2, "Fine.", "Bien.") ],
+            'expected': [ "Bonjour. Comment ça va?", "Bien.", None ],
+        },
+        {
+            'description': "Missing line remains unmatched",
+            'originals': [ "Hello there.", "How are you?", "Fine." ],
+            'response': [ (1, "Hello there.", "Bonjour."), (3, "Fine.", "Bien.") ],
+            'expected': [ "Bonjour.", None, "Bien." ],
+        },
+    ]
+
+    def test_MatchTranslations(self):
+        log_test_name("MatchTranslations")
+        for case in self.match_translations_cases:
+            with self.subTest(case['description']):
+                originals = [ SubtitleLine.Construct(number, timedelta(seconds=number), timedelta(seconds=number + 1), text) for number, text in enumerate(case['originals'], start=1) ]
+
+                parser = TranslationParser(DEFAULT_TASK_TYPE, Options())
+                parser.ProcessTranslation(Translation({ 'text': _format_response(case['response']) }))
+                matched, unmatched = parser.MatchTranslations(originals)
+
+                result = [ item.translation for item in originals ]
+                log_input_expected_result(case['description'], case['expected'], result)
+                self.assertSequenceEqual(result, case['expected'])
+
+                expected_matched = [ (number, text) for number, text in enumerate(case['expected'], start=1) if text ]
+                self.assertSequenceEqual([ (line.number, line.text) for line in matched ], expected_matched)
+                self.assertSequenceEqual([ item.number for item in unmatched ], [ number for number, text in enumerate(case['expected'], start=1) if (number, text) not in expected_matched ])
+
+                for line in matched:
+                    self.assertEqual(line.start, timedelta(seconds=line.number))
+
+                has_untranslated_error = any(isinstance(error, UntranslatedLinesError) for error in parser.errors)
+                self.assertEqual(has_untranslated_error, len(unmatched) > 0)
+
+if __name__ == '__main__':
+    unittest.main()
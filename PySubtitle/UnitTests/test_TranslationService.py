@@ -0,0 +1,247 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from PySubtitle.Helpers.TestCases import SubtitleTestCase
+from PySubtitle.Helpers.Tests import log_input_expected_result, log_test_name
+from PySubtitle.Options import Options
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleError import SubtitleError
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.TranslationJobQueue import TranslationJobQueue
+from PySubtitle.TranslationServer import TranslationRequestHandler, TranslationServer, UnixTranslationServer
+from PySubtitle.TranslationService import TranslationService
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+class TestTranslationService(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue_path = os.path.join(self.temp_dir.name, "jobs.db")
+
+        # The stand-in provider replies with the responses from the test data
+        self.service_options = Options(self.options)
+        self.service_options.provider_settings['Dummy Provider'] = SettingsType(chinese_dinner_data)
+
+        self.job_options = {
+            'movie_name': chinese_dinner_data.get_str('movie_name'),
+            'description': chinese_dinner_data.get_str('description'),
+            'names': chinese_dinner_data.get_list('names'),
+        }
+        self.content = chinese_dinner_data.get_str('original') or ''
+        self.services : list[TranslationService] = []
+
+    def tearDown(self):
+        for service in self.services:
+            service.Stop(timeout=10.0)
+        self.temp_dir.cleanup()
+
+    def _create_service(self, workers : int = 2) -> TranslationService:
+        service = TranslationService(self.service_options, self.queue_path, workers=workers)
+        self.services.append(service)
+        return service
+
+    def _wait_for_job(self, service : TranslationService, job_id : str, timeout : float = 30.0) -> dict:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = service.GetJob(job_id)
+            if job and job['status'] in TranslationJobQueue.finished_statuses:
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job_id} did not finish")
+
+    def test_TranslateJobs(self):
+        log_test_name("Jobs are translated by a shared worker pool")
+        service = self._create_service()
+        service.Start()
+
+        job_ids = [ service.SubmitJob(self.content, self.job_options, f"episode{i}.srt") for i in range(3) ]
+        jobs = [ self._wait_for_job(service, job_id) for job_id in job_ids ]
+
+        statuses = [ job['status'] for job in jobs ]
+        log_input_expected_result("Statuses", [TranslationJobQueue.COMPLETED] * 3, statuses)
+        self.assertEqual(statuses, [TranslationJobQueue.COMPLETED] * 3)
+
+        for job in jobs:
+            self.assertEqual(job['line_count'], 64)
+            self.assertEqual(job['translated_count'], 64)
+
+            result = Subtitles()
+            result.LoadSubtitlesFromString(service.GetResult(job['id']) or '')
+            self.assertEqual(len(result.originals or []), 64)
+
+        # Every job reuses the same provider, client and request budget
+        log_input_expected_result("Clients", 1, len(service._clients.clients))
+        self.assertEqual(len(service._providers), 1)
+        self.assertEqual(len(service._clients.clients), 1)
+        self.assertEqual(len(service._clients.budgets), 1)
+
+        event_types = [ event['type'] for event in service.GetEvents(job_ids[0]) ]
+        self.assertEqual(event_types[:3], [ 'queued', 'running', 'preprocessed' ])
+        self.assertEqual(event_types.count('batch_translated'), 4)
+        self.assertEqual(event_types.count('scene_translated'), 4)
+        self.assertEqual(event_types[-1], 'completed')
+
+    def test_InvalidJob(self):
+        log_test_name("Jobs without subtitles fail")
+        service = self._create_service(workers=1)
+        service.Start()
+
+        job_id = service.SubmitJob("This is not a subtitle file", self.job_options)
+        job = self._wait_for_job(service, job_id)
+        log_input_expected_result("Status", TranslationJobQueue.FAILED, job['status'])
+        self.assertEqual(job['status'], TranslationJobQueue.FAILED)
+        self.assertIsNotNone(job['error'])
+
+    def test_JobOptions(self):
+        log_test_name("Jobs cannot override paths, providers or credentials")
+        service = self._create_service(workers=1)
+
+        for options in [ { 'instruction_file': "/etc/passwd" }, { 'api_base': "http://example.com" }, { 'provider': "OpenAI" }, { 'provider_settings': {} } ]:
+            with self.subTest(options=options):
+                with self.assertRaises(SubtitleError):
+                    service.SubmitJob(self.content, options)
+
+        job_id = service.SubmitJob(self.content, { **self.job_options, 'target_language': "Spanish", 'max_batch_size': 20 })
+        self.assertIsNotNone(service.GetJob(job_id))
+
+    def test_PersistentQueue(self):
+        log_test_name("Queued and interrupted jobs are translated when the service restarts")
+        service = self._create_service()
+        queued_id = service.SubmitJob(self.content, self.job_options)
+        running_id = service.SubmitJob(self.content, self.job_options)
+
+        # Simulate a job that was in progress when the service stopped
+        claimed = service.queue.ClaimJob()
+        self.assertIsNotNone(claimed)
+        service.Stop()
+        self.services.remove(service)
+
+        restarted = self._create_service()
+        restarted.Start()
+        for job_id in [ queued_id, running_id ]:
+            job = self._wait_for_job(restarted, job_id)
+            log_input_expected_result(job_id, TranslationJobQueue.COMPLETED, job['status'])
+            self.assertEqual(job['status'], TranslationJobQueue.COMPLETED)
+
+    def test_CancelJob(self):
+        log_test_name("Queued jobs can be cancelled")
+        service = self._create_service()
+        job_id = service.SubmitJob(self.content, self.job_options)
+
+        self.assertTrue(service.CancelJob(job_id))
+        self.assertFalse(service.CancelJob(job_id))
+
+        service.Start()
+        other_id = service.SubmitJob(self.content, self.job_options)
+        self._wait_for_job(service, other_id)
+
+        job = service.GetJob(job_id)
+        log_input_expected_result("Status", TranslationJobQueue.CANCELLED, job and job['status'])
+        self.assertEqual(job and job['status'], TranslationJobQueue.CANCELLED)
+        self.assertIsNone(service.GetResult(job_id))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix domain sockets are not supported")
+    def test_UnixSocketPath(self):
+        log_test_name("Unix socket server only replaces a stale socket")
+        service = self._create_service()
+        socket_path = os.path.join(self.temp_dir.name, "service.sock")
+
+        with open(socket_path, 'w') as f:
+            f.write("Not a socket")
+
+        with self.assertRaises(ValueError):
+            UnixTranslationServer(service, socket_path)
+        self.assertTrue(os.path.isfile(socket_path))
+        os.remove(socket_path)
+
+        server = UnixTranslationServer(service, socket_path)
+        server.socket.close()
+
+        # A socket left behind by a server that did not shut down cleanly is replaced
+        server = UnixTranslationServer(service, socket_path)
+        server.server_close()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_HttpServer(self):
+        log_test_name("Jobs can be submitted and followed over HTTP")
+        service = self._create_service()
+        server = TranslationServer(service, "127.0.0.1", 0)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        service.Start()
+
+        def request(method : str, path : str, body : dict|None = None, content_type : str = 'application/json') -> tuple[int, bytes]:
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=30)
+            try:
+                connection.request(method, path, body=json.dumps(body) if body else None, headers={ 'Content-Type': content_type })
+                response = connection.getresponse()
+                return response.status, response.read()
+            finally:
+                connection.close()
+
+        try:
+            status, body = request('POST', '/jobs', { 'content': self.content, 'options': self.job_options, 'filename': "episode.srt" })
+            self.assertEqual(status, 201)
+            job_id = json.loads(body)['id']
+
+            status, body = request('GET', f'/jobs/{job_id}/stream')
+            events = [ json.loads(line) for line in body.decode('utf-8').splitlines() ]
+            log_input_expected_result("Last event", TranslationJobQueue.COMPLETED, events[-1]['type'])
+            self.assertEqual(events[-1]['type'], TranslationJobQueue.COMPLETED)
+            self.assertEqual([ event['sequence'] for event in events ], list(range(1, len(events) + 1)))
+
+            status, body = request('GET', f'/jobs/{job_id}')
+            self.assertEqual(json.loads(body)['status'], TranslationJobQueue.COMPLETED)
+
+            status, body = request('GET', f'/jobs/{job_id}/result')
+            self.assertEqual(status, 200)
+            self.assertEqual(body.decode('utf-8'), service.GetResult(job_id))
+
+            status, body = request('POST', '/jobs', { 'content': '' })
+            self.assertEqual(status, 400)
+
+            for invalid in [ { 'content': 123 }, { 'content': self.content, 'filename': [ "episode.srt" ] } ]:
+                status, body = request('POST', '/jobs', invalid)
+                log_input_expected_result(invalid, 400, status)
+                self.assertEqual(status, 400)
+
+            status, body = request('POST', '/jobs', { 'content': self.content, 'options': { 'instruction_file': "/etc/passwd" } })
+            self.assertEqual(status, 400)
+
+            # Simple cross-origin requests cannot set a JSON content type
+            status, body = request('POST', '/jobs', { 'content': self.content }, content_type='text/plain')
+            log_input_expected_result("text/plain", 415, status)
+            self.assertEqual(status, 415)
+
+            max_request_size = TranslationRequestHandler.max_request_size
+            TranslationRequestHandler.max_request_size = 100
+            try:
+                status, body = request('POST', '/jobs', { 'content': self.content })
+                log_input_expected_result("Oversized request", 413, status)
+                self.assertEqual(status, 413)
+            finally:
+                TranslationRequestHandler.max_request_size = max_request_size
+
+            status, body = request('GET', '/jobs/unknown')
+            self.assertEqual(status, 404)
+
+            status, body = request('DELETE', f'/jobs/{job_id}')
+            self.assertEqual(status, 409)
+
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
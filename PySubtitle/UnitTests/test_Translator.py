@@ -1,4 +1,6 @@
 from copy import deepcopy
+import os
+import tempfile
 
 from PySubtitle.Helpers.Parse import ParseNames
 from PySubtitle.Helpers.TestCases import DummyProvider, PrepareSubtitles, SubtitleTestCase
@@ -48,6 +50,36 @@ class SubtitleTranslatorTests(SubtitleTestCase):
 
             translator.TranslateSubtitles(originals)
 
+    def test_StreamingTranslation(self):
+        log_test_name("Streaming translation tests")
+
+        data = chinese_dinner_data
+        provider = DummyProvider(data=data)
+        reference : Subtitles = PrepareSubtitles(data, 'translated')
+        batcher = SubtitleBatcher(self.options)
+        reference.AutoBatch(batcher)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "chinese_dinner.srt")
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(data.get_str('original') or "")
+
+            originals = Subtitles(filepath)
+            originals.UpdateProjectSettings(PrepareSubtitles(data, 'original').settings)
+
+            # Each scene should be translated before the following scene has been read
+            scene_counts : list[int] = []
+            translator = SubtitleTranslator(self.options, translation_provider=provider)
+            translator.events.scene_translated += lambda scene: scene_counts.append(originals.scenecount) # type: ignore
+            translator.events.batch_translated += lambda batch: self.validate_batch(batch, original=originals, reference=reference) # type: ignore
+
+            translator.TranslateStreamingScenes(originals, originals.StreamScenes(batcher))
+
+        log_input_expected_result("Scenes read when each scene was translated", list(range(1, reference.scenecount + 1)), scene_counts)
+        self.assertSequenceEqual(scene_counts, list(range(1, reference.scenecount + 1)))
+        self.assertEqual(originals.linecount, reference.linecount)
+        self.assertEqual(len(originals.translated or []), reference.linecount)
+
     def validate_batch(self, batch : SubtitleBatch, original : Subtitles, reference : Subtitles):
         log_info(f"Validating scene {batch.scene} batch {batch.number}")
         log_info(f"Summary: {batch.summary}")
@@ -0,0 +1,67 @@
+import os
+import logging
+import random
+import time
+from datetime import timedelta
+
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+
+def generate_synthetic_lines(count : int, seed : int = 0) -> list[SubtitleLine]:
+    """
+    Generate a long sequence of lines with realistic durations and a mix of short and long gaps
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    time_ms = 0
+    for number in range(1, count + 1):
+        time_ms += rng.choice([50, 200, 500, 1000, rng.randint(0, 90000) if rng.random() < 0.02 else 800])
+        duration = rng.randint(800, 5000)
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=time_ms), timedelta(milliseconds=time_ms + duration), f"Line {number}"))
+        time_ms += duration
+    return lines
+
+def batcher_benchmark(lines : list[SubtitleLine], options : SettingsType) -> tuple[float, int, int]:
+    batcher = SubtitleBatcher(options)
+
+    start_time = time.perf_counter()
+    scenes = batcher.BatchSubtitles(lines)
+    elapsed = time.perf_counter() - start_time
+
+    return elapsed, len(scenes), sum(scene.size for scene in scenes)
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "batcher_benchmark.log", log_level=logging.INFO)
+
+    test_options = [
+        { 'min_batch_size': 10, 'max_batch_size': 100, 'scene_threshold': 60 },
+        { 'min_batch_size': 8, 'max_batch_size': 40, 'scene_threshold': 30 },
+        { 'min_batch_size': 1, 'max_batch_size': 30, 'scene_threshold': 1000000 },  # One enormous scene
+        { 'min_batch_size': 10, 'max_batch_size': 100, 'scene_threshold': 60, 'balance_batches': True },
+        { 'min_batch_size': 8, 'max_batch_size': 40, 'auto_scene_threshold': True, 'balance_batches': True },
+    ]
+
+    line_count = 100000
+
+    logging.info(separator)
+    logging.info(f"Batcher benchmark with {line_count} synthetic lines")
+    logging.info(separator)
+
+    for options in test_options:
+        lines = generate_synthetic_lines(line_count)
+        elapsed, scene_count, batch_count = batcher_benchmark(lines, SettingsType(options))
+        logging.info(f"{str(options):<80}{elapsed:>8.3f}s {scene_count:>8} scenes {batch_count:>8} batches")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
@@ -57,6 +57,8 @@ def run_tests(directory_path, results_path):
         { 'min_batch_size': 10, 'max_batch_size': 100, 'scene_threshold': 60 },
         { 'min_batch_size': 8, 'max_batch_size': 40, 'scene_threshold': 30 },
         { 'min_batch_size': 16, 'max_batch_size': 80, 'scene_threshold': 40 },
+        { 'min_batch_size': 8, 'max_batch_size': 40, 'scene_threshold': 30, 'balance_batches': True },
+        { 'min_batch_size': 8, 'max_batch_size': 40, 'auto_scene_threshold': True, 'balance_batches': True },
     ]
 
     RunTestOnAllSrtFiles(batcher_test, test_options, directory_path, results_path)
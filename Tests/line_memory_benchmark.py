@@ -0,0 +1,74 @@
+import gc
+import os
+import logging
+import tracemalloc
+from datetime import timedelta
+from typing import Any
+
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+
+class LegacySubtitleLine:
+    """
+    Mirrors the attributes of the unslotted SubtitleLine, which stored each timing as a timedelta and each line had its own metadata dictionary
+    """
+    def __init__(self, number : int, start : timedelta, end : timedelta, text : str):
+        self._index : int|None = number
+        self._start : timedelta|None = start
+        self._end : timedelta|None = end
+        self.content : str|None = text
+        self.metadata : dict[str, Any] = {}
+        self.translation : str|None = None
+        self.original : str|None = None
+        self._duration : timedelta|None = end - start
+
+def measure_memory(create_line, count : int) -> float:
+    """
+    Measure the memory allocated per line when constructing count lines, excluding the text itself
+    """
+    texts = [ f"Line {number}" for number in range(1, count + 1) ]
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    lines = [ create_line(number, text) for number, text in enumerate(texts, start=1) ]
+
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del lines
+    return (current - baseline) / count
+
+def create_legacy_line(number : int, text : str) -> LegacySubtitleLine:
+    return LegacySubtitleLine(number, timedelta(milliseconds=number * 2500), timedelta(milliseconds=number * 2500 + 2000), text)
+
+def create_line(number : int, text : str) -> SubtitleLine:
+    return SubtitleLine.Construct(number, timedelta(milliseconds=number * 2500), timedelta(milliseconds=number * 2500 + 2000), text)
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "line_memory_benchmark.log", log_level=logging.INFO)
+
+    line_count = 200000
+
+    logging.info(separator)
+    logging.info(f"SubtitleLine memory benchmark with {line_count} lines")
+    logging.info(separator)
+
+    legacy_bytes = measure_memory(create_legacy_line, line_count)
+    slotted_bytes = measure_memory(create_line, line_count)
+
+    logging.info(f"{'Unslotted line with timedeltas':<40}{legacy_bytes:>10.1f} bytes per line {legacy_bytes * line_count / 2**20:>10.1f} MB")
+    logging.info(f"{'Slotted line with integer timings':<40}{slotted_bytes:>10.1f} bytes per line {slotted_bytes * line_count / 2**20:>10.1f} MB")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
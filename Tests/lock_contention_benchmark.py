@@ -0,0 +1,127 @@
+import os
+import logging
+import random
+import threading
+import time
+
+from PySubtitle.Helpers.TestCases import DummyProvider, PrepareSubtitles
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.Options import Options
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleProject import SubtitleProject
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+thread_count = 8
+rounds = 10
+response_delay = 0.005
+
+def create_options() -> Options:
+    return Options({
+        'provider': 'Dummy Provider',
+        'provider_settings': { 'Dummy Provider' : {} },
+        'target_language': 'English',
+        'scene_threshold': 60.0,
+        'min_batch_size': 10,
+        'max_batch_size': 100,
+        'preprocess_subtitles': False,
+        'postprocess_translation': False,
+        'project': 'write',
+        'retry_on_error': False,
+        'stop_on_error': False
+    })
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "lock_contention_benchmark.log", log_level=logging.INFO)
+
+    options = create_options()
+    provider = DummyProvider(data=chinese_dinner_data)
+    provider.settings['response_delay'] = response_delay
+
+    project = SubtitleProject(options)
+    project.subtitles = PrepareSubtitles(chinese_dinner_data)
+    project.subtitles.AutoBatch(SubtitleBatcher(options))
+    project.projectfile = os.path.join(results_path, "lock_contention_benchmark.subtrans")
+    project.subtitles.outputpath = os.path.join(results_path, "lock_contention_benchmark.srt")
+
+    subtitles = project.subtitles
+    scene_count = subtitles.scenecount
+    line_count = subtitles.linecount
+
+    logging.info(separator)
+    logging.info(f"Lock contention benchmark: {thread_count} translation threads, {rounds} rounds of {scene_count} scenes, {response_delay * 1000:.0f}ms simulated latency")
+    logging.info(separator)
+
+    # Silence per-batch logging from the translator so that it does not dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    finished = threading.Event()
+    errors : list[Exception] = []
+    counts = { 'scenes': 0, 'saves': 0, 'edits': 0 }
+    counts_lock = threading.Lock()
+
+    def translate(worker : int):
+        translator = SubtitleTranslator(options, translation_provider=provider)
+        try:
+            for iteration in range(rounds):
+                scene_number = (worker + iteration) % scene_count + 1
+                project.TranslateScene(translator, scene_number)
+                with counts_lock:
+                    counts['scenes'] += 1
+        except Exception as e:
+            errors.append(e)
+
+    def autosave():
+        while not finished.is_set():
+            project.needs_writing = True
+            project.UpdateProjectFile()
+            counts['saves'] += 1
+
+    def edit():
+        rng = random.Random(0)
+        while not finished.is_set():
+            line_number = rng.randint(1, line_count)
+            line = subtitles.GetOriginalLine(line_number)
+            if line and line.text:
+                subtitles.UpdateLineText(line_number, line.text, line.translation or line.text)
+                counts['edits'] += 1
+            time.sleep(0.001)
+
+    start_time = time.perf_counter()
+    workers = [ threading.Thread(target=translate, args=(worker,)) for worker in range(thread_count) ]
+    helpers = [ threading.Thread(target=autosave), threading.Thread(target=edit) ]
+    for thread in workers + helpers:
+        thread.start()
+
+    for thread in workers:
+        thread.join()
+
+    finished.set()
+    for thread in helpers:
+        thread.join()
+
+    elapsed = time.perf_counter() - start_time
+    read_wait, write_wait = subtitles.lock_wait_time
+
+    logging.getLogger().setLevel(logging.INFO)
+    logging.info(f"{'Scenes translated':<40}{counts['scenes']:>10}")
+    logging.info(f"{'Project saves':<40}{counts['saves']:>10}")
+    logging.info(f"{'Line edits':<40}{counts['edits']:>10}")
+    logging.info(f"{'Elapsed time':<40}{elapsed:>9.3f}s")
+    logging.info(f"{'Total wait for read lock':<40}{read_wait:>9.3f}s")
+    logging.info(f"{'Total wait for exclusive lock':<40}{write_wait:>9.3f}s")
+    logging.info(f"{'Average wait per thread':<40}{(read_wait + write_wait) / (thread_count + len(helpers)):>9.3f}s")
+    for error in errors:
+        logging.error(f"Translation thread failed: {error}")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
@@ -0,0 +1,94 @@
+import os
+import logging
+import random
+import time
+from datetime import timedelta
+
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.Helpers.Text import standard_filler_words
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleProcessor import SubtitleProcessor
+
+episode_count = 12
+lines_per_episode = 3000
+
+settings = SettingsType({
+    'max_line_duration': 3.0,
+    'min_line_duration': 0.8,
+    'break_long_lines': True,
+    'max_single_line_length': 20,
+    'min_single_line_length': 4,
+    'break_dialog_on_one_line': True,
+    'normalise_dialog_tags': True,
+    'remove_filler_words': True,
+    'filler_words': standard_filler_words,
+    'full_width_punctuation': True,
+})
+
+fragments = [ "不过，满清对浙江很注意，", "派过去的都是他们的能源，", "你处处有性命之忧,", "我们去吃饭吧,好吗?", "今天下雨了。", "- 走吧!", "晚饭准备好了" ]
+
+def generate_episode(seed : int) -> list[SubtitleLine]:
+    """
+    Generate a dense CJK subtitle file with many lines that are long enough to be split
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    start = timedelta(seconds=1)
+    for number in range(1, lines_per_episode + 1):
+        text = ''.join(rng.choice(fragments) for _ in range(rng.randint(1, 6)))
+        duration = timedelta(milliseconds=rng.randint(1000, 9000))
+        lines.append(SubtitleLine.Construct(number, start, start + duration, text))
+        start += duration + timedelta(milliseconds=rng.randint(50, 2000))
+    return lines
+
+def describe(lines : list[SubtitleLine]) -> list[tuple]:
+    return [ (line.number, line.start_ms, line.end_ms, line.text) for line in lines ]
+
+def process_season(processor : SubtitleProcessor, episodes : list[list[SubtitleLine]]) -> tuple[float, list]:
+    start_time = time.perf_counter()
+    results = []
+    for episode in episodes:
+        preprocessed = processor.PreprocessSubtitles([ SubtitleLine(line) for line in episode ])
+        postprocessed = processor.PostprocessSubtitles(preprocessed)
+        results.append(describe(postprocessed))
+    return time.perf_counter() - start_time, results
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "parallel_processing_benchmark.log", log_level=logging.INFO)
+
+    episodes = [ generate_episode(seed) for seed in range(episode_count) ]
+    cpu_count = os.cpu_count() or 1
+
+    logging.info(separator)
+    logging.info(f"Parallel processing benchmark: {episode_count} episodes of {lines_per_episode} lines, {cpu_count} CPUs")
+    logging.info(separator)
+
+    serial_time, expected = process_season(SubtitleProcessor(settings), episodes)
+    logging.info(f"{'Workers':<10}{'Time':>10}{'Speedup':>10}")
+    logging.info(f"{1:<10}{serial_time:>9.3f}s{1.0:>9.2f}x")
+
+    for workers in sorted({ 2, 4, cpu_count } - { 1 }):
+        processor = SubtitleProcessor(SettingsType({ **settings, 'processing_workers': workers }))
+
+        # Start the worker processes before timing, as they are only started once
+        processor.PreprocessSubtitles([ SubtitleLine(line) for line in episodes[0] ])
+
+        parallel_time, results = process_season(processor, episodes)
+        processor.Close()
+        if results != expected:
+            logging.error(f"Results with {workers} workers differ from serial processing")
+
+        logging.info(f"{workers:<10}{parallel_time:>9.3f}s{serial_time / parallel_time:>9.2f}x")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
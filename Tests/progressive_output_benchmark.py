@@ -0,0 +1,86 @@
+import os
+import logging
+import random
+import tempfile
+import time
+from datetime import timedelta
+
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.ProgressiveOutput import ProgressiveOutput
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Subtitles import Subtitles
+
+line_count = 20000
+
+def generate_subtitles(count : int, seed : int = 0) -> Subtitles:
+    """
+    Generate untranslated subtitles split into scenes
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    time_ms = 0
+    for number in range(1, count + 1):
+        time_ms += rng.choice([50, 200, 500, 1000, rng.randint(0, 90000) if rng.random() < 0.02 else 800])
+        duration = rng.randint(800, 5000)
+        text = " ".join(rng.choice(["雨", "晚饭", "我们", "今天", "朋友", "吃", "好吗", "走吧"]) for _ in range(rng.randint(2, 8)))
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=time_ms), timedelta(milliseconds=time_ms + duration), text))
+        time_ms += duration
+
+    subtitles = Subtitles("benchmark.srt")
+    subtitles.originals = lines
+    subtitles.AutoBatch(SubtitleBatcher(SettingsType({ 'min_batch_size': 10, 'max_batch_size': 40, 'scene_threshold': 60 })))
+    return subtitles
+
+def translate_scene(scene):
+    for batch in scene.batches:
+        batch.translated = [ SubtitleLine.Construct(line.number, line.start, line.end, f"Translation of line {line.number}") for line in batch.originals ]
+
+def run_translation(save) -> float:
+    """ Translate every scene in turn, saving the output after each one, and return the time spent saving """
+    subtitles = generate_subtitles(line_count)
+    save_time = 0.0
+    for scene in subtitles.scenes:
+        translate_scene(scene)
+        start_time = time.perf_counter()
+        save(subtitles)
+        save_time += time.perf_counter() - start_time
+    return save_time
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "progressive_output_benchmark.log", log_level=logging.INFO)
+
+    scene_count = len(generate_subtitles(line_count).scenes)
+
+    logging.info(separator)
+    logging.info(f"Progressive output benchmark: {line_count} lines in {scene_count} scenes, output saved after each scene")
+    logging.info(separator)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outputpath = os.path.join(temp_dir, "benchmark.translated.srt")
+
+        save_time = run_translation(lambda subtitles: subtitles.SaveTranslation(outputpath))
+        logging.info(f"{'SaveTranslation':<30}{save_time:>9.3f}s")
+
+        outputs : list[ProgressiveOutput] = []
+        def save_progressive(subtitles):
+            if not outputs:
+                outputs.append(ProgressiveOutput(subtitles, outputpath, interval=0))
+            outputs[0].Write()
+
+        save_time = run_translation(save_progressive)
+        output = outputs[0]
+        logging.info(f"{'ProgressiveOutput':<30}{save_time:>9.3f}s{'appends':>10}{output.append_count:>6}{'rewrites':>10}{output.rewrite_count:>6}")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
@@ -0,0 +1,173 @@
+import json
+import os
+import logging
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import timedelta
+from unittest.mock import patch
+
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.ProjectDatabase import ProjectDatabase
+from PySubtitle.ProjectIndex import ProjectIndex, ReleaseProjectFile
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.Translation import Translation
+from PySubtitle.TranslationPrompt import TranslationPrompt
+import PySubtitle.SubtitleSerialisation as SubtitleSerialisation
+from PySubtitle.SubtitleSerialisation import DecodeIndexedProject, DecodeProject, EncodeProject, SubtitleDecoder, SubtitleEncoder
+
+line_count = 10000
+repetitions = 3
+
+instructions = "Translate these subtitles into English. Keep each line roughly the same length as the original and preserve any names."
+
+def generate_project(count : int, seed : int = 0) -> Subtitles:
+    """
+    Generate a fully translated project with a prompt and translation stored for every batch
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    time_ms = 0
+    for number in range(1, count + 1):
+        time_ms += rng.choice([50, 200, 500, 1000, rng.randint(0, 90000) if rng.random() < 0.02 else 800])
+        duration = rng.randint(800, 5000)
+        text = " ".join(rng.choice(["雨", "晚饭", "我们", "今天", "朋友", "吃", "好吗", "走吧"]) for _ in range(rng.randint(2, 8)))
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=time_ms), timedelta(milliseconds=time_ms + duration), text))
+        time_ms += duration
+
+    subtitles = Subtitles("benchmark.srt")
+    subtitles.originals = lines
+    subtitles.AutoBatch(SubtitleBatcher(SettingsType({ 'min_batch_size': 10, 'max_batch_size': 40, 'scene_threshold': 60 })))
+
+    for scene in subtitles.scenes:
+        scene.summary = f"Summary of scene {scene.number}"
+        for batch in scene.batches:
+            context = { 'summary': f"Summary of batch {batch.number}", 'history': [ f"Summary of scene {n}" for n in range(max(1, scene.number - 5), scene.number) ] }
+            batch.summary = context['summary']
+            batch.context = context
+
+            prompt = TranslationPrompt("Translate these subtitles [ for movie][ to language]")
+            prompt.supports_system_messages = True
+            prompt.GenerateMessages(instructions, batch.originals, context)
+            batch.prompt = prompt
+
+            translated = [ SubtitleLine.Construct(line.number, line.start, line.end, f"Translation of line {line.number}") for line in batch.originals ]
+            batch.translated = translated
+            for line, translated_line in zip(batch.originals, translated):
+                line.translation = translated_line.text
+
+            response = "\n\n".join(f"#{line.number}\nOriginal>\n{line.text}\nTranslation>\n{line.translation}" for line in batch.originals)
+            batch.translation = Translation({ 'text': f"{response}\n<summary>{batch.summary}</summary>", 'prompt_tokens': 1000, 'output_tokens': 800 })
+
+    return subtitles
+
+def measure(function, count : int = repetitions) -> float:
+    """ Return the best time of several runs """
+    best = float('inf')
+    for _ in range(count):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "project_codec_benchmark.log", log_level=logging.INFO)
+
+    subtitles = generate_project(line_count)
+
+    logging.info(separator)
+    logging.info(f"Project codec benchmark: {line_count} lines, {sum(scene.size for scene in subtitles.scenes)} batches with prompts, best of {repetitions}")
+    logging.info(separator)
+
+    # The previous implementation: JSONEncoder.default with indentation and a per-dictionary object_hook
+    legacy_content = json.dumps(subtitles, cls=SubtitleEncoder, ensure_ascii=False, indent=4).encode('utf-8')
+    save_time = measure(lambda: json.dumps(subtitles, cls=SubtitleEncoder, ensure_ascii=False, indent=4).encode('utf-8'))
+    load_time = measure(lambda: json.loads(legacy_content, cls=SubtitleDecoder))
+    logging.info(f"{'Legacy encoder/decoder':<30}{'save':>6}{save_time:>9.3f}s{'load':>6}{load_time:>9.3f}s{len(legacy_content) / 1024 / 1024:>9.2f}MB")
+
+    backends = [ "orjson", "msgspec", "json" ]
+    for backend in backends:
+        if backend != "json" and not getattr(SubtitleSerialisation, backend):
+            logging.info(f"{backend:<30}not installed")
+            continue
+
+        # Disable the faster libraries to measure each backend in turn
+        with ExitStack() as stack:
+            for name in backends[:backends.index(backend)]:
+                stack.enter_context(patch.object(SubtitleSerialisation, name, None))
+
+            for pretty in [False, True]:
+                content = EncodeProject(subtitles, pretty=pretty)
+                save_time = measure(lambda: EncodeProject(subtitles, pretty=pretty))
+                load_time = measure(lambda: DecodeProject(content))
+                name = f"{backend}{' (pretty)' if pretty else ''}"
+                logging.info(f"{name:<30}{'save':>6}{save_time:>9.3f}s{'load':>6}{load_time:>9.3f}s{len(content) / 1024 / 1024:>9.2f}MB")
+
+            content = EncodeProject(subtitles, include_prompts=False, include_responses=False)
+            save_time = measure(lambda: EncodeProject(subtitles, include_prompts=False, include_responses=False))
+            load_time = measure(lambda: DecodeProject(content))
+            name = f"{backend} (no prompts/responses)"
+            logging.info(f"{name:<30}{'save':>6}{save_time:>9.3f}s{'load':>6}{load_time:>9.3f}s{len(content) / 1024 / 1024:>9.2f}MB")
+
+    logging.info(separator)
+    logging.info("Opening a saved project: full decode versus index with prompts and responses loaded on demand")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        projectfile = os.path.join(temp_dir, "benchmark.subtrans")
+        index = ProjectIndex()
+        with open(projectfile, 'wb') as f:
+            f.write(EncodeProject(subtitles, index=index))
+        index.Stamp(projectfile)
+
+        def read_full():
+            with open(projectfile, 'rb') as f:
+                return DecodeProject(f.read())
+
+        for name, function in [ ("Full decode", read_full), ("Indexed", lambda: DecodeIndexedProject(projectfile, index)) ]:
+            open_time = measure(function)
+            tracemalloc.start()
+            project = function()
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            logging.info(f"{name:<30}{'open':>6}{open_time:>9.3f}s{'memory':>8}{memory / 1024 / 1024:>8.2f}MB")
+            del project
+
+        ReleaseProjectFile(projectfile)
+
+    logging.info(separator)
+    logging.info("Project database: saving in full, saving one changed batch, and reading")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = ProjectDatabase(os.path.join(temp_dir, "benchmark.subtransdb"))
+
+        def write_full():
+            database.DeleteProject("benchmark")
+            database.WriteProject("benchmark", subtitles)
+
+        write_time = measure(write_full)
+        batch = subtitles.scenes[0].batches[0]
+        batch_time = measure(lambda: database.WriteBatch("benchmark", batch))
+        read_time = measure(lambda: database.ReadProject("benchmark"))
+        size = sum(os.path.getsize(os.path.join(temp_dir, name)) for name in os.listdir(temp_dir))
+
+        logging.info(f"{'Save project':<30}{write_time:>9.3f}s{size / 1024 / 1024:>9.2f}MB")
+        logging.info(f"{'Save one batch':<30}{batch_time * 1000:>8.2f}ms")
+        logging.info(f"{'Read project':<30}{read_time:>9.3f}s")
+        database.Close()
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
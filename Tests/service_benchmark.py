@@ -0,0 +1,107 @@
+import os
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+
+from PySubtitle.Helpers.TestCases import SubtitleTestCase
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.Options import Options
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.TranslationJobQueue import TranslationJobQueue
+from PySubtitle.TranslationService import TranslationService
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+job_count = 20
+cold_start_count = 3
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Translate one file in a new process, as a job runner wrapping the command line would
+cold_start_script = """
+import sys
+from PySubtitle.Helpers.TestCases import DummyProvider, SubtitleTestCase
+from PySubtitle.Options import Options
+from PySubtitle.Subtitles import Subtitles
+from PySubtitle.SubtitleTranslator import SubtitleTranslator
+from PySubtitle.UnitTests.TestData.chinese_dinner import chinese_dinner_data
+
+options = Options(SubtitleTestCase().options, max_batch_size=100)
+subtitles = Subtitles()
+subtitles.LoadSubtitlesFromString(chinese_dinner_data['original'])
+subtitles.UpdateProjectSettings(chinese_dinner_data)
+translator = SubtitleTranslator(options, DummyProvider(data=chinese_dinner_data))
+translator.TranslateSubtitles(subtitles)
+sys.stdout.write(subtitles.ComposeTranslation())
+"""
+
+def time_cold_start() -> float:
+    start_time = time.perf_counter()
+    environment = { **os.environ, 'PYTHONPATH': base_path }
+    subprocess.run([ sys.executable, "-c", cold_start_script ], check=True, capture_output=True, env=environment, cwd=base_path)
+    return time.perf_counter() - start_time
+
+def time_service_jobs(service : TranslationService, job_options : dict) -> list[float]:
+    timings = []
+    for _ in range(job_count):
+        start_time = time.perf_counter()
+        job_id = service.SubmitJob(chinese_dinner_data.get_str('original') or '', job_options)
+        while True:
+            job = service.GetJob(job_id)
+            if job and job['status'] in TranslationJobQueue.finished_statuses:
+                break
+            service.GetEvents(job_id, timeout=0.05)
+
+        if job['status'] != TranslationJobQueue.COMPLETED:
+            logging.error(f"Job {job_id} {job['status']}: {job['error']}")
+
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "service_benchmark.log", log_level=logging.INFO)
+
+    logging.info(separator)
+    logging.info(f"Translation service benchmark: {job_count} jobs through the service, {cold_start_count} cold starts")
+    logging.info(separator)
+
+    # Keep the translation log out of the results
+    logger = logging.getLogger()
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+
+    cold_timings = [ time_cold_start() for _ in range(cold_start_count) ]
+
+    options = Options(SubtitleTestCase().options, max_batch_size=100)
+    options.provider_settings['Dummy Provider'] = SettingsType(chinese_dinner_data)
+    job_options = { key: chinese_dinner_data[key] for key in [ 'movie_name', 'description', 'names' ] }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = TranslationService(options, os.path.join(temp_dir, "jobs.db"), workers=1)
+        service.Start()
+        try:
+            service_timings = time_service_jobs(service, job_options)
+        finally:
+            service.Stop(timeout=10.0)
+
+    logger.setLevel(level)
+
+    cold_time = sum(cold_timings) / len(cold_timings)
+    first_time = service_timings[0]
+    warm_time = sum(service_timings[1:]) / len(service_timings[1:])
+
+    logging.info(f"{'Cold start per file':<28}{cold_time * 1000:>10.1f}ms")
+    logging.info(f"{'Service, first job':<28}{first_time * 1000:>10.1f}ms")
+    logging.info(f"{'Service, later jobs':<28}{warm_time * 1000:>10.1f}ms{cold_time / warm_time:>9.1f}x")
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
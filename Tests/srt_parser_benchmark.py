@@ -0,0 +1,101 @@
+import os
+import logging
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Iterator
+
+import srt # type: ignore
+
+from PySubtitle.Formats.SrtParser import SrtParser
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.SubtitleLine import SubtitleLine
+
+cue_count = 50000
+repetitions = 3
+
+def generate_srt(count : int, seed : int = 0) -> str:
+    """
+    Generate SRT content with a mix of one and two line cues, and occasional blank lines inside a cue
+    """
+    rng = random.Random(seed)
+    cues : list[str] = []
+    time_ms = 0
+    for number in range(1, count + 1):
+        time_ms += rng.randint(50, 2000)
+        start = srt.timedelta_to_srt_timestamp(srt.timedelta(milliseconds=time_ms))
+        time_ms += rng.randint(800, 5000)
+        end = srt.timedelta_to_srt_timestamp(srt.timedelta(milliseconds=time_ms))
+        text = "\n".join(" ".join(rng.choice(["雨", "晚饭", "我们", "今天", "朋友", "吃", "好吗", "走吧"]) for _ in range(rng.randint(2, 8))) for _ in range(rng.randint(1, 2)))
+        if rng.random() < 0.01:
+            text = f"{text}\n\n{text}"
+        cues.append(f"{number}\n{start} --> {end}\n{text}\n")
+    return "\n".join(cues)
+
+def parse_with_srt(filepath : str) -> Iterator[SubtitleLine]:
+    """ The previous implementation: srt.parse over the whole file, then SubtitleLine.Construct for each item """
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        for item in srt.parse(f.read()):
+            yield SubtitleLine.Construct(item.index, item.start, item.end, item.content, { "proprietary": item.proprietary } if item.proprietary else None)
+
+def parse_with_parser(filepath : str) -> Iterator[SubtitleLine]:
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        yield from SrtParser().Parse(f)
+
+def consume(lines : Iterator[SubtitleLine]) -> None:
+    """ Parse every line without keeping any of them """
+    deque(lines, maxlen=0)
+
+def measure(function : Callable[[], None], count : int = repetitions) -> float:
+    """ Return the best time of several runs """
+    best = float('inf')
+    for _ in range(count):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def peak_memory(function : Callable[[], None]) -> int:
+    """ Return the peak memory allocated while a function runs """
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "srt_parser_benchmark.log", log_level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, "benchmark.srt")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(generate_srt(cue_count))
+
+        logging.info(separator)
+        logging.info(f"SRT parser benchmark: {cue_count} cues, {os.path.getsize(filepath) / 1024 / 1024:.2f}MB, best of {repetitions}")
+        logging.info(separator)
+
+        expected = [ (line.number, line.start_ms, line.end_ms, line.text) for line in parse_with_srt(filepath) ]
+        result = [ (line.number, line.start_ms, line.end_ms, line.text) for line in parse_with_parser(filepath) ]
+        if result != expected:
+            logging.error("Parsed lines do not match the srt library")
+
+        for name, parse in [ ("srt library", parse_with_srt), ("SrtParser", parse_with_parser) ]:
+            # Lines are discarded as they are parsed, so the peak shows how much the parser itself holds in memory
+            parse_time = measure(lambda: consume(parse(filepath)))
+            streaming_peak = peak_memory(lambda: consume(parse(filepath)))
+            logging.info(f"{name:<20}{parse_time:>9.3f}s{'peak while streaming':>24}{streaming_peak / 1024:>10.1f}KB")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
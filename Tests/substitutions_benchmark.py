@@ -0,0 +1,78 @@
+import os
+import logging
+import random
+import time
+
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.Substitutions import Substitutions
+
+glossary_sizes = [ 10, 100, 1000, 5000 ]
+line_count = 2000
+
+syllables = [ "an", "bel", "cor", "dan", "el", "fa", "gor", "hin", "jo", "ka", "li", "mo", "nu", "or", "pe", "ri", "sa", "tu", "vi", "zo" ]
+words = [ "the", "and", "said", "that", "was", "going", "to", "find", "where", "you", "are", "tonight", "with" ]
+
+def generate_glossary(size : int, rng : random.Random) -> dict[str, str]:
+    glossary : dict[str, str] = {}
+    while len(glossary) < size:
+        name = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+        glossary[name] = name.upper()
+    return glossary
+
+def generate_lines(glossary : dict[str, str], rng : random.Random) -> list[str]:
+    names = list(glossary)
+    return [ ' '.join(rng.choice(names) if rng.random() < 0.1 else rng.choice(words) for _ in range(rng.randint(5, 15))) for _ in range(line_count) ]
+
+def substitute_sequentially(substitutions : Substitutions, lines : list[str]) -> list[str]:
+    """ The previous implementation, applying one pattern per substitution to each line in turn """
+    results = []
+    for line in lines:
+        for pattern, substitution in substitutions.patterns:
+            line = pattern.sub(substitution, line)
+        results.append(line)
+    return results
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "substitutions_benchmark.log", log_level=logging.INFO)
+
+    logging.info(separator)
+    logging.info(f"Substitutions benchmark: {line_count} lines, Auto mode")
+    logging.info(separator)
+    logging.info(f"{'Glossary':<10}{'Compile':>10}{'Sequential':>12}{'Combined':>10}{'Speedup':>10}")
+
+    rng = random.Random(0)
+    for size in glossary_sizes:
+        glossary = generate_glossary(size, rng)
+        lines = generate_lines(glossary, rng)
+
+        substitutions = Substitutions(glossary, Substitutions.Mode.Auto)
+        start_time = time.perf_counter()
+        _ = substitutions.pattern
+        compile_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        results, _ = substitutions.PerformSubstitutionsOnAll(lines)
+        combined_time = time.perf_counter() - start_time
+
+        # Compile the individual patterns before timing them, as the combined pattern was timed separately
+        _ = substitutions.patterns
+        start_time = time.perf_counter()
+        expected = substitute_sequentially(substitutions, lines)
+        sequential_time = time.perf_counter() - start_time
+
+        if results != expected:
+            logging.error(f"Results differ for a glossary of {size} names")
+
+        logging.info(f"{size:<10}{compile_time:>9.3f}s{sequential_time:>11.3f}s{combined_time:>9.3f}s{sequential_time / combined_time:>9.1f}x")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
@@ -0,0 +1,132 @@
+import os
+import logging
+import random
+import time
+
+import regex
+
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+from PySubtitle.Helpers.Text import (
+    break_sequences,
+    dialog_marker,
+    fullwidth_pattern,
+    fullwidth_punctuation_map,
+    standard_filler_words,
+    BreakDialogOnOneLine,
+    BreakLongLine,
+    CompileDialogSplitPattern,
+    CompileFillerWordsPattern,
+    NormaliseDialogTags,
+    RemoveFillerWords
+)
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleProcessor import SubtitleProcessor
+
+line_count = 100000
+
+settings = SettingsType({
+    'whitespaces_to_newline': True,
+    'convert_wide_dashes': True,
+    'full_width_punctuation': True,
+    'remove_filler_words': True,
+    'filler_words': standard_filler_words,
+    'break_dialog_on_one_line': True,
+    'normalise_dialog_tags': True,
+    'break_long_lines': True,
+    'max_single_line_length': 42,
+    'min_single_line_length': 8,
+})
+
+corpora = {
+    "English": [ "I don't know what you mean.", "Where are you going tonight?", "Umm, I think so.", "- Wait!", "- What is it?",
+                 "No escape—I have one condition", "We should leave before it gets dark", "<i>Italic text, with a comma.</i>" ],
+    "Chinese": [ "我们去吃饭吧,好吗?", "今天下雨了。", "不过，满清对浙江很注意，", "你处处有性命之忧", "晚饭准备好了", "- 走吧!" ],
+}
+
+def generate_lines(fragments : list[str], count : int, seed : int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [ ' '.join(rng.choice(fragments) for _ in range(rng.randint(1, 3))) for _ in range(count) ]
+
+def legacy_processor():
+    """
+    The previous implementation: every enabled step is applied to every line, with regex patterns looked up on each call
+    """
+    split_pattern = CompileDialogSplitPattern(dialog_marker)
+    filler_pattern = CompileFillerWordsPattern(standard_filler_words)
+    compiled_break_sequences = [ regex.compile(sequence) for sequence in break_sequences ]
+
+    def whitespace_to_newline(text : str) -> str:
+        if text and '\n' not in text:
+            text = regex.sub(r' {3,}|\，\s*', '\n', text)
+        return text
+
+    def full_width_punctuation(text : str) -> str:
+        def replace(match) -> str:
+            punctuation : str = match.group('punct')
+            return fullwidth_punctuation_map.get(punctuation) or punctuation
+        return regex.sub(fullwidth_pattern, replace, text)
+
+    def preprocess(text : str) -> str:
+        text = whitespace_to_newline(text)
+        text = regex.sub(r'\s*—+\s*', ' - ', text)
+        text = full_width_punctuation(text)
+        text = RemoveFillerWords(text, filler_pattern) if filler_pattern else text
+        text = BreakDialogOnOneLine(text, split_pattern)
+        return NormaliseDialogTags(text, dialog_marker)
+
+    def postprocess(text : str) -> str:
+        text = RemoveFillerWords(text, filler_pattern) if filler_pattern else text
+        text = regex.sub(r'\s*—+\s*', ' - ', text)
+        text = BreakDialogOnOneLine(text, split_pattern)
+        text = NormaliseDialogTags(text, dialog_marker)
+        text = full_width_punctuation(text)
+        return BreakLongLine(text, 42, 8, compiled_break_sequences)
+
+    return preprocess, postprocess
+
+def time_function(function, texts : list[str]) -> tuple[float, list[str]]:
+    start_time = time.perf_counter()
+    results = [ function(text) for text in texts ]
+    return time.perf_counter() - start_time, results
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "text_pipeline_benchmark.log", log_level=logging.INFO)
+
+    logging.info(separator)
+    logging.info(f"Text pipeline benchmark: {line_count} lines per corpus, all processing options enabled")
+    logging.info(separator)
+    logging.info(f"{'Corpus':<10}{'Stage':<14}{'Legacy':>10}{'Pipeline':>10}{'Speedup':>10}")
+
+    legacy_preprocess, legacy_postprocess = legacy_processor()
+
+    for corpus_name, fragments in corpora.items():
+        texts = generate_lines(fragments, line_count)
+        processor = SubtitleProcessor(settings)
+
+        stages = [
+            ("Preprocess", legacy_preprocess, processor.preprocess_pipeline.Apply),
+            ("Postprocess", legacy_postprocess, processor.postprocess_pipeline.Apply)
+        ]
+        for stage, legacy_function, pipeline_function in stages:
+            legacy_time, expected = time_function(legacy_function, texts)
+            pipeline_time, results = time_function(pipeline_function, texts)
+            if results != expected:
+                logging.error(f"{corpus_name} {stage}: results differ from the legacy implementation")
+
+            logging.info(f"{corpus_name:<10}{stage:<14}{legacy_time:>9.3f}s{pipeline_time:>9.3f}s{legacy_time / pipeline_time:>9.2f}x")
+
+        for stage, timings in processor.GetTimings().items():
+            for name, timing in timings.items():
+                logging.info(f"    {stage:<12}{name:<26}{timing['elapsed']:>8.3f}s{'applied':>10}{timing['applied']:>8}{'skipped':>10}{timing['skipped']:>8}")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
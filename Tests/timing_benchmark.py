@@ -0,0 +1,79 @@
+import os
+import logging
+import random
+import time
+from datetime import timedelta
+
+from PySubtitle.SettingsType import SettingsType
+from PySubtitle.SubtitleBatcher import SubtitleBatcher
+from PySubtitle.SubtitleLine import SubtitleLine
+from PySubtitle.SubtitleTimings import SubtitleTimings, numpy
+from PySubtitle.Helpers.Tests import create_logfile, end_logfile, separator
+
+def generate_synthetic_lines(count : int, seed : int = 0) -> list[SubtitleLine]:
+    """
+    Generate a long sequence of lines with some overlaps and a mix of short and long gaps
+    """
+    rng = random.Random(seed)
+    lines : list[SubtitleLine] = []
+    time_ms = 0
+    for number in range(1, count + 1):
+        time_ms += rng.choice([-200, 50, 200, 500, 1000, rng.randint(0, 90000) if rng.random() < 0.02 else 800])
+        duration = rng.randint(800, 5000)
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=max(time_ms, 0)), timedelta(milliseconds=max(time_ms, 0) + duration), f"Line {number}"))
+        time_ms += duration
+    return lines
+
+def shift_lines(lines : list[SubtitleLine], offset : timedelta):
+    """ Shift every line individually through the timedelta properties, for comparison """
+    for line in lines:
+        line.start = line.start + offset
+        line.end = line.end + offset
+
+def timed(operation) -> float:
+    start_time = time.perf_counter()
+    operation()
+    return time.perf_counter() - start_time
+
+def run_tests(directory_path : str, results_path : str|None = None):
+    results_path = results_path or directory_path
+    os.makedirs(results_path, exist_ok=True)
+    log_file = create_logfile(results_path, "timing_benchmark.log", log_level=logging.INFO)
+
+    line_count = 100000
+    offset = timedelta(seconds=2.5)
+
+    logging.info(separator)
+    logging.info(f"Timing benchmark with {line_count} synthetic lines (NumPy {'available' if numpy is not None else 'not available'})")
+    logging.info(separator)
+
+    lines = generate_synthetic_lines(line_count)
+    logging.info(f"{'Shift lines individually':<50}{timed(lambda: shift_lines(lines, offset)):>8.3f}s")
+
+    for use_numpy in ([ True, False ] if numpy is not None else [ False ]):
+        label = "NumPy" if use_numpy else "lists"
+        lines = generate_synthetic_lines(line_count)
+
+        timings = SubtitleTimings(lines, use_numpy=use_numpy)
+        logging.info(f"{f'Build timings view ({label})':<50}{timed(lambda: SubtitleTimings(lines, use_numpy=use_numpy)):>8.3f}s")
+        logging.info(f"{f'Shift ({label})':<50}{timed(lambda: timings.Shift(offset)):>8.3f}s")
+        logging.info(f"{f'Convert framerate ({label})':<50}{timed(lambda: timings.ConvertFramerate(25.0, 23.976)):>8.3f}s")
+        logging.info(f"{f'Fix overlaps ({label})':<50}{timed(lambda: timings.FixOverlaps()):>8.3f}s")
+        logging.info(f"{f'Enforce minimum gap ({label})':<50}{timed(lambda: timings.EnforceMinGap(timedelta(milliseconds=50))):>8.3f}s")
+        logging.info(f"{f'Gap histogram ({label})':<50}{timed(lambda: timings.GapHistogram([ timedelta(seconds=s) for s in (0, 1, 5, 30, 60) ])):>8.3f}s")
+        logging.info(f"{f'Filter by duration ({label})':<50}{timed(lambda: timings.FilterByDuration(longer_than=timedelta(seconds=4))):>8.3f}s")
+        logging.info(f"{f'Write back ({label})':<50}{timed(lambda: timings.WriteBack()):>8.3f}s")
+
+    batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 10, 'max_batch_size': 100, 'scene_threshold': 60 }))
+    lines = generate_synthetic_lines(line_count)
+    logging.info(f"{'Batch subtitles':<50}{timed(lambda: batcher.BatchSubtitles(lines)):>8.3f}s")
+
+    logging.info(separator)
+    end_logfile(log_file)
+
+if __name__ == "__main__":
+    directory_path = os.path.join(os.getcwd(), "test_subtitles")
+    results_path = os.path.join(directory_path, "test_results")
+    logging.getLogger().setLevel(logging.INFO)
+    logging.getLogger().addHandler(logging.StreamHandler())
+    run_tests(directory_path, results_path)
@@ -6,7 +6,7 @@ import logging
 base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(base_path)
 
-from scripts.subtrans_common import InitLogger, CreateArgParser, CreateOptions, CreateTranslator, CreateProject
+from scripts.subtrans_common import InitLogger, CreateArgParser, CreateOptions, CreateTranslator, CreateProject, BatchTranslate
 
 from PySubtitle.Options import Options
 from PySubtitle.SubtitleProject import SubtitleProject
@@ -15,35 +15,41 @@ from PySubtitle.SubtitleTranslator import SubtitleTranslator
 provider = "DeepSeek"
 default_model = os.getenv('DEEPSEEK_MODEL') or "deepseek-chat"
 
-parser = CreateArgParser(f"Translates an SRT file using an DeepSeek model")
-parser.add_argument('-k', '--apikey', type=str, default=None, help=f"Your DeepSeek API Key (https://platform.deepseek.com/api_keys)")
-parser.add_argument('-b', '--apibase', type=str, default="https://api.deepseek.com", help="API backend base address.")
-parser.add_argument('-m', '--model', type=str, default=None, help="The model to use for translation")
-args = parser.parse_args()
+if __name__ == "__main__":
+    parser = CreateArgParser(f"Translates an SRT file using an DeepSeek model")
+    parser.add_argument('-k', '--apikey', type=str, default=None, help=f"Your DeepSeek API Key (https://platform.deepseek.com/api_keys)")
+    parser.add_argument('-b', '--apibase', type=str, default="https://api.deepseek.com", help="API backend base address.")
+    parser.add_argument('-m', '--model', type=str, default=None, help="The model to use for translation")
+    args = parser.parse_args()
 
-logger_options = InitLogger("deepseek-subtrans", args.debug)
+    logger_options = InitLogger("deepseek-subtrans", args.debug)
 
-try:
-    options : Options = CreateOptions(
-        args,
-        provider,
-        api_base=args.apibase,
-        model=args.model or default_model
-    )
+    try:
+        options : Options = CreateOptions(
+            args,
+            provider,
+            api_base=args.apibase,
+            model=args.model or default_model
+        )
 
-    # Create a project for the translation
-    project : SubtitleProject = CreateProject(options, args)
+        if args.batch:
+            # Translate every file in the directory with a single provider
+            BatchTranslate(options, args)
 
-    # Create a translator with the provided options
-    translator : SubtitleTranslator = CreateTranslator(options)
+        else:
+            # Create a project for the translation
+            project : SubtitleProject = CreateProject(options, args)
 
-    # Translate the subtitles
-    project.TranslateSubtitles(translator)
+            # Create a translator with the provided options
+            translator : SubtitleTranslator = CreateTranslator(options)
 
-    if project.write_project:
-        logging.info(f"Writing project data to {str(project.projectfile)}")
-        project.SaveProjectFile()
+            # Translate the subtitles
+            project.TranslateSubtitles(translator)
 
-except Exception as e:
-    print("Error:", e)
-    raise
+            if project.write_project:
+                logging.info(f"Writing project data to {str(project.projectfile)}")
+                project.SaveProjectFile()
+
+    except Exception as e:
+        print("Error:", e)
+        raise
@@ -0,0 +1,68 @@
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to the sys path so that modules can be found
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(base_path)
+
+from scripts.subtrans_common import InitLogger
+
+from PySubtitle.Options import Options, config_dir, settings_path
+from PySubtitle.TranslationServer import TranslationServer, UnixTranslationServer
+from PySubtitle.TranslationService import TranslationService
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs a local service that translates subtitles submitted as jobs over HTTP")
+    parser.add_argument('--host', type=str, default="127.0.0.1", help="Address to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on")
+    parser.add_argument('--socket', type=str, default=None, help="Listen on a Unix domain socket at this path instead of a TCP port")
+    parser.add_argument('--queue', type=str, default=os.path.join(config_dir, "service-jobs.db"), help="Path of the database to keep the job queue in")
+    parser.add_argument('--workers', type=int, default=2, help="Number of jobs to translate at the same time")
+    parser.add_argument('-p', '--provider', type=str, default=None, help="The default translation provider for jobs")
+    parser.add_argument('-m', '--model', type=str, default=None, help="The default model for jobs")
+    parser.add_argument('-l', '--target_language', type=str, default=None, help="The default target language for jobs")
+    parser.add_argument('--instructionfile', type=str, default=None, help="Name/path of a file to load instructions from")
+    parser.add_argument('--ratelimit', type=int, default=None, help="Maximum number of requests per minute to each provider, across all jobs")
+    parser.add_argument('--debug', action='store_true', help="Run with DEBUG log level")
+    args = parser.parse_args()
+
+    logger_options = InitLogger("service-subtrans", args.debug)
+
+    # Load the saved settings and update with any explicit arguments
+    options = Options()
+    options.MigrateSettings()
+    if options.LoadSettings():
+        logging.info(f"Loaded settings from {settings_path}")
+
+    options.update({ key: value for key, value in {
+        'provider': args.provider,
+        'model': args.model,
+        'target_language': args.target_language,
+        'instruction_file': args.instructionfile,
+        'rate_limit': args.ratelimit,
+    }.items() if value is not None })
+
+    options.InitialiseInstructions()
+
+    service = TranslationService(options, args.queue, workers=args.workers)
+
+    if args.socket:
+        server = UnixTranslationServer(service, args.socket)
+        logging.info(f"Listening on {args.socket}")
+    else:
+        server = TranslationServer(service, args.host, args.port)
+        logging.info(f"Listening on http://{args.host}:{args.port}")
+
+    service.Start()
+
+    try:
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+        logging.info("Stopping service")
+
+    finally:
+        server.server_close()
+        service.Stop(timeout=30.0)
@@ -4,6 +4,7 @@ import logging
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass
 
+from PySubtitle.BatchTranslator import BatchTranslator, default_manifest_name
 from PySubtitle.Helpers.Parse import ParseNames
 from PySubtitle.Options import Options, config_dir
 from PySubtitle.Substitutions import Substitutions
@@ -58,16 +59,21 @@ def CreateArgParser(description : str) -> ArgumentParser:
     Create new arg parser and parse shared command line arguments between models
     """
     parser = ArgumentParser(description=description)
-    parser.add_argument('input', help="Input SRT file path")
-    parser.add_argument('-o', '--output', help="Output SRT file path")
+    parser.add_argument('input', help="Input SRT file path (or a directory or glob pattern with --batch)")
+    parser.add_argument('-o', '--output', help="Output SRT file path (or a directory for the translations with --batch)")
     parser.add_argument('-l', '--target_language', type=str, default=None, help="The target language for the translation")
+    parser.add_argument('--batch', action='store_true', help="Translate every subtitle file in a directory or matching a glob pattern")
+    parser.add_argument('--batchfiles', type=int, default=2, help="Number of files to translate at the same time with --batch")
     parser.add_argument('--batchthreshold', type=float, default=None, help="Number of seconds between lines to consider for batching")
     parser.add_argument('--debug', action='store_true', help="Run with DEBUG log level")
     parser.add_argument('--description', type=str, default=None, help="A brief description of the film to give context")
+    parser.add_argument('--autoscenethreshold', action='store_true', default=None, help="Choose the scene threshold automatically from the gaps between lines")
+    parser.add_argument('--balancebatches', action='store_true', default=None, help="Divide scenes into evenly sized batches rather than splitting at the largest gap")
     parser.add_argument('--addrtlmarkers', action='store_true', help="Add RTL markers to translated lines if they contains primarily right-to-left script")
     parser.add_argument('--includeoriginal', action='store_true', help="Include the original text in the translated subtitles")
     parser.add_argument('--instruction', action='append', type=str, default=None, help="An instruction for the AI translator")
     parser.add_argument('--instructionfile', type=str, default=None, help="Name/path of a file to load instructions from")
+    parser.add_argument('--manifest', type=str, default=None, help=f"Path to write a summary of a batch translation to (default {default_manifest_name})")
     parser.add_argument('--matchpartialwords', action='store_true', help="Allow substitutions that do not match not on word boundaries")
     parser.add_argument('--maxbatchsize', type=int, default=None, help="Maximum number of lines before starting a new batch is compulsory")
     parser.add_argument('--maxlines', type=int, default=None, help="Maximum number of lines(subtitles) to process in this run")
@@ -76,11 +82,16 @@ def CreateArgParser(description : str) -> ArgumentParser:
     parser.add_argument('--moviename', type=str, default=None, help="Optionally specify the name of the movie to help the translator")
     parser.add_argument('--name', action='append', type=str, default=None, help="A name to use verbatim in the translation")
     parser.add_argument('--names', type=str, default=None, help="A list of names to use verbatim")
+    parser.add_argument('--overwrite', action='store_true', help="Translate files with --batch even if a translation already exists")
     parser.add_argument('--postprocess', action='store_true', default=None, help="Postprocess the subtitles after translation")
     parser.add_argument('--preprocess', action='store_true', default=None, help="Preprocess the subtitles before translation")
+    parser.add_argument('--processingworkers', type=int, default=None, help="Number of processes to use for preprocessing and postprocessing large subtitle files")
+    parser.add_argument('--progressive', type=float, nargs='?', const=10.0, default=None, metavar='SECONDS', help="Write the translation to the output file as each scene is completed, at most once every SECONDS (default 10)")
     parser.add_argument('--project', type=str, default=None, help="Read or Write project file to working directory")
+    parser.add_argument('--projectdb', type=str, default=None, help="Store the project in an SQLite database, which can be shared by several projects (e.g. season.subtransdb)")
     parser.add_argument('--ratelimit', type=int, default=None, help="Maximum number of batches per minute to process")
     parser.add_argument('--scenethreshold', type=float, default=None, help="Number of seconds between lines to consider a new scene")
+    parser.add_argument('--stream', action='store_true', default=None, help="Start translating each scene as soon as it has been read from the source file")
     parser.add_argument('--substitution', action='append', type=str, default=None, help="A pair of strings separated by ::, to subsitute in source or translation")
     parser.add_argument('--temperature', type=float, default=0.0, help="A higher temperature increases the random variance of translations.")
     parser.add_argument('--writebackup', action='store_true', help="Write a backup of the project file when it is loaded (if it exists)")
@@ -93,6 +104,8 @@ def CreateOptions(args: Namespace, provider: str, **kwargs) -> Options:
         'description': args.description,
         'include_original': args.includeoriginal,
         'add_right_to_left_markers': args.addrtlmarkers,
+        'auto_scene_threshold': args.autoscenethreshold,
+        'balance_batches': args.balancebatches,
         'instruction_args': args.instruction,
         'instruction_file': args.instructionfile,
         'substitution_mode': "Partial Words" if args.matchpartialwords else "Auto",
@@ -100,14 +113,19 @@ def CreateOptions(args: Namespace, provider: str, **kwargs) -> Options:
         'max_context_summaries': args.maxsummaries,
         'max_lines': args.maxlines,
         'min_batch_size': args.minbatchsize,
-        'movie_name': args.moviename or os.path.splitext(os.path.basename(args.input))[0],
+        'movie_name': args.moviename or (None if args.batch else os.path.splitext(os.path.basename(args.input))[0]),
         'names': ParseNames(args.names or args.name),
         'postprocess_translation': args.postprocess,
         'preprocess_subtitles': args.preprocess,
+        'processing_workers': args.processingworkers,
+        'progressive_output': True if args.progressive is not None else None,
+        'progressive_interval': args.progressive,
         'project': args.project and args.project.lower(),
+        'project_database': args.projectdb,
         'provider': provider,
         'rate_limit': args.ratelimit,
         'scene_threshold': args.scenethreshold,
+        'stream_subtitles': args.stream,
         'substitutions': Substitutions.Parse(args.substitution),
         'target_language': args.target_language,
         'temperature': args.temperature,
@@ -120,9 +138,9 @@ def CreateOptions(args: Namespace, provider: str, **kwargs) -> Options:
 
     return Options(options)
 
-def CreateTranslator(options : Options) -> SubtitleTranslator:
+def CreateProvider(options : Options) -> TranslationProvider:
     """
-    Initialise a subtitle translator with the provided options
+    Initialise and validate the translation provider for the provided options
     """
     translation_provider = TranslationProvider.get_provider(options)
     if not translation_provider:
@@ -137,6 +155,14 @@ def CreateTranslator(options : Options) -> SubtitleTranslator:
     # Load the instructions
     options.InitialiseInstructions()
 
+    return translation_provider
+
+def CreateTranslator(options : Options) -> SubtitleTranslator:
+    """
+    Initialise a subtitle translator with the provided options
+    """
+    translation_provider = CreateProvider(options)
+
     return SubtitleTranslator(options, translation_provider)
 
 def CreateProject(options : Options, args: Namespace) -> SubtitleProject:
@@ -153,6 +179,28 @@ def CreateProject(options : Options, args: Namespace) -> SubtitleProject:
 
     project.UpdateProjectSettings(options)
 
-    logging.info(f"Translating {project.subtitles.linecount} subtitles from {args.input}")
+    if project.stream_subtitles:
+        logging.info(f"Streaming subtitles from {args.input}")
+    else:
+        logging.info(f"Translating {project.subtitles.linecount} subtitles from {args.input}")
+
+    return project
+
+def BatchTranslate(options : Options, args: Namespace) -> BatchTranslator:
+    """
+    Translate every subtitle file in a directory or matching a glob pattern, sharing a single provider
+    """
+    translation_provider = CreateProvider(options)
+
+    filepaths = BatchTranslator.FindSourceFiles(args.input, options.target_language)
+    if not filepaths:
+        raise ValueError(f"No subtitle files found in {args.input}")
+
+    input_root = args.input if os.path.isdir(args.input) else None
+    batch = BatchTranslator(options, translation_provider, max_files=args.batchfiles, output_dir=args.output, overwrite=args.overwrite, movie_name=args.moviename, input_root=input_root)
+
+    root_dir = args.output or (args.input if os.path.isdir(args.input) else os.path.dirname(args.input))
+    manifest_path = args.manifest or os.path.join(root_dir or os.getcwd(), default_manifest_name)
 
-    return project
\ No newline at end of file
+    batch.TranslateFiles(filepaths, manifest_path)
+    return batch